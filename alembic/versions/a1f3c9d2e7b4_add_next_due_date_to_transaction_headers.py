@@ -0,0 +1,77 @@
+"""Add next_due_date to transaction_headers for due/overdue rental reports
+
+Revision ID: a1f3c9d2e7b4
+Revises: e46f4a9edacc
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c9d2e7b4'
+down_revision: Union[str, None] = 'e46f4a9edacc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the precomputed rental due date and backfill it from open transaction lines.
+    """
+    op.add_column(
+        'transaction_headers',
+        sa.Column(
+            'next_due_date',
+            sa.Date(),
+            nullable=True,
+            comment='Earliest rental end date among lines not yet returned'
+        )
+    )
+
+    # Backfill: earliest end date of lines still out on rent, NULL when fully returned
+    op.execute("""
+        UPDATE transaction_headers h
+        SET next_due_date = open_lines.due_date
+        FROM (
+            SELECT transaction_id, MIN(rental_end_date) AS due_date
+            FROM transaction_lines
+            WHERE returned_quantity < quantity
+              AND current_rental_status IN (
+                  'ACTIVE', 'LATE', 'EXTENDED', 'PARTIAL_RETURN', 'LATE_PARTIAL_RETURN'
+              )
+            GROUP BY transaction_id
+        ) AS open_lines
+        WHERE h.id = open_lines.transaction_id
+          AND h.transaction_type = 'RENTAL'
+    """)
+
+    # Partial indexes: returned rentals (NULL) are never part of the index
+    op.create_index(
+        'idx_rental_next_due',
+        'transaction_headers',
+        ['next_due_date', 'id'],
+        postgresql_where=sa.text('next_due_date IS NOT NULL'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'idx_rental_next_due_location',
+        'transaction_headers',
+        ['location_id', 'next_due_date', 'id'],
+        postgresql_where=sa.text('next_due_date IS NOT NULL'),
+        if_not_exists=True
+    )
+
+    op.execute("ANALYZE transaction_headers;")
+
+
+def downgrade() -> None:
+    """
+    Remove the precomputed rental due date.
+    """
+    op.drop_index('idx_rental_next_due_location', 'transaction_headers', if_exists=True)
+    op.drop_index('idx_rental_next_due', 'transaction_headers', if_exists=True)
+    op.drop_column('transaction_headers', 'next_due_date')
@@ -0,0 +1,64 @@
+"""Add keyset pagination indexes for transactions and stock movements
+
+Revision ID: a2d8e6b4c9f1
+Revises: f1c7d3a9b5e2
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d8e6b4c9f1'
+down_revision: Union[str, None] = 'f1c7d3a9b5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Index the (sort key, id) orders used by cursor pagination. The stock
+    movement indexes replace the (item_id, created_at) and
+    (stock_level_id, created_at) ones, which they cover.
+    """
+    op.create_index(
+        'idx_transaction_date_id',
+        'transaction_headers',
+        ['transaction_date', 'id'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'idx_stock_movement_item_created_id',
+        'stock_movements',
+        ['item_id', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'idx_stock_movement_stock_created_id',
+        'stock_movements',
+        ['stock_level_id', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+    op.drop_index('idx_stock_movement_item_created', 'stock_movements', if_exists=True)
+    op.drop_index('idx_stock_movement_stock_created', 'stock_movements', if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore the previous stock movement indexes and drop the keyset ones."""
+    op.create_index(
+        'idx_stock_movement_stock_created',
+        'stock_movements',
+        ['stock_level_id', 'created_at'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'idx_stock_movement_item_created',
+        'stock_movements',
+        ['item_id', 'created_at'],
+        if_not_exists=True,
+    )
+    op.drop_index('idx_stock_movement_stock_created_id', 'stock_movements', if_exists=True)
+    op.drop_index('idx_stock_movement_item_created_id', 'stock_movements', if_exists=True)
+    op.drop_index('idx_transaction_date_id', 'transaction_headers', if_exists=True)
@@ -0,0 +1,43 @@
+"""Bump cache versions on item, customer and supplier writes
+
+Revision ID: a9e4c2d7f3b1
+Revises: b4f9e2c7a1d3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c2d7f3b1'
+down_revision: Union[str, None] = 'b4f9e2c7a1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = ('items', 'customers', 'suppliers')
+
+
+def upgrade() -> None:
+    """
+    Bump the items/customers/suppliers cache versions after every statement
+    that writes to those tables, so each worker's autocomplete indexes
+    notice writes made elsewhere. Reuses bump_cache_version() from the
+    add_cache_versions migration.
+    """
+    for table in TRACKED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_cache_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('{table}');
+        """)
+
+
+def downgrade() -> None:
+    """
+    Remove the item, customer and supplier version triggers.
+    """
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_cache_version ON {table};")
+        op.execute(f"DELETE FROM cache_versions WHERE name = '{table}';")
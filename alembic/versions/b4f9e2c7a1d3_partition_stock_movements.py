@@ -0,0 +1,191 @@
+"""Partition stock movements by month and add daily movement aggregates
+
+Revision ID: b4f9e2c7a1d3
+Revises: a2d8e6b4c9f1
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.modules.inventory.models import STOCK_MOVEMENT_ROLLUP_FUNCTION, STOCK_MOVEMENT_ROLLUP_TRIGGER
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f9e2c7a1d3'
+down_revision: Union[str, None] = 'a2d8e6b4c9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months of partitions created ahead of the current one (the nightly job keeps this up)
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = [
+    ('stock_movements_stock_level_id_fkey', 'stock_level_id', 'stock_levels'),
+    ('stock_movements_item_id_fkey', 'item_id', 'items'),
+    ('stock_movements_location_id_fkey', 'location_id', 'locations'),
+]
+
+INDEXES = [
+    ('idx_stock_movement_stock_level', ['stock_level_id']),
+    ('idx_stock_movement_item', ['item_id']),
+    ('idx_stock_movement_location', ['location_id']),
+    ('idx_stock_movement_type', ['movement_type']),
+    ('idx_stock_movement_reference', ['reference_type', 'reference_id']),
+    ('idx_stock_movement_created', ['created_at']),
+    ('idx_stock_movement_item_created_id', ['item_id', 'created_at', 'id']),
+    ('idx_stock_movement_stock_created_id', ['stock_level_id', 'created_at', 'id']),
+]
+
+
+def _relkind() -> str:
+    """'r' for a plain stock_movements table, 'p' if it is already partitioned."""
+    return op.get_bind().execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass('stock_movements')")
+    ).scalar()
+
+
+def _add_constraints_and_indexes() -> None:
+    for name, column, target in FOREIGN_KEYS:
+        op.create_foreign_key(name, 'stock_movements', target, [column], ['id'])
+    for name, columns in INDEXES:
+        op.create_index(name, 'stock_movements', columns, if_not_exists=True)
+
+
+def upgrade() -> None:
+    """
+    Turn stock_movements into a table range-partitioned by month on
+    created_at (primary key (id, created_at)), copying existing rows into
+    monthly partitions, and add stock_movement_daily with the trigger that
+    keeps it in step with inserts and deletes. Movements are append-only:
+    the trigger rejects updates to their ledger fields.
+    """
+    if _relkind() == 'r':
+        op.execute("ALTER TABLE stock_movements RENAME TO stock_movements_unpartitioned")
+        op.execute("""
+            CREATE TABLE stock_movements (
+                LIKE stock_movements_unpartitioned INCLUDING DEFAULTS INCLUDING COMMENTS
+            ) PARTITION BY RANGE (created_at)
+        """)
+
+        # One partition per UTC month from the oldest movement to MONTHS_AHEAD out
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month DATE;
+                last_month DATE := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                                    + interval '{MONTHS_AHEAD} months')::date;
+            BEGIN
+                SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')::date
+                INTO month
+                FROM stock_movements_unpartitioned;
+
+                WHILE month <= last_month LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF stock_movements FOR VALUES FROM (%L) TO (%L)',
+                        'stock_movements_p' || to_char(month, 'YYYY_MM'),
+                        month::text || ' 00:00:00+00',
+                        (month + interval '1 month')::date::text || ' 00:00:00+00'
+                    );
+                    month := (month + interval '1 month')::date;
+                END LOOP;
+            END
+            $$;
+        """)
+        op.execute("CREATE TABLE stock_movements_default PARTITION OF stock_movements DEFAULT")
+
+        op.execute("INSERT INTO stock_movements SELECT * FROM stock_movements_unpartitioned")
+        op.execute("DROP TABLE stock_movements_unpartitioned")
+
+        op.execute("""
+            ALTER TABLE stock_movements
+            ADD CONSTRAINT stock_movements_pkey PRIMARY KEY (id, created_at)
+        """)
+        _add_constraints_and_indexes()
+    else:
+        # Already created partitioned (create_all on a fresh database); the
+        # nightly job adds the monthly partitions
+        op.execute("CREATE TABLE IF NOT EXISTS stock_movements_default PARTITION OF stock_movements DEFAULT")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS stock_movement_daily (
+            item_id CHAR(36) NOT NULL,
+            location_id CHAR(36) NOT NULL,
+            movement_day DATE NOT NULL,
+            movement_type VARCHAR(50) NOT NULL,
+            movement_count INTEGER NOT NULL DEFAULT 0,
+            quantity_in NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            quantity_out NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            net_change NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            CONSTRAINT stock_movement_daily_pkey
+                PRIMARY KEY (item_id, location_id, movement_day, movement_type)
+        )
+    """)
+    op.create_index(
+        'idx_stock_movement_daily_item_day',
+        'stock_movement_daily',
+        ['item_id', 'movement_day'],
+        if_not_exists=True,
+    )
+
+    # Per-day totals by UTC day. stock_movements.skip_rollup = 'on' is set by
+    # the partition manager while it relocates rows that are already counted.
+    op.execute(STOCK_MOVEMENT_ROLLUP_FUNCTION)
+
+    # Backfill and attach the trigger with writers locked out, so no movement
+    # is counted twice or missed
+    op.execute("LOCK TABLE stock_movements IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("TRUNCATE stock_movement_daily")
+    op.execute("""
+        INSERT INTO stock_movement_daily (
+            item_id, location_id, movement_day, movement_type,
+            movement_count, quantity_in, quantity_out, net_change
+        )
+        SELECT
+            item_id,
+            location_id,
+            (created_at AT TIME ZONE 'UTC')::date,
+            movement_type,
+            count(*),
+            sum(greatest(quantity_change, 0)),
+            sum(greatest(-quantity_change, 0)),
+            sum(quantity_change)
+        FROM stock_movements
+        WHERE is_active
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("DROP TRIGGER IF EXISTS stock_movements_daily_rollup ON stock_movements")
+    op.execute(STOCK_MOVEMENT_ROLLUP_TRIGGER)
+
+    op.execute("ANALYZE stock_movements")
+    op.execute("ANALYZE stock_movement_daily")
+
+
+def downgrade() -> None:
+    """
+    Drop the daily aggregates and copy the attached partitions back into a
+    plain stock_movements table. Partitions already moved to the archive
+    schema are left where they are.
+    """
+    op.execute("DROP TRIGGER IF EXISTS stock_movements_daily_rollup ON stock_movements")
+    op.execute("DROP FUNCTION IF EXISTS stock_movements_daily_rollup_trigger()")
+    op.drop_index('idx_stock_movement_daily_item_day', 'stock_movement_daily', if_exists=True)
+    op.execute("DROP TABLE IF EXISTS stock_movement_daily")
+
+    if _relkind() != 'p':
+        return
+
+    op.execute("ALTER TABLE stock_movements RENAME TO stock_movements_partitioned")
+    op.execute("""
+        CREATE TABLE stock_movements (
+            LIKE stock_movements_partitioned INCLUDING DEFAULTS INCLUDING COMMENTS
+        )
+    """)
+    op.execute("INSERT INTO stock_movements SELECT * FROM stock_movements_partitioned")
+    op.execute("DROP TABLE stock_movements_partitioned")
+
+    op.execute("ALTER TABLE stock_movements ADD CONSTRAINT stock_movements_pkey PRIMARY KEY (id)")
+    _add_constraints_and_indexes()
@@ -0,0 +1,76 @@
+"""Add rental return counters to transaction_headers
+
+Revision ID: b7d2e4f1a9c3
+Revises: a1f3c9d2e7b4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f1a9c3'
+down_revision: Union[str, None] = 'a1f3c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the incrementally maintained return counters and backfill them from the lines.
+    """
+    op.add_column(
+        'transaction_headers',
+        sa.Column('rental_line_count', sa.Integer(), nullable=False, server_default='0',
+                  comment='Number of rental lines')
+    )
+    op.add_column(
+        'transaction_headers',
+        sa.Column('returned_line_count', sa.Integer(), nullable=False, server_default='0',
+                  comment='Rental lines fully returned')
+    )
+    op.add_column(
+        'transaction_headers',
+        sa.Column('partial_return_line_count', sa.Integer(), nullable=False, server_default='0',
+                  comment='Rental lines partially returned')
+    )
+    op.add_column(
+        'transaction_headers',
+        sa.Column('returned_quantity_total', sa.Numeric(10, 2), nullable=False, server_default='0',
+                  comment='Quantity returned across all rental lines')
+    )
+
+    # Backfill from a full recompute over the lines
+    op.execute("""
+        UPDATE transaction_headers h
+        SET rental_line_count = counters.line_count,
+            returned_line_count = counters.returned_count,
+            partial_return_line_count = counters.partial_count,
+            returned_quantity_total = counters.returned_quantity
+        FROM (
+            SELECT transaction_id,
+                   COUNT(*) AS line_count,
+                   COUNT(*) FILTER (WHERE returned_quantity >= quantity) AS returned_count,
+                   COUNT(*) FILTER (WHERE returned_quantity > 0 AND returned_quantity < quantity) AS partial_count,
+                   COALESCE(SUM(returned_quantity), 0) AS returned_quantity
+            FROM transaction_lines
+            GROUP BY transaction_id
+        ) AS counters
+        WHERE h.id = counters.transaction_id
+          AND h.transaction_type = 'RENTAL'
+    """)
+
+    op.execute("ANALYZE transaction_headers;")
+
+
+def downgrade() -> None:
+    """
+    Remove the rental return counters.
+    """
+    op.drop_column('transaction_headers', 'returned_quantity_total')
+    op.drop_column('transaction_headers', 'partial_return_line_count')
+    op.drop_column('transaction_headers', 'returned_line_count')
+    op.drop_column('transaction_headers', 'rental_line_count')
@@ -0,0 +1,40 @@
+"""Add text_pattern_ops index for category path prefix scans
+
+Revision ID: c4e8a2b6d1f5
+Revises: b7d2e4f1a9c3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2b6d1f5'
+down_revision: Union[str, None] = 'b7d2e4f1a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Index category_path with text_pattern_ops so LIKE 'path/%' subtree scans
+    (descendants, moves, renames) can use an index range scan.
+    """
+    op.create_index(
+        'idx_category_path_prefix',
+        'categories',
+        ['category_path'],
+        postgresql_ops={'category_path': 'text_pattern_ops'},
+        if_not_exists=True
+    )
+
+    op.execute("ANALYZE categories;")
+
+
+def downgrade() -> None:
+    """
+    Remove the category path prefix index.
+    """
+    op.drop_index('idx_category_path_prefix', 'categories', if_exists=True)
@@ -0,0 +1,38 @@
+"""Index updated_at on items, customers and suppliers
+
+Revision ID: c7f1a3e9d2b4
+Revises: a9e4c2d7f3b1
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1a3e9d2b4'
+down_revision: Union[str, None] = 'a9e4c2d7f3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('idx_item_updated_at', 'items'),
+    ('idx_customer_updated_at', 'customers'),
+    ('idx_supplier_updated_at', 'suppliers'),
+)
+
+
+def upgrade() -> None:
+    """
+    Index updated_at on the autocomplete tables, so each worker can read
+    just the rows changed since its indexes were last synced.
+    """
+    for name, table in INDEXES:
+        op.create_index(name, table, ['updated_at'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop the updated_at indexes."""
+    for name, table in INDEXES:
+        op.drop_index(name, table, if_exists=True)
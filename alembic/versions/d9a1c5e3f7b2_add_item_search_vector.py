@@ -0,0 +1,97 @@
+"""Add trigger-maintained search document to items
+
+Revision ID: d9a1c5e3f7b2
+Revises: c4e8a2b6d1f5
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.modules.master_data.item_master.models import (
+    BRAND_REFRESH_ITEM_SEARCH_FUNCTION,
+    BRAND_REFRESH_ITEM_SEARCH_TRIGGER,
+    CATEGORY_REFRESH_ITEM_SEARCH_FUNCTION,
+    CATEGORY_REFRESH_ITEM_SEARCH_TRIGGER,
+    ITEM_SEARCH_DOCUMENT_FUNCTION,
+    ITEM_SEARCH_DOCUMENT_TRIGGER,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a1c5e3f7b2'
+down_revision: Union[str, None] = 'c4e8a2b6d1f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add items.search_text / items.search_vector, the triggers that keep them
+    in sync with item, brand and category changes, and their GIN indexes.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    op.add_column(
+        'items',
+        sa.Column('search_text', sa.Text(), nullable=True,
+                  comment='Lower-cased search text for trigram matching')
+    )
+    op.add_column(
+        'items',
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True,
+                  comment='Weighted full-text search vector')
+    )
+
+    # The search document function and trigger, plus the brand and category
+    # refresh triggers (renaming either re-runs the item trigger)
+    for statement in (
+        ITEM_SEARCH_DOCUMENT_FUNCTION,
+        ITEM_SEARCH_DOCUMENT_TRIGGER,
+        BRAND_REFRESH_ITEM_SEARCH_FUNCTION,
+        BRAND_REFRESH_ITEM_SEARCH_TRIGGER,
+        CATEGORY_REFRESH_ITEM_SEARCH_FUNCTION,
+        CATEGORY_REFRESH_ITEM_SEARCH_TRIGGER,
+    ):
+        op.execute(statement)
+
+    # Backfill through the trigger, then index (faster than maintaining the index row by row)
+    op.execute("UPDATE items SET brand_id = brand_id;")
+
+    op.create_index(
+        'idx_item_search_vector',
+        'items',
+        ['search_vector'],
+        postgresql_using='gin',
+        if_not_exists=True
+    )
+    op.create_index(
+        'idx_item_search_text_trgm',
+        'items',
+        ['search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
+
+    op.execute("ANALYZE items;")
+
+
+def downgrade() -> None:
+    """
+    Remove the item search document, its triggers and indexes.
+    """
+    op.execute("DROP TRIGGER IF EXISTS categories_refresh_item_search ON categories;")
+    op.execute("DROP FUNCTION IF EXISTS categories_refresh_item_search_trigger();")
+    op.execute("DROP TRIGGER IF EXISTS brands_refresh_item_search ON brands;")
+    op.execute("DROP FUNCTION IF EXISTS brands_refresh_item_search_trigger();")
+    op.execute("DROP TRIGGER IF EXISTS items_search_document ON items;")
+    op.execute("DROP FUNCTION IF EXISTS items_search_document_trigger();")
+
+    op.drop_index('idx_item_search_text_trgm', 'items', if_exists=True)
+    op.drop_index('idx_item_search_vector', 'items', if_exists=True)
+    op.drop_column('items', 'search_vector')
+    op.drop_column('items', 'search_text')
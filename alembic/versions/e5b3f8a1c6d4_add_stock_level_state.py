@@ -0,0 +1,99 @@
+"""Add trigger-maintained stock state to stock levels
+
+Revision ID: e5b3f8a1c6d4
+Revises: d9a1c5e3f7b2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.modules.inventory.models import (
+    REFRESH_STOCK_STATE_FUNCTION,
+    REFRESH_STOCK_STATE_TRIGGER,
+    STOCK_STATE_FUNCTION,
+    STOCK_STATE_TRIGGER,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b3f8a1c6d4'
+down_revision: Union[str, None] = 'd9a1c5e3f7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add stock_levels.stock_state / stock_levels.below_reorder, the triggers
+    that keep them in sync with quantity and reorder point changes, and the
+    partial indexes used by the low-stock list and alerts summary.
+    """
+    op.add_column(
+        'stock_levels',
+        sa.Column('stock_state', sa.String(length=20), nullable=False,
+                  server_default='IN_STOCK', comment='Stock state relative to reorder point')
+    )
+    op.add_column(
+        'stock_levels',
+        sa.Column('below_reorder', sa.Boolean(), nullable=False,
+                  server_default=sa.text('false'), comment='Available quantity at or below reorder point')
+    )
+
+    # Same rules as inventory.models.stock_state_for; NOTIFY on state
+    # transitions. Changing an item's reorder point re-runs the stock level
+    # trigger for its rows.
+    for statement in (
+        STOCK_STATE_FUNCTION,
+        STOCK_STATE_TRIGGER,
+        REFRESH_STOCK_STATE_FUNCTION,
+        REFRESH_STOCK_STATE_TRIGGER,
+    ):
+        op.execute(statement)
+
+    # Backfill without notifying: compute directly rather than through the trigger
+    op.execute("""
+        UPDATE stock_levels sl
+        SET below_reorder = (i.reorder_point > 0 AND sl.quantity_available <= i.reorder_point),
+            stock_state = CASE
+                WHEN sl.quantity_available <= 0 THEN 'OUT_OF_STOCK'
+                WHEN i.reorder_point > 0 AND sl.quantity_available <= i.reorder_point THEN 'LOW_STOCK'
+                ELSE 'IN_STOCK'
+            END
+        FROM items i
+        WHERE i.id = sl.item_id;
+    """)
+
+    op.create_index(
+        'idx_stock_level_below_reorder',
+        'stock_levels',
+        ['quantity_available', 'item_id', 'location_id'],
+        postgresql_where=sa.text('below_reorder'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'idx_stock_level_alert_state',
+        'stock_levels',
+        ['stock_state', 'item_id'],
+        postgresql_where=sa.text("stock_state <> 'IN_STOCK'"),
+        if_not_exists=True
+    )
+
+    op.execute("ANALYZE stock_levels;")
+
+
+def downgrade() -> None:
+    """
+    Remove the stock state columns, their triggers and partial indexes.
+    """
+    op.execute("DROP TRIGGER IF EXISTS items_refresh_stock_state ON items;")
+    op.execute("DROP FUNCTION IF EXISTS items_refresh_stock_state_trigger();")
+    op.execute("DROP TRIGGER IF EXISTS stock_levels_stock_state ON stock_levels;")
+    op.execute("DROP FUNCTION IF EXISTS stock_levels_stock_state_trigger();")
+
+    op.drop_index('idx_stock_level_alert_state', 'stock_levels', if_exists=True)
+    op.drop_index('idx_stock_level_below_reorder', 'stock_levels', if_exists=True)
+    op.drop_column('stock_levels', 'below_reorder')
+    op.drop_column('stock_levels', 'stock_state')
@@ -0,0 +1,60 @@
+"""Add cache_versions table with category write trigger
+
+Revision ID: f1c7d3a9b5e2
+Revises: e5b3f8a1c6d4
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d3a9b5e2'
+down_revision: Union[str, None] = 'e5b3f8a1c6d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create cache_versions and bump its 'categories' counter after every
+    statement that writes to categories.
+    """
+    # IF NOT EXISTS: app startup (metadata.create_all) may already have created it
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        );
+    """)
+    op.execute("INSERT INTO cache_versions (name, version) VALUES ('categories', 1) ON CONFLICT DO NOTHING;")
+
+    # Statement-level: one bump per INSERT/UPDATE/DELETE, however many rows it touches
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_cache_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO cache_versions (name, version, updated_at)
+            VALUES (TG_ARGV[0], 1, now())
+            ON CONFLICT (name) DO UPDATE
+                SET version = cache_versions.version + 1, updated_at = now();
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER categories_bump_cache_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('categories');
+    """)
+
+
+def downgrade() -> None:
+    """
+    Remove the category version trigger and the cache_versions table.
+    """
+    op.execute("DROP TRIGGER IF EXISTS categories_bump_cache_version ON categories;")
+    op.execute("DROP FUNCTION IF EXISTS bump_cache_version();")
+    op.execute("DROP TABLE IF EXISTS cache_versions;")
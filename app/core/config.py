@@ -23,6 +23,32 @@ class Settings(BaseSettings):
     )
     DATABASE_ECHO: bool = Field(default=False, env="DATABASE_ECHO")
     
+    # Connection pool: DATABASE_MAX_CONNECTIONS is the budget for the whole
+    # deployment, split across WEB_CONCURRENCY worker processes unless
+    # DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW are set explicitly
+    DATABASE_MAX_CONNECTIONS: int = Field(default=80, env="DATABASE_MAX_CONNECTIONS")
+    WEB_CONCURRENCY: int = Field(default=1, env="WEB_CONCURRENCY")
+    DATABASE_POOL_SIZE: Optional[int] = Field(default=None, env="DATABASE_POOL_SIZE")
+    DATABASE_MAX_OVERFLOW: Optional[int] = Field(default=None, env="DATABASE_MAX_OVERFLOW")
+    DATABASE_POOL_TIMEOUT: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")
+    DATABASE_POOL_RECYCLE: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")
+    # NullPool (a new connection per session) for scripts/tests that switch event loops
+    DATABASE_NULL_POOL: bool = Field(default=False, env="DATABASE_NULL_POOL")
+    
+    # Prepared statement caching: "direct" when connecting to PostgreSQL (or a
+    # PgBouncer >= 1.21 with max_prepared_statements set), "transaction_pooling"
+    # behind a PgBouncer in transaction mode without prepared statement support
+    DATABASE_STATEMENT_CACHE_MODE: str = Field(default="direct", env="DATABASE_STATEMENT_CACHE_MODE")
+    DATABASE_STATEMENT_CACHE_SIZE: int = Field(default=500, env="DATABASE_STATEMENT_CACHE_SIZE")
+    
+    # Read replicas (comma-separated URLs) for read-only endpoints; reads fall
+    # back to the primary when a replica lags by more than DATABASE_REPLICA_MAX_LAG
+    # seconds, and stay on it for a while after the same client writes
+    DATABASE_REPLICA_URLS: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    DATABASE_REPLICA_MAX_LAG: float = Field(default=5.0, env="DATABASE_REPLICA_MAX_LAG")
+    DATABASE_REPLICA_CHECK_INTERVAL: float = Field(default=5.0, env="DATABASE_REPLICA_CHECK_INTERVAL")
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = Field(default=10.0, env="DATABASE_READ_YOUR_WRITES_SECONDS")
+    
     # Redis Settings
     REDIS_URL: str = Field(
         default="redis://localhost:6379",
@@ -55,6 +81,44 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Typeahead (entities held per in-memory autocomplete index, and how often
+    # each worker rebuilds its indexes in the background to drop rows that
+    # another worker hard-deleted)
+    TYPEAHEAD_MAX_ENTRIES: int = Field(default=200000, env="TYPEAHEAD_MAX_ENTRIES")
+    TYPEAHEAD_REBUILD_INTERVAL: float = Field(default=3600.0, env="TYPEAHEAD_REBUILD_INTERVAL")
+    
+    # List counts: exact up to this many (planner-estimated) rows, estimated above
+    COUNT_EXACT_THRESHOLD: int = Field(default=10000, env="COUNT_EXACT_THRESHOLD")
+    COUNT_CACHE_TTL: int = Field(default=60, env="COUNT_CACHE_TTL")
+    
+    # Stock movement ledger partitions (monthly; retention 0 keeps every month,
+    # an empty archive schema drops expired partitions instead of moving them)
+    STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD: int = Field(default=3, env="STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD")
+    STOCK_MOVEMENT_RETENTION_MONTHS: int = Field(default=36, env="STOCK_MOVEMENT_RETENTION_MONTHS")
+    STOCK_MOVEMENT_ARCHIVE_SCHEMA: str = Field(default="archive", env="STOCK_MOVEMENT_ARCHIVE_SCHEMA")
+    
+    # SQL instrumentation (per-fingerprint metrics on /metrics; a fingerprint run
+    # more than the N+1 threshold times in one request is reported)
+    SQL_METRICS_ENABLED: bool = Field(default=True, env="SQL_METRICS_ENABLED")
+    SQL_METRICS_MAX_FINGERPRINTS: int = Field(default=1000, env="SQL_METRICS_MAX_FINGERPRINTS")
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(default=10, env="SQL_N_PLUS_ONE_THRESHOLD")
+    
+    # Routes decorated with @query_budget_route: "off", "warn" (log overruns)
+    # or "raise" (fail the request; for staging)
+    QUERY_BUDGET_ENFORCEMENT: str = Field(default="off", env="QUERY_BUDGET_ENFORCEMENT")
+    
+    # Directory shared by the workers for merged /metrics (unset: this worker only)
+    METRICS_MULTIPROC_DIR: Optional[str] = Field(default=None, env="METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL: float = Field(default=5.0, env="METRICS_FLUSH_INTERVAL")
+    
+    # Sampling profiler endpoints under /api/monitoring/profiler (superusers only)
+    PROFILER_ENABLED: bool = Field(default=False, env="PROFILER_ENABLED")
+    
+    # Event loop lag monitor; blocks longer than the threshold are reported with a stack
+    LOOP_MONITOR_ENABLED: bool = Field(default=True, env="LOOP_MONITOR_ENABLED")
+    LOOP_MONITOR_INTERVAL: float = Field(default=0.1, env="LOOP_MONITOR_INTERVAL")
+    LOOP_BLOCKING_THRESHOLD: float = Field(default=0.1, env="LOOP_BLOCKING_THRESHOLD")
+    
     # Email Settings (optional)
     SMTP_HOST: Optional[str] = Field(default=None)
     SMTP_PORT: Optional[int] = Field(default=None)
@@ -82,6 +146,11 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip()]
     
+    @property
+    def replica_urls(self) -> List[str]:
+        """Read replica URLs from DATABASE_REPLICA_URLS."""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
     def validate_database_url(cls, v):
@@ -1,50 +1,14 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import DateTime, func, text
 from typing import AsyncGenerator
 import datetime
 
-from app.core.config import settings
+from app.db import session as db_session
 
-
-# Performance-optimized engine configuration
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    
-    # Connection pool optimization
-    pool_size=20,  # Increased from default 5 for high concurrency
-    max_overflow=40,  # Increased from default 10
-    pool_timeout=30,  # Timeout for getting connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_pre_ping=True,  # Verify connections before use
-    
-    # Query execution optimization
-    connect_args={
-        "server_settings": {
-            "application_name": "rental_manager",
-            "jit": "off",  # Disable JIT for consistent performance
-        },
-        "command_timeout": 60,  # Query timeout in seconds
-        "prepared_statement_cache_size": 0,  # Disable PS cache for better pooling
-    },
-    
-    # Engine-level optimizations
-    query_cache_size=1200,  # Increase query cache
-    echo_pool=settings.DEBUG,  # Log pool checkouts/checkins in debug mode
-)
-
-# Optimized session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    
-    # Session-level optimizations
-    autoflush=False,  # Disable autoflush for better control
-    autocommit=False,
-)
+# The application's single pooled engine and session factory (see app.db.session)
+engine = db_session.engine
+AsyncSessionLocal = db_session.AsyncSessionLocal
 
 
 # Base class for all models
@@ -103,10 +67,4 @@ async def close_db():
 # Connection pool monitoring utilities
 async def get_pool_status() -> dict:
     """Get current connection pool statistics"""
-    pool = engine.pool
-    return {
-        "size": getattr(pool, 'size', lambda: 0)() if hasattr(pool, 'size') else 0,
-        "checked_out": getattr(pool, 'checked_out_connections', lambda: 0)() if hasattr(pool, 'checked_out_connections') else 0,
-        "overflow": getattr(pool, 'overflow', lambda: 0)() if hasattr(pool, 'overflow') else 0,
-        "total": (getattr(pool, 'size', lambda: 0)() + getattr(pool, 'overflow', lambda: 0)()) if hasattr(pool, 'size') else 0
-    }
\ No newline at end of file
+    return db_session.get_pool_status(engine)
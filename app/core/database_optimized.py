@@ -3,55 +3,19 @@ Optimized database configuration with performance tuning for rental operations.
 This can replace or be merged with the existing database.py file.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import DateTime, func, pool
+from sqlalchemy import DateTime, func, text
 from typing import AsyncGenerator
 import datetime
 
 from app.core.config import settings
+from app.db import session as db_session
 
-
-# Performance-optimized engine configuration
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    
-    # Connection pool optimization
-    poolclass=pool.NullPool if settings.TESTING else pool.AsyncAdaptedQueuePool,
-    pool_size=20,  # Increased from default 5 for high concurrency
-    max_overflow=40,  # Increased from default 10
-    pool_timeout=30,  # Timeout for getting connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_pre_ping=True,  # Verify connections before use
-    
-    # Query execution optimization
-    connect_args={
-        "server_settings": {
-            "application_name": "rental_manager",
-            "jit": "off",  # Disable JIT for consistent performance
-        },
-        "command_timeout": 60,  # Query timeout in seconds
-        "prepared_statement_cache_size": 0,  # Disable PS cache for better pooling
-        "prepared_statement_name_func": lambda:None,  # Disable prepared statements
-    },
-    
-    # Engine-level optimizations
-    query_cache_size=1200,  # Increase query cache
-    echo_pool=settings.DEBUG,  # Log pool checkouts/checkins in debug mode
-)
-
-# Optimized session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    
-    # Session-level optimizations
-    autoflush=False,  # Disable autoflush for better control
-    autocommit=False,
-)
+# Pool sizing and connection settings live in app.db.session; every module
+# shares its engine rather than opening a pool of its own
+engine = db_session.engine
+AsyncSessionLocal = db_session.AsyncSessionLocal
 
 
 # Base class for all models
@@ -83,10 +47,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             # Log pool statistics in debug mode
             if settings.DEBUG:
-                pool_status = engine.pool.status()  # type: ignore
-                if hasattr(engine.pool, 'size'):
-                    print(f"DB Pool - Size: {engine.pool.size()}, "
-                          f"Checked out: {engine.pool.checked_out_connections()}")
+                print(f"DB Pool - {db_session.get_pool_status(engine)}")
             
             yield session
             
@@ -127,13 +88,7 @@ async def close_db():
 # Connection pool monitoring utilities
 async def get_pool_status() -> dict:
     """Get current connection pool statistics"""
-    pool = engine.pool
-    return {
-        "size": pool.size() if hasattr(pool, 'size') else 0,
-        "checked_out": pool.checked_out_connections() if hasattr(pool, 'checked_out_connections') else 0,
-        "overflow": pool.overflow() if hasattr(pool, 'overflow') else 0,
-        "total": pool.size() + pool.overflow() if hasattr(pool, 'size') else 0
-    }
+    return db_session.get_pool_status(engine)
 
 
 # Database performance helpers
@@ -17,6 +17,11 @@ from starlette.types import ASGIApp
 import logging
 
 from app.core.config import settings
+from app.modules.monitoring.query_metrics import (
+    RequestQueries,
+    begin_request as begin_query_tracking,
+    end_request as end_query_tracking,
+)
 
 
 class TransactionLoggingMiddleware(BaseHTTPMiddleware):
@@ -88,8 +93,8 @@ class TransactionLoggingMiddleware(BaseHTTPMiddleware):
         if any(request.url.path.startswith(path) for path in self.exclude_paths):
             return await call_next(request)
             
-        # Generate correlation ID for this request
-        correlation_id = str(uuid.uuid4())
+        # Reuse the request's correlation ID (set by RequestContextMiddleware) or generate one
+        correlation_id = getattr(request.state, "correlation_id", None) or str(uuid.uuid4())
         request.state.correlation_id = correlation_id
         
         # Start timing
@@ -445,7 +450,8 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
     Middleware for adding request context to all requests.
     
     This middleware adds correlation IDs and timing information
-    that can be used by other components for logging and tracking.
+    that can be used by other components for logging and tracking,
+    and attributes the SQL statements run for the request to it.
     """
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
@@ -466,8 +472,14 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         # Add request start time
         request.state.start_time = time.time()
         
-        # Process request
-        response = await call_next(request)
+        # Process request, counting its SQL statements (N+1 detection)
+        token = begin_query_tracking(
+            RequestQueries(correlation_id=request.state.correlation_id, path=request.url.path)
+        )
+        try:
+            response = await call_next(request)
+        finally:
+            end_query_tracking(token)
         
         # Add timing and correlation headers to response
         if hasattr(request.state, "correlation_id"):
@@ -11,6 +11,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.core.whitelist import whitelist_manager
+from app.db.routing import (
+    STICKY_COOKIE, RequestRouting, begin_request, client_key, end_request, replica_router
+)
 
 logger = logging.getLogger(__name__)
 
@@ -240,4 +243,44 @@ class EndpointAccessMiddleware(BaseHTTPMiddleware):
         # This middleware just logs access attempts
         logger.debug(f"Access attempt to protected endpoint: {path}")
         
-        return await call_next(request)
\ No newline at end of file
+        return await call_next(request)
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Track each request's caller and writes for read replica routing.
+    
+    Reads a client's recent writes from the sticky cookie, exposes the
+    request's routing state to ``get_read_session`` and, after a request
+    that committed a write, sets the cookie so other workers also keep the
+    client on the primary for the read-your-writes window.
+    """
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        try:
+            primary_until = float(request.cookies.get(STICKY_COOKIE, 0))
+        except ValueError:
+            primary_until = 0.0
+        
+        routing = RequestRouting(
+            client_key=client_key(
+                request.headers.get("authorization"),
+                request.client.host if request.client else None
+            ),
+            primary_until=primary_until
+        )
+        token = begin_request(routing)
+        try:
+            response = await call_next(request)
+        finally:
+            end_request(token)
+        
+        if routing.wrote and replica_router.sticky_seconds > 0:
+            window = replica_router.sticky_seconds
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(int(time.time() + window) + 1),
+                max_age=int(window) + 1,
+                httponly=True,
+                samesite="lax"
+            )
+        return response
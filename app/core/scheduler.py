@@ -163,6 +163,24 @@ class TaskScheduler:
                     replace_existing=True
                 )
                 
+                # Add nightly rental counter consistency check (daily at 3 AM)
+                self.scheduler.add_job(
+                    func=self._rental_counter_check_job,
+                    trigger=CronTrigger(hour=3, minute=0),
+                    id='rental_counter_consistency_check',
+                    name='Rental Counter Consistency Check',
+                    replace_existing=True
+                )
+                
+                # Create upcoming stock movement partitions and archive expired ones (daily at 4 AM)
+                self.scheduler.add_job(
+                    func=self._stock_movement_partition_job,
+                    trigger=CronTrigger(hour=4, minute=0),
+                    id='stock_movement_partition_maintenance',
+                    name='Stock Movement Partition Maintenance',
+                    replace_existing=True
+                )
+                
                 logger.info("Default scheduled jobs registered")
                 break
                 
@@ -224,6 +242,61 @@ class TaskScheduler:
             
             raise
     
+    async def _rental_counter_check_job(self):
+        """Daily job verifying incremental rental counters against a full recompute."""
+        logger.info("Starting rental counter consistency check job")
+        
+        try:
+            async for session in get_session():
+                from app.modules.transactions.services.rental_status_counters import RentalCounterConsistencyChecker
+                
+                checker = RentalCounterConsistencyChecker(session)
+                results = await checker.check(repair=True)
+                
+                logger.info(
+                    f"Rental counter check completed: {results['mismatch_count']} mismatches, "
+                    f"{results['repaired_count']} repaired"
+                )
+                
+                if self._system_service:
+                    await self._system_service.create_audit_log(
+                        action='SCHEDULED_TASK',
+                        entity_type='RentalCounterCheck',
+                        audit_metadata={
+                            'job_name': 'rental_counter_consistency_check',
+                            'mismatch_count': results['mismatch_count'],
+                            'repaired_count': results['repaired_count'],
+                            'transaction_ids': [str(m['transaction_id']) for m in results['mismatches']]
+                        },
+                        success=True
+                    )
+                
+                break
+                
+        except Exception as e:
+            logger.error(f"Rental counter consistency check job failed: {e}")
+            raise
+    
+    async def _stock_movement_partition_job(self):
+        """Daily job maintaining the monthly stock movement partitions."""
+        logger.info("Starting stock movement partition maintenance job")
+        
+        try:
+            async for session in get_session():
+                from app.modules.inventory.partitions import StockMovementPartitionManager
+                
+                results = await StockMovementPartitionManager(session).run()
+                await session.commit()
+                logger.info(
+                    f"Stock movement partition maintenance completed: {len(results['created'])} created, "
+                    f"{len(results['archived'])} archived"
+                )
+                break
+                
+        except Exception as e:
+            logger.error(f"Stock movement partition maintenance job failed: {e}")
+            raise
+    
     async def _weekly_cleanup_job(self):
         """Weekly job for system maintenance and cleanup."""
         logger.info("Starting weekly cleanup job")
@@ -0,0 +1,312 @@
+"""
+Read/write routing between the primary database and read replicas.
+
+Writes always go to the primary (``get_session``). Read-only endpoints -
+reports, overviews, statistics - take ``get_read_session`` instead, which
+hands out a session on a healthy replica whose replication lag is within
+``DATABASE_REPLICA_MAX_LAG`` and falls back to the primary otherwise.
+
+Replica health and lag are sampled in the background every
+``DATABASE_REPLICA_CHECK_INTERVAL`` seconds. A server that is not in
+recovery reports zero lag, so the primary's own URL can be listed as a
+replica to exercise the routing locally with a single instance.
+
+Read-your-writes: once a request commits a write, the same client's reads
+stay on the primary for ``DATABASE_READ_YOUR_WRITES_SECONDS``. Clients are
+identified by their bearer token (or address), remembered in process and,
+for requests served by another worker, by a short-lived cookie.
+
+Repository and service methods that are safe to run on a replica are
+marked with ``@read_only``. A read session sends the statements issued
+inside a marked method to its replica and everything else to the primary,
+so an unmarked query reached from a read endpoint is never served stale.
+Read sessions also refuse to flush, so a write reaching one fails loudly
+instead of landing on the wrong server.
+"""
+
+import asyncio
+import functools
+import hashlib
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import create_engine, db_manager
+from app.shared.write_tracking import on_tables_committed
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Cookie carrying the wall-clock time until which the client reads from the primary
+STICKY_COOKIE = "db_read_primary_until"
+
+READ_ONLY_KEY = "read_only"
+REPLICA_ENGINE_KEY = "replica_engine"
+
+# Replication delay in seconds; 0 on a server that is not a standby or has replayed everything received
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+# Set while a @read_only method runs; read sessions consult it per statement
+_in_read_only: ContextVar[bool] = ContextVar("in_read_only", default=False)
+
+
+def read_only(method: F) -> F:
+    """Mark an async repository/service method as safe to run on a read replica."""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = _in_read_only.set(True)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _in_read_only.reset(token)
+
+    wrapper.__read_only__ = True
+    return wrapper
+
+
+def is_read_only(method: Callable) -> bool:
+    return getattr(method, "__read_only__", False)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_writes_on_read_sessions(session, flush_context, instances):
+    if session.info.get(READ_ONLY_KEY) and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Attempted to write through a read-only (replica) session")
+
+
+class ReadSession(Session):
+    """
+    Session behind ``get_read_session``: bound to the primary, except for
+    statements issued inside ``@read_only`` methods, which go to the
+    replica picked for the request (if any).
+    """
+
+    def get_bind(self, mapper=None, **kw):
+        replica = self.info.get(REPLICA_ENGINE_KEY)
+        if replica is not None and _in_read_only.get():
+            return replica
+        return super().get_bind(mapper, **kw)
+
+
+@dataclass
+class RequestRouting:
+    """Routing state of the current request."""
+    client_key: Optional[str] = None
+    primary_until: float = 0.0  # From the sticky cookie (epoch seconds)
+    wrote: bool = False
+
+
+_request_routing: ContextVar[Optional[RequestRouting]] = ContextVar("request_routing", default=None)
+
+
+def client_key(authorization: Optional[str], client_host: Optional[str]) -> Optional[str]:
+    """Stable, non-reversible key for the caller of a request."""
+    source = authorization or client_host
+    if not source:
+        return None
+    return hashlib.sha1(source.encode()).hexdigest()
+
+
+def begin_request(routing: RequestRouting):
+    """Make ``routing`` the current request's state; returns a token for ``end_request``."""
+    return _request_routing.set(routing)
+
+
+def end_request(token) -> None:
+    _request_routing.reset(token)
+
+
+def current_routing() -> Optional[RequestRouting]:
+    return _request_routing.get()
+
+
+@dataclass
+class Replica:
+    """One read replica and its last health check."""
+    url: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    checked_at: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """Pick the server for reads: a fresh-enough replica or the primary."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_lag: float,
+        check_interval: float,
+        sticky_seconds: float,
+        engine_factory: Callable[[str], AsyncEngine] = None,
+    ):
+        engine_factory = engine_factory or (lambda url: create_engine(url))
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.replicas: List[Replica] = []
+        for url in urls:
+            self.replicas.append(Replica(url=url, engine=engine_factory(url)))
+        self._next = itertools.count()
+        self._sticky_clients: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # Health checks
+
+    async def check_replica(self, replica: Replica) -> None:
+        """Refresh one replica's health and lag."""
+        try:
+            async with replica.engine.connect() as connection:
+                lag = await asyncio.wait_for(connection.scalar(LAG_QUERY), timeout=self.check_interval)
+            replica.lag_seconds = float(lag or 0)
+            replica.healthy = True
+            replica.error = None
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Read replica {replica.name} unavailable: {e}")
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.error = str(e)
+        replica.checked_at = time.monotonic()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*[self.check_replica(replica) for replica in self.replicas])
+
+    async def _check_loop(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self) -> None:
+        """Run a first health check, then keep checking in the background."""
+        if not self.replicas or self._task is not None:
+            return
+        await self.check_all()
+        self._task = asyncio.create_task(self._check_loop())
+        logger.info(f"Read replica routing enabled for {len(self.replicas)} replica(s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    # Routing
+
+    def usable_replicas(self) -> List[Replica]:
+        """Replicas that are up, within the lag limit and recently checked."""
+        stale_after = time.monotonic() - 3 * self.check_interval
+        return [
+            replica for replica in self.replicas
+            if replica.healthy
+            and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag
+            and replica.checked_at >= stale_after
+        ]
+
+    def mark_write(self, key: Optional[str]) -> None:
+        """Keep ``key``'s reads on the primary for the read-your-writes window."""
+        if not key or self.sticky_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._sticky_clients) > 10000:
+            self._sticky_clients = {k: v for k, v in self._sticky_clients.items() if v > now}
+        self._sticky_clients[key] = now + self.sticky_seconds
+
+    def is_sticky(self, routing: Optional[RequestRouting]) -> bool:
+        if routing is None:
+            return False
+        if routing.wrote or routing.primary_until > time.time():
+            return True
+        deadline = self._sticky_clients.get(routing.client_key) if routing.client_key else None
+        return deadline is not None and deadline > time.monotonic()
+
+    def read_target(self, routing: Optional[RequestRouting] = None) -> Optional[Replica]:
+        """Replica to read from, or None for the primary."""
+        if self.is_sticky(routing):
+            return None
+        replicas = self.usable_replicas()
+        if not replicas:
+            return None
+        return replicas[next(self._next) % len(replicas)]
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "replica": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "usable": replica in self.usable_replicas(),
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(
+    urls=settings.replica_urls,
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+    sticky_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+)
+
+
+read_sessionmaker = async_sessionmaker(
+    bind=db_manager.engine,
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+@on_tables_committed
+def _stick_to_primary(tables: Set[str]) -> None:
+    routing = current_routing()
+    if routing is not None:
+        routing.wrote = True
+        replica_router.mark_write(routing.client_key)
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only endpoints: a session on a replica, or on the
+    primary when none is fresh enough or the caller has just written.
+    """
+    replica = replica_router.read_target(current_routing())
+    async with read_sessionmaker() as session:
+        session.info[READ_ONLY_KEY] = True
+        session.info[REPLICA_ENGINE_KEY] = replica.engine.sync_engine if replica else None
+        session.info["replica"] = replica.name if replica else None
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,54 +1,213 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+from uuid import uuid4
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from contextlib import asynccontextmanager
 import logging
+import time
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class PoolMetrics:
+    """Checkout wait and connection setup timings of one engine's pool."""
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = 0
+    connections_opened: int = 0
+    connect_seconds_total: float = 0.0
+    
+    def record_checkout(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "checkout_wait_max_ms": round(self.wait_seconds_max * 1000, 3),
+            "checkout_timeouts": self.timeouts,
+            "connections_opened": self.connections_opened,
+            "connect_avg_ms": round(
+                self.connect_seconds_total / self.connections_opened * 1000, 3
+            ) if self.connections_opened else 0.0,
+        }
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout waits and new connections."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+    
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+    
+    def _create_connection(self):
+        started = time.perf_counter()
+        record = super()._create_connection()
+        self.metrics.connections_opened += 1
+        self.metrics.connect_seconds_total += time.perf_counter() - started
+        return record
+    
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_sizing(
+    max_connections: int,
+    workers: int,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Per-process ``(pool_size, max_overflow)`` for a connection budget.
+    
+    Every worker process has its own pool, so the budget is split between
+    them: half of each worker's share is kept open, the other half is
+    overflow opened under load and closed again when returned. Explicit
+    values override the computed ones.
+    """
+    share = max(max_connections // max(workers, 1), 2)
+    computed_size = max(share // 2, 1)
+    size = pool_size if pool_size is not None else computed_size
+    overflow = max_overflow if max_overflow is not None else max(share - size, 0)
+    return size, overflow
+
+
+class StatementCacheMode(str, Enum):
+    """How asyncpg may reuse prepared statements on a connection."""
+    DIRECT = "direct"                            # Connected to PostgreSQL itself
+    TRANSACTION_POOLING = "transaction_pooling"  # Behind PgBouncer in transaction mode
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4().hex}__"
+
+
+def statement_cache_args(mode: StatementCacheMode, cache_size: int) -> Dict[str, Any]:
+    """
+    asyncpg connect arguments for a statement caching mode.
+    
+    Direct connections keep up to ``cache_size`` prepared statements per
+    connection, so a repeated query is parsed and planned once and then only
+    bound and executed. In transaction pooling mode consecutive transactions
+    may run on different server connections, where a cached statement does
+    not exist, so caching is off. Both use unique statement names, which
+    never collide with a statement another client left on a shared server
+    connection.
+    """
+    mode = StatementCacheMode(mode)
+    if mode == StatementCacheMode.TRANSACTION_POOLING:
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {
+        "prepared_statement_cache_size": cache_size,
+        "statement_cache_size": cache_size,
+        "prepared_statement_name_func": _unique_statement_name,
+    }
+
+
 # Create async engine with appropriate configuration
-def create_engine(database_url: str = None, echo: bool = None):
+def create_engine(
+    database_url: str = None,
+    echo: bool = None,
+    pooled: bool = None,
+    statement_cache_mode: StatementCacheMode = None,
+) -> AsyncEngine:
     """
     Create SQLAlchemy async engine with proper configuration.
     
     Args:
         database_url: Database URL (defaults to settings)
         echo: Enable SQL echo logging (defaults to settings)
+        pooled: Keep connections in a queue pool (defaults to settings);
+            NullPool otherwise, for code that runs each task in a new event loop
+        statement_cache_mode: Prepared statement caching (defaults to settings)
         
     Returns:
         AsyncEngine instance
     """
     url = database_url or settings.DATABASE_URL
     echo_sql = echo if echo is not None else settings.DATABASE_ECHO
+    use_pool = pooled if pooled is not None else not settings.DATABASE_NULL_POOL
+    cache_mode = statement_cache_mode or settings.DATABASE_STATEMENT_CACHE_MODE
     
-    # Use NullPool for SQLite to avoid connection issues
-    engine_args = {
-        "poolclass": NullPool,
-    }
+    if use_pool:
+        pool_size, max_overflow = pool_sizing(
+            settings.DATABASE_MAX_CONNECTIONS,
+            settings.WEB_CONCURRENCY,
+            settings.DATABASE_POOL_SIZE,
+            settings.DATABASE_MAX_OVERFLOW,
+        )
+        engine_args = {
+            "poolclass": MeteredAsyncQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+    else:
+        engine_args = {"poolclass": NullPool}
     
     engine = create_async_engine(
         url,
         echo=echo_sql,
         future=True,
+        connect_args={
+            "server_settings": {
+                "application_name": "rental_manager",
+                "jit": "off",  # Consistent plans for short OLTP queries
+            },
+            "command_timeout": 60,
+            **statement_cache_args(cache_mode, settings.DATABASE_STATEMENT_CACHE_SIZE),
+        },
         **engine_args
     )
     
     return engine
 
 
-# Create the default engine
-engine = create_engine()
-
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+def get_pool_status(engine: AsyncEngine = None) -> Dict[str, Any]:
+    """Connection pool occupancy and checkout metrics of ``engine`` (default: the shared one)."""
+    pool = (engine or db_manager.engine).pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+    
+    status = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+    }
+    if isinstance(pool, MeteredAsyncQueuePool):
+        status.update(pool.metrics.snapshot())
+    return status
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -111,27 +270,33 @@ async def create_test_engine(database_url: str = None):
         AsyncEngine instance for testing
     """
     url = database_url or settings.TEST_DATABASE_URL
-    return create_engine(url, echo=False)
+    return create_engine(url, echo=False, pooled=False)
 
 
 class DatabaseSessionManager:
     """
     Manager for database sessions with transaction support.
+    
+    The process-wide instance (``db_manager``) owns the only application
+    engine; ``engine``/``AsyncSessionLocal`` below and every session
+    dependency (``app.shared.dependencies.get_session``,
+    ``app.core.database.get_db``, the scheduler) draw from its pool.
     """
     
     def __init__(self):
         self._engine = None
         self._sessionmaker = None
     
-    def init(self, database_url: str = None, echo: bool = None):
+    def init(self, database_url: str = None, echo: bool = None, pooled: bool = None):
         """
         Initialize the session manager.
         
         Args:
             database_url: Database URL
             echo: Enable SQL echo logging
+            pooled: Use a connection pool (defaults to settings)
         """
-        self._engine = create_engine(database_url, echo)
+        self._engine = create_engine(database_url, echo, pooled)
         self._sessionmaker = async_sessionmaker(
             bind=self._engine,
             class_=AsyncSession,
@@ -140,6 +305,18 @@ class DatabaseSessionManager:
             autoflush=False,
         )
     
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError("DatabaseSessionManager not initialized")
+        return self._engine
+    
+    @property
+    def sessionmaker(self) -> async_sessionmaker:
+        if self._sessionmaker is None:
+            raise RuntimeError("DatabaseSessionManager not initialized")
+        return self._sessionmaker
+    
     async def close(self):
         """Close the database connection."""
         if self._engine:
@@ -192,6 +369,10 @@ class DatabaseSessionManager:
 db_manager = DatabaseSessionManager()
 db_manager.init()
 
+# Shared engine and session factory
+engine = db_manager.engine
+AsyncSessionLocal = db_manager.sessionmaker
+
 
 # Utility functions
 async def init_db():
@@ -245,6 +426,7 @@ __all__ = [
     "get_session",
     "get_session_context",
     "db_manager",
+    "get_pool_status",
     "init_db",
     "drop_db",
     "check_db_connection",
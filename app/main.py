@@ -6,7 +6,7 @@ import logging
 
 from app.core.config import settings
 from app.core.database import engine
-from app.core.middleware import WhitelistMiddleware, EndpointAccessMiddleware
+from app.core.middleware import WhitelistMiddleware, EndpointAccessMiddleware, ReadYourWritesMiddleware
 from app.db.base import Base
 from app.shared.exceptions import CustomHTTPException
 
@@ -39,6 +39,7 @@ from app.modules.inventory.routes import router as inventory_router
 from app.modules.transactions.routes import router as transactions_router  # Re-enabled for Swagger
 from app.modules.analytics.routes import router as analytics_router
 from app.modules.system.routes import router as system_router
+from app.modules.autocomplete.routes import router as autocomplete_router
 
 # Import centralized logging configuration
 from app.core.logging_config import setup_application_logging, get_application_logger
@@ -48,7 +49,15 @@ from app.core.logging_middleware import TransactionLoggingMiddleware, RequestCon
 from app.core.scheduler import task_scheduler
 
 # Import performance monitoring
-from app.modules.monitoring.performance_monitor import monitoring_router, PerformanceTrackingMiddleware
+from app.modules.monitoring.performance_monitor import (
+    metrics,
+    metrics_flusher,
+    metrics_router,
+    monitoring_router,
+    PerformanceTrackingMiddleware,
+)
+from app.modules.monitoring.profiler import ProfilerRouteMiddleware
+from app.modules.monitoring.query_metrics import instrument_engine
 
 # Initialize centralized logging
 setup_application_logging()
@@ -119,6 +128,10 @@ app = FastAPI(
             "name": "Analytics",
             "description": "Analytics and reporting operations"
         },
+        {
+            "name": "Autocomplete",
+            "description": "Typeahead suggestions for items, customers and suppliers"
+        },
         {
             "name": "System",
             "description": "System administration operations"
@@ -126,6 +139,17 @@ app = FastAPI(
     ]
 )
 
+# Record every SQL statement by fingerprint (reported on /metrics)
+if settings.SQL_METRICS_ENABLED:
+    from app.db.routing import replica_router
+    instrument_engine(engine, metrics.sql)
+    for replica in replica_router.replicas:
+        instrument_engine(replica.engine, metrics.sql)
+
+# Map requests to routes for the sampling profiler (innermost; idle unless a run is active)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerRouteMiddleware)
+
 # Add custom whitelist middleware (before CORS)
 app.add_middleware(WhitelistMiddleware, enabled=settings.USE_WHITELIST_CONFIG)
 app.add_middleware(EndpointAccessMiddleware, enabled=settings.USE_WHITELIST_CONFIG)
@@ -137,6 +161,10 @@ app.add_middleware(RequestContextMiddleware)
 # Add performance tracking middleware
 app.add_middleware(PerformanceTrackingMiddleware)
 
+# Track writes per client so reads routed to replicas see them
+if settings.replica_urls:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -183,11 +211,16 @@ async def health_check_detailed():
     from app.core.database import get_pool_status
     from datetime import datetime
     
+    from app.db.routing import replica_router
+    from app.modules.monitoring.loop_monitor import loop_monitor
+    
     pool_status = await get_pool_status()
     return {
         "status": "healthy",
         "service": settings.PROJECT_NAME,
         "database_pool": pool_status,
+        "read_replicas": replica_router.status(),
+        "event_loop": loop_monitor.status(include_reports=False),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -201,7 +234,9 @@ app.include_router(inventory_router, prefix="/api/inventory", tags=["Inventory"]
 app.include_router(transactions_router, prefix="/api/transactions", tags=["Transactions"])
 app.include_router(analytics_router, prefix="/api/analytics", tags=["Analytics"])
 app.include_router(system_router, prefix="/api/system", tags=["System"])
+app.include_router(autocomplete_router, prefix="/api/autocomplete", tags=["Autocomplete"])
 app.include_router(monitoring_router)  # Performance monitoring endpoints
+app.include_router(metrics_router)  # Prometheus /metrics
 
 # API v1 routes (for backward compatibility)
 app.include_router(suppliers_router, prefix="/api/v1/suppliers", tags=["Suppliers V1"])
@@ -263,6 +298,29 @@ async def startup():
         logger.error(f"Error during system settings initialization: {str(e)}")
         # Continue startup even if there's an import or other error
     
+    # Build the in-memory autocomplete indexes in the background
+    try:
+        from app.modules.autocomplete.service import typeahead_service
+        await typeahead_service.start()
+    except Exception as e:
+        logger.warning(f"Error during autocomplete initialization: {str(e)}")
+    
+    # Start read replica health checks (no-op without replicas)
+    try:
+        from app.db.routing import replica_router
+        await replica_router.start()
+    except Exception as e:
+        logger.error(f"Failed to start read replica routing: {str(e)}")
+    
+    # Watch the event loop for lag and blocking calls
+    if settings.LOOP_MONITOR_ENABLED:
+        from app.modules.monitoring.loop_monitor import loop_monitor
+        await loop_monitor.start()
+    
+    # Share this worker's metrics with the others through the snapshot directory
+    if metrics_flusher is not None:
+        await metrics_flusher.start()
+    
     # Initialize and start the task scheduler
     try:
         await task_scheduler.start()
@@ -293,6 +351,28 @@ async def shutdown():
     except Exception as e:
         logger.warning(f"Error closing Redis cache: {str(e)}")
     
+    # Stop the autocomplete index rebuilds
+    from app.modules.autocomplete.service import typeahead_service
+    await typeahead_service.stop()
+    
+    # Stop the event loop monitor
+    from app.modules.monitoring.loop_monitor import loop_monitor
+    await loop_monitor.stop()
+    
+    # Write the final metrics snapshot
+    if metrics_flusher is not None:
+        try:
+            await metrics_flusher.stop()
+        except Exception as e:
+            logger.warning(f"Error writing metrics snapshot: {str(e)}")
+    
+    # Close pooled database connections
+    from app.db.routing import replica_router
+    from app.db.session import db_manager
+    await replica_router.stop()
+    await db_manager.close()
+    logger.info("Database connection pool closed")
+    
     logger.info("Shutdown complete")
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from sqlalchemy import and_, or_, func, select, update, delete, desc, asc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
+from app.db.routing import read_only
 from app.modules.analytics.models import (
     AnalyticsReport, BusinessMetric, SystemAlert,
     ReportType, ReportStatus, ReportFormat, MetricType,
@@ -43,12 +44,14 @@ class AnalyticsReportRepository:
         await self.session.refresh(report)
         return report
     
+    @read_only
     async def get_by_id(self, report_id: UUID) -> Optional[AnalyticsReport]:
         """Get analytics report by ID."""
         query = select(AnalyticsReport).where(AnalyticsReport.id == report_id)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -86,6 +89,7 @@ class AnalyticsReportRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def search(
         self, 
         search_params: AnalyticsSearch,
@@ -182,6 +186,7 @@ class AnalyticsReportRepository:
         """Get failed reports."""
         return await self.get_by_status(ReportStatus.FAILED)
     
+    @read_only
     async def count_by_status(self, status: ReportStatus) -> int:
         """Count reports by status."""
         query = select(func.count(AnalyticsReport.id)).where(
@@ -193,6 +198,7 @@ class AnalyticsReportRepository:
         result = await self.session.execute(query)
         return result.scalar()
     
+    @read_only
     async def get_report_summary(self) -> Dict[str, Any]:
         """Get report summary statistics."""
         query = select(AnalyticsReport).where(AnalyticsReport.is_active == True)
@@ -242,6 +248,7 @@ class BusinessMetricRepository:
         await self.session.refresh(metric)
         return metric
     
+    @read_only
     async def get_by_id(self, metric_id: UUID) -> Optional[BusinessMetric]:
         """Get business metric by ID."""
         query = select(BusinessMetric).where(BusinessMetric.id == metric_id)
@@ -259,6 +266,7 @@ class BusinessMetricRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -293,6 +301,7 @@ class BusinessMetricRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def search(
         self, 
         search_params: MetricSearch,
@@ -377,6 +386,7 @@ class BusinessMetricRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_metrics_with_targets(self) -> List[BusinessMetric]:
         """Get metrics that have targets set."""
         query = select(BusinessMetric).where(
@@ -389,6 +399,7 @@ class BusinessMetricRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_metrics_meeting_targets(self) -> List[BusinessMetric]:
         """Get metrics that are meeting their targets."""
         query = select(BusinessMetric).where(
@@ -402,6 +413,7 @@ class BusinessMetricRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_metric_history(self, metric_name: str, limit: int = 30) -> List[BusinessMetric]:
         """Get metric history by name."""
         query = select(BusinessMetric).where(
@@ -438,12 +450,14 @@ class SystemAlertRepository:
         await self.session.refresh(alert)
         return alert
     
+    @read_only
     async def get_by_id(self, alert_id: UUID) -> Optional[SystemAlert]:
         """Get system alert by ID."""
         query = select(SystemAlert).where(SystemAlert.id == alert_id)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -478,6 +492,7 @@ class SystemAlertRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def search(
         self, 
         search_params: AlertSearch,
@@ -597,6 +612,7 @@ class SystemAlertRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def count_by_severity(self, severity: AlertSeverity) -> int:
         """Count alerts by severity."""
         query = select(func.count(SystemAlert.id)).where(
@@ -609,6 +625,7 @@ class SystemAlertRepository:
         result = await self.session.execute(query)
         return result.scalar()
     
+    @read_only
     async def count_by_status(self, status: AlertStatus) -> int:
         """Count alerts by status."""
         query = select(func.count(SystemAlert.id)).where(
@@ -620,6 +637,7 @@ class SystemAlertRepository:
         result = await self.session.execute(query)
         return result.scalar()
     
+    @read_only
     async def get_alert_summary(self) -> Dict[str, Any]:
         """Get alert summary statistics."""
         query = select(SystemAlert).where(SystemAlert.is_active == True)
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError, ConflictError
-from app.shared.dependencies import get_session
+from app.shared.dependencies import get_session, ReadSessionDep
 from app.modules.analytics.service import AnalyticsService
 from app.modules.analytics.models import (
     ReportType, ReportStatus, ReportFormat, MetricType,
@@ -30,6 +30,11 @@ async def get_analytics_service(session: AsyncSession = Depends(get_session)) ->
     return AnalyticsService(session)
 
 
+# Analytics service for read-only endpoints (served from a read replica when available)
+async def get_analytics_read_service(session: ReadSessionDep) -> AnalyticsService:
+    return AnalyticsService(session)
+
+
 # Analytics Report endpoints
 @router.post("/reports", response_model=AnalyticsReportResponse, status_code=status.HTTP_201_CREATED)
 async def create_report(
@@ -47,7 +52,7 @@ async def create_report(
 @router.get("/reports/{report_id}", response_model=AnalyticsReportResponse)
 async def get_report(
     report_id: UUID,
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get analytics report by ID."""
     try:
@@ -66,7 +71,7 @@ async def get_reports(
     start_date: Optional[datetime] = Query(None, description="Filter by start date"),
     end_date: Optional[datetime] = Query(None, description="Filter by end date"),
     active_only: bool = Query(True, description="Only active reports"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get all analytics reports with optional filtering."""
     try:
@@ -90,7 +95,7 @@ async def search_reports(
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
     active_only: bool = Query(True, description="Only active reports"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Search analytics reports."""
     try:
@@ -164,7 +169,7 @@ async def create_metric(
 @router.get("/metrics/{metric_id}", response_model=BusinessMetricResponse)
 async def get_metric(
     metric_id: UUID,
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get business metric by ID."""
     try:
@@ -181,7 +186,7 @@ async def get_metrics(
     category: Optional[str] = Query(None, description="Filter by category"),
     has_target: Optional[bool] = Query(None, description="Filter by target presence"),
     active_only: bool = Query(True, description="Only active metrics"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get all business metrics with optional filtering."""
     try:
@@ -203,7 +208,7 @@ async def search_metrics(
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
     active_only: bool = Query(True, description="Only active metrics"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Search business metrics."""
     try:
@@ -265,7 +270,7 @@ async def update_metric_value(
 async def get_metric_history(
     metric_name: str,
     limit: int = Query(30, ge=1, le=100, description="Maximum records to return"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get metric history by name."""
     try:
@@ -301,7 +306,7 @@ async def create_alert(
 @router.get("/alerts/{alert_id}", response_model=SystemAlertResponse)
 async def get_alert(
     alert_id: UUID,
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get system alert by ID."""
     try:
@@ -319,7 +324,7 @@ async def get_alerts(
     status: Optional[AlertStatus] = Query(None, description="Filter by status"),
     source: Optional[str] = Query(None, description="Filter by source"),
     active_only: bool = Query(True, description="Only active alerts"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get all system alerts with optional filtering."""
     try:
@@ -342,7 +347,7 @@ async def search_alerts(
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
     active_only: bool = Query(True, description="Only active alerts"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Search system alerts."""
     try:
@@ -434,7 +439,7 @@ async def suppress_alert(
 # Dashboard and monitoring endpoints
 @router.get("/dashboard", response_model=AnalyticsDashboard)
 async def get_analytics_dashboard(
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get analytics dashboard data."""
     try:
@@ -445,7 +450,7 @@ async def get_analytics_dashboard(
 
 @router.get("/system/health", response_model=SystemHealthSummary)
 async def get_system_health(
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get system health summary."""
     try:
@@ -459,7 +464,7 @@ async def get_system_health(
 async def get_reports_by_type(
     report_type: ReportType,
     limit: int = Query(10, ge=1, le=100, description="Maximum records to return"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get reports by type."""
     try:
@@ -475,7 +480,7 @@ async def get_reports_by_type(
 async def get_reports_by_status(
     report_status: ReportStatus,
     limit: int = Query(10, ge=1, le=100, description="Maximum records to return"),
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get reports by status."""
     try:
@@ -491,7 +496,7 @@ async def get_reports_by_status(
 @router.get("/metrics/categories/{category}", response_model=List[BusinessMetricListResponse])
 async def get_metrics_by_category(
     category: str,
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get metrics by category."""
     try:
@@ -504,7 +509,7 @@ async def get_metrics_by_category(
 
 @router.get("/metrics/with-targets", response_model=List[BusinessMetricListResponse])
 async def get_metrics_with_targets(
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get metrics that have targets set."""
     try:
@@ -519,7 +524,7 @@ async def get_metrics_with_targets(
 @router.get("/alerts/severity/{severity}", response_model=List[SystemAlertListResponse])
 async def get_alerts_by_severity(
     severity: AlertSeverity,
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get alerts by severity."""
     try:
@@ -532,7 +537,7 @@ async def get_alerts_by_severity(
 
 @router.get("/alerts/active", response_model=List[SystemAlertListResponse])
 async def get_active_alerts(
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get active alerts."""
     try:
@@ -545,7 +550,7 @@ async def get_active_alerts(
 
 @router.get("/alerts/critical", response_model=List[SystemAlertListResponse])
 async def get_critical_alerts(
-    service: AnalyticsService = Depends(get_analytics_service)
+    service: AnalyticsService = Depends(get_analytics_read_service)
 ):
     """Get critical alerts."""
     try:
@@ -0,0 +1 @@
+# Autocomplete module
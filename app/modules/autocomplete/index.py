@@ -0,0 +1,148 @@
+"""
+Compact in-memory prefix index for typeahead lookups.
+
+Keys live in one sorted list of ``(key, entity_id)`` tuples; a lookup is a
+``bisect`` to the first key >= the prefix followed by a short forward scan,
+so latency depends on the number of results, not on the index size.
+"""
+
+import re
+import sys
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize(value: Optional[str]) -> str:
+    """Case-fold and collapse whitespace so keys and prefixes compare equal."""
+    if not value:
+        return ""
+    return _WHITESPACE_RE.sub(" ", value).strip().casefold()
+
+
+def word_keys(value: Optional[str]) -> List[str]:
+    """
+    Keys for every word start of ``value``.
+
+    ``"Cordless Drill 18V"`` yields ``"cordless drill 18v"``, ``"drill 18v"``
+    and ``"18v"`` so typing any word of a name finds it.
+    """
+    text = normalize(value)
+    if not text:
+        return []
+    words = text.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index mapping normalised keys to entity ids and labels.
+
+    ``max_entries`` bounds the number of entities held; once full, further
+    entities are dropped (and counted) until a rebuild with a larger limit.
+    """
+
+    def __init__(self, max_entries: int = 200000):
+        self.max_entries = max_entries
+        self._keys: List[Tuple[str, str]] = []
+        self._labels: Dict[str, str] = {}
+        self._entity_keys: Dict[str, Tuple[str, ...]] = {}
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._labels
+
+    def rebuild(self, entries: Iterable[Tuple[str, str, Iterable[str]]]) -> None:
+        """Replace the whole index from ``(entity_id, label, keys)`` entries."""
+        keys: List[Tuple[str, str]] = []
+        labels: Dict[str, str] = {}
+        entity_keys: Dict[str, Tuple[str, ...]] = {}
+        dropped = 0
+
+        for entity_id, label, raw_keys in entries:
+            if entity_id in labels:
+                continue
+            if len(labels) >= self.max_entries:
+                dropped += 1
+                continue
+            own_keys = self._unique_keys(raw_keys)
+            labels[entity_id] = label
+            entity_keys[entity_id] = own_keys
+            keys.extend((key, entity_id) for key in own_keys)
+
+        keys.sort()
+        self._keys, self._labels, self._entity_keys = keys, labels, entity_keys
+        self.dropped = dropped
+
+    def upsert(self, entity_id: str, label: str, keys: Iterable[str]) -> bool:
+        """Add or replace one entity. Returns False if the index is full."""
+        self.remove(entity_id)
+        if len(self._labels) >= self.max_entries:
+            self.dropped += 1
+            return False
+
+        own_keys = self._unique_keys(keys)
+        self._labels[entity_id] = label
+        self._entity_keys[entity_id] = own_keys
+        for key in own_keys:
+            insort(self._keys, (key, entity_id))
+        return True
+
+    def remove(self, entity_id: str) -> bool:
+        """Drop one entity. Returns False if it was not indexed."""
+        own_keys = self._entity_keys.pop(entity_id, None)
+        if own_keys is None:
+            return False
+        del self._labels[entity_id]
+        for key in own_keys:
+            position = bisect_left(self._keys, (key, entity_id))
+            if position < len(self._keys) and self._keys[position] == (key, entity_id):
+                del self._keys[position]
+        return True
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Up to ``limit`` distinct ``(entity_id, label)`` pairs whose keys start with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        results: List[Tuple[str, str]] = []
+        seen = set()
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and len(results) < limit:
+            key, entity_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if entity_id not in seen:
+                seen.add(entity_id)
+                results.append((entity_id, self._labels[entity_id]))
+            position += 1
+        return results
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index (containers plus owned strings)."""
+        size = sys.getsizeof(self._keys) + sys.getsizeof(self._labels) + sys.getsizeof(self._entity_keys)
+        for pair in self._keys:
+            size += sys.getsizeof(pair) + sys.getsizeof(pair[0])
+        for entity_id, label in self._labels.items():
+            size += sys.getsizeof(entity_id) + sys.getsizeof(label)
+        for own_keys in self._entity_keys.values():
+            size += sys.getsizeof(own_keys)
+        return size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entities": len(self._labels),
+            "keys": len(self._keys),
+            "max_entries": self.max_entries,
+            "dropped": self.dropped,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    @staticmethod
+    def _unique_keys(keys: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(key for key in (normalize(k) for k in keys) if key))
@@ -0,0 +1,50 @@
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.auth.dependencies import get_current_superuser
+from app.shared.dependencies import get_session
+from app.modules.autocomplete.schemas import TypeaheadResponse, TypeaheadStatsResponse
+from app.modules.autocomplete.service import SOURCES, typeahead_service
+
+
+router = APIRouter(tags=["Autocomplete"])
+
+
+@router.get("/", response_model=TypeaheadResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    types: Optional[List[str]] = Query(None, description="Entity types to search (item, customer, supplier)"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions to return"),
+    session: AsyncSession = Depends(get_session)
+):
+    """Prefix suggestions (ID and label only) for items, customers and suppliers."""
+    unknown = [t for t in types or [] if t not in SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown autocomplete types: {', '.join(unknown)}"
+        )
+
+    await typeahead_service.ensure_current(session)
+
+    started = time.perf_counter()
+    suggestions = typeahead_service.suggest(q, types=types, limit=limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return TypeaheadResponse(query=q, suggestions=suggestions, elapsed_ms=elapsed_ms)
+
+
+@router.get("/stats", response_model=TypeaheadStatsResponse)
+async def autocomplete_stats():
+    """Entity counts and approximate memory footprint of the autocomplete indexes."""
+    return typeahead_service.stats()
+
+
+@router.post("/rebuild", response_model=TypeaheadStatsResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_autocomplete(current_user=Depends(get_current_superuser)):
+    """Start reloading this worker's autocomplete indexes in the background (superusers only)."""
+    typeahead_service.schedule_rebuild()
+    return typeahead_service.stats()
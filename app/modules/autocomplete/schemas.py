@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class TypeaheadSuggestion(BaseModel):
+    """One autocomplete suggestion: id and display label only."""
+    id: str = Field(..., description="Entity ID")
+    label: str = Field(..., description="Display label")
+    type: str = Field(..., description="Entity type (item, customer or supplier)")
+
+
+class TypeaheadResponse(BaseModel):
+    """Schema for autocomplete responses."""
+    query: str
+    suggestions: List[TypeaheadSuggestion]
+    elapsed_ms: float = Field(..., description="Time spent in the index lookup")
+
+
+class TypeaheadIndexStats(BaseModel):
+    """Size of one entity type's index."""
+    entities: int
+    keys: int
+    max_entries: int
+    dropped: int
+    memory_bytes: int
+
+
+class TypeaheadStatsResponse(BaseModel):
+    """Schema for autocomplete index statistics."""
+    loaded: bool
+    versions: Dict[str, Optional[int]] = Field(default_factory=dict, description="Table version each index is current with")
+    last_built_at: Optional[float] = None
+    rebuilding: bool = Field(False, description="Whether a full build is running in the background")
+    memory_bytes: int
+    indexes: Dict[str, TypeaheadIndexStats]
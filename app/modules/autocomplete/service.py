@@ -0,0 +1,291 @@
+"""
+Typeahead suggestions for items, customers and suppliers.
+
+The service keeps one PrefixIndex per entity type in process memory, built
+from a narrow column query by a background task. Each index is stamped
+with its table's version from ``cache_versions`` (bumped by a trigger on
+every write, in any worker, including bulk SQL). When a table's version
+has moved, the rows updated since the last sync are upserted into (or,
+once deactivated, removed from) its index. Rows deleted through this
+worker's sessions are removed when the delete commits; the periodic full
+rebuild catches deletes made elsewhere.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import db_manager
+from app.modules.autocomplete.index import PrefixIndex, word_keys
+from app.modules.customers.models import Customer
+from app.modules.master_data.item_master.models import Item
+from app.modules.suppliers.models import Supplier
+from app.shared.write_tracking import on_rows_deleted, read_cache_versions
+
+logger = logging.getLogger(__name__)
+
+# How far before the last sync a delta reads back from
+DELTA_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class TypeaheadSource:
+    """How one entity type is loaded and turned into index entries."""
+    name: str
+    model: Type[Any]
+    columns: Tuple[str, ...]
+    label: Callable[[Mapping[str, Any]], str]
+    keys: Callable[[Mapping[str, Any]], List[str]]
+
+    @property
+    def cache_name(self) -> str:
+        """The ``cache_versions`` entry bumped by writes to the source table."""
+        return self.model.__tablename__
+
+    def entry(self, row: Mapping[str, Any]) -> Tuple[str, str, List[str]]:
+        return str(row["id"]), self.label(row), self.keys(row)
+
+
+def _customer_name(row: Mapping[str, Any]) -> str:
+    if row.get("business_name"):
+        return row["business_name"]
+    return " ".join(part for part in (row.get("first_name"), row.get("last_name")) if part)
+
+
+SOURCES: Dict[str, TypeaheadSource] = {
+    source.name: source
+    for source in (
+        TypeaheadSource(
+            name="item",
+            model=Item,
+            columns=("sku", "item_name"),
+            label=lambda row: f"{row['item_name']} ({row['sku']})",
+            keys=lambda row: [row["sku"], *word_keys(row["item_name"])],
+        ),
+        TypeaheadSource(
+            name="customer",
+            model=Customer,
+            columns=("customer_code", "business_name", "first_name", "last_name"),
+            label=lambda row: f"{_customer_name(row)} ({row['customer_code']})",
+            keys=lambda row: [row["customer_code"], *word_keys(_customer_name(row))],
+        ),
+        TypeaheadSource(
+            name="supplier",
+            model=Supplier,
+            columns=("supplier_code", "company_name"),
+            label=lambda row: f"{row['company_name']} ({row['supplier_code']})",
+            keys=lambda row: [row["supplier_code"], *word_keys(row["company_name"])],
+        ),
+    )
+}
+
+
+class TypeaheadService:
+    """
+    Process-wide typeahead indexes, kept current from row changes.
+
+    Full builds run in a background task: the first one at startup, then
+    every ``rebuild_interval`` seconds. Requests only apply deltas.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.TYPEAHEAD_MAX_ENTRIES,
+        rebuild_interval: float = settings.TYPEAHEAD_REBUILD_INTERVAL,
+    ):
+        self.indexes: Dict[str, PrefixIndex] = {
+            name: PrefixIndex(max_entries=max_entries) for name in SOURCES
+        }
+        # Table version each index is current with (None: not built yet)
+        self.versions: Dict[str, Optional[int]] = dict.fromkeys(SOURCES)
+        # Database time each index was last synced at; rows updated after
+        # it (less DELTA_OVERLAP) are the next delta
+        self.synced_at: Dict[str, Optional[datetime]] = dict.fromkeys(SOURCES)
+        self.last_built_at: Optional[float] = None
+        self.rebuild_interval = rebuild_interval
+        self._lock = asyncio.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return all(version is not None for version in self.versions.values())
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._rebuild_task is not None and not self._rebuild_task.done()
+
+    async def ensure_current(self, session: AsyncSession) -> None:
+        """
+        Apply the rows changed since the last sync to the indexes whose table
+        version moved; one primary-key read when none did.
+
+        Before the first build has finished this only makes sure one is
+        running, and while a build holds the indexes it returns at once,
+        so no request waits for a full load.
+        """
+        if not self.loaded:
+            self.schedule_rebuild()
+            return
+        if self._lock.locked():
+            return
+        versions = await self._read_versions(session)
+        if not self._stale(versions):
+            return
+        async with self._lock:
+            for name in self._stale(versions):
+                await self._apply_changes(session, name, versions[name])
+
+    def schedule_rebuild(self) -> asyncio.Task:
+        """Start a full build in the background, unless one is already running."""
+        if not self.rebuilding:
+            self._rebuild_task = asyncio.create_task(self._rebuild_in_background())
+        return self._rebuild_task
+
+    async def _rebuild_in_background(self) -> None:
+        try:
+            async with db_manager.sessionmaker() as session:
+                await self.rebuild(session)
+        except Exception as e:
+            logger.warning(f"Typeahead index build failed: {e}")
+
+    async def _rebuild_loop(self) -> None:
+        while True:
+            await self.schedule_rebuild()
+            await asyncio.sleep(self.rebuild_interval)
+
+    async def start(self) -> None:
+        """Build the indexes in the background, then rebuild them every ``rebuild_interval``."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._rebuild_loop())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._rebuild_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._rebuild_task = None
+
+    async def rebuild(self, session: AsyncSession) -> Dict[str, int]:
+        """
+        Reload every index from the database; returns entity counts.
+
+        Runs in the background task. Besides the initial load, it drops
+        rows that deltas cannot see: bulk or other workers' hard deletes,
+        and TRUNCATE.
+        """
+        started = time.perf_counter()
+        versions = await self._read_versions(session)
+        async with self._lock:
+            for name in SOURCES:
+                await self._load(session, name, versions[name])
+
+        counts = {name: len(index) for name, index in self.indexes.items()}
+        logger.info(
+            f"Typeahead indexes built in {(time.perf_counter() - started) * 1000:.0f}ms: {counts}"
+        )
+        return counts
+
+    async def _read_versions(self, session: AsyncSession) -> Dict[str, int]:
+        by_cache = await read_cache_versions(session, [source.cache_name for source in SOURCES.values()])
+        return {name: by_cache[source.cache_name] for name, source in SOURCES.items()}
+
+    def _stale(self, versions: Mapping[str, int]) -> List[str]:
+        return [name for name in SOURCES if self.versions[name] != versions[name]]
+
+    async def _load(self, session: AsyncSession, name: str, version: int) -> None:
+        """
+        Rebuild one index and stamp it with ``version`` and the sync time.
+
+        The version and time are read before the rows, so a write landing
+        in between leaves the index stamped older than its data and is
+        applied again by the next delta rather than missed.
+        """
+        source = SOURCES[name]
+        synced_at = await session.scalar(select(func.now()))
+        columns = [source.model.id] + [getattr(source.model, c) for c in source.columns]
+        result = await session.execute(
+            select(*columns).where(source.model.is_active == True)
+        )
+        self.indexes[name].rebuild(source.entry(row) for row in result.mappings())
+        self.versions[name] = version
+        self.synced_at[name] = synced_at
+        self.last_built_at = time.time()
+
+    async def _apply_changes(self, session: AsyncSession, name: str, version: int) -> None:
+        """
+        Upsert the rows of one index's table updated since its last sync,
+        removing those deactivated, and stamp it with ``version``.
+
+        The window reaches DELTA_OVERLAP back past the last sync, so rows
+        written by transactions that were still open at that point (their
+        ``updated_at`` is earlier than their commit) are picked up too.
+        """
+        source = SOURCES[name]
+        model = source.model
+        synced_at = await session.scalar(select(func.now()))
+        columns = [model.id, model.is_active] + [getattr(model, c) for c in source.columns]
+        result = await session.execute(
+            select(*columns).where(model.updated_at > self.synced_at[name] - DELTA_OVERLAP)
+        )
+        index = self.indexes[name]
+        for row in result.mappings():
+            if row["is_active"]:
+                index.upsert(*source.entry(row))
+            else:
+                index.remove(str(row["id"]))
+        self.versions[name] = version
+        self.synced_at[name] = synced_at
+
+    def remove_deleted(self, deleted: Mapping[str, Set[str]]) -> None:
+        """Drop hard-deleted rows, keyed by table name, from the matching indexes."""
+        for name, source in SOURCES.items():
+            for entity_id in deleted.get(source.cache_name, ()):
+                self.indexes[name].remove(entity_id)
+
+    def suggest(
+        self,
+        query: str,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, str]]:
+        """Suggestions for ``query`` across the requested entity types, in type order."""
+        suggestions: List[Dict[str, str]] = []
+        for name in types or SOURCES:
+            remaining = limit - len(suggestions)
+            if remaining <= 0:
+                break
+            for entity_id, label in self.indexes[name].search(query, remaining):
+                suggestions.append({"id": entity_id, "label": label, "type": name})
+        return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        indexes = {name: index.stats() for name, index in self.indexes.items()}
+        return {
+            "loaded": self.loaded,
+            "versions": dict(self.versions),
+            "last_built_at": self.last_built_at,
+            "rebuilding": self.rebuilding,
+            "memory_bytes": sum(s["memory_bytes"] for s in indexes.values()),
+            "indexes": indexes,
+        }
+
+
+typeahead_service = TypeaheadService()
+
+
+@on_rows_deleted
+def _remove_deleted_entities(deleted: Dict[str, Set[str]]) -> None:
+    """Drop rows this worker deleted as soon as the delete commits."""
+    typeahead_service.remove_deleted(deleted)
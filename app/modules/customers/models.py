@@ -8,6 +8,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 import re
 
 from app.db.base import BaseModel
+from app.shared.write_tracking import track_cache_version
 
 if TYPE_CHECKING:
     from app.modules.transactions.base.models import TransactionHeader
@@ -124,6 +125,7 @@ class Customer(BaseModel):
         Index('idx_customer_city', 'city'),
         Index('idx_customer_state', 'state'),
         Index('idx_customer_country', 'country'),
+        Index('idx_customer_updated_at', 'updated_at'),
 # Removed is_active index - column is inherited from BaseModel
     )
     
@@ -469,4 +471,8 @@ class Customer(BaseModel):
             f"Customer(id={self.id}, code='{self.customer_code}', "
             f"type='{self.customer_type}', tier='{self.customer_tier}', "
             f"active={self.is_active})"
-        )
\ No newline at end of file
+        )
+
+
+# Autocomplete indexes in every worker rebuild when this version moves
+track_cache_version(Customer.__table__, "customers")
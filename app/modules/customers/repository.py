@@ -2,11 +2,14 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date
-from sqlalchemy import and_, or_, func, select, update, delete, desc, asc
+from sqlalchemy import and_, or_, select, update, delete, desc, asc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.modules.customers.models import Customer, CustomerType, CustomerTier, BlacklistStatus, CustomerStatus
+from app.shared.statistics import StatisticsQuery
+from app.shared.counting import CountResult, row_counter
+from app.db.routing import read_only
 
 
 class CustomerRepository:
@@ -27,6 +30,7 @@ class CustomerRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -87,6 +91,22 @@ class CustomerRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get customer statistics (one query, cached until customers change)."""
+        active = Customer.is_active == True
+        return await (
+            StatisticsQuery(Customer, "customers")
+            .count("total_customers")
+            .count("active_customers", active)
+            .count("blacklisted_customers", Customer.blacklist_status == BlacklistStatus.BLACKLISTED.value, active)
+            .breakdown("customers_by_type", Customer.customer_type, active)
+            .breakdown("customers_by_credit_rating", Customer.credit_rating, active)
+            .breakdown("customers_by_state", Customer.state, active, top=10)
+            .fetch(self.session)
+        )
+    
+    @read_only
     async def count_all(
         self,
         customer_type: Optional[CustomerType] = None,
@@ -94,9 +114,9 @@ class CustomerRepository:
         customer_tier: Optional[CustomerTier] = None,
         blacklist_status: Optional[BlacklistStatus] = None,
         active_only: bool = True
-    ) -> int:
-        """Count all customers with optional filtering."""
-        query = select(func.count(Customer.id))
+    ) -> CountResult:
+        """Count all customers with optional filtering (exact, estimated or cached)."""
+        query = select(Customer.id)
         
         # Apply filters
         conditions = []
@@ -114,8 +134,7 @@ class CustomerRepository:
         if conditions:
             query = query.where(and_(*conditions))
         
-        result = await self.session.execute(query)
-        return result.scalar()
+        return await row_counter.count(self.session, query)
     
     async def create(self, customer_data: dict) -> Customer:
         """Create a new customer."""
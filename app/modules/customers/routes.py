@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError, ConflictError
-from app.shared.dependencies import get_session
+from app.shared.dependencies import get_session, ReadSessionDep
 from app.modules.customers.service import CustomerService
 from app.modules.customers.models import CustomerType, CustomerStatus, BlacklistStatus, CreditRating
 from app.modules.customers.schemas import (
@@ -23,6 +23,11 @@ async def get_customer_service(session: AsyncSession = Depends(get_session)) ->
     return CustomerService(session)
 
 
+# CustomerService for read-only endpoints (served from a read replica when available)
+async def get_customer_read_service(session: ReadSessionDep) -> CustomerService:
+    return CustomerService(session)
+
+
 # Customer CRUD endpoints
 @router.post("/", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
@@ -84,19 +89,24 @@ async def count_customers(
     active_only: bool = Query(True, description="Show only active customers"),
     service: CustomerService = Depends(get_customer_service)
 ):
-    """Count customers with optional filtering."""
-    count = await service.count_customers(
+    """
+    Count customers with optional filtering.
+
+    ``strategy`` tells whether the count is exact, a planner estimate
+    (large results) or cached from an earlier identical request.
+    """
+    result = await service.count_customers(
         customer_type=customer_type,
         status=status,
         blacklist_status=blacklist_status,
         active_only=active_only
     )
-    return {"count": count}
+    return {"count": result.count, "strategy": result.strategy}
 
 
 @router.get("/statistics")
 async def get_customer_statistics(
-    service: CustomerService = Depends(get_customer_service)
+    service: CustomerService = Depends(get_customer_read_service)
 ):
     """Get customer statistics."""
     return await service.get_customer_statistics()
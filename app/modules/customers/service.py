@@ -12,6 +12,7 @@ from .schemas import (
 )
 from app.core.errors import ValidationError, NotFoundError, ConflictError
 from app.shared.pagination import Page
+from app.shared.counting import CountResult
 
 
 class CustomerService:
@@ -173,7 +174,7 @@ class CustomerService:
         status: Optional[CustomerStatus] = None,
         blacklist_status: Optional[BlacklistStatus] = None,
         active_only: bool = True
-    ) -> int:
+    ) -> CountResult:
         """Count customers with filtering."""
         return await self.repository.count_all(
             customer_type=customer_type,
@@ -232,28 +233,21 @@ class CustomerService:
     
     async def get_customer_statistics(self) -> Dict[str, Any]:
         """Get customer statistics."""
-        # Get basic counts
-        total_customers = await self.repository.count_all(active_only=False)
-        active_customers = await self.repository.count_all(active_only=True)
-        individual_customers = await self.repository.count_all(
-            customer_type=CustomerType.INDIVIDUAL, active_only=True
-        )
-        business_customers = await self.repository.count_all(
-            customer_type=CustomerType.BUSINESS, active_only=True
-        )
+        stats = await self.repository.get_statistics()
+        by_type = stats["customers_by_type"]
         
         # Get recent customers
         recent_customers = await self.repository.get_all(skip=0, limit=10, active_only=True)
         
         return {
-            "total_customers": total_customers,
-            "active_customers": active_customers,
-            "inactive_customers": total_customers - active_customers,
-            "individual_customers": individual_customers,
-            "business_customers": business_customers,
-            "blacklisted_customers": 0,  # Will be implemented when blacklist filtering is available
-            "customers_by_credit_rating": {},
-            "customers_by_state": {},
+            "total_customers": stats["total_customers"],
+            "active_customers": stats["active_customers"],
+            "inactive_customers": stats["total_customers"] - stats["active_customers"],
+            "individual_customers": by_type.get(CustomerType.INDIVIDUAL.value, 0),
+            "business_customers": by_type.get(CustomerType.BUSINESS.value, 0),
+            "blacklisted_customers": stats["blacklisted_customers"],
+            "customers_by_credit_rating": stats["customers_by_credit_rating"],
+            "customers_by_state": stats["customers_by_state"],
             "top_customers_by_rentals": [],
             "top_customers_by_spending": [],
             "recent_customers": [CustomerResponse.model_validate(customer) for customer in recent_customers]
@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Optional, TYPE_CHECKING
 from decimal import Decimal
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, Boolean, Text, DateTime, ForeignKey, Index
+from sqlalchemy import (
+    Column, String, Numeric, Boolean, Text, DateTime, Date, Integer, ForeignKey, Index, FetchedValue,
+    PrimaryKeyConstraint, Table, DDL, event, text,
+)
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -31,6 +34,26 @@ class InventoryUnitStatus(str, Enum):
     RETIRED = "RETIRED"
 
 
+class StockState(str, Enum):
+    """Stock level state relative to the item's reorder point."""
+    IN_STOCK = "IN_STOCK"
+    LOW_STOCK = "LOW_STOCK"
+    OUT_OF_STOCK = "OUT_OF_STOCK"
+
+
+def stock_state_for(quantity_available: Decimal, reorder_point: Optional[int]) -> StockState:
+    """
+    State of a stock level (mirrors the ``stock_levels_stock_state`` trigger).
+
+    Out of stock takes precedence; low stock requires a configured reorder point.
+    """
+    if quantity_available <= 0:
+        return StockState.OUT_OF_STOCK
+    if reorder_point and quantity_available <= reorder_point:
+        return StockState.LOW_STOCK
+    return StockState.IN_STOCK
+
+
 class InventoryUnitCondition(str, Enum):
     """Inventory unit condition enumeration."""
     NEW = "NEW"
@@ -298,9 +321,12 @@ class StockLevel(BaseModel):
         item: Item relationship
         location: Location relationship
         stock_movements: All stock movements for this stock level
+        stock_state: IN_STOCK / LOW_STOCK / OUT_OF_STOCK, maintained by trigger
+        below_reorder: Quantity available at or below the item's reorder point
     """
     
     __tablename__ = "stock_levels"
+    __mapper_args__ = {"eager_defaults": True}
     
     item_id = Column(UUIDType(), ForeignKey("items.id"), nullable=False, comment="Item ID")
     location_id = Column(UUIDType(), ForeignKey("locations.id"), nullable=False, comment="Location ID")
@@ -308,6 +334,16 @@ class StockLevel(BaseModel):
     quantity_available = Column(Numeric(10, 2), nullable=False, default=0, comment="Available quantity")
     quantity_on_rent = Column(Numeric(10, 2), nullable=False, default=0, comment="Quantity currently on rent")
     
+    # Maintained by the stock_levels_stock_state trigger from quantity_available and items.reorder_point
+    stock_state = Column(
+        String(20), nullable=False, server_default=StockState.IN_STOCK.value,
+        server_onupdate=FetchedValue(), comment="Stock state relative to reorder point"
+    )
+    below_reorder = Column(
+        Boolean, nullable=False, server_default=text("false"),
+        server_onupdate=FetchedValue(), comment="Available quantity at or below reorder point"
+    )
+    
     # Relationships
     item = relationship("Item", back_populates="stock_levels", lazy="select")
     # location = relationship("Location", back_populates="stock_levels", lazy="select")  # Temporarily disabled
@@ -318,6 +354,12 @@ class StockLevel(BaseModel):
         Index('idx_stock_level_item', 'item_id'),
         Index('idx_stock_level_location', 'location_id'),
         Index('idx_stock_level_item_location', 'item_id', 'location_id', unique=True),
+        # Low-stock list: only rows at/below reorder point, ordered by urgency
+        Index('idx_stock_level_below_reorder', 'quantity_available', 'item_id', 'location_id',
+              postgresql_where=text('below_reorder')),
+        # Alerts summary: only rows that are not in stock
+        Index('idx_stock_level_alert_state', 'stock_state', 'item_id',
+              postgresql_where=text("stock_state <> 'IN_STOCK'")),
 # Removed is_active index - column is inherited from BaseModel
     )
     
@@ -451,6 +493,75 @@ class StockLevel(BaseModel):
         )
 
 
+# stock_state/below_reorder are maintained by triggers (same rules as
+# stock_state_for). The add_stock_level_state migration creates them from
+# these statements, and they are attached to the table here so that
+# databases built with metadata.create_all keep the columns current too.
+# Items are created before stock levels, so the reorder point trigger is
+# attached here as well.
+STOCK_STATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION stock_levels_stock_state_trigger() RETURNS trigger AS $$
+DECLARE
+    reorder INTEGER;
+BEGIN
+    SELECT i.reorder_point INTO reorder FROM items i WHERE i.id = NEW.item_id;
+
+    NEW.below_reorder := coalesce(reorder, 0) > 0 AND NEW.quantity_available <= reorder;
+    NEW.stock_state := CASE
+        WHEN NEW.quantity_available <= 0 THEN 'OUT_OF_STOCK'
+        WHEN NEW.below_reorder THEN 'LOW_STOCK'
+        ELSE 'IN_STOCK'
+    END;
+
+    IF TG_OP = 'INSERT' OR NEW.stock_state IS DISTINCT FROM OLD.stock_state THEN
+        IF TG_OP = 'UPDATE' OR NEW.stock_state <> 'IN_STOCK' THEN
+            PERFORM pg_notify('stock_state_changed', json_build_object(
+                'stock_level_id', NEW.id,
+                'item_id', NEW.item_id,
+                'location_id', NEW.location_id,
+                'stock_state', NEW.stock_state,
+                'quantity_available', NEW.quantity_available,
+                'reorder_point', reorder
+            )::text);
+        END IF;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+STOCK_STATE_TRIGGER = """
+CREATE TRIGGER stock_levels_stock_state
+BEFORE INSERT OR UPDATE OF quantity_available, item_id
+ON stock_levels
+FOR EACH ROW EXECUTE FUNCTION stock_levels_stock_state_trigger()
+"""
+
+REFRESH_STOCK_STATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION items_refresh_stock_state_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE stock_levels SET quantity_available = quantity_available WHERE item_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+REFRESH_STOCK_STATE_TRIGGER = """
+CREATE TRIGGER items_refresh_stock_state
+AFTER UPDATE OF reorder_point ON items
+FOR EACH ROW WHEN (OLD.reorder_point IS DISTINCT FROM NEW.reorder_point)
+EXECUTE FUNCTION items_refresh_stock_state_trigger()
+"""
+
+for _statement in (
+    STOCK_STATE_FUNCTION,
+    STOCK_STATE_TRIGGER,
+    REFRESH_STOCK_STATE_FUNCTION,
+    REFRESH_STOCK_STATE_TRIGGER,
+):
+    event.listen(StockLevel.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class SKUSequence(BaseModel):
     """
     SKU sequence tracking model for generating unique SKUs.
@@ -553,6 +664,11 @@ class StockMovement(Base, TimestampMixin, AuditMixin):
     quantities before and after, and references to the triggering transactions.
     Stock movements are immutable audit records and do not support soft deletion.
     
+    The table is range-partitioned by month on ``created_at`` (hence the
+    ``(id, created_at)`` primary key; the mapper still identifies rows by
+    ``id``). Per-day totals are kept in ``stock_movement_daily`` by trigger,
+    and old partitions are archived by ``StockMovementPartitionManager``.
+    
     Attributes:
         id: Primary key UUID
         stock_level_id: Reference to the stock level being modified
@@ -574,8 +690,9 @@ class StockMovement(Base, TimestampMixin, AuditMixin):
     
     __tablename__ = "stock_movements"
     
-    # Primary key
-    id = Column(UUIDType(), primary_key=True, default=uuid4, comment="Primary key UUID")
+    # Primary key (with created_at, which partitioned tables must include)
+    id = Column(UUIDType(), nullable=False, default=uuid4, comment="Primary key UUID")
+    __mapper_args__ = {"primary_key": [id]}
     
     # Core references
     stock_level_id = Column(UUIDType(), ForeignKey("stock_levels.id"), nullable=False, comment="Stock level ID")
@@ -612,8 +729,11 @@ class StockMovement(Base, TimestampMixin, AuditMixin):
         Index('idx_stock_movement_type', 'movement_type'),
         Index('idx_stock_movement_reference', 'reference_type', 'reference_id'),
         Index('idx_stock_movement_created', 'created_at'),
-        Index('idx_stock_movement_item_created', 'item_id', 'created_at'),
-        Index('idx_stock_movement_stock_created', 'stock_level_id', 'created_at'),
+        # Keyset pagination order (created_at, id) per item / stock level
+        Index('idx_stock_movement_item_created_id', 'item_id', 'created_at', 'id'),
+        Index('idx_stock_movement_stock_created_id', 'stock_level_id', 'created_at', 'id'),
+        PrimaryKeyConstraint('id', 'created_at', name='stock_movements_pkey'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
     
     def __init__(
@@ -733,4 +853,113 @@ class StockMovement(Base, TimestampMixin, AuditMixin):
             f"StockMovement(id={self.id}, type='{self.movement_type}', "
             f"change={self.quantity_change}, before={self.quantity_before}, "
             f"after={self.quantity_after}, active={self.is_active})"
-        )
\ No newline at end of file
+        )
+
+# Rows outside every monthly partition (e.g. before the first scheduled run on
+# a fresh database) land here instead of failing the insert.
+event.listen(
+    StockMovement.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS stock_movements_default "
+        "PARTITION OF stock_movements DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+# Per-day movement totals, maintained by the stock_movements rollup trigger
+# below. Not an ORM model: it is only read by summary queries and never
+# written by the application.
+stock_movement_daily = Table(
+    "stock_movement_daily",
+    Base.metadata,
+    Column("item_id", UUIDType(), nullable=False, comment="Item ID"),
+    Column("location_id", UUIDType(), nullable=False, comment="Location ID"),
+    Column("movement_day", Date, nullable=False, comment="UTC day of the movements"),
+    Column("movement_type", String(50), nullable=False, comment="Type of movement"),
+    Column("movement_count", Integer, nullable=False, server_default="0", comment="Number of movements"),
+    Column("quantity_in", Numeric(14, 2), nullable=False, server_default="0", comment="Sum of positive changes"),
+    Column("quantity_out", Numeric(14, 2), nullable=False, server_default="0", comment="Sum of negative changes (as a positive number)"),
+    Column("net_change", Numeric(14, 2), nullable=False, server_default="0", comment="Sum of all changes"),
+    PrimaryKeyConstraint("item_id", "location_id", "movement_day", "movement_type", name="stock_movement_daily_pkey"),
+    Index("idx_stock_movement_daily_item_day", "item_id", "movement_day"),
+)
+
+
+# Per-day totals by UTC day. The partition_stock_movements migration creates
+# the function and trigger from these statements; they are attached to the
+# table here so that databases built with metadata.create_all fill
+# stock_movement_daily too. stock_movements.skip_rollup = 'on' is set by the
+# partition manager while it relocates rows that are already counted.
+STOCK_MOVEMENT_ROLLUP_FUNCTION = """
+CREATE OR REPLACE FUNCTION stock_movements_daily_rollup_trigger() RETURNS trigger AS $$
+DECLARE
+    movement stock_movements%ROWTYPE;
+    direction INTEGER;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF (NEW.item_id, NEW.location_id, NEW.stock_level_id, NEW.movement_type,
+            NEW.quantity_change, NEW.quantity_before, NEW.quantity_after,
+            NEW.created_at, NEW.is_active)
+           IS DISTINCT FROM
+           (OLD.item_id, OLD.location_id, OLD.stock_level_id, OLD.movement_type,
+            OLD.quantity_change, OLD.quantity_before, OLD.quantity_after,
+            OLD.created_at, OLD.is_active)
+        THEN
+            RAISE EXCEPTION 'stock movement % is immutable; record a new movement instead', OLD.id;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF current_setting('stock_movements.skip_rollup', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        movement := NEW;
+        direction := 1;
+    ELSE
+        movement := OLD;
+        direction := -1;
+    END IF;
+
+    IF NOT movement.is_active THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO stock_movement_daily AS daily (
+        item_id, location_id, movement_day, movement_type,
+        movement_count, quantity_in, quantity_out, net_change
+    ) VALUES (
+        movement.item_id,
+        movement.location_id,
+        (movement.created_at AT TIME ZONE 'UTC')::date,
+        movement.movement_type,
+        direction,
+        direction * greatest(movement.quantity_change, 0),
+        direction * greatest(-movement.quantity_change, 0),
+        direction * movement.quantity_change
+    )
+    ON CONFLICT (item_id, location_id, movement_day, movement_type) DO UPDATE SET
+        movement_count = daily.movement_count + EXCLUDED.movement_count,
+        quantity_in = daily.quantity_in + EXCLUDED.quantity_in,
+        quantity_out = daily.quantity_out + EXCLUDED.quantity_out,
+        net_change = daily.net_change + EXCLUDED.net_change;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+STOCK_MOVEMENT_ROLLUP_TRIGGER = """
+CREATE TRIGGER stock_movements_daily_rollup
+AFTER INSERT OR UPDATE OR DELETE ON stock_movements
+FOR EACH ROW EXECUTE FUNCTION stock_movements_daily_rollup_trigger()
+"""
+
+# DDL formats its statement with %, so the function's literal percent signs are doubled
+for _statement in (STOCK_MOVEMENT_ROLLUP_FUNCTION, STOCK_MOVEMENT_ROLLUP_TRIGGER):
+    event.listen(
+        StockMovement.__table__,
+        "after_create",
+        DDL(_statement.replace("%", "%%")).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,192 @@
+"""
+Monthly partition maintenance for the ``stock_movements`` ledger.
+
+``stock_movements`` is range-partitioned on ``created_at`` with one partition
+per UTC calendar month (``stock_movements_pYYYY_MM``) plus a default
+partition that catches anything outside them. The nightly job keeps a few
+months of partitions ahead of time so inserts never land in the default
+partition, and retires partitions older than the retention period by
+detaching them and moving them to an archive schema (or dropping them when
+no schema is configured). Per-day totals in ``stock_movement_daily`` are
+not touched, so summaries still cover archived months.
+"""
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "stock_movements"
+DEFAULT_PARTITION = "stock_movements_default"
+
+_PARTITION_RE = re.compile(r"^stock_movements_p(\d{4})_(\d{2})$")
+_IDENTIFIER_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after (or before) ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding ``month``."""
+    return f"{PARENT_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month held by a partition name, or None for other tables (e.g. the default)."""
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month: date) -> str:
+    """``FOR VALUES`` clause of the partition holding ``month`` (UTC month boundaries)."""
+    upper = add_months(month, 1)
+    return f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+
+
+class StockMovementPartitionManager:
+    """Create upcoming and archive expired monthly ``stock_movements`` partitions."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_partitions(self) -> List[str]:
+        """Names of the partitions currently attached to ``stock_movements``."""
+        result = await self.session.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(:parent)
+            ORDER BY child.relname
+        """), {"parent": PARENT_TABLE})
+        return list(result.scalars().all())
+
+    async def ensure_partitions(self, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+        """
+        Create the partitions from the current month to ``months_ahead`` months out.
+
+        Returns:
+            Names of the partitions that were created
+        """
+        months_ahead = months_ahead if months_ahead is not None else settings.STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD
+        current = month_start(today or datetime.now(timezone.utc).date())
+        existing = set(await self.list_partitions())
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            await self._create_partition(month)
+            created.append(name)
+
+        if created:
+            logger.info(f"Created stock movement partitions: {', '.join(created)}")
+        return created
+
+    async def _create_partition(self, month: date) -> None:
+        name = partition_name(month)
+        upper = add_months(month, 1)
+        stray = await self.session.execute(text(f"""
+            SELECT EXISTS (
+                SELECT 1 FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :lower AND created_at < :upper
+            )
+        """), {
+            "lower": datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+            "upper": datetime(upper.year, upper.month, 1, tzinfo=timezone.utc),
+        })
+
+        if not stray.scalar_one():
+            await self.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} {partition_bounds(month)}"
+            ))
+            return
+
+        # The default partition already holds rows for this month (e.g. the
+        # job did not run in time). Attaching a new partition over them would
+        # fail, so move them into it first. They are only relocated, so the
+        # daily aggregate trigger is told to skip them.
+        await self.session.execute(text("SET LOCAL stock_movements.skip_rollup = 'on'"))
+        await self.session.execute(text(
+            f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await self.session.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= '{month.isoformat()} 00:00:00+00'
+                  AND created_at < '{upper.isoformat()} 00:00:00+00'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """))
+        await self.session.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {partition_bounds(month)}"
+        ))
+        await self.session.execute(text("SET LOCAL stock_movements.skip_rollup = 'off'"))
+        logger.warning(f"Moved stock movements for {month:%Y-%m} out of {DEFAULT_PARTITION}")
+
+    async def archive_expired(
+        self,
+        retention_months: Optional[int] = None,
+        archive_schema: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> List[str]:
+        """
+        Detach partitions whose whole month is older than the retention period.
+
+        Detached partitions are moved to ``archive_schema`` (created if needed)
+        or dropped when it is empty. A retention of 0 keeps everything.
+
+        Returns:
+            Names of the partitions that were archived or dropped
+        """
+        retention_months = retention_months if retention_months is not None else settings.STOCK_MOVEMENT_RETENTION_MONTHS
+        archive_schema = archive_schema if archive_schema is not None else settings.STOCK_MOVEMENT_ARCHIVE_SCHEMA
+        if retention_months <= 0:
+            return []
+        if archive_schema and not _IDENTIFIER_RE.match(archive_schema):
+            raise ValueError(f"Invalid archive schema name: {archive_schema}")
+
+        cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+        expired = [
+            name for name in await self.list_partitions()
+            if (month := partition_month(name)) is not None and month < cutoff
+        ]
+
+        if expired and archive_schema:
+            await self.session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+        for name in expired:
+            await self.session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            if archive_schema:
+                await self.session.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+            else:
+                await self.session.execute(text(f"DROP TABLE {name}"))
+
+        if expired:
+            action = f"moved to schema {archive_schema}" if archive_schema else "dropped"
+            logger.info(f"Stock movement partitions {action}: {', '.join(expired)}")
+        return expired
+
+    async def run(self) -> Dict[str, Any]:
+        """Nightly maintenance: create upcoming partitions, then archive expired ones."""
+        created = await self.ensure_partitions()
+        archived = await self.archive_expired()
+        return {"created": created, "archived": archived}
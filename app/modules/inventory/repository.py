@@ -1,7 +1,8 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from decimal import Decimal
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
 from sqlalchemy import and_, or_, func, select, update, delete, desc, asc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
@@ -9,9 +10,12 @@ from sqlalchemy.orm import selectinload, joinedload
 from app.modules.master_data.item_master.models import Item, ItemStatus
 from app.modules.inventory.models import (
     InventoryUnit, StockLevel, StockMovement, InventoryUnitStatus, InventoryUnitCondition,
-    MovementType, ReferenceType
+    MovementType, ReferenceType, stock_movement_daily
 )
 from app.modules.master_data.item_master.schemas import ItemCreate, ItemUpdate
+from app.shared.cursor_pagination import CountMode, CursorPage, KeysetPaginator
+from app.shared.filters import SortOrder, SortSpec
+from app.db.routing import read_only
 from app.modules.inventory.schemas import (
     InventoryUnitCreate, InventoryUnitUpdate, StockLevelCreate, StockLevelUpdate
 )
@@ -207,6 +211,7 @@ class ItemRepository:
         await self.session.commit()
         return True
     
+    @read_only
     async def get_rental_items(self, active_only: bool = True) -> List[Item]:
         """Get all rental items."""
         query = select(Item).where(Item.is_rentable == True)
@@ -219,6 +224,7 @@ class ItemRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_sale_items(self, active_only: bool = True) -> List[Item]:
         """Get all sale items."""
         query = select(Item).where(Item.is_saleable == True)
@@ -298,6 +304,7 @@ class InventoryUnitRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -519,6 +526,7 @@ class StockLevelRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self, 
         skip: int = 0, 
@@ -609,6 +617,64 @@ class StockLevelRepository:
         return True
 
 
+# Stock movement history pages: newest first, (created_at, id) keyset
+MOVEMENT_PAGINATOR = KeysetPaginator(
+    StockMovement, [SortSpec(field="created_at", order=SortOrder.DESC)]
+)
+
+# created_at has microsecond precision, so "<= end" is "< end + 1us"
+_TIMESTAMP_RESOLUTION = timedelta(microseconds=1)
+
+
+def _utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken to be UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+@dataclass
+class SummaryWindow:
+    """
+    A movement summary range split into whole UTC days and partial edges.
+
+    Whole days ``[first_day, end_day)`` are read from ``stock_movement_daily``;
+    the half-open ``raw_ranges`` around them from ``stock_movements``. A
+    bound of None means unbounded on that side.
+    """
+    first_day: Optional[date] = None
+    end_day: Optional[date] = None
+    has_days: bool = True
+    raw_ranges: List[tuple] = field(default_factory=list)
+
+
+def summary_window(start: Optional[datetime], end: Optional[datetime]) -> SummaryWindow:
+    """Split the inclusive ``[start, end]`` range for a movement summary."""
+    lower = _utc(start) if start else None
+    upper = _utc(end) + _TIMESTAMP_RESOLUTION if end else None
+
+    first_day = end_day = None
+    if lower is not None:
+        first_day = lower.date() if lower == _day_start(lower.date()) else lower.date() + timedelta(days=1)
+    if upper is not None:
+        end_day = upper.date()
+
+    if first_day is not None and end_day is not None and first_day >= end_day:
+        # Less than one whole day: everything comes from raw rows
+        return SummaryWindow(has_days=False, raw_ranges=[(lower, upper)])
+
+    window = SummaryWindow(first_day=first_day, end_day=end_day)
+    if lower is not None and lower < _day_start(first_day):
+        window.raw_ranges.append((lower, _day_start(first_day)))
+    if upper is not None and _day_start(end_day) < upper:
+        window.raw_ranges.append((_day_start(end_day), upper))
+    return window
+
+
 class StockMovementRepository:
     """Repository for StockMovement operations."""
     
@@ -623,12 +689,14 @@ class StockMovementRepository:
         await self.session.refresh(movement)
         return movement
     
+    @read_only
     async def get_by_id(self, movement_id: UUID) -> Optional[StockMovement]:
         """Get stock movement by ID."""
         query = select(StockMovement).where(StockMovement.id == movement_id)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_by_stock_level(
         self,
         stock_level_id: UUID,
@@ -647,6 +715,32 @@ class StockMovementRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        count: CountMode = CountMode.NONE,
+        item_id: Optional[UUID] = None,
+        stock_level_id: Optional[UUID] = None,
+        movement_type: Optional[MovementType] = None,
+        active_only: bool = True
+    ) -> CursorPage:
+        """Newest-first page of stock movements using keyset pagination."""
+        query = select(StockMovement)
+        
+        if item_id:
+            query = query.where(StockMovement.item_id == item_id)
+        if stock_level_id:
+            query = query.where(StockMovement.stock_level_id == stock_level_id)
+        if movement_type:
+            query = query.where(StockMovement.movement_type == movement_type.value)
+        if active_only:
+            query = query.where(StockMovement.is_active == True)
+        
+        return await MOVEMENT_PAGINATOR.paginate(self.session, query, cursor=cursor, limit=limit, count=count)
+    
+    @read_only
     async def get_by_item(
         self,
         item_id: UUID,
@@ -669,6 +763,7 @@ class StockMovementRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_by_reference(
         self,
         reference_type: ReferenceType,
@@ -691,6 +786,7 @@ class StockMovementRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_movements_by_date_range(
         self,
         start_date: datetime,
@@ -725,43 +821,105 @@ class StockMovementRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
+    async def get_recent_by_item(self, item_id: UUID, limit: int = 10) -> List[StockMovement]:
+        """Newest movements of an item (a backward scan of the item/created_at index)."""
+        query = (
+            select(StockMovement)
+            .where(
+                and_(
+                    StockMovement.item_id == item_id,
+                    StockMovement.is_active == True
+                )
+            )
+            .order_by(desc(StockMovement.created_at), desc(StockMovement.id))
+            .limit(limit)
+        )
+        
+        result = await self.session.execute(query)
+        return result.scalars().all()
+    
+    @read_only
     async def get_movement_summary(
         self,
         item_id: UUID,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Get movement summary for an item."""
-        query = select(StockMovement).where(StockMovement.item_id == item_id)
-        
-        if start_date:
-            query = query.where(StockMovement.created_at >= start_date)
-        
-        if end_date:
-            query = query.where(StockMovement.created_at <= end_date)
-        
-        query = query.where(StockMovement.is_active == True)
-        
-        result = await self.session.execute(query)
-        movements = result.scalars().all()
+        """
+        Get movement summary for an item.
+        
+        Whole UTC days come from the ``stock_movement_daily`` aggregates (which
+        also cover archived partitions); only partial days at the edges of
+        the range read individual movements.
+        """
+        window = summary_window(start_date, end_date)
+        rows = []
+        
+        if window.has_days:
+            daily = stock_movement_daily.c
+            query = select(
+                daily.movement_type,
+                func.sum(daily.movement_count),
+                func.sum(daily.quantity_in),
+                func.sum(daily.quantity_out),
+                func.sum(daily.net_change)
+            ).where(daily.item_id == item_id)
+            if window.first_day:
+                query = query.where(daily.movement_day >= window.first_day)
+            if window.end_day:
+                query = query.where(daily.movement_day < window.end_day)
+            result = await self.session.execute(query.group_by(daily.movement_type))
+            rows.extend(result.all())
+        
+        if window.raw_ranges:
+            ranges = []
+            for lower, upper in window.raw_ranges:
+                bounds = []
+                if lower is not None:
+                    bounds.append(StockMovement.created_at >= lower)
+                if upper is not None:
+                    bounds.append(StockMovement.created_at < upper)
+                ranges.append(and_(*bounds))
+            query = select(
+                StockMovement.movement_type,
+                func.count(),
+                func.sum(func.greatest(StockMovement.quantity_change, 0)),
+                func.sum(func.greatest(-StockMovement.quantity_change, 0)),
+                func.sum(StockMovement.quantity_change)
+            ).where(
+                and_(
+                    StockMovement.item_id == item_id,
+                    StockMovement.is_active == True,
+                    or_(*ranges)
+                )
+            ).group_by(StockMovement.movement_type)
+            result = await self.session.execute(query)
+            rows.extend(result.all())
         
         summary = {
-            "total_movements": len(movements),
-            "total_increases": sum(m.quantity_change for m in movements if m.quantity_change > 0),
-            "total_decreases": abs(sum(m.quantity_change for m in movements if m.quantity_change < 0)),
-            "net_change": sum(m.quantity_change for m in movements),
+            "total_movements": 0,
+            "total_increases": Decimal("0"),
+            "total_decreases": Decimal("0"),
+            "net_change": Decimal("0"),
             "movement_types": {}
         }
         
-        # Count by movement type
-        for movement in movements:
-            movement_type = movement.movement_type
+        # Totals overall and by movement type
+        for movement_type, count, quantity_in, quantity_out, net_change in rows:
+            if not count:
+                continue
+            summary["total_movements"] += count
+            summary["total_increases"] += quantity_in or Decimal("0")
+            summary["total_decreases"] += quantity_out or Decimal("0")
+            summary["net_change"] += net_change or Decimal("0")
+            
             if movement_type not in summary["movement_types"]:
                 summary["movement_types"][movement_type] = {
                     "count": 0,
                     "total_quantity": Decimal("0")
                 }
-            summary["movement_types"][movement_type]["count"] += 1
-            summary["movement_types"][movement_type]["total_quantity"] += movement.quantity_change
+            summary["movement_types"][movement_type]["count"] += count
+            summary["movement_types"][movement_type]["total_quantity"] += net_change or Decimal("0")
         
-        return summary
\ No newline at end of file
+        return summary
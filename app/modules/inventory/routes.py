@@ -5,7 +5,7 @@ from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.dependencies import get_session
+from app.shared.dependencies import get_session, ReadSessionDep
 from app.modules.inventory.service import InventoryService
 from app.modules.master_data.item_master.models import ItemStatus
 from app.modules.inventory.models import InventoryUnitStatus, InventoryUnitCondition, MovementType, ReferenceType
@@ -23,6 +23,7 @@ from app.modules.inventory.schemas import (
     ItemInventoryOverviewParams
 )
 from app.core.errors import NotFoundError, ValidationError, ConflictError
+from app.shared.cursor_pagination import CountMode, CursorPage
 
 
 router = APIRouter(tags=["inventory"])
@@ -33,6 +34,11 @@ def get_inventory_service(session: AsyncSession = Depends(get_session)) -> Inven
     return InventoryService(session)
 
 
+def get_inventory_read_service(session: ReadSessionDep) -> InventoryService:
+    """Get inventory service instance for read-only endpoints (read replica when available)."""
+    return InventoryService(session)
+
+
 # Item endpoints
 @router.post("/items", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item(
@@ -63,7 +69,7 @@ async def get_items_inventory_overview(
     search: Optional[str] = None,
     sort_by: Optional[str] = Query(default="item_name", regex="^(item_name|sku|created_at|total_units|stock_status)$"),
     sort_order: Optional[str] = Query(default="asc", regex="^(asc|desc)$"),
-    service: InventoryService = Depends(get_inventory_service)
+    service: InventoryService = Depends(get_inventory_read_service)
 ):
     """Get inventory overview for all items - optimized for table display."""
     try:
@@ -88,7 +94,7 @@ async def get_items_inventory_overview(
 @router.get("/items/{item_id}/detailed", response_model=ItemInventoryDetailed)
 async def get_item_inventory_detailed(
     item_id: UUID,
-    service: InventoryService = Depends(get_inventory_service)
+    service: InventoryService = Depends(get_inventory_read_service)
 ):
     """Get detailed inventory information for a single item."""
     try:
@@ -546,7 +552,7 @@ async def get_item_inventory_units(
 @router.get("/items/{item_id}/stock-summary")
 async def get_item_stock_summary(
     item_id: UUID,
-    service: InventoryService = Depends(get_inventory_service)
+    service: InventoryService = Depends(get_inventory_read_service)
 ):
     """Get comprehensive stock summary for an item."""
     try:
@@ -623,6 +629,26 @@ async def get_stock_level_movements(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+@router.get("/stock/{stock_level_id}/movements/page", response_model=CursorPage[StockMovementResponse])
+async def get_stock_level_movement_page(
+    stock_level_id: UUID,
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    limit: int = Query(default=50, ge=1, le=1000, description="Number of records to return"),
+    count: CountMode = Query(default=CountMode.NONE, description="Whether to include a total count"),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get stock movements for a stock level with cursor pagination (newest first)."""
+    try:
+        return await service.get_stock_movement_page(
+            cursor=cursor,
+            limit=limit,
+            count=count,
+            stock_level_id=stock_level_id
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
 @router.get("/items/{item_id}/movements", response_model=List[StockMovementResponse])
 async def get_item_movements(
     item_id: UUID,
@@ -643,6 +669,28 @@ async def get_item_movements(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+@router.get("/items/{item_id}/movements/page", response_model=CursorPage[StockMovementResponse])
+async def get_item_movement_page(
+    item_id: UUID,
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    limit: int = Query(default=50, ge=1, le=1000, description="Number of records to return"),
+    movement_type: Optional[MovementType] = Query(default=None, description="Filter by movement type"),
+    count: CountMode = Query(default=CountMode.NONE, description="Whether to include a total count"),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get stock movements for an item with cursor pagination (newest first)."""
+    try:
+        return await service.get_stock_movement_page(
+            cursor=cursor,
+            limit=limit,
+            count=count,
+            item_id=item_id,
+            movement_type=movement_type
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
 @router.get("/movements/reference/{reference_type}/{reference_id}", response_model=List[StockMovementResponse])
 async def get_movements_by_reference(
     reference_type: ReferenceType,
@@ -686,7 +734,7 @@ async def get_item_movement_summary(
     item_id: UUID,
     start_date: Optional[datetime] = Query(default=None, description="Start date for summary"),
     end_date: Optional[datetime] = Query(default=None, description="End date for summary"),
-    service: InventoryService = Depends(get_inventory_service)
+    service: InventoryService = Depends(get_inventory_read_service)
 ):
     """Get movement summary for an item."""
     try:
@@ -28,6 +28,9 @@ from app.modules.inventory.schemas import (
     UnitsByStatus, LocationStockInfo, InventoryUnitDetail, RecentMovement,
     ItemInventoryOverviewParams
 )
+from app.db.routing import read_only
+from app.shared.cursor_pagination import CountMode, CursorPage
+from app.shared.loaders import get_loaders
 from app.shared.utils.sku_generator import SKUGenerator
 
 
@@ -419,11 +422,12 @@ class InventoryService:
         
         # Get items needing reorder
         low_stock_items = await self.stock_level_repository.get_low_stock_items()
-        items_needing_reorder = []
-        for stock_level in low_stock_items:
-            item = await self.item_repository.get_by_id(UUID(stock_level.item_id))
-            if item:
-                items_needing_reorder.append(ItemListResponse.model_validate(item))
+        reorder_items = await get_loaders(self.session)[Item].load_many(
+            stock_level.item_id for stock_level in low_stock_items
+        )
+        items_needing_reorder = [
+            ItemListResponse.model_validate(item) for item in reorder_items if item
+        ]
         
         # Convert items to response format
         item_responses = [ItemWithInventoryResponse.model_validate(item) for item in items]
@@ -1041,6 +1045,26 @@ class InventoryService:
         )
         return [StockMovementResponse.model_validate(movement) for movement in movements]
     
+    async def get_stock_movement_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        count: CountMode = CountMode.NONE,
+        item_id: Optional[UUID] = None,
+        stock_level_id: Optional[UUID] = None,
+        movement_type: Optional[MovementType] = None
+    ) -> CursorPage[StockMovementResponse]:
+        """Get a cursor-paginated page of stock movements, newest first."""
+        page = await self.stock_movement_repository.get_page(
+            cursor=cursor,
+            limit=limit,
+            count=count,
+            item_id=item_id,
+            stock_level_id=stock_level_id,
+            movement_type=movement_type
+        )
+        return page.map(StockMovementResponse.model_validate)
+    
     async def get_stock_movements_by_item(
         self,
         item_id: UUID,
@@ -1212,6 +1236,7 @@ class InventoryService:
         return StockMovementResponse.model_validate(movement)
     
     # Item Inventory Overview and Detailed operations
+    @read_only
     async def get_items_inventory_overview(
         self,
         params: ItemInventoryOverviewParams
@@ -1342,6 +1367,7 @@ class InventoryService:
         end = params.skip + params.limit
         return overview_list[start:end]
     
+    @read_only
     async def get_item_inventory_detailed(self, item_id: UUID) -> ItemInventoryDetailed:
         """Get detailed inventory information for a single item."""
         from sqlalchemy import select
@@ -1353,8 +1379,7 @@ class InventoryService:
             selectinload(Item.category),
             selectinload(Item.unit_of_measurement),
             selectinload(Item.inventory_units),
-            selectinload(Item.stock_levels),
-            selectinload(Item.stock_movements)
+            selectinload(Item.stock_levels)
         ).where(Item.id == item_id)
         
         result = await self.session.execute(query)
@@ -1363,6 +1388,9 @@ class InventoryService:
         if not item:
             raise NotFoundError(f"Item with ID {item_id} not found")
         
+        # Last 10 movements straight from the (item_id, created_at, id) index
+        latest_movements = await self.stock_movement_repository.get_recent_by_item(item_id, limit=10)
+        
         # Build units by status
         units_by_status = UnitsByStatus()
         inventory_unit_details = []
@@ -1372,6 +1400,7 @@ class InventoryService:
         for unit in item.inventory_units:
             if unit.is_active:
                 location_ids.add(unit.location_id)
+        location_ids.update(movement.location_id for movement in latest_movements)
         
         # Fetch locations
         locations_map = {}
@@ -1430,36 +1459,21 @@ class InventoryService:
         
         # Get recent movements (last 10)
         recent_movements = []
-        if item.stock_movements:
-            # Sort by created_at descending and take first 10
-            sorted_movements = sorted(
-                item.stock_movements,
-                key=lambda x: x.created_at,
-                reverse=True
-            )[:10]
-            
-            # Get user names if needed
-            user_ids = set()
-            for movement in sorted_movements:
-                if movement.created_by:
-                    user_ids.add(movement.created_by)
-            
-            # For now, we'll use user IDs as names
-            # In a real implementation, you'd fetch user names from the users tables
-            
-            for movement in sorted_movements:
-                recent_movement = RecentMovement(
-                    id=movement.id,
-                    movement_type=movement.movement_type,
-                    quantity_change=movement.quantity_change,
-                    reason=movement.reason,
-                    reference_type=movement.reference_type,
-                    reference_id=movement.reference_id,
-                    location_name=locations_map.get(movement.location_id, "Unknown"),
-                    created_at=movement.created_at,
-                    created_by_name=str(movement.created_by) if movement.created_by else None
-                )
-                recent_movements.append(recent_movement)
+        # For now, we'll use user IDs as names
+        # In a real implementation, you'd fetch user names from the users tables
+        for movement in latest_movements:
+            recent_movement = RecentMovement(
+                id=movement.id,
+                movement_type=movement.movement_type,
+                quantity_change=movement.quantity_change,
+                reason=movement.reason,
+                reference_type=movement.reference_type,
+                reference_id=movement.reference_id,
+                location_name=locations_map.get(movement.location_id, "Unknown"),
+                created_at=movement.created_at,
+                created_by_name=str(movement.created_by) if movement.created_by else None
+            )
+            recent_movements.append(recent_movement)
         
         # Determine stock status
         if units_by_status.available == 0 and total_available == 0:
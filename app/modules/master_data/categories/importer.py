@@ -0,0 +1,169 @@
+"""
+Bulk category import.
+
+Importing row by row costs a parent lookup, a duplicate check and an insert
+(plus a parent update) per row. The importer instead loads every existing
+category path once, orders the rows by depth so parents are always resolved
+before their children, settles parents and duplicates in memory and inserts
+each tree level with multi-row INSERTs (chunked to stay under the driver's
+bind parameter limit).
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Category
+from .schemas import CategoryImport, CategoryImportResult, CategoryImportRowResult
+
+PATH_SEPARATOR = "/"
+MAX_PATH_LENGTH = 500
+
+# asyncpg allows at most 32767 bind parameters per statement
+INSERT_BATCH_SIZE = 2000
+
+
+@dataclass
+class _Node:
+    """A category known to the import, existing or about to be created."""
+    id: UUID
+    level: int
+    is_leaf: bool
+    created: bool = False
+
+
+class CategoryImporter:
+    """Import a taxonomy in a fixed number of statements per tree level."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run(
+        self,
+        rows: Sequence[CategoryImport],
+        created_by: Optional[str] = None,
+    ) -> CategoryImportResult:
+        """
+        Import ``rows`` and commit.
+
+        Each row's outcome is reported in input order: ``created``,
+        ``skipped`` (a category with that path already exists, in the
+        database or earlier in the import) or ``failed``.
+        """
+        nodes = await self._load_existing()
+        results = [
+            CategoryImportRowResult(row=index, name=data.name, status="pending")
+            for index, data in enumerate(rows, 1)
+        ]
+
+        levels: Dict[int, List[int]] = defaultdict(list)
+        for position, data in enumerate(rows):
+            if PATH_SEPARATOR in data.name:
+                self._fail(results[position], f"Category name cannot contain '{PATH_SEPARATOR}'")
+                continue
+            path = self._path(data)
+            results[position].category_path = path
+            if len(path) > MAX_PATH_LENGTH:
+                self._fail(results[position], f"Category path exceeds {MAX_PATH_LENGTH} characters")
+                continue
+            levels[path.count(PATH_SEPARATOR) + 1].append(position)
+
+        # Resolve every row in memory first, shallowest level first
+        new_parents: Set[UUID] = set()
+        planned: Dict[int, List[dict]] = defaultdict(list)
+        for depth in sorted(levels):
+            for position in levels[depth]:
+                data, result = rows[position], results[position]
+
+                parent = None
+                if data.parent_category_path:
+                    parent = nodes.get(data.parent_category_path)
+                    if parent is None:
+                        self._fail(result, f"Parent category '{data.parent_category_path}' not found")
+                        continue
+
+                existing = nodes.get(result.category_path)
+                if existing is not None:
+                    result.status = "skipped"
+                    result.category_id = existing.id
+                    continue
+
+                node = _Node(id=uuid4(), level=parent.level + 1 if parent else 1, is_leaf=True, created=True)
+                nodes[result.category_path] = node
+                if parent is not None and parent.is_leaf:
+                    parent.is_leaf = False
+                    if not parent.created:
+                        new_parents.add(parent.id)
+
+                result.status = "created"
+                result.category_id = node.id
+                planned[depth].append({
+                    "id": node.id,
+                    "name": data.name,
+                    "parent_category_id": parent.id if parent else None,
+                    "category_path": result.category_path,
+                    "category_level": node.level,
+                    "display_order": data.display_order,
+                    "is_active": data.is_active,
+                    "created_by": created_by,
+                    "updated_by": created_by,
+                })
+
+        # Then write level by level; parents always exist before their children
+        for depth in sorted(planned):
+            values = planned[depth]
+            for row in values:
+                row["is_leaf"] = nodes[row["category_path"]].is_leaf
+            await self._insert_level(values)
+
+        await self._mark_parents(new_parents, created_by)
+        await self.session.commit()
+
+        return CategoryImportResult(
+            total_processed=len(rows),
+            successful_imports=sum(1 for r in results if r.status == "created"),
+            failed_imports=sum(1 for r in results if r.status == "failed"),
+            skipped_imports=sum(1 for r in results if r.status == "skipped"),
+            errors=[{"row": r.row, "error": r.error} for r in results if r.status == "failed"],
+            rows=results,
+        )
+
+    async def _load_existing(self) -> Dict[str, _Node]:
+        """Every existing category keyed by path, in one query."""
+        result = await self.session.execute(
+            select(Category.id, Category.category_path, Category.category_level, Category.is_leaf)
+        )
+        return {
+            path: _Node(id=category_id, level=level, is_leaf=is_leaf)
+            for category_id, path, level, is_leaf in result.all()
+        }
+
+    async def _insert_level(self, values: List[dict]) -> None:
+        for start in range(0, len(values), INSERT_BATCH_SIZE):
+            await self.session.execute(insert(Category).values(values[start:start + INSERT_BATCH_SIZE]))
+
+    async def _mark_parents(self, parent_ids: Set[UUID], updated_by: Optional[str]) -> None:
+        """Existing leaf categories that received children are no longer leaves."""
+        ids = list(parent_ids)
+        for start in range(0, len(ids), INSERT_BATCH_SIZE):
+            await self.session.execute(
+                update(Category)
+                .where(Category.id.in_(ids[start:start + INSERT_BATCH_SIZE]))
+                .values(is_leaf=False, updated_by=updated_by)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _path(data: CategoryImport) -> str:
+        if data.parent_category_path:
+            return f"{data.parent_category_path}{PATH_SEPARATOR}{data.name}"
+        return data.name
+
+    @staticmethod
+    def _fail(result: CategoryImportRowResult, error: str) -> None:
+        result.status = "failed"
+        result.error = error
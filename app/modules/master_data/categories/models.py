@@ -5,6 +5,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from uuid import UUID
 
 from app.db.base import BaseModel, UUIDType
+from app.shared.write_tracking import track_cache_version
 
 if TYPE_CHECKING:
     from app.modules.master_data.item_master.models import Item
@@ -46,6 +47,8 @@ class Category(BaseModel):
     __table_args__ = (
         Index('idx_category_parent', 'parent_category_id'),
         Index('idx_category_path', 'category_path'),
+        # Subtree scans use LIKE 'path/%', which needs pattern ops under non-C collations
+        Index('idx_category_path_prefix', 'category_path', postgresql_ops={'category_path': 'text_pattern_ops'}),
         Index('idx_category_active_leaf', 'is_active', 'is_leaf'),
         Index('idx_category_level', 'category_level'),
         Index('idx_category_display_order', 'display_order'),
@@ -341,6 +344,10 @@ class Category(BaseModel):
         )
 
 
+# Other workers notice category writes through the version (see tree_cache)
+track_cache_version(Category.__table__, "categories")
+
+
 class CategoryPath:
     """Value object for managing category paths."""
     
@@ -1,12 +1,13 @@
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from sqlalchemy import select, func, or_, and_, desc, asc, text
+from sqlalchemy import select, update, func, or_, and_, desc, asc, text, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 from pydantic import BaseModel
 from math import ceil
 
 from .models import Category, CategoryPath
+from app.shared.statistics import StatisticsQuery
 
 # from app.shared.pagination import Page
 
@@ -32,6 +33,12 @@ class PaginationResult(BaseModel):
         arbitrary_types_allowed = True
 
 
+def _subtree_pattern(path: str) -> str:
+    """LIKE pattern matching every path below ``path`` (wildcards escaped)."""
+    escaped = path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}/%"
+
+
 class CategoryRepository:
     """Repository for category data access operations."""
 
@@ -105,7 +112,9 @@ class CategoryRepository:
             select(Category)
             .where(
                 and_(
-                    Category.category_path.like(f"{parent_category.category_path}/%"),
+                    Category.category_path.like(
+                        _subtree_pattern(parent_category.category_path), escape="\\"
+                    ),
                     Category.is_active == True,
                 )
             )
@@ -121,16 +130,15 @@ class CategoryRepository:
             return []
 
         path_segments = category.get_path_segments()
-        ancestors = []
+        ancestor_paths = ["/".join(path_segments[: i + 1]) for i in range(len(path_segments) - 1)]
 
-        # Build paths for each ancestor
-        for i in range(len(path_segments) - 1):
-            ancestor_path = "/".join(path_segments[: i + 1])
-            ancestor = await self.get_by_path(ancestor_path)
-            if ancestor:
-                ancestors.append(ancestor)
-
-        return ancestors
+        query = (
+            select(Category)
+            .where(Category.category_path.in_(ancestor_paths))
+            .order_by(Category.category_level)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
 
     async def get_siblings(self, category_id: UUID) -> List[Category]:
         """Get sibling categories."""
@@ -166,7 +174,9 @@ class CategoryRepository:
                     and_(
                         or_(
                             Category.id == root_id,
-                            Category.category_path.like(f"{root_category.category_path}/%"),
+                            Category.category_path.like(
+                                _subtree_pattern(root_category.category_path), escape="\\"
+                            ),
                         ),
                         Category.is_active == True,
                     )
@@ -292,9 +302,13 @@ class CategoryRepository:
             category.is_active = update_data["is_active"]
 
         if "category_path" in update_data:
+            old_path = category.category_path
             category.update_path(
                 update_data["category_path"], updated_by=update_data.get("updated_by")
             )
+            await self.rewrite_subtree_paths(
+                old_path, category.category_path, updated_by=update_data.get("updated_by")
+            )
 
         if "is_leaf" in update_data:
             category.is_leaf = update_data["is_leaf"]
@@ -320,6 +334,9 @@ class CategoryRepository:
             if not new_parent:
                 raise ValueError(f"New parent category {new_parent_id} not found")
 
+        old_path = category.category_path
+        old_level = category.category_level
+
         # Calculate new level and path
         if new_parent:
             new_level = new_parent.category_level + 1
@@ -337,7 +354,9 @@ class CategoryRepository:
         )
 
         # Update all descendants
-        await self._update_descendant_paths(category)
+        await self.rewrite_subtree_paths(
+            old_path, new_path, level_delta=new_level - old_level, updated_by=updated_by
+        )
 
         await self.session.commit()
         await self.session.refresh(category)
@@ -510,43 +529,22 @@ class CategoryRepository:
         return count
 
     async def get_statistics(self) -> Dict[str, Any]:
-        """Get category statistics."""
-        # Count all categories
-        total_query = select(func.count()).select_from(Category)
-        total_result = await self.session.execute(total_query)
-        total_categories = total_result.scalar_one()
-
-        # Count active categories
-        active_query = select(func.count()).select_from(Category).where(Category.is_active == True)
-        active_result = await self.session.execute(active_query)
-        active_categories = active_result.scalar_one()
-
-        # Count root categories
-        root_query = (
-            select(func.count())
-            .select_from(Category)
-            .where(and_(Category.category_level == 1, Category.is_active == True))
-        )
-        root_result = await self.session.execute(root_query)
-        root_categories = root_result.scalar_one()
-
-        # Count leaf categories
-        leaf_query = (
-            select(func.count())
-            .select_from(Category)
-            .where(and_(Category.is_leaf == True, Category.is_active == True))
-        )
-        leaf_result = await self.session.execute(leaf_query)
-        leaf_categories = leaf_result.scalar_one()
-
-        # Get max depth
-        max_depth_query = (
-            select(func.max(Category.category_level))
-            .select_from(Category)
-            .where(Category.is_active == True)
+        """Get category statistics (one query, cached until categories change)."""
+        active = Category.is_active == True
+        stats = await (
+            StatisticsQuery(Category, "categories")
+            .count("total_categories")
+            .count("active_categories", active)
+            .count("root_categories", Category.category_level == 1, active)
+            .count("leaf_categories", Category.is_leaf == True, active)
+            .aggregate("max_depth", func.max(Category.category_level), active)
+            .fetch(self.session)
         )
-        max_depth_result = await self.session.execute(max_depth_query)
-        max_depth = max_depth_result.scalar_one() or 0
+        total_categories = stats["total_categories"]
+        active_categories = stats["active_categories"]
+        root_categories = stats["root_categories"]
+        leaf_categories = stats["leaf_categories"]
+        max_depth = stats["max_depth"] or 0
 
         # Count categories with items
         # Items relationship is temporarily disabled
@@ -596,23 +594,39 @@ class CategoryRepository:
 
         return updated_categories
 
-    async def _update_descendant_paths(self, parent_category: Category):
-        """Update paths for all descendants when parent is moved."""
-        descendants = await self.get_descendants(parent_category.id)
-
-        for descendant in descendants:
-            # Calculate new path
-            old_path_segments = descendant.get_path_segments()
-            parent_path_segments = parent_category.get_path_segments()
-
-            # Replace the parent part of the path
-            descendant_relative_segments = old_path_segments[len(parent_path_segments) :]
-            new_path_segments = parent_path_segments + descendant_relative_segments
-            new_path = "/".join(new_path_segments)
-
-            # Update descendant
-            descendant.category_path = new_path
-            descendant.category_level = len(new_path_segments)
+    async def rewrite_subtree_paths(
+        self,
+        old_path: str,
+        new_path: str,
+        level_delta: int = 0,
+        updated_by: Optional[str] = None,
+    ) -> int:
+        """
+        Re-root every descendant of ``old_path`` under ``new_path``.
+
+        Runs a single UPDATE that swaps the path prefix and shifts the level,
+        so moving or renaming a large subtree does not load it. The prefix
+        scan is served by the text_pattern_ops index on category_path. Does
+        not commit.
+
+        Returns:
+            Number of descendants updated
+        """
+        if old_path == new_path and level_delta == 0:
+            return 0
+
+        result = await self.session.execute(
+            update(Category)
+            .where(Category.category_path.like(_subtree_pattern(old_path), escape="\\"))
+            .values(
+                category_path=literal(new_path)
+                + func.substr(Category.category_path, len(old_path) + 1),
+                category_level=Category.category_level + level_delta,
+                updated_by=updated_by,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     def _apply_filters(self, query, filters: Dict[str, Any]):
         """Apply filters to query."""
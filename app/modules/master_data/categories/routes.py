@@ -16,6 +16,7 @@ from app.core.errors import (
     NotFoundError, ConflictError, ValidationError,
     BusinessRuleError
 )
+from app.modules.monitoring.query_budget import query_budget_route
 
 
 router = APIRouter(tags=["categories"])
@@ -90,6 +91,7 @@ async def get_category_by_path(
 
 
 @router.get("/", response_model=CategoryList)
+@query_budget_route(max_repeats=3)
 async def list_categories(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
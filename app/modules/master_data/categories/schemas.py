@@ -259,6 +259,17 @@ class CategoryImport(BaseModel):
         return v
 
 
+class CategoryImportRowResult(BaseModel):
+    """Schema for the outcome of one imported row."""
+    
+    row: int = Field(..., description="1-based row number in the import")
+    name: str = Field(..., description="Category name")
+    category_path: Optional[str] = Field(None, description="Full path of the category")
+    status: str = Field(..., description="created, skipped or failed")
+    category_id: Optional[UUID] = Field(None, description="Created or existing category ID")
+    error: Optional[str] = Field(None, description="Reason the row failed")
+
+
 class CategoryImportResult(BaseModel):
     """Schema for category import results."""
     
@@ -267,6 +278,7 @@ class CategoryImportResult(BaseModel):
     failed_imports: int = Field(..., description="Number of failed imports")
     skipped_imports: int = Field(..., description="Number of skipped imports (duplicates)")
     errors: List[Dict[str, Any]] = Field(..., description="List of import errors")
+    rows: List[CategoryImportRowResult] = Field(default_factory=list, description="Per-row import report")
     
     @validator('errors')
     def validate_errors(cls, v):
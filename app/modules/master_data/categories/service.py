@@ -1,8 +1,10 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from uuid import UUID
 from datetime import datetime
 
 from .repository import CategoryRepository
+from .importer import CategoryImporter
+from .tree_cache import CategoryNode, CategoryTreeSnapshot, category_tree_cache
 from .models import Category, CategoryPath
 from .schemas import (
     CategoryCreate, CategoryUpdate, CategoryMove, CategoryResponse, 
@@ -102,11 +104,12 @@ class CategoryService:
         Raises:
             NotFoundError: If category not found
         """
-        category = await self.repository.get_by_id(category_id)
-        if not category:
+        snapshot = await self._tree()
+        node = snapshot.get(category_id)
+        if not node:
             raise NotFoundError(f"Category with id {category_id} not found")
         
-        return await self._to_response(category)
+        return await self._to_response(node, snapshot)
     
     async def get_category_by_path(self, path: str) -> CategoryResponse:
         """Get category by path.
@@ -120,11 +123,12 @@ class CategoryService:
         Raises:
             NotFoundError: If category not found
         """
-        category = await self.repository.get_by_path(path)
-        if not category:
+        snapshot = await self._tree()
+        node = snapshot.get_by_path(path)
+        if not node:
             raise NotFoundError(f"Category with path '{path}' not found")
         
-        return await self._to_response(category)
+        return await self._to_response(node, snapshot)
     
     async def update_category(
         self,
@@ -180,7 +184,7 @@ class CategoryService:
         if category_data.is_leaf is not None:
             update_data["is_leaf"] = category_data.is_leaf
         
-        # Update path if name changed
+        # Update path if name changed (the repository re-roots descendants too)
         if path_update_needed:
             parent_path = existing_category.get_parent_path()
             if parent_path:
@@ -195,10 +199,6 @@ class CategoryService:
         if not updated_category:
             raise NotFoundError(f"Category with id {category_id} not found")
         
-        # Update descendant paths if name changed
-        if path_update_needed:
-            await self._update_descendant_paths_after_rename(updated_category)
-        
         return await self._to_response(updated_category)
     
     async def move_category(
@@ -296,57 +296,34 @@ class CategoryService:
         Returns:
             List of category trees
         """
-        # Get all categories in tree
-        categories = await self.repository.get_tree(root_id)
-        
-        if not include_inactive:
-            categories = [cat for cat in categories if cat.is_active]
-        
-        # Build tree structure
-        category_dict = {cat.id: cat for cat in categories}
-        tree_nodes = {}
-        
-        # Create tree nodes
-        for category in categories:
-            tree_node = CategoryTree(
-                id=category.id,
-                name=category.name,
-                category_path=category.category_path,
-                category_level=category.category_level,
-                parent_category_id=category.parent_category_id,
-                display_order=category.display_order,
-                is_leaf=category.is_leaf,
-                is_active=category.is_active,
-                child_count=category.child_count,
-                item_count=category.item_count,
-                children=[]
+        snapshot = await self._tree()
+        
+        def visible(node: CategoryNode) -> bool:
+            return include_inactive or node.is_active
+        
+        def build(node: CategoryNode) -> CategoryTree:
+            return CategoryTree(
+                id=node.id,
+                name=node.name,
+                category_path=node.category_path,
+                category_level=node.category_level,
+                parent_category_id=node.parent_category_id,
+                display_order=node.display_order,
+                is_leaf=node.is_leaf,
+                is_active=node.is_active,
+                child_count=node.child_count,
+                item_count=node.item_count,
+                children=[build(child) for child in snapshot.child_nodes(node.id) if visible(child)]
             )
-            tree_nodes[category.id] = tree_node
         
-        # Build parent-child relationships
-        root_nodes = []
-        for category in categories:
-            tree_node = tree_nodes[category.id]
-            
-            if category.parent_category_id and category.parent_category_id in tree_nodes:
-                parent_node = tree_nodes[category.parent_category_id]
-                parent_node.children.append(tree_node)
-            else:
-                root_nodes.append(tree_node)
-        
-        # Sort children by display order and name
-        def sort_children(node):
-            node.children.sort(key=lambda x: (x.display_order, x.name))
-            for child in node.children:
-                sort_children(child)
-        
-        for root in root_nodes:
-            sort_children(root)
-        
-        # Sort root nodes
-        root_nodes.sort(key=lambda x: (x.display_order, x.name))
+        if root_id:
+            root = snapshot.get(root_id)
+            roots = [root] if root and visible(root) else []
+        else:
+            roots = [node for node in snapshot.child_nodes(None) if visible(node)]
         
-        return root_nodes
+        # Children lists in the snapshot are already sorted by display order and name
+        return [build(root) for root in roots]
     
     async def get_category_hierarchy(self, category_id: UUID) -> CategoryHierarchy:
         """Get category hierarchy information.
@@ -364,20 +341,22 @@ class CategoryService:
         if not category:
             raise NotFoundError(f"Category with id {category_id} not found")
         
-        # Get ancestors
-        ancestors = await self.repository.get_ancestors(category_id)
-        ancestor_summaries = [await self._to_summary(cat) for cat in ancestors]
+        snapshot = await self._tree()
+        
+        # Ancestors come from the cached tree (breadcrumb minus the category itself)
+        ancestors = [node for node in snapshot.breadcrumb(category_id)[:-1] if node.is_active]
+        ancestor_summaries = [await self._to_summary(node, snapshot) for node in ancestors]
         
         # Get descendants
         descendants = await self.repository.get_descendants(category_id)
-        descendant_summaries = [await self._to_summary(cat) for cat in descendants]
+        descendant_summaries = [await self._to_summary(cat, snapshot) for cat in descendants]
         
         # Get siblings
         siblings = await self.repository.get_siblings(category_id)
-        sibling_summaries = [await self._to_summary(cat) for cat in siblings]
+        sibling_summaries = [await self._to_summary(cat, snapshot) for cat in siblings]
         
         # Build path to root
-        path_to_root = ancestor_summaries + [await self._to_summary(category)]
+        path_to_root = ancestor_summaries + [await self._to_summary(category, snapshot)]
         
         return CategoryHierarchy(
             category_id=category_id,
@@ -430,10 +409,11 @@ class CategoryService:
             include_inactive=include_inactive
         )
         
-        # Convert to summaries
+        # Convert to summaries (counts come from the cached tree)
+        snapshot = await self._tree()
         category_summaries = []
         for category in page_result.items:
-            summary = await self._to_summary(category)
+            summary = await self._to_summary(category, snapshot)
             category_summaries.append(summary)
         
         # Return list response
@@ -469,7 +449,8 @@ class CategoryService:
             include_inactive=include_inactive
         )
         
-        return [await self._to_summary(cat) for cat in categories]
+        snapshot = await self._tree()
+        return [await self._to_summary(cat, snapshot) for cat in categories]
     
     async def get_root_categories(self) -> List[CategorySummary]:
         """Get all root categories.
@@ -477,8 +458,9 @@ class CategoryService:
         Returns:
             List of root category summaries
         """
-        categories = await self.repository.get_root_categories()
-        return [await self._to_summary(cat) for cat in categories]
+        snapshot = await self._tree()
+        roots = [node for node in snapshot.child_nodes(None) if node.is_active]
+        return [await self._to_summary(node, snapshot) for node in roots]
     
     async def get_leaf_categories(self) -> List[CategorySummary]:
         """Get all leaf categories.
@@ -487,7 +469,8 @@ class CategoryService:
             List of leaf category summaries
         """
         categories = await self.repository.get_leaf_categories()
-        return [await self._to_summary(cat) for cat in categories]
+        snapshot = await self._tree()
+        return [await self._to_summary(cat, snapshot) for cat in categories]
     
     async def get_parent_categories(self) -> List[CategorySummary]:
         """Get all categories that are not marked as leaf (is_leaf = False).
@@ -499,7 +482,8 @@ class CategoryService:
             List of non-leaf category summaries
         """
         categories = await self.repository.get_parent_categories()
-        return [await self._to_summary(cat) for cat in categories]
+        snapshot = await self._tree()
+        return [await self._to_summary(cat, snapshot) for cat in categories]
     
     async def get_category_children(self, parent_id: UUID) -> List[CategorySummary]:
         """Get direct children of a category.
@@ -513,12 +497,12 @@ class CategoryService:
         Raises:
             NotFoundError: If parent category not found
         """
-        parent = await self.repository.get_by_id(parent_id)
-        if not parent:
+        snapshot = await self._tree()
+        if not snapshot.get(parent_id):
             raise NotFoundError(f"Parent category with id {parent_id} not found")
         
-        children = await self.repository.get_children(parent_id)
-        return [await self._to_summary(cat) for cat in children]
+        children = [node for node in snapshot.child_nodes(parent_id) if node.is_active]
+        return [await self._to_summary(node, snapshot) for node in children]
     
     async def get_category_statistics(self) -> CategoryStats:
         """Get category statistics.
@@ -634,7 +618,7 @@ class CategoryService:
         import_data: List[CategoryImport],
         created_by: Optional[str] = None
     ) -> CategoryImportResult:
-        """Import categories data.
+        """Import categories data in bulk (see CategoryImporter).
         
         Args:
             import_data: List of category import data
@@ -643,61 +627,8 @@ class CategoryService:
         Returns:
             Import operation result
         """
-        total_processed = len(import_data)
-        successful_imports = 0
-        failed_imports = 0
-        skipped_imports = 0
-        errors = []
-        
-        for row, category_data in enumerate(import_data, 1):
-            try:
-                # Find parent category if specified
-                parent_id = None
-                if category_data.parent_category_path:
-                    parent_category = await self.repository.get_by_path(
-                        category_data.parent_category_path
-                    )
-                    if parent_category:
-                        parent_id = parent_category.id
-                    else:
-                        errors.append({
-                            "row": row,
-                            "error": f"Parent category '{category_data.parent_category_path}' not found"
-                        })
-                        failed_imports += 1
-                        continue
-                
-                # Check if category already exists
-                if await self.repository.exists_by_name_and_parent(
-                    category_data.name, parent_id
-                ):
-                    skipped_imports += 1
-                    continue
-                
-                # Create category
-                create_request = CategoryCreate(
-                    name=category_data.name,
-                    parent_category_id=parent_id,
-                    display_order=category_data.display_order
-                )
-                
-                await self.create_category(create_request, created_by=created_by)
-                successful_imports += 1
-                
-            except Exception as e:
-                failed_imports += 1
-                errors.append({
-                    "row": row,
-                    "error": str(e)
-                })
-        
-        return CategoryImportResult(
-            total_processed=total_processed,
-            successful_imports=successful_imports,
-            failed_imports=failed_imports,
-            skipped_imports=skipped_imports,
-            errors=errors
-        )
+        importer = CategoryImporter(self.repository.session)
+        return await importer.run(import_data, created_by=created_by)
     
     async def validate_category_operation(
         self,
@@ -790,103 +721,68 @@ class CategoryService:
                 {"is_leaf": should_be_leaf}
             )
     
-    async def _update_descendant_paths_after_rename(self, category: Category):
-        """Update descendant paths after category rename."""
-        descendants = await self.repository.get_descendants(category.id)
-        
-        for descendant in descendants:
-            # Calculate new path
-            old_segments = descendant.get_path_segments()
-            category_segments = category.get_path_segments()
-            
-            # Replace the category part of the path
-            descendant_relative_segments = old_segments[len(category_segments):]
-            new_path_segments = category_segments + descendant_relative_segments
-            new_path = "/".join(new_path_segments)
-            
-            # Update descendant
-            await self.repository.update(
-                descendant.id,
-                {"category_path": new_path}
-            )
+    async def _tree(self) -> CategoryTreeSnapshot:
+        """Cached category tree (one version read when nothing changed)."""
+        return await category_tree_cache.get(self.repository.session)
     
-    async def _to_response(self, category: Category) -> CategoryResponse:
-        """Convert category model to response schema."""
-        # Extract all needed attributes first to avoid lazy loading issues
-        category_id = category.id
-        category_name = category.name
-        parent_category_id = category.parent_category_id
-        category_path = category.category_path
-        category_level = category.category_level
-        display_order = category.display_order
-        is_leaf = category.is_leaf
-        is_active = category.is_active
-        created_at = category.created_at
-        updated_at = category.updated_at
-        created_by = category.created_by
-        updated_by = category.updated_by
-        item_count = category.item_count
-        
-        # Calculate child count properly using repository to avoid async issues
-        child_count = 0
-        if not is_leaf:
-            children = await self.repository.get_children(category_id)
-            child_count = len(children)
+    async def _to_response(
+        self,
+        category: Union[Category, CategoryNode],
+        snapshot: Optional[CategoryTreeSnapshot] = None
+    ) -> CategoryResponse:
+        """Convert a category (model or cached node) to response schema."""
+        snapshot = snapshot or await self._tree()
+        node = snapshot.get(category.id)
+        
+        # Counts and breadcrumb come from the cached tree; a category written in
+        # the current, uncommitted transaction is not in it yet
+        child_count = node.child_count if node else 0
+        item_count = node.item_count if node else 0
+        breadcrumb = [n.name for n in snapshot.breadcrumb(category.id)] if node else category.category_path.split("/")
         
         return CategoryResponse(
-            id=category_id,
-            name=category_name,
-            parent_category_id=parent_category_id,
-            category_path=category_path,
-            category_level=category_level,
-            display_order=display_order,
-            is_leaf=is_leaf,
-            is_active=is_active,
-            created_at=created_at,
-            updated_at=updated_at,
-            created_by=created_by,
-            updated_by=updated_by,
+            id=category.id,
+            name=category.name,
+            parent_category_id=category.parent_category_id,
+            category_path=category.category_path,
+            category_level=category.category_level,
+            display_order=category.display_order,
+            is_leaf=category.is_leaf,
+            is_active=category.is_active,
+            created_at=category.created_at,
+            updated_at=category.updated_at,
+            created_by=category.created_by,
+            updated_by=category.updated_by,
             child_count=child_count,
             item_count=item_count,
-            can_have_items=category.can_have_items(),
-            can_have_children=category.can_have_children(),
-            can_delete=category.can_delete(),
-            is_root=category.is_root(),
-            has_children=category.has_children,
-            has_items=category.has_items,
-            breadcrumb=category.get_breadcrumb(),
-            full_name=category.full_name
+            can_have_items=category.is_leaf,
+            can_have_children=True,
+            can_delete=category.is_active and child_count == 0 and item_count == 0,
+            is_root=category.category_level == 1 and category.parent_category_id is None,
+            has_children=not category.is_leaf,
+            has_items=item_count > 0,
+            breadcrumb=breadcrumb,
+            full_name=category.category_path
         )
     
-    async def _to_summary(self, category: Category) -> CategorySummary:
-        """Convert category model to summary schema."""
-        # Avoid accessing category.id multiple times to prevent lazy loading issues
-        # Extract all needed attributes first
-        category_id = category.id
-        category_name = category.name
-        category_path = category.category_path
-        category_level = category.category_level
-        parent_category_id = category.parent_category_id
-        display_order = category.display_order
-        is_leaf = category.is_leaf
-        is_active = category.is_active
-        item_count = category.item_count
-        
-        # Calculate child count properly using repository to avoid async issues
-        child_count = 0
-        if not is_leaf:
-            children = await self.repository.get_children(category_id)
-            child_count = len(children)
+    async def _to_summary(
+        self,
+        category: Union[Category, CategoryNode],
+        snapshot: Optional[CategoryTreeSnapshot] = None
+    ) -> CategorySummary:
+        """Convert a category (model or cached node) to summary schema."""
+        snapshot = snapshot or await self._tree()
+        node = snapshot.get(category.id)
         
         return CategorySummary(
-            id=category_id,
-            name=category_name,
-            category_path=category_path,
-            category_level=category_level,
-            parent_category_id=parent_category_id,
-            display_order=display_order,
-            is_leaf=is_leaf,
-            is_active=is_active,
-            child_count=child_count,
-            item_count=item_count
+            id=category.id,
+            name=category.name,
+            category_path=category.category_path,
+            category_level=category.category_level,
+            parent_category_id=category.parent_category_id,
+            display_order=category.display_order,
+            is_leaf=category.is_leaf,
+            is_active=category.is_active,
+            child_count=node.child_count if node else 0,
+            item_count=node.item_count if node else 0
         )
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Cached category tree.
+
+The whole category table (a few thousand rows at most) is loaded with one
+query that also carries each category's item count, and kept in process
+memory together with child lists and per-category child counts. The
+snapshot is stamped with the ``categories`` version from ``cache_versions``
+(bumped by a trigger on every category write, in any worker) and rebuilt
+only when that version moves, when this process commits a category write,
+or when the item counts are older than ``ttl`` seconds.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.master_data.item_master.models import Item
+from app.shared.write_tracking import on_tables_committed, read_cache_version
+
+from .models import Category
+
+CACHE_NAME = "categories"
+
+
+@dataclass
+class CategoryNode:
+    """Immutable-by-convention copy of a category row plus derived counts."""
+    id: UUID
+    name: str
+    parent_category_id: Optional[UUID]
+    category_path: str
+    category_level: int
+    display_order: int
+    is_leaf: bool
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+    created_by: Optional[str]
+    updated_by: Optional[str]
+    item_count: int = 0
+    child_count: int = 0
+
+
+@dataclass
+class CategoryTreeSnapshot:
+    """All categories at one version, indexed for tree, detail and breadcrumb lookups."""
+    version: int
+    built_at: float
+    nodes: Dict[UUID, CategoryNode] = field(default_factory=dict)
+    children: Dict[Optional[UUID], List[UUID]] = field(default_factory=dict)
+    by_path: Dict[str, UUID] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: int, nodes: List[CategoryNode]) -> "CategoryTreeSnapshot":
+        snapshot = cls(version=version, built_at=time.monotonic())
+        children: Dict[Optional[UUID], List[CategoryNode]] = defaultdict(list)
+        for node in nodes:
+            snapshot.nodes[node.id] = node
+            snapshot.by_path[node.category_path] = node.id
+            children[node.parent_category_id].append(node)
+
+        for parent_id, siblings in children.items():
+            siblings.sort(key=lambda n: (n.display_order, n.name))
+            snapshot.children[parent_id] = [n.id for n in siblings]
+            parent = snapshot.nodes.get(parent_id) if parent_id else None
+            if parent is not None:
+                # Matches repository.get_children: active children only
+                parent.child_count = sum(1 for n in siblings if n.is_active)
+        return snapshot
+
+    def get(self, category_id: UUID) -> Optional[CategoryNode]:
+        return self.nodes.get(category_id)
+
+    def get_by_path(self, path: str) -> Optional[CategoryNode]:
+        category_id = self.by_path.get(path)
+        return self.nodes[category_id] if category_id else None
+
+    def child_nodes(self, parent_id: Optional[UUID]) -> List[CategoryNode]:
+        return [self.nodes[child_id] for child_id in self.children.get(parent_id, [])]
+
+    def breadcrumb(self, category_id: UUID) -> List[CategoryNode]:
+        """Ancestors from the root down to and including ``category_id``."""
+        trail: List[CategoryNode] = []
+        seen: Set[UUID] = set()
+        node = self.nodes.get(category_id)
+        while node is not None and node.id not in seen:
+            seen.add(node.id)
+            trail.append(node)
+            node = self.nodes.get(node.parent_category_id) if node.parent_category_id else None
+        trail.reverse()
+        return trail
+
+
+class CategoryTreeCache:
+    """Process-wide category tree snapshot, rebuilt when the category version changes."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._snapshot: Optional[CategoryTreeSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    async def get(self, session: AsyncSession) -> CategoryTreeSnapshot:
+        """Current snapshot; costs one primary-key read when nothing changed."""
+        version = await read_cache_version(session, CACHE_NAME)
+        snapshot = self._snapshot
+        if self._is_current(snapshot, version):
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if not self._is_current(snapshot, version):
+                snapshot = await self._load(session, version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _is_current(self, snapshot: Optional[CategoryTreeSnapshot], version: int) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - snapshot.built_at < self.ttl
+        )
+
+    @staticmethod
+    async def _load(session: AsyncSession, version: int) -> CategoryTreeSnapshot:
+        """All categories with their active item counts, in one grouped query."""
+        item_counts = (
+            select(Item.category_id, func.count(Item.id).label("item_count"))
+            .where(Item.is_active == True)
+            .group_by(Item.category_id)
+            .subquery()
+        )
+        query = select(
+            Category.id,
+            Category.name,
+            Category.parent_category_id,
+            Category.category_path,
+            Category.category_level,
+            Category.display_order,
+            Category.is_leaf,
+            Category.is_active,
+            Category.created_at,
+            Category.updated_at,
+            Category.created_by,
+            Category.updated_by,
+            func.coalesce(item_counts.c.item_count, 0).label("item_count"),
+        ).outerjoin(item_counts, item_counts.c.category_id == Category.id)
+
+        result = await session.execute(query)
+        return CategoryTreeSnapshot.build(
+            version, [CategoryNode(**row) for row in result.mappings()]
+        )
+
+
+category_tree_cache = CategoryTreeCache()
+
+
+@on_tables_committed
+def _invalidate_category_tree(tables: Set[str]) -> None:
+    if "categories" in tables:
+        category_tree_cache.invalidate()
@@ -1,10 +1,12 @@
 from enum import Enum
 from typing import Optional, TYPE_CHECKING
 from decimal import Decimal
-from sqlalchemy import Column, String, Numeric, Boolean, Text, ForeignKey, Index, Integer
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy import Column, String, Numeric, Boolean, Text, ForeignKey, Index, Integer, DDL, event
+from sqlalchemy.orm import relationship, validates, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from app.db.base import BaseModel, UUIDType
+from app.shared.write_tracking import track_cache_version
 
 if TYPE_CHECKING:
     from app.modules.master_data.brands.models import Brand
@@ -79,6 +81,10 @@ class Item(BaseModel):
     is_rentable = Column(Boolean, nullable=False, default=True, comment="Item can be rented")
     is_saleable = Column(Boolean, nullable=False, default=False, comment="Item can be sold")
     
+    # Search document, maintained by database triggers from the item, brand and category
+    search_text = deferred(Column(Text, nullable=True, comment="Lower-cased search text for trigram matching"))
+    search_vector = deferred(Column(TSVECTOR, nullable=True, comment="Weighted full-text search vector"))
+    
     # Relationships - re-enabled with proper foreign keys
     brand = relationship("Brand", back_populates="items", lazy="select")
     category = relationship("Category", back_populates="items", lazy="select")
@@ -95,6 +101,10 @@ class Item(BaseModel):
         Index('idx_item_status', 'item_status'),
         Index('idx_item_brand', 'brand_id'),
         Index('idx_item_category', 'category_id'),
+        Index('idx_item_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_item_search_text_trgm', 'search_text', postgresql_using='gin',
+              postgresql_ops={'search_text': 'gin_trgm_ops'}),
+        Index('idx_item_updated_at', 'updated_at'),
     )
     
     def __init__(
@@ -251,4 +261,96 @@ class Item(BaseModel):
             f"Item(id={self.id}, sku='{self.sku}', "
             f"name='{self.item_name}', status='{self.item_status}', "
             f"rentable={self.is_rentable}, saleable={self.is_saleable}, active={self.is_active})"
-        )
\ No newline at end of file
+        )
+
+
+# The search document (search_text/search_vector) is maintained by triggers.
+# The add_item_search_vector migration creates them from the statements
+# below, and they are attached to the table here so that databases built
+# with metadata.create_all get them too. pg_trgm must exist before the
+# trigram index.
+event.listen(
+    Item.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Built from the item plus its brand and category names. Weights:
+# A = SKU/name, B = model/brand/category, C = description, D = specifications
+ITEM_SEARCH_DOCUMENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION items_search_document_trigger() RETURNS trigger AS $$
+DECLARE
+    brand_name TEXT;
+    category_name TEXT;
+BEGIN
+    SELECT b.name INTO brand_name FROM brands b WHERE b.id = NEW.brand_id;
+    SELECT c.name INTO category_name FROM categories c WHERE c.id = NEW.category_id;
+
+    NEW.search_text := lower(concat_ws(' ',
+        NEW.sku, NEW.item_name, NEW.model_number, brand_name, category_name,
+        NEW.description, NEW.specifications));
+
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.sku, NEW.item_name)), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.model_number, brand_name, category_name)), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(NEW.specifications, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+ITEM_SEARCH_DOCUMENT_TRIGGER = """
+CREATE TRIGGER items_search_document
+BEFORE INSERT OR UPDATE OF sku, item_name, model_number, description, specifications,
+                           brand_id, category_id
+ON items
+FOR EACH ROW EXECUTE FUNCTION items_search_document_trigger()
+"""
+
+BRAND_REFRESH_ITEM_SEARCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION brands_refresh_item_search_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE items SET brand_id = brand_id WHERE brand_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+BRAND_REFRESH_ITEM_SEARCH_TRIGGER = """
+CREATE TRIGGER brands_refresh_item_search
+AFTER UPDATE OF name ON brands
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION brands_refresh_item_search_trigger()
+"""
+
+CATEGORY_REFRESH_ITEM_SEARCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION categories_refresh_item_search_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE items SET category_id = category_id WHERE category_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CATEGORY_REFRESH_ITEM_SEARCH_TRIGGER = """
+CREATE TRIGGER categories_refresh_item_search
+AFTER UPDATE OF name ON categories
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION categories_refresh_item_search_trigger()
+"""
+
+# Brands and categories are created before items (foreign keys), so their
+# refresh triggers are attached here too.
+for _statement in (
+    ITEM_SEARCH_DOCUMENT_FUNCTION,
+    ITEM_SEARCH_DOCUMENT_TRIGGER,
+    BRAND_REFRESH_ITEM_SEARCH_FUNCTION,
+    BRAND_REFRESH_ITEM_SEARCH_TRIGGER,
+    CATEGORY_REFRESH_ITEM_SEARCH_FUNCTION,
+    CATEGORY_REFRESH_ITEM_SEARCH_TRIGGER,
+):
+    event.listen(Item.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+# Autocomplete indexes in every worker rebuild when this version moves
+track_cache_version(Item.__table__, "items")
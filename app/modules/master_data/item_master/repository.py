@@ -1,12 +1,14 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from decimal import Decimal
-from sqlalchemy import and_, or_, func, select, asc, case, Integer
+from sqlalchemy import and_, func, select, asc, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.modules.master_data.item_master.models import Item, ItemStatus
+from app.modules.master_data.item_master.search import search_condition, search_rank
 from app.modules.master_data.item_master.schemas import ItemCreate, ItemUpdate
+from app.shared.counting import CountResult, row_counter
 
 
 class ItemMasterRepository:
@@ -249,18 +251,9 @@ class ItemMasterRepository:
         if max_sale_price:
             conditions.append(Item.sale_price <= max_sale_price)
         
-        # Search functionality enhanced
+        # Search over the denormalised search document (covers brand and category names)
         if search_term:
-            search_condition = or_(
-                Item.item_name.ilike(f"%{search_term}%"),
-                Item.sku.ilike(f"%{search_term}%"),
-                Item.description.ilike(f"%{search_term}%"),
-                Item.model_number.ilike(f"%{search_term}%"),
-                Item.specifications.ilike(f"%{search_term}%"),
-                Brand.name.ilike(f"%{search_term}%"),
-                Category.name.ilike(f"%{search_term}%")
-            )
-            conditions.append(search_condition)
+            conditions.append(search_condition(search_term))
         
         # Date range filters
         if created_after:
@@ -290,7 +283,11 @@ class ItemMasterRepository:
             else:
                 query = query.having(func.count(InventoryUnit.id) == 0)
         
-        query = query.order_by(asc(Item.item_name)).offset(skip).limit(limit)
+        if search_term:
+            query = query.order_by(search_rank(search_term).desc(), asc(Item.item_name))
+        else:
+            query = query.order_by(asc(Item.item_name))
+        query = query.offset(skip).limit(limit)
         
         result = await self.session.execute(query)
         rows = result.all()
@@ -351,9 +348,9 @@ class ItemMasterRepository:
         is_rentable: Optional[bool] = None,
         is_saleable: Optional[bool] = None,
         active_only: bool = True
-    ) -> int:
-        """Count all items with optional search and filtering."""
-        query = select(func.count(Item.id))
+    ) -> CountResult:
+        """Count all items with optional search and filtering (exact, estimated or cached)."""
+        query = select(Item.id)
         
         # Apply filters
         conditions = []
@@ -370,20 +367,14 @@ class ItemMasterRepository:
         if is_saleable is not None:
             conditions.append(Item.is_saleable == is_saleable)
         
-        # Apply search
+        # Apply search (same predicate and indexes as the list queries)
         if search:
-            search_condition = or_(
-                Item.item_name.ilike(f"%{search}%"),
-                Item.sku.ilike(f"%{search}%"),
-                Item.description.ilike(f"%{search}%")
-            )
-            conditions.append(search_condition)
+            conditions.append(search_condition(search))
         
         if conditions:
             query = query.where(and_(*conditions))
         
-        result = await self.session.execute(query)
-        return result.scalar()
+        return await row_counter.count(self.session, query)
     
     async def search(
         self, 
@@ -392,19 +383,17 @@ class ItemMasterRepository:
         limit: int = 100,
         active_only: bool = True
     ) -> List[Item]:
-        """Search items by name or code."""
-        query = select(Item).where(
-            or_(
-                Item.item_name.ilike(f"%{search_term}%"),
-                Item.sku.ilike(f"%{search_term}%"),
-                Item.description.ilike(f"%{search_term}%")
-            )
-        )
+        """Search items by name, SKU, model, brand, category or description, best match first."""
+        query = select(Item).where(search_condition(search_term))
         
         if active_only:
             query = query.where(Item.is_active == True)
         
-        query = query.order_by(asc(Item.item_name)).offset(skip).limit(limit)
+        query = (
+            query.order_by(search_rank(search_term).desc(), asc(Item.item_name))
+            .offset(skip)
+            .limit(limit)
+        )
         
         result = await self.session.execute(query)
         return result.scalars().all()
@@ -529,10 +518,6 @@ class ItemMasterRepository:
         updated_before: Optional[str] = None
     ) -> List[Item]:
         """Get all items with eagerly loaded relationships for nested response."""
-        from app.modules.master_data.brands.models import Brand
-        from app.modules.master_data.categories.models import Category
-        from app.modules.master_data.units.models import UnitOfMeasurement
-        
         # Build query with eager loading
         query = (
             select(Item)
@@ -566,22 +551,9 @@ class ItemMasterRepository:
         if max_sale_price:
             conditions.append(Item.sale_price <= max_sale_price)
         
-        # Search functionality
+        # Search over the denormalised search document (no brand/category join needed)
         if search_term:
-            # Need to join for search in related tables
-            query = query.outerjoin(Brand, Item.brand_id == Brand.id)
-            query = query.outerjoin(Category, Item.category_id == Category.id)
-            
-            search_condition = or_(
-                Item.item_name.ilike(f"%{search_term}%"),
-                Item.sku.ilike(f"%{search_term}%"),
-                Item.description.ilike(f"%{search_term}%"),
-                Item.model_number.ilike(f"%{search_term}%"),
-                Item.specifications.ilike(f"%{search_term}%"),
-                Brand.name.ilike(f"%{search_term}%"),
-                Category.name.ilike(f"%{search_term}%")
-            )
-            conditions.append(search_condition)
+            conditions.append(search_condition(search_term))
         
         # Date range filters
         if created_after:
@@ -604,7 +576,11 @@ class ItemMasterRepository:
         if conditions:
             query = query.where(and_(*conditions))
         
-        query = query.order_by(asc(Item.item_name)).offset(skip).limit(limit)
+        if search_term:
+            query = query.order_by(search_rank(search_term).desc(), asc(Item.item_name))
+        else:
+            query = query.order_by(asc(Item.item_name))
+        query = query.offset(skip).limit(limit)
         
         result = await self.session.execute(query)
         return result.scalars().unique().all()
@@ -617,18 +593,16 @@ class ItemMasterRepository:
     ) -> List[Item]:
         """
         Get items with stock levels at or below their reorder point.
-        Uses efficient JOIN with StockLevel table.
+        Reads the trigger-maintained below_reorder flag through its partial index.
         """
         from app.modules.inventory.models import StockLevel
         
-        # Build query with JOIN between items and stock_levels
         query = select(Item).join(
             StockLevel, Item.id == StockLevel.item_id
         ).where(
             and_(
-                Item.is_active == True,
-                Item.reorder_point > 0,  # Only include items with configured reorder points
-                func.cast(StockLevel.quantity_available, Integer) <= Item.reorder_point
+                StockLevel.below_reorder,
+                Item.is_active == True
             )
         )
         
@@ -639,7 +613,7 @@ class ItemMasterRepository:
         # Add pagination
         query = query.order_by(
             # Order by urgency: out of stock first, then by how far below reorder point
-            asc(func.cast(StockLevel.quantity_available, Integer)),
+            asc(StockLevel.quantity_available),
             asc(Item.item_name)
         ).offset(skip).limit(limit)
         
@@ -648,49 +622,41 @@ class ItemMasterRepository:
     
     async def get_stock_alerts_summary(self) -> Dict[str, Any]:
         """
-        Get summary statistics for stock alerts.
-        """
-        from app.modules.inventory.models import StockLevel
+        Get summary statistics for stock alerts in a single query.
         
-        # Count items that are out of stock
-        out_of_stock_query = select(func.count(Item.id.distinct())).select_from(
-            Item.__table__.join(StockLevel.__table__, Item.id == StockLevel.item_id)
-        ).where(
-            and_(
-                Item.is_active == True,
-                func.cast(StockLevel.quantity_available, Integer) == 0
-            )
-        )
+        Alert counts come from the stock levels that are not IN_STOCK (partial
+        index); item totals are scalar subqueries in the same statement.
+        """
+        from app.modules.inventory.models import StockLevel, StockState
         
-        # Count items that are low stock (at or below reorder point, but not zero)
-        low_stock_query = select(func.count(Item.id.distinct())).select_from(
-            Item.__table__.join(StockLevel.__table__, Item.id == StockLevel.item_id)
+        total_items = select(func.count(Item.id)).where(Item.is_active == True).scalar_subquery()
+        avg_reorder_point = select(func.avg(Item.reorder_point)).where(
+            and_(Item.is_active == True, Item.reorder_point > 0)
+        ).scalar_subquery()
+        
+        query = select(
+            func.count(StockLevel.item_id.distinct()).filter(
+                StockLevel.stock_state == StockState.OUT_OF_STOCK.value
+            ).label("out_of_stock"),
+            func.count(StockLevel.item_id.distinct()).filter(
+                StockLevel.stock_state == StockState.LOW_STOCK.value
+            ).label("low_stock"),
+            total_items.label("total_items"),
+            avg_reorder_point.label("avg_reorder_point"),
+        ).select_from(StockLevel).join(
+            Item, Item.id == StockLevel.item_id
         ).where(
             and_(
-                Item.is_active == True,
-                Item.reorder_point > 0,
-                func.cast(StockLevel.quantity_available, Integer) > 0,
-                func.cast(StockLevel.quantity_available, Integer) <= Item.reorder_point
+                StockLevel.stock_state != StockState.IN_STOCK.value,
+                Item.is_active == True
             )
         )
         
-        # Count total active items
-        total_items_query = select(func.count(Item.id)).where(Item.is_active == True)
-        
-        # Average reorder point
-        avg_reorder_point_query = select(func.avg(Item.reorder_point)).where(
-            and_(Item.is_active == True, Item.reorder_point > 0)
-        )
-        
-        # Execute all queries
-        out_of_stock_result = await self.session.execute(out_of_stock_query)
-        low_stock_result = await self.session.execute(low_stock_query)
-        total_items_result = await self.session.execute(total_items_query)
-        avg_reorder_result = await self.session.execute(avg_reorder_point_query)
+        row = (await self.session.execute(query)).one()
         
         return {
-            "out_of_stock": out_of_stock_result.scalar() or 0,
-            "low_stock": low_stock_result.scalar() or 0,
-            "total_items": total_items_result.scalar() or 0,
-            "avg_reorder_point": float(avg_reorder_result.scalar() or 0)
+            "out_of_stock": row.out_of_stock or 0,
+            "low_stock": row.low_stock or 0,
+            "total_items": row.total_items or 0,
+            "avg_reorder_point": float(row.avg_reorder_point or 0)
         }
\ No newline at end of file
@@ -402,8 +402,13 @@ async def count_items(
     active_only: bool = Query(True, description="Count only active items"),
     service: ItemMasterService = Depends(get_item_master_service)
 ):
-    """Count items with optional search and filtering."""
-    count = await service.count_items(
+    """
+    Count items with optional search and filtering.
+
+    ``strategy`` tells whether the count is exact, a planner estimate
+    (large results) or cached from an earlier identical request.
+    """
+    result = await service.count_items(
         search=search,
         item_status=item_status,
         brand_id=brand_id,
@@ -412,5 +417,5 @@ async def count_items(
         is_saleable=is_saleable,
         active_only=active_only
     )
-    return {"count": count}
+    return {"count": result.count, "strategy": result.strategy}
 
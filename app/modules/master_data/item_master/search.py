@@ -0,0 +1,90 @@
+"""
+Item search backed by the denormalised ``items.search_vector`` / ``items.search_text`` columns.
+
+Both columns are maintained by database triggers (see the
+``add_item_search_vector`` migration) from the item's own fields plus its
+brand and category names, so searching never has to join brands or
+categories. ``search_vector`` is a weighted tsvector for ranked word/prefix
+matches; ``search_text`` is the same text lower-cased for pg_trgm substring
+matches (partial SKUs, model numbers, typos). Each predicate has its own GIN
+index and Postgres combines them with a BitmapOr.
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, literal, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.modules.master_data.item_master.models import Item
+
+# Text search configuration: 'simple' keeps product codes and brand names unstemmed
+SEARCH_CONFIG = "simple"
+
+# Below this length trigram matching cannot use the index (fewer than one trigram)
+MIN_TRIGRAM_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"[\w]+", re.UNICODE)
+
+
+def search_tokens(term: str) -> List[str]:
+    """Split a raw search box value into lower-cased word tokens."""
+    return [token.lower() for token in _TOKEN_RE.findall(term or "")]
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """
+    Build a to_tsquery expression matching every token as a prefix.
+
+    ``"dewalt dri"`` becomes ``"dewalt:* & dri:*"`` so results narrow as the
+    user types. Returns None when the term has no searchable tokens.
+    """
+    tokens = search_tokens(term)
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_condition(term: str) -> ColumnElement:
+    """
+    WHERE clause for an item search.
+
+    Matches the prefix tsquery against ``search_vector`` or, for terms long
+    enough to form a trigram, a substring match on ``search_text``.
+    """
+    normalized = (term or "").strip().lower()
+    conditions = []
+
+    query = prefix_tsquery(normalized)
+    if query:
+        conditions.append(
+            Item.search_vector.op("@@")(func.to_tsquery(SEARCH_CONFIG, query))
+        )
+    if len(normalized) >= MIN_TRIGRAM_LENGTH or not conditions:
+        conditions.append(
+            Item.search_text.like(f"%{_escape_like(normalized)}%", escape="\\")
+        )
+
+    return or_(*conditions) if len(conditions) > 1 else conditions[0]
+
+
+def search_rank(term: str) -> ColumnElement:
+    """
+    Relevance score for ordering search results (higher is better).
+
+    Combines the weighted full-text rank with trigram word similarity so that
+    exact SKU/name hits sort above description matches and near misses.
+    """
+    normalized = (term or "").strip().lower()
+    query = prefix_tsquery(normalized)
+
+    trigram_score = func.word_similarity(literal(normalized), Item.search_text)
+    if not query:
+        return trigram_score
+    return func.ts_rank_cd(
+        Item.search_vector, func.to_tsquery(SEARCH_CONFIG, query)
+    ) + trigram_score
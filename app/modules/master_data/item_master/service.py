@@ -26,6 +26,7 @@ from app.modules.master_data.item_master.schemas import (
     UnitOfMeasurementNested,
 )
 from app.shared.utils.sku_generator import SKUGenerator
+from app.shared.counting import CountResult
 
 
 class ItemMasterService:
@@ -236,7 +237,7 @@ class ItemMasterService:
         is_rentable: Optional[bool] = None,
         is_saleable: Optional[bool] = None,
         active_only: bool = True,
-    ) -> int:
+    ) -> CountResult:
         """Count all items with optional search and filtering."""
         return await self.item_repository.count_all(
             search=search,
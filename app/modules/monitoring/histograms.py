@@ -0,0 +1,229 @@
+"""
+Fixed-memory latency histograms and Prometheus text exposition.
+
+``HdrHistogram`` records durations into log-linear buckets in the style of
+HdrHistogram: exact below 64 microseconds, then 32 linear sub-buckets per
+power of two, so any recorded value is off by at most ~3%. Memory is a
+fixed array per histogram regardless of how many values are recorded, and
+percentiles are one pass over the buckets. Histograms with the same layout
+merge by adding counts, which is how per-worker metrics are aggregated.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Values are recorded in microseconds and clamped to this maximum (1 hour)
+MAX_TRACKABLE_US = 3_600_000_000
+
+# Bucket upper bounds (seconds) reported to Prometheus
+PROMETHEUS_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+def bucket_index(value_us: int) -> int:
+    """Bucket holding a value in microseconds."""
+    if value_us < 2 * SUB_BUCKETS:
+        return value_us
+    exponent = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return (exponent + 1) * SUB_BUCKETS + (value_us >> exponent) - SUB_BUCKETS
+
+
+def bucket_upper_us(index: int) -> int:
+    """Largest value in microseconds that falls into bucket ``index``."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS - 1
+    sub_bucket = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((sub_bucket + 1) << exponent) - 1
+
+
+BUCKET_COUNT = bucket_index(MAX_TRACKABLE_US) + 1
+
+
+class HdrHistogram:
+    """Duration histogram (seconds in, seconds out) with fixed memory."""
+
+    __slots__ = ("counts", "count", "sum", "sum_squares", "min", "max")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        value_us = min(int(seconds * 1_000_000), MAX_TRACKABLE_US)
+        self.counts[bucket_index(value_us)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.sum_squares += seconds * seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Value (seconds) at ``percent`` (0-100), within the bucket resolution."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_upper_us(index) / 1_000_000, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.sum_squares - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def cumulative(self, bounds: Iterable[float] = PROMETHEUS_BUCKETS) -> List[Tuple[float, int]]:
+        """``(upper bound, values <= bound)`` pairs, ending with +Inf."""
+        pairs = []
+        index, seen = 0, 0
+        for bound in bounds:
+            limit_us = bound * 1_000_000
+            while index < BUCKET_COUNT and bucket_upper_us(index) <= limit_us:
+                seen += self.counts[index]
+                index += 1
+            pairs.append((bound, seen))
+        pairs.append((math.inf, self.count))
+        return pairs
+
+    def merge(self, other: "HdrHistogram") -> "HdrHistogram":
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "average": self.mean,
+            "median": self.percentile(50),
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "std_deviation": self.stddev,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact serialisable form (non-empty buckets only)."""
+        return {
+            "buckets": {str(index): count for index, count in enumerate(self.counts) if count},
+            "count": self.count,
+            "sum": self.sum,
+            "sum_squares": self.sum_squares,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HdrHistogram":
+        histogram = cls()
+        for index, count in data["buckets"].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.sum_squares = data["sum_squares"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_histogram(
+    name: str,
+    help_text: str,
+    series: Iterable[Tuple[Dict[str, str], HdrHistogram]],
+    bounds: Iterable[float] = PROMETHEUS_BUCKETS,
+) -> List[str]:
+    """Exposition lines for a histogram family; ``series`` pairs labels with a histogram."""
+    bounds = tuple(bounds)
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        label_text = _labels(labels)
+        prefix = f"{label_text}," if label_text else ""
+        for bound, count in histogram.cumulative(bounds):
+            lines.append(f'{name}_bucket{{{prefix}le="{_number(bound)}"}} {count}')
+        suffix = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{name}_sum{suffix} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def prometheus_simple(
+    name: str,
+    help_text: str,
+    metric_type: str,
+    series: Iterable[Tuple[Dict[str, str], float]],
+) -> List[str]:
+    """Exposition lines for a counter or gauge family."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in series:
+        label_text = _labels(labels)
+        suffix = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{name}{suffix} {_number(value)}")
+    return lines
+
+
+def merge_histogram_maps(
+    maps: Iterable[Dict[str, Dict[str, Any]]]
+) -> Dict[str, HdrHistogram]:
+    """Merge ``{key: HdrHistogram.to_dict()}`` maps from several workers."""
+    merged: Dict[str, HdrHistogram] = {}
+    for histograms in maps:
+        for key, data in histograms.items():
+            histogram = HdrHistogram.from_dict(data)
+            if key in merged:
+                merged[key].merge(histogram)
+            else:
+                merged[key] = histogram
+    return merged
+
+
+def merge_counter_maps(maps: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum ``{key: number or list of numbers}`` maps from several workers."""
+    merged: Dict[str, Any] = {}
+    for counters in maps:
+        for key, value in counters.items():
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+    return merged
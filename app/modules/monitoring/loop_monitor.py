@@ -0,0 +1,171 @@
+"""
+Event loop lag monitor and blocking-call detector.
+
+A heartbeat task sleeps ``interval`` seconds at a time and records how late
+it wakes up - the scheduling lag every other coroutine sees at that
+moment - into a histogram.
+
+A watchdog thread checks the heartbeat. When it has not run for
+``threshold`` seconds beyond its sleep, something is blocking the loop;
+the watchdog captures the loop thread's stack and the running task while
+the block is still in progress, and the report is completed with the
+total blocked time once the heartbeat runs again. This is what asyncio's
+debug mode slow-callback warning tells you, without debug mode's cost,
+and with the stack of the offending code instead of just the callback.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.modules.monitoring.histograms import HdrHistogram
+
+logger = logging.getLogger(__name__)
+
+
+def _format_stack(frame, limit: int) -> List[str]:
+    """``file:line in function`` entries, outermost first, without reading source files."""
+    summary = traceback.StackSummary.extract(traceback.walk_stack(frame), limit=limit, lookup_lines=False)
+    return [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in reversed(summary)]
+
+
+def _describe_task(task: Optional[asyncio.Task]) -> Optional[str]:
+    if task is None:
+        return None
+    coroutine = task.get_coro()
+    return f"{task.get_name()} ({getattr(coroutine, '__qualname__', coroutine)})"
+
+
+class EventLoopMonitor:
+    """Measure event loop lag and report callbacks that block it."""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, stack_limit: int = 40, max_reports: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self.lag = HdrHistogram()
+        self.blocking_events = 0
+        self.blocked_seconds = 0.0
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._beat = 0
+        self._beat_at = time.monotonic()
+        self._open_report: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat_at = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (blocking threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 5)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - expected, 0.0)
+            self.lag.record(lag)
+
+            report = self._open_report
+            if report is not None and report["beat"] == self._beat:
+                report["blocked_ms"] = round(lag * 1000, 1)
+                self.blocked_seconds += max(lag - self.threshold, 0.0)
+                self._open_report = None
+            self._beat += 1
+            self._beat_at = time.monotonic()
+
+    def _watch(self) -> None:
+        check_every = min(self.threshold, self.interval) / 2
+        while not self._stop.wait(check_every):
+            beat, beat_at = self._beat, self._beat_at
+            stalled = time.monotonic() - beat_at - self.interval
+            if stalled < self.threshold or (self._open_report or {}).get("beat") == beat:
+                continue
+            self._report_blocking(beat, stalled)
+
+    def _report_blocking(self, beat: int, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        report = {
+            "beat": beat,
+            "detected_at": datetime.now().isoformat(),
+            "blocked_ms": round(stalled * 1000, 1),  # Updated when the loop resumes
+            "task": _describe_task(task),
+            "stack": _format_stack(frame, self.stack_limit) if frame is not None else [],
+        }
+        self._open_report = report
+        self.reports.append(report)
+        self.blocking_events += 1
+        location = report["stack"][-1] if report["stack"] else "unknown"
+        logger.warning(
+            f"Event loop blocked for over {stalled * 1000:.0f} ms in {report['task'] or 'a callback'} at {location}"
+        )
+
+    def status(self, include_reports: bool = True) -> Dict[str, Any]:
+        """Lag percentiles (ms) and blocking reports."""
+        status = {
+            "running": self.running,
+            "lag_ms": {
+                "p50": round(self.lag.percentile(50) * 1000, 2),
+                "p95": round(self.lag.percentile(95) * 1000, 2),
+                "p99": round(self.lag.percentile(99) * 1000, 2),
+                "max": round(self.lag.max * 1000, 2),
+            },
+            "samples": self.lag.count,
+            "blocking_threshold_ms": self.threshold * 1000,
+            "blocking_events": self.blocking_events,
+        }
+        if include_reports:
+            status["recent_blocking"] = [
+                {key: value for key, value in report.items() if key != "beat"}
+                for report in list(self.reports)
+            ]
+        return status
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialisable state for the multi-worker metrics store."""
+        return {
+            "lag": self.lag.to_dict(),
+            "blocking_events": self.blocking_events,
+            "blocked_seconds": self.blocked_seconds,
+        }
+
+
+loop_monitor = EventLoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    threshold=settings.LOOP_BLOCKING_THRESHOLD,
+)
@@ -0,0 +1,98 @@
+"""
+File-backed metrics registry for multi-worker deployments.
+
+Each worker process keeps its metrics in memory. With several workers
+(``WEB_CONCURRENCY`` > 1) a scrape only reaches one of them. When
+``METRICS_MULTIPROC_DIR`` is set, every worker writes a snapshot of its
+metrics to ``<dir>/<pid>.json`` every ``METRICS_FLUSH_INTERVAL`` seconds
+(and the scraped worker once more before answering), and ``/metrics``
+merges all snapshots in the directory.
+
+Snapshots of exited workers are kept so counters stay monotonic; gauges
+only sum snapshots written in the last few flush intervals. Empty the
+directory when deploying, as with prometheus_client's multiprocess mode.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FileMetricsStore:
+    """Per-process metric snapshots in a directory shared by the workers."""
+
+    def __init__(self, directory: str, pid: Optional[int] = None):
+        self.directory = Path(directory)
+        self._pid = pid
+
+    @property
+    def pid(self) -> int:
+        # Looked up on use: workers are usually forked after this module is imported
+        return self._pid or os.getpid()
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.pid}.json"
+
+    def write(self, snapshot: Dict[str, Any]) -> None:
+        """Replace this process's snapshot atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=f".{self.pid}-", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as handle:
+                json.dump(snapshot, handle, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """Snapshots of every process that has written one."""
+        snapshots = []
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics snapshot {path.name}: {e}")
+        return snapshots
+
+
+class MetricsFlusher:
+    """Periodically write this worker's snapshot to a ``FileMetricsStore``."""
+
+    def __init__(self, store: FileMetricsStore, snapshot: Callable[[], Dict[str, Any]], interval: float):
+        self.store = store
+        self.snapshot = snapshot
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self.store.write, self.snapshot())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Failed to write metrics snapshot: {e}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -8,17 +8,39 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from decimal import Decimal
-import statistics
-from collections import defaultdict, deque
+from collections import defaultdict
 from functools import wraps
 import json
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.modules.monitoring.histograms import (
+    HdrHistogram,
+    merge_counter_maps,
+    merge_histogram_maps,
+    prometheus_histogram,
+    prometheus_simple,
+)
+from app.modules.monitoring.loop_monitor import loop_monitor
+from app.modules.monitoring.multiprocess import FileMetricsStore, MetricsFlusher
+from app.modules.monitoring.query_metrics import (
+    QueryMetrics,
+    merge_snapshots as merge_sql_snapshots,
+    prometheus_lines as sql_prometheus_lines,
+)
+
 
 class PerformanceMetrics:
-    """Singleton class to track performance metrics across the application."""
+    """
+    Singleton class to track performance metrics across the application.
+    
+    Durations are recorded into fixed-size histograms keyed by route
+    template (``/api/customers/{customer_id}``, not the raw path),
+    operation or query type, so memory is bounded by the number of routes
+    rather than requests and percentiles take one pass over the buckets.
+    """
     
     _instance = None
     
@@ -30,21 +52,28 @@ class PerformanceMetrics:
     
     def initialize(self):
         """Initialize metrics storage."""
-        self.request_times = defaultdict(lambda: deque(maxlen=1000))
-        self.query_times = defaultdict(lambda: deque(maxlen=1000))
-        self.operation_times = defaultdict(lambda: deque(maxlen=1000))
+        self.request_times: Dict[str, HdrHistogram] = defaultdict(HdrHistogram)
+        self.query_times: Dict[str, HdrHistogram] = defaultdict(HdrHistogram)
+        self.operation_times: Dict[str, HdrHistogram] = defaultdict(HdrHistogram)
         self.error_counts = defaultdict(int)
         self.success_counts = defaultdict(int)
+        self.operation_errors = defaultdict(int)
         self.active_requests = 0
         self.start_time = datetime.now()
+        
+        # SQL statements by fingerprint, fed by the engine instrumentation; kept
+        # across resets so instrumented engines keep reporting into it
+        if hasattr(self, 'sql'):
+            self.sql.reset()
+        else:
+            self.sql = QueryMetrics(
+                max_fingerprints=settings.SQL_METRICS_MAX_FINGERPRINTS,
+                n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD
+            )
     
     def record_request(self, endpoint: str, duration: float, success: bool = True):
-        """Record API request metrics."""
-        self.request_times[endpoint].append({
-            'duration': duration,
-            'timestamp': datetime.now(),
-            'success': success
-        })
+        """Record API request metrics (``endpoint`` is the route template)."""
+        self.request_times[endpoint].record(duration)
         
         if success:
             self.success_counts[endpoint] += 1
@@ -53,38 +82,34 @@ class PerformanceMetrics:
     
     def record_query(self, query_type: str, duration: float):
         """Record database query metrics."""
-        self.query_times[query_type].append({
-            'duration': duration,
-            'timestamp': datetime.now()
-        })
+        self.query_times[query_type].record(duration)
     
     def record_operation(self, operation: str, duration: float, metadata: Dict = None):
         """Record specific operation metrics."""
-        self.operation_times[operation].append({
-            'duration': duration,
-            'timestamp': datetime.now(),
-            'metadata': metadata or {}
-        })
+        self.operation_times[operation].record(duration)
+        if metadata and 'error' in metadata:
+            self.operation_errors[operation] += 1
     
     def get_endpoint_stats(self, endpoint: str) -> Dict[str, Any]:
         """Get statistics for a specific endpoint."""
-        times = [r['duration'] for r in self.request_times[endpoint]]
+        histogram = self.request_times.get(endpoint)
         
-        if not times:
+        if histogram is None or not histogram.count:
             return {'error': 'No data available'}
         
+        stats = histogram.stats()
         return {
             'endpoint': endpoint,
-            'total_requests': len(times),
+            'total_requests': stats['count'],
             'success_count': self.success_counts[endpoint],
             'error_count': self.error_counts[endpoint],
-            'average_time': statistics.mean(times),
-            'median_time': statistics.median(times),
-            'min_time': min(times),
-            'max_time': max(times),
-            'p95_time': self._calculate_percentile(times, 95),
-            'p99_time': self._calculate_percentile(times, 99),
-            'std_deviation': statistics.stdev(times) if len(times) > 1 else 0
+            'average_time': stats['average'],
+            'median_time': stats['median'],
+            'min_time': stats['min'],
+            'max_time': stats['max'],
+            'p95_time': stats['p95'],
+            'p99_time': stats['p99'],
+            'std_deviation': stats['std_deviation']
         }
     
     def get_all_stats(self) -> Dict[str, Any]:
@@ -96,13 +121,12 @@ class PerformanceMetrics:
             endpoint_stats[endpoint] = self.get_endpoint_stats(endpoint)
         
         query_stats = {}
-        for query_type in self.query_times:
-            times = [q['duration'] for q in self.query_times[query_type]]
-            if times:
+        for query_type, histogram in self.query_times.items():
+            if histogram.count:
                 query_stats[query_type] = {
-                    'count': len(times),
-                    'average': statistics.mean(times),
-                    'total': sum(times)
+                    'count': histogram.count,
+                    'average': histogram.mean,
+                    'total': histogram.sum
                 }
         
         return {
@@ -110,25 +134,114 @@ class PerformanceMetrics:
             'active_requests': self.active_requests,
             'endpoints': endpoint_stats,
             'queries': query_stats,
+            'sql': self.sql.summary(),
             'timestamp': datetime.now().isoformat()
         }
     
-    def _calculate_percentile(self, data: List[float], percentile: int) -> float:
-        """Calculate percentile value."""
-        if not data:
-            return 0
-        sorted_data = sorted(data)
-        index = (percentile / 100) * (len(sorted_data) - 1)
-        if index.is_integer():
-            return sorted_data[int(index)]
-        lower = sorted_data[int(index)]
-        upper = sorted_data[int(index) + 1]
-        return lower + (upper - lower) * (index - int(index))
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialisable state of this worker, merged across workers by ``render_prometheus``."""
+        return {
+            'written_at': time.time(),
+            'active_requests': self.active_requests,
+            'requests': {key: histogram.to_dict() for key, histogram in self.request_times.items()},
+            'request_outcomes': {
+                key: [self.success_counts[key], self.error_counts[key]] for key in self.request_times
+            },
+            'operations': {key: histogram.to_dict() for key, histogram in self.operation_times.items()},
+            'operation_errors': dict(self.operation_errors),
+            'queries': {key: histogram.to_dict() for key, histogram in self.query_times.items()},
+            'sql': self.sql.snapshot(),
+            'event_loop': loop_monitor.snapshot()
+        }
+
+
+def render_prometheus(snapshots: List[Dict[str, Any]], stale_after: Optional[float] = None) -> str:
+    """
+    Prometheus text exposition of one or more workers' ``PerformanceMetrics.snapshot()``.
+    
+    Counters and histograms add up every snapshot, including those of exited
+    workers. Gauges describe the present, so they only count snapshots
+    written within the last ``stale_after`` seconds (all of them if None).
+    """
+    if stale_after is None:
+        live = snapshots
+    else:
+        cutoff = time.time() - stale_after
+        live = [snapshot for snapshot in snapshots if snapshot.get('written_at', 0) >= cutoff]
+    requests = merge_histogram_maps(snapshot['requests'] for snapshot in snapshots)
+    outcomes = merge_counter_maps(snapshot['request_outcomes'] for snapshot in snapshots)
+    operations = merge_histogram_maps(snapshot['operations'] for snapshot in snapshots)
+    operation_errors = merge_counter_maps(snapshot['operation_errors'] for snapshot in snapshots)
+    queries = merge_histogram_maps(snapshot['queries'] for snapshot in snapshots)
+    
+    lines = prometheus_histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        [({"route": route}, histogram) for route, histogram in requests.items()]
+    )
+    lines += prometheus_simple(
+        "http_requests_total",
+        "HTTP requests by route template and outcome",
+        "counter",
+        [({"route": route, "outcome": outcome}, counts[position])
+         for route, counts in outcomes.items()
+         for position, outcome in enumerate(("success", "error"))]
+    )
+    lines += prometheus_simple(
+        "http_requests_in_progress",
+        "HTTP requests being served",
+        "gauge",
+        [({}, sum(snapshot['active_requests'] for snapshot in live))]
+    )
+    lines += prometheus_histogram(
+        "app_operation_duration_seconds",
+        "Duration of tracked operations",
+        [({"operation": name}, histogram) for name, histogram in operations.items()]
+    )
+    lines += prometheus_simple(
+        "app_operation_errors_total",
+        "Failed tracked operations",
+        "counter",
+        [({"operation": name}, count) for name, count in operation_errors.items()]
+    )
+    lines += prometheus_histogram(
+        "app_query_duration_seconds",
+        "Duration of tracked queries by query type",
+        [({"query_type": name}, histogram) for name, histogram in queries.items()]
+    )
+    lines += sql_prometheus_lines(merge_sql_snapshots([snapshot['sql'] for snapshot in snapshots]))
+    
+    event_loops = [snapshot['event_loop'] for snapshot in snapshots if 'event_loop' in snapshot]
+    lines += prometheus_histogram(
+        "event_loop_lag_seconds",
+        "Event loop scheduling lag",
+        [({}, histogram) for histogram in merge_histogram_maps({'lag': loop['lag']} for loop in event_loops).values()]
+    )
+    lines += prometheus_simple(
+        "event_loop_blocking_events_total",
+        "Times the event loop was blocked beyond the threshold",
+        "counter",
+        [({}, sum(loop['blocking_events'] for loop in event_loops))]
+    )
+    lines += prometheus_simple(
+        "event_loop_blocked_seconds_total",
+        "Time the event loop spent blocked beyond the threshold",
+        "counter",
+        [({}, sum(loop['blocked_seconds'] for loop in event_loops))]
+    )
+    return "\n".join(lines) + "\n"
 
 
 # Global metrics instance
 metrics = PerformanceMetrics()
 
+# Shared snapshot directory when several workers serve the app
+metrics_store = FileMetricsStore(settings.METRICS_MULTIPROC_DIR) if settings.METRICS_MULTIPROC_DIR else None
+metrics_flusher = (
+    MetricsFlusher(metrics_store, metrics.snapshot, settings.METRICS_FLUSH_INTERVAL)
+    if metrics_store else None
+)
+
 
 # Decorators for automatic performance tracking
 def track_performance(operation_name: str = None):
@@ -220,11 +333,11 @@ class RentalPerformanceAnalyzer:
         
         breakdown = {}
         for op in operations:
-            op_times = [o['duration'] for o in metrics.operation_times.get(op, [])]
-            if op_times:
+            op_times = metrics.operation_times.get(op)
+            if op_times is not None and op_times.count:
                 breakdown[op] = {
-                    'count': len(op_times),
-                    'average': statistics.mean(op_times),
+                    'count': op_times.count,
+                    'average': op_times.mean,
                     'percentage': 0  # Will calculate after
                 }
         
@@ -313,8 +426,8 @@ class RentalPerformanceAnalyzer:
             recommendations.append("95th percentile response time is too high (>5s)")
         
         # Check specific operations
-        stock_update_times = [o['duration'] for o in metrics.operation_times.get('batch_stock_updates', [])]
-        if stock_update_times and statistics.mean(stock_update_times) > 0.5:
+        stock_update_times = metrics.operation_times.get('batch_stock_updates')
+        if stock_update_times is not None and stock_update_times.mean > 0.5:
             recommendations.append("Stock update operations are slow - ensure bulk updates are implemented")
         
         # Check error rate
@@ -327,11 +440,31 @@ class RentalPerformanceAnalyzer:
 
 
 # API Routes for monitoring
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from app.core.database import get_db
+from app.modules.auth.dependencies import get_current_superuser
+from app.modules.monitoring.profiler import profiler
 
 monitoring_router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
 
+# Prometheus scrape endpoint, served at the application root
+metrics_router = APIRouter(tags=["monitoring"])
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Metrics in the Prometheus text exposition format, merged across workers."""
+    snapshot = metrics.snapshot()
+    if metrics_store is not None:
+        await asyncio.to_thread(metrics_store.write, snapshot)
+        snapshots = await asyncio.to_thread(metrics_store.read_all)
+        # A live worker rewrites its snapshot every flush interval
+        stale_after = 3 * settings.METRICS_FLUSH_INTERVAL
+    else:
+        snapshots, stale_after = [snapshot], None
+    return PlainTextResponse(render_prometheus(snapshots, stale_after), media_type="text/plain; version=0.0.4")
+
 
 @monitoring_router.get("/metrics")
 async def get_performance_metrics():
@@ -346,6 +479,25 @@ async def get_rental_performance(session: AsyncSession = Depends(get_db)):
     return await analyzer.analyze_rental_performance()
 
 
+@monitoring_router.get("/metrics/queries")
+async def get_query_metrics(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total_time", pattern="^(total_time|count|mean_time|p95_time|rows|errors|n_plus_one_requests)$")
+):
+    """Top SQL fingerprints and recent N+1 detections."""
+    return {
+        'summary': metrics.sql.summary(),
+        'fingerprints': metrics.sql.top(limit, order_by),
+        'n_plus_one': list(metrics.sql.recent_n_plus_one)
+    }
+
+
+@monitoring_router.get("/event-loop", dependencies=[Depends(get_current_superuser)])
+async def get_event_loop_status():
+    """Event loop lag percentiles and recent blocking reports with stacks (superusers only)."""
+    return loop_monitor.status()
+
+
 @monitoring_router.get("/metrics/endpoint/{endpoint_path:path}")
 async def get_endpoint_metrics(endpoint_path: str):
     """Get metrics for a specific endpoint."""
@@ -360,6 +512,58 @@ async def reset_metrics():
     return {"message": "Metrics reset successfully"}
 
 
+def require_profiler(current_user=Depends(get_current_superuser)):
+    """Profiler endpoints: superusers only, and only where enabled."""
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiler is not enabled")
+    return current_user
+
+
+@monitoring_router.post("/profiler/start", dependencies=[Depends(require_profiler)])
+async def start_profiler(
+    mode: str = Query("cpu", pattern="^(cpu|wall)$", description="cpu: running frame; wall: await chains of requests"),
+    interval_ms: float = Query(10, ge=1, le=1000, description="Target sampling interval"),
+    max_overhead: float = Query(0.02, gt=0, le=0.2, description="Maximum share of one core the sampler may use"),
+    duration_seconds: float = Query(600, gt=0, le=86400, description="Stop automatically after this long")
+):
+    """Start a sampling profiler run (replaces the previous run's data)."""
+    try:
+        profiler.start(
+            mode=mode,
+            interval=interval_ms / 1000,
+            max_overhead=max_overhead,
+            max_duration=duration_seconds
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return profiler.status()
+
+
+@monitoring_router.post("/profiler/stop", dependencies=[Depends(require_profiler)])
+async def stop_profiler():
+    """Stop the current profiler run; its data stays available until the next start."""
+    await asyncio.to_thread(profiler.stop)
+    return profiler.status()
+
+
+@monitoring_router.get("/profiler", dependencies=[Depends(require_profiler)])
+async def get_profiler_status():
+    """Profiler state, measured overhead and samples per route."""
+    return profiler.status()
+
+
+@monitoring_router.get("/profiler/collapsed", response_class=PlainTextResponse, dependencies=[Depends(require_profiler)])
+async def get_profiler_collapsed_stacks():
+    """Collapsed stacks (route;frame;... count) for flamegraph.pl or speedscope."""
+    return PlainTextResponse(profiler.collapsed())
+
+
+@monitoring_router.get("/profiler/flamegraph", dependencies=[Depends(require_profiler)])
+async def get_profiler_flamegraph():
+    """Sampled stacks as a d3-flame-graph tree."""
+    return profiler.flamegraph()
+
+
 # Middleware for automatic request tracking
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
@@ -378,12 +582,17 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
         start_time = time.perf_counter()
         
         try:
-            response = await call_next(request)
+            try:
+                response = await call_next(request)
+            except Exception:
+                metrics.record_request(self._route_template(request), time.perf_counter() - start_time, False)
+                raise
             duration = time.perf_counter() - start_time
             
-            # Record metrics
+            # Record metrics under the route template so path parameters
+            # (IDs) don't create a series per value
             success = 200 <= response.status_code < 400
-            metrics.record_request(request.url.path, duration, success)
+            metrics.record_request(self._route_template(request), duration, success)
             
             # Add performance headers
             response.headers["X-Response-Time"] = f"{duration:.3f}"
@@ -392,6 +601,11 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
             return response
         finally:
             metrics.active_requests -= 1
+    
+    @staticmethod
+    def _route_template(request: Request) -> str:
+        route = request.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
 
 
 # Usage example:
@@ -0,0 +1,268 @@
+"""
+In-process sampling profiler for production workers.
+
+A daemon thread wakes every ``interval`` seconds and records the stack of
+the event loop, attributed to the route of the request being served:
+
+- ``cpu`` mode samples the frame currently executing on the loop thread
+  (what is burning CPU; an idle loop is counted as ``idle``).
+- ``wall`` mode samples the await chain of every in-flight request task
+  (where requests spend their time, including waits on the database).
+
+Samples are aggregated as collapsed stacks (``route;module.func;... count``),
+ready for flamegraph.pl/speedscope, or as a d3-flame-graph tree.
+
+Overhead is capped: the thread measures the CPU time each sample costs
+and stretches the interval so the sampler never uses more than
+``max_overhead`` of one core. A run also stops after ``max_duration``
+seconds, so a profiler left running during an incident cannot outlive it.
+
+Requests are mapped to their route by ``ProfilerRouteMiddleware``, which
+only does work while a run is active. Synchronous endpoints run in a
+threadpool and are not sampled.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Distinct stacks kept per run; further stacks are counted under TRUNCATED
+MAX_STACKS = 20000
+TRUNCATED = "[truncated]"
+IDLE = "idle"
+BACKGROUND = "background"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _thread_stack(frame, max_depth: int) -> List[str]:
+    """Labels from the outermost frame to ``frame``."""
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_chain(coroutine, max_depth: int) -> List[str]:
+    """Labels of a suspended task's await chain, outermost first."""
+    labels = []
+    while coroutine is not None and len(labels) < max_depth:
+        frame = getattr(coroutine, "cr_frame", None) or getattr(coroutine, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        coroutine = (
+            getattr(coroutine, "cr_await", None)
+            or getattr(coroutine, "gi_yieldfrom", None)
+            or getattr(coroutine, "ag_await", None)
+        )
+    return labels
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    return f"{scope.get('method', '')} {template}".strip() if template else "unmatched"
+
+
+class SamplingProfiler:
+    """Thread-based stack sampler for one event loop."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._request_tasks: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self.stacks: Counter = Counter()
+        self.mode = "cpu"
+        self.interval = 0.01
+        self.effective_interval = 0.01
+        self.max_overhead = 0.02
+        self.max_duration = 600.0
+        self.max_depth = 64
+        self.samples = 0
+        self.sampler_cpu_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # Request attribution
+
+    def register_request(self, scope: Dict[str, Any]) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._request_tasks[task] = scope
+
+    def unregister_request(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._request_tasks.pop(task, None)
+
+    # Control
+
+    def start(
+        self,
+        mode: str = "cpu",
+        interval: float = 0.01,
+        max_overhead: float = 0.02,
+        max_duration: float = 600.0,
+        max_depth: int = 64,
+    ) -> None:
+        """Start a new run on the calling thread's event loop (discarding the previous one)."""
+        if mode not in ("cpu", "wall"):
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Profiler is already running")
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self.mode = mode
+            self.interval = self.effective_interval = interval
+            self.max_overhead = max_overhead
+            self.max_duration = max_duration
+            self.max_depth = max_depth
+            self.stacks = Counter()
+            self.samples = 0
+            self.sampler_cpu_seconds = 0.0
+            self.started_at = time.monotonic()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Sampling profiler started ({mode}, every {interval * 1000:.0f} ms)")
+
+    def stop(self) -> None:
+        with self._lock:
+            thread = self._thread
+            self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    # Sampling
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.effective_interval):
+                if time.monotonic() - self.started_at >= self.max_duration:
+                    logger.info("Sampling profiler reached its maximum duration")
+                    break
+                cpu_started = time.thread_time()
+                self.sample()
+                cost = time.thread_time() - cpu_started
+                self.sampler_cpu_seconds += cost
+                # Overhead cap: never sample more often than cost / max_overhead
+                self.effective_interval = max(self.interval, cost / self.max_overhead)
+        except Exception:
+            logger.exception("Sampling profiler failed")
+        finally:
+            self.stopped_at = time.monotonic()
+            logger.info(f"Sampling profiler stopped after {self.samples} samples")
+
+    def sample(self) -> None:
+        """Take one sample of the event loop."""
+        if self.mode == "wall":
+            for task, scope in self._request_tasks.copy().items():  # copy() is atomic
+                if not task.done():
+                    stack = _await_chain(task.get_coro(), self.max_depth)
+                    self._add(_route_label(scope), stack)
+        else:
+            frame = sys._current_frames().get(self._loop_thread_id)
+            task = asyncio.current_task(self._loop) if self._loop is not None else None
+            if task is None:
+                self._add(IDLE, [])
+            else:
+                scope = self._request_tasks.get(task)
+                route = _route_label(scope) if scope is not None else BACKGROUND
+                self._add(route, _thread_stack(frame, self.max_depth) if frame is not None else [])
+        self.samples += 1
+
+    def _add(self, route: str, stack: List[str]) -> None:
+        key = ";".join([route] + stack)
+        if key not in self.stacks and len(self.stacks) >= MAX_STACKS:
+            key = f"{route};{TRUNCATED}"
+        self.stacks[key] += 1
+
+    # Export
+
+    def collapsed(self) -> str:
+        """Folded stacks, one ``frame;frame;... count`` line each."""
+        stacks = Counter(dict.copy(self.stacks))  # The sampler thread may be adding to it
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def flamegraph(self) -> Dict[str, Any]:
+        """Stacks as a d3-flame-graph tree (``name``/``value``/``children``)."""
+        root: Dict[str, Any] = {"name": "all", "value": 0, "children": {}}
+        for stack, count in dict.copy(self.stacks).items():
+            node = root
+            node["value"] += count
+            for name in stack.split(";"):
+                node = node["children"].setdefault(name, {"name": name, "value": 0, "children": {}})
+                node["value"] += count
+
+        def as_lists(node):
+            return {
+                "name": node["name"],
+                "value": node["value"],
+                "children": [as_lists(child) for child in node["children"].values()],
+            }
+        return as_lists(root)
+
+    def status(self) -> Dict[str, Any]:
+        end = self.stopped_at if self.stopped_at is not None else time.monotonic()
+        elapsed = end - self.started_at if self.started_at is not None else 0.0
+        routes = Counter()
+        for stack, count in dict.copy(self.stacks).items():
+            routes[stack.split(";", 1)[0]] += count
+        return {
+            "running": self.running,
+            "mode": self.mode,
+            "interval_ms": self.interval * 1000,
+            "effective_interval_ms": self.effective_interval * 1000,
+            "max_overhead": self.max_overhead,
+            "overhead": self.sampler_cpu_seconds / elapsed if elapsed else 0.0,
+            "elapsed_seconds": elapsed,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            "samples_by_route": dict(routes.most_common()),
+        }
+
+
+profiler = SamplingProfiler()
+
+
+class ProfilerRouteMiddleware:
+    """
+    Pure ASGI middleware mapping the task serving a request to its scope.
+
+    Added innermost, so it runs in the task that executes the endpoint; the
+    route template is read from the scope when a sample is taken.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.running:
+            return await self.app(scope, receive, send)
+        profiler.register_request(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.unregister_request()
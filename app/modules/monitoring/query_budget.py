@@ -0,0 +1,156 @@
+"""
+Query budgets: fail when a block of code or a request runs too many SQL statements.
+
+``QueryBudget`` counts the statements executed while it is active - on any
+engine, including test engines - grouped by fingerprint. On exit it raises
+``QueryBudgetExceeded`` when more than ``max_queries`` statements ran, or
+when a single fingerprint ran more than ``max_repeats`` times (the shape
+of an N+1 loop), listing the offending fingerprints::
+
+    with QueryBudget(max_queries=12, max_repeats=2, label="category list"):
+        await service.list_categories()
+
+Budgets are scoped to the current context (task) by default. The
+``query_budget`` pytest fixture uses ``process_wide=True`` budgets, which
+also count statements run by ``TestClient`` requests on the app's own
+thread.
+
+``@query_budget_route(...)`` applies a budget to a route handler. What
+happens on overrun depends on ``QUERY_BUDGET_ENFORCEMENT``: ``off`` (the
+default), ``warn`` (log) or ``raise`` (fail the request; for staging).
+"""
+
+import logging
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.modules.monitoring.query_metrics import fingerprint
+
+logger = logging.getLogger(__name__)
+
+_context_budgets: ContextVar[Tuple["QueryBudget", ...]] = ContextVar("query_budgets", default=())
+_process_budgets: List["QueryBudget"] = []
+_process_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block or request ran more SQL statements than its budget allows."""
+
+    def __init__(self, budget: "QueryBudget", problems: List[str]):
+        self.budget = budget
+        self.problems = problems
+        lines = [f"Query budget exceeded for {budget.label}: " + "; ".join(problems)]
+        lines += [f"  {count:>4} x {sql}" for sql, count in budget.statements.most_common(10)]
+        super().__init__("\n".join(lines))
+
+
+class QueryBudget:
+    """Count statements executed while active and check them against a budget."""
+
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        max_repeats: Optional[int] = None,
+        label: Optional[str] = None,
+        process_wide: bool = False,
+    ):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.label = label or "block"
+        self.process_wide = process_wide
+        self.statements: Counter = Counter()
+        self._token = None
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def record(self, statement: str) -> None:
+        self.statements[fingerprint(statement)] += 1
+
+    def problems(self) -> List[str]:
+        """Descriptions of every limit exceeded so far."""
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} statements, budget {self.max_queries}")
+        if self.max_repeats is not None:
+            repeated = [sql for sql, count in self.statements.items() if count > self.max_repeats]
+            if repeated:
+                problems.append(
+                    f"{len(repeated)} statement(s) repeated more than {self.max_repeats} times (possible N+1)"
+                )
+        return problems
+
+    def check(self) -> None:
+        problems = self.problems()
+        if problems:
+            raise QueryBudgetExceeded(self, problems)
+
+    def __enter__(self) -> "QueryBudget":
+        if self.process_wide:
+            with _process_lock:
+                _process_budgets.append(self)
+        else:
+            self._token = _context_budgets.set(_context_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self.process_wide:
+            with _process_lock:
+                _process_budgets.remove(self)
+        else:
+            _context_budgets.reset(self._token)
+        if exc_type is None:
+            self.check()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    budgets = _context_budgets.get()
+    if _process_budgets:
+        with _process_lock:
+            budgets = budgets + tuple(_process_budgets)
+    for budget in budgets:
+        budget.record(statement)
+
+
+def query_budget_route(
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+    label: Optional[str] = None,
+) -> Callable:
+    """
+    Apply a query budget to an async route handler.
+
+    Counts the statements the handler itself runs; a commit in the session
+    dependency's teardown happens after it returns and is not included.
+    """
+    def decorator(func):
+        budget_label = label or f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            enforcement = settings.QUERY_BUDGET_ENFORCEMENT
+            if enforcement == "off":
+                return await func(*args, **kwargs)
+            budget = QueryBudget(max_queries, max_repeats, label=budget_label)
+            token = _context_budgets.set(_context_budgets.get() + (budget,))
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                _context_budgets.reset(token)
+            problems = budget.problems()
+            if problems:
+                if enforcement == "raise":
+                    raise QueryBudgetExceeded(budget, problems)
+                logger.warning(str(QueryBudgetExceeded(budget, problems)))
+            return result
+        return wrapper
+    return decorator
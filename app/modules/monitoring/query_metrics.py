@@ -0,0 +1,270 @@
+"""
+SQL statement instrumentation.
+
+``instrument_engine`` hooks SQLAlchemy's ``before_cursor_execute`` /
+``after_cursor_execute`` events so every statement the engine runs is
+recorded - no ``@track_query`` needed. Statements are normalised into
+fingerprints (literals and bind parameters replaced by ``?``, ``IN`` lists
+and multi-row ``VALUES`` collapsed), and each fingerprint keeps a latency
+histogram, row and error counts.
+
+Queries are attributed to the request they ran in through the correlation
+ID (``begin_request``, called by ``RequestContextMiddleware``). A
+fingerprint executed more than ``n_plus_one_threshold`` times in a single
+request is flagged as a likely N+1 pattern and logged once per request.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.modules.monitoring.histograms import (
+    HdrHistogram,
+    merge_counter_maps,
+    merge_histogram_maps,
+    prometheus_histogram,
+    prometheus_simple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statements beyond the fingerprint limit are counted under this one
+OTHER_FINGERPRINT = "other"
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PARAMS = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):[A-Za-z_]\w*")
+_NUMBERS = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\?(?:, \.\.\.)?\))(?:\s*,\s*\(\?(?:, \.\.\.)?\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalise ``statement`` so executions differing only in values match."""
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PARAMS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _SPACES.sub(" ", sql).strip()
+    sql = _LISTS.sub("(?, ...)", sql)
+    return _ROWS.sub(r"\1, ...", sql)
+
+
+def fingerprint_id(fingerprint_sql: str) -> str:
+    """Short stable identifier of a fingerprint, used as a metric label."""
+    return hashlib.sha1(fingerprint_sql.encode()).hexdigest()[:12]
+
+
+@dataclass
+class FingerprintStats:
+    """Everything recorded for one statement fingerprint."""
+    fingerprint: str
+    histogram: HdrHistogram = field(default_factory=HdrHistogram)
+    rows: int = 0
+    errors: int = 0
+    n_plus_one: int = 0  # Requests in which it was flagged
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = self.histogram
+        return {
+            "id": fingerprint_id(self.fingerprint),
+            "fingerprint": self.fingerprint,
+            "count": histogram.count,
+            "total_time": histogram.sum,
+            "mean_time": histogram.mean,
+            "p50_time": histogram.percentile(50),
+            "p95_time": histogram.percentile(95),
+            "p99_time": histogram.percentile(99),
+            "rows": self.rows,
+            "errors": self.errors,
+            "n_plus_one_requests": self.n_plus_one,
+        }
+
+
+@dataclass
+class RequestQueries:
+    """Statements executed while serving one request."""
+    correlation_id: str
+    path: Optional[str] = None
+    statements: int = 0
+    total_time: float = 0.0
+    counts: Counter = field(default_factory=Counter)
+    flagged: Set[str] = field(default_factory=set)
+
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def begin_request(queries: RequestQueries):
+    """Attribute statements to ``queries`` until ``end_request``; returns a token."""
+    return _request_queries.set(queries)
+
+
+def end_request(token) -> None:
+    _request_queries.reset(token)
+
+
+def current_request() -> Optional[RequestQueries]:
+    return _request_queries.get()
+
+
+class QueryMetrics:
+    """Per-fingerprint statement metrics with N+1 detection."""
+
+    def __init__(self, max_fingerprints: int = 1000, n_plus_one_threshold: int = 10):
+        self.max_fingerprints = max_fingerprints
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.reset()
+
+    def reset(self) -> None:
+        self.fingerprints: Dict[str, FingerprintStats] = {}
+        self.recent_n_plus_one: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+    def _stats(self, fingerprint_sql: str) -> FingerprintStats:
+        stats = self.fingerprints.get(fingerprint_sql)
+        if stats is None:
+            if len(self.fingerprints) >= self.max_fingerprints:
+                fingerprint_sql = OTHER_FINGERPRINT
+                stats = self.fingerprints.get(fingerprint_sql)
+            if stats is None:
+                stats = self.fingerprints[fingerprint_sql] = FingerprintStats(fingerprint_sql)
+        return stats
+
+    def record(self, statement: str, duration: float, rows: int = 0, error: bool = False) -> None:
+        """Record one execution of ``statement``."""
+        stats = self._stats(fingerprint(statement))
+        stats.histogram.record(duration)
+        stats.rows += max(rows, 0)
+        if error:
+            stats.errors += 1
+
+        request = current_request()
+        if request is None:
+            return
+        request.statements += 1
+        request.total_time += duration
+        request.counts[stats.fingerprint] += 1
+        if (
+            request.counts[stats.fingerprint] > self.n_plus_one_threshold
+            and stats.fingerprint not in request.flagged
+            and stats.fingerprint != OTHER_FINGERPRINT
+        ):
+            self._flag_n_plus_one(request, stats)
+
+    def _flag_n_plus_one(self, request: RequestQueries, stats: FingerprintStats) -> None:
+        request.flagged.add(stats.fingerprint)
+        stats.n_plus_one += 1
+        self.recent_n_plus_one.append({
+            "correlation_id": request.correlation_id,
+            "path": request.path,
+            "fingerprint_id": fingerprint_id(stats.fingerprint),
+            "fingerprint": stats.fingerprint,
+            "timestamp": time.time(),
+        })
+        logger.warning(
+            f"Possible N+1 in request {request.correlation_id} ({request.path}): more than "
+            f"{self.n_plus_one_threshold} executions of {stats.fingerprint[:200]}"
+        )
+
+    def top(self, limit: int = 20, order_by: str = "total_time") -> List[Dict[str, Any]]:
+        """Fingerprints with the highest ``order_by`` value (a ``to_dict`` key)."""
+        rows = [stats.to_dict() for stats in self.fingerprints.values()]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit]
+
+    def summary(self) -> Dict[str, Any]:
+        histograms = [stats.histogram for stats in self.fingerprints.values()]
+        return {
+            "fingerprints": len(self.fingerprints),
+            "statements": sum(histogram.count for histogram in histograms),
+            "total_time": sum(histogram.sum for histogram in histograms),
+            "n_plus_one_detections": sum(stats.n_plus_one for stats in self.fingerprints.values()),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialisable state, merged across workers by ``merge_snapshots``."""
+        return {
+            "histograms": {sql: stats.histogram.to_dict() for sql, stats in self.fingerprints.items()},
+            "counters": {
+                sql: [stats.rows, stats.errors, stats.n_plus_one]
+                for sql, stats in self.fingerprints.items()
+            },
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        """This process's metrics in the Prometheus text exposition format."""
+        return prometheus_lines(merge_snapshots([self.snapshot()]))
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine ``QueryMetrics.snapshot()`` results from several workers."""
+    return {
+        "histograms": merge_histogram_maps(snapshot["histograms"] for snapshot in snapshots),
+        "counters": merge_counter_maps(snapshot["counters"] for snapshot in snapshots),
+    }
+
+
+def prometheus_lines(merged: Dict[str, Any]) -> List[str]:
+    """Exposition lines for merged SQL metrics, labelled by fingerprint ID."""
+    labels = {sql: {"fingerprint": fingerprint_id(sql)} for sql in merged["histograms"]}
+    lines = prometheus_histogram(
+        "sql_query_duration_seconds",
+        "SQL statement latency by fingerprint",
+        [(labels[sql], histogram) for sql, histogram in merged["histograms"].items()],
+    )
+    for position, (name, help_text) in enumerate((
+        ("sql_query_rows_total", "Rows returned or affected by fingerprint"),
+        ("sql_query_errors_total", "Failed executions by fingerprint"),
+        ("sql_n_plus_one_requests_total", "Requests flagged as N+1 by fingerprint"),
+    )):
+        lines += prometheus_simple(
+            name, help_text, "counter",
+            [(labels[sql], values[position]) for sql, values in merged["counters"].items()],
+        )
+    return lines
+
+
+def _row_count(cursor) -> int:
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        return rowcount
+    # asyncpg's adapted cursor reports -1 for SELECT but has prefetched the rows
+    return len(getattr(cursor, "_rows", None) or ())
+
+
+def instrument_engine(engine, query_metrics: QueryMetrics) -> None:
+    """Record every statement ``engine`` executes into ``query_metrics``."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if getattr(sync_engine, "_query_metrics", None) is not None:
+        return
+    sync_engine._query_metrics = query_metrics
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            query_metrics.record(statement, time.perf_counter() - started, _row_count(cursor))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        started = getattr(context, "_query_started", None) if context is not None else None
+        if started is not None and exception_context.statement:
+            query_metrics.record(
+                exception_context.statement, time.perf_counter() - started, error=True
+            )
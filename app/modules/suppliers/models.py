@@ -6,6 +6,7 @@ from decimal import Decimal
 from datetime import datetime
 
 from app.db.base import BaseModel
+from app.shared.write_tracking import track_cache_version
 
 
 class SupplierType(str, Enum):
@@ -150,6 +151,7 @@ class Supplier(BaseModel):
         Index('idx_supplier_last_order', 'last_order_date'),
         Index('idx_supplier_contract_dates', 'contract_start_date', 'contract_end_date'),
         Index('idx_supplier_ratings', 'quality_rating', 'delivery_rating'),
+        Index('idx_supplier_updated_at', 'updated_at'),
     )
     
     def __init__(
@@ -388,4 +390,8 @@ class Supplier(BaseModel):
             f"Supplier(id={self.id}, code='{self.supplier_code}', "
             f"company='{self.company_name}', type='{self.supplier_type}', "
             f"status='{self.status}', active={self.is_active})"
-        )
\ No newline at end of file
+        )
+
+
+# Autocomplete indexes in every worker rebuild when this version moves
+track_cache_version(Supplier.__table__, "suppliers")
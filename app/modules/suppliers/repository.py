@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 
 from .models import Supplier, SupplierType, SupplierTier, SupplierStatus, PaymentTerms
 from app.shared.repository import BaseRepository
+from app.shared.statistics import StatisticsQuery
+from app.shared.counting import CountResult, row_counter
+from app.db.routing import read_only
 
 
 class SupplierRepository(BaseRepository[Supplier]):
@@ -27,6 +30,7 @@ class SupplierRepository(BaseRepository[Supplier]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_all(
         self,
         skip: int = 0,
@@ -127,6 +131,7 @@ class SupplierRepository(BaseRepository[Supplier]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def count_all(
         self,
         supplier_type: Optional[SupplierType] = None,
@@ -135,9 +140,9 @@ class SupplierRepository(BaseRepository[Supplier]):
         payment_terms: Optional[PaymentTerms] = None,
         country: Optional[str] = None,
         active_only: bool = True
-    ) -> int:
-        """Count suppliers with filtering."""
-        query = select(func.count(Supplier.id))
+    ) -> CountResult:
+        """Count suppliers with filtering (exact, estimated or cached)."""
+        query = select(Supplier.id)
         
         # Apply filters
         if active_only:
@@ -158,8 +163,37 @@ class SupplierRepository(BaseRepository[Supplier]):
         if country:
             query = query.where(Supplier.country.ilike(f"%{country}%"))
         
-        result = await self.session.execute(query)
-        return result.scalar()
+        return await row_counter.count(self.session, query)
+    
+    async def get_paginated(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        active_only: bool = True,
+        **filters
+    ) -> Dict[str, Any]:
+        """Get paginated results (``count_all`` returns a ``CountResult``, not an int)."""
+        skip = (page - 1) * page_size
+        
+        total = (await self.count_all(active_only=active_only, **filters)).count
+        items = await self.get_all(
+            skip=skip,
+            limit=page_size,
+            active_only=active_only,
+            **filters
+        )
+        
+        total_pages = (total + page_size - 1) // page_size
+        
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1
+        }
     
     async def get_suppliers_by_type(
         self,
@@ -305,61 +339,31 @@ class SupplierRepository(BaseRepository[Supplier]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @read_only
     async def get_statistics(self) -> Dict[str, Any]:
-        """Get supplier statistics."""
-        # Basic counts
-        total_count = await self.session.execute(select(func.count(Supplier.id)))
-        active_count = await self.session.execute(
-            select(func.count(Supplier.id)).where(Supplier.is_active == True)
-        )
-        
-        # Count by type
-        type_counts = await self.session.execute(
-            select(Supplier.supplier_type, func.count(Supplier.id))
-            .where(Supplier.is_active == True)
-            .group_by(Supplier.supplier_type)
-        )
-        
-        # Count by status
-        status_counts = await self.session.execute(
-            select(Supplier.status, func.count(Supplier.id))
-            .where(Supplier.is_active == True)
-            .group_by(Supplier.status)
-        )
-        
-        # Count by tier
-        tier_counts = await self.session.execute(
-            select(Supplier.supplier_tier, func.count(Supplier.id))
-            .where(Supplier.is_active == True)
-            .group_by(Supplier.supplier_tier)
-        )
-        
-        # Count by country
-        country_counts = await self.session.execute(
-            select(Supplier.country, func.count(Supplier.id))
-            .where(and_(Supplier.is_active == True, Supplier.country.isnot(None)))
-            .group_by(Supplier.country)
-            .order_by(desc(func.count(Supplier.id)))
-            .limit(10)
-        )
-        
-        # Average ratings
-        avg_ratings = await self.session.execute(
-            select(
-                func.avg(Supplier.quality_rating),
-                func.avg(Supplier.delivery_rating)
-            )
-            .where(Supplier.is_active == True)
+        """Get supplier statistics (one query, cached until suppliers change)."""
+        active = Supplier.is_active == True
+        stats = await (
+            StatisticsQuery(Supplier, "suppliers")
+            .count("total_suppliers")
+            .count("active_suppliers", active)
+            .aggregate("average_quality_rating", func.avg(Supplier.quality_rating), active)
+            .aggregate("average_delivery_rating", func.avg(Supplier.delivery_rating), active)
+            .breakdown("suppliers_by_type", Supplier.supplier_type, active)
+            .breakdown("suppliers_by_status", Supplier.status, active)
+            .breakdown("suppliers_by_tier", Supplier.supplier_tier, active)
+            .breakdown("suppliers_by_country", Supplier.country, active, top=10)
+            .fetch(self.session)
         )
         
         return {
-            "total_suppliers": total_count.scalar(),
-            "active_suppliers": active_count.scalar(),
-            "suppliers_by_type": dict(type_counts.fetchall()),
-            "suppliers_by_status": dict(status_counts.fetchall()),
-            "suppliers_by_tier": dict(tier_counts.fetchall()),
-            "suppliers_by_country": dict(country_counts.fetchall()),
-            "average_ratings": avg_ratings.fetchone()
+            "total_suppliers": stats["total_suppliers"],
+            "active_suppliers": stats["active_suppliers"],
+            "suppliers_by_type": stats["suppliers_by_type"],
+            "suppliers_by_status": stats["suppliers_by_status"],
+            "suppliers_by_tier": stats["suppliers_by_tier"],
+            "suppliers_by_country": stats["suppliers_by_country"],
+            "average_ratings": (stats["average_quality_rating"], stats["average_delivery_rating"])
         }
     
     async def get_recent_suppliers(
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError, ConflictError
-from app.shared.dependencies import get_session
+from app.shared.dependencies import get_session, ReadSessionDep
 from app.modules.suppliers.service import SupplierService
 from app.modules.suppliers.models import SupplierType, SupplierStatus
 from app.modules.suppliers.schemas import (
@@ -20,6 +20,11 @@ async def get_supplier_service(session: AsyncSession = Depends(get_session)) ->
     return SupplierService(session)
 
 
+# SupplierService for read-only endpoints (served from a read replica when available)
+async def get_supplier_read_service(session: ReadSessionDep) -> SupplierService:
+    return SupplierService(session)
+
+
 # Supplier CRUD endpoints
 @router.post("/", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED)
 async def create_supplier(
@@ -78,18 +83,23 @@ async def count_suppliers(
     active_only: bool = Query(True, description="Show only active suppliers"),
     service: SupplierService = Depends(get_supplier_service)
 ):
-    """Count suppliers with optional filtering."""
-    count = await service.count_suppliers(
+    """
+    Count suppliers with optional filtering.
+
+    ``strategy`` tells whether the count is exact, a planner estimate
+    (large results) or cached from an earlier identical request.
+    """
+    result = await service.count_suppliers(
         supplier_type=supplier_type,
         status=status,
         active_only=active_only
     )
-    return {"count": count}
+    return {"count": result.count, "strategy": result.strategy}
 
 
 @router.get("/statistics")
 async def get_supplier_statistics(
-    service: SupplierService = Depends(get_supplier_service)
+    service: SupplierService = Depends(get_supplier_read_service)
 ):
     """Get supplier statistics."""
     return await service.get_supplier_statistics()
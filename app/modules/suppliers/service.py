@@ -8,6 +8,7 @@ from .schemas import (
     SupplierCreate, SupplierUpdate, SupplierResponse, SupplierStatusUpdate
 )
 from app.core.errors import ValidationError, NotFoundError, ConflictError
+from app.shared.counting import CountResult
 
 
 class SupplierService:
@@ -104,7 +105,7 @@ class SupplierService:
         supplier_type: Optional[SupplierType] = None,
         status: Optional[SupplierStatus] = None,
         active_only: bool = True
-    ) -> int:
+    ) -> CountResult:
         """Count suppliers with filtering."""
         return await self.repository.count_all(
             supplier_type=supplier_type,
@@ -128,25 +129,11 @@ class SupplierService:
     
     async def get_supplier_statistics(self) -> Dict[str, Any]:
         """Get supplier statistics."""
-        # Get basic counts
-        total_suppliers = await self.repository.count_all(active_only=False)
-        active_suppliers = await self.repository.count_all(active_only=True)
-        
-        # Get suppliers by type
-        inventory_suppliers = await self.repository.count_all(
-            supplier_type=SupplierType.INVENTORY, active_only=True
-        )
-        service_suppliers = await self.repository.count_all(
-            supplier_type=SupplierType.SERVICE, active_only=True
-        )
-        
-        # Get suppliers by status
-        approved_suppliers = await self.repository.count_all(
-            status=SupplierStatus.APPROVED, active_only=True
-        )
-        pending_suppliers = await self.repository.count_all(
-            status=SupplierStatus.PENDING, active_only=True
-        )
+        stats = await self.repository.get_statistics()
+        total_suppliers = stats["total_suppliers"]
+        active_suppliers = stats["active_suppliers"]
+        by_type = stats["suppliers_by_type"]
+        by_status = stats["suppliers_by_status"]
         
         # Get recent suppliers
         recent_suppliers = await self.repository.get_all(skip=0, limit=10, active_only=True)
@@ -155,11 +142,11 @@ class SupplierService:
             "total_suppliers": total_suppliers,
             "active_suppliers": active_suppliers,
             "inactive_suppliers": total_suppliers - active_suppliers,
-            "inventory_suppliers": inventory_suppliers,
-            "service_suppliers": service_suppliers,
-            "approved_suppliers": approved_suppliers,
-            "pending_suppliers": pending_suppliers,
-            "suppliers_by_country": {},
+            "inventory_suppliers": by_type.get(SupplierType.INVENTORY.value, 0),
+            "service_suppliers": by_type.get(SupplierType.SERVICE.value, 0),
+            "approved_suppliers": by_status.get(SupplierStatus.APPROVED.value, 0),
+            "pending_suppliers": by_status.get(SupplierStatus.PENDING.value, 0),
+            "suppliers_by_country": stats["suppliers_by_country"],
             "suppliers_by_rating": {},
             "top_suppliers_by_orders": [],
             "top_suppliers_by_value": [],
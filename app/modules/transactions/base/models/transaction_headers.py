@@ -6,7 +6,7 @@ from enum import Enum as PyEnum
 from typing import Optional, TYPE_CHECKING
 from decimal import Decimal
 from datetime import datetime, date, time
-from sqlalchemy import Column, String, Numeric, Boolean, Text, DateTime, Date, Time, ForeignKey, Integer, Index, Enum, CheckConstraint
+from sqlalchemy import Column, String, Numeric, Boolean, Text, DateTime, Date, Time, ForeignKey, Integer, Index, Enum, CheckConstraint, text
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
@@ -141,6 +141,15 @@ class TransactionHeader(BaseModel):
     pickup_date = Column(Date, nullable=True, comment="Scheduled pickup date")
     pickup_time = Column(Time, nullable=True, comment="Scheduled pickup time")
     
+    # Rental due tracking (precomputed from transaction lines, NULL once everything is returned)
+    next_due_date = Column(Date, nullable=True, comment="Earliest rental end date among lines not yet returned")
+    
+    # Rental return counters (maintained incrementally by the return path)
+    rental_line_count = Column(Integer, nullable=False, default=0, server_default="0", comment="Number of rental lines")
+    returned_line_count = Column(Integer, nullable=False, default=0, server_default="0", comment="Rental lines fully returned")
+    partial_return_line_count = Column(Integer, nullable=False, default=0, server_default="0", comment="Rental lines partially returned")
+    returned_quantity_total = Column(Numeric(10, 2), nullable=False, default=0, server_default="0", comment="Quantity returned across all rental lines")
+    
     # Relationships
     # customer = relationship("Customer", back_populates="transactions", lazy="select")  # Temporarily disabled
     # location = relationship("Location", back_populates="transactions", lazy="select")  # Temporarily disabled
@@ -157,6 +166,8 @@ class TransactionHeader(BaseModel):
         Index("idx_transaction_type", "transaction_type"),
         Index("idx_transaction_status", "status"),
         Index("idx_transaction_date", "transaction_date"),
+        # Keyset pagination order (transaction_date, id)
+        Index("idx_transaction_date_id", "transaction_date", "id"),
         Index("idx_customer_id", "customer_id"),
         Index("idx_location_id", "location_id"),
         Index("idx_reference_transaction", "reference_transaction_id"),
@@ -164,6 +175,16 @@ class TransactionHeader(BaseModel):
         Index("idx_pickup_required", "pickup_required"),
         Index("idx_delivery_date", "delivery_date"),
         Index("idx_pickup_date", "pickup_date"),
+        Index(
+            "idx_rental_next_due",
+            "next_due_date", "id",
+            postgresql_where=text("next_due_date IS NOT NULL"),
+        ),
+        Index(
+            "idx_rental_next_due_location",
+            "location_id", "next_due_date", "id",
+            postgresql_where=text("next_due_date IS NOT NULL"),
+        ),
         CheckConstraint("total_amount >= 0", name="check_positive_total"),
         CheckConstraint("paid_amount >= 0", name="check_positive_paid"),
         CheckConstraint("paid_amount <= total_amount", name="check_paid_not_exceed_total"),
@@ -25,6 +25,24 @@ from app.modules.transactions.schemas import (
     TransactionLineUpdate,
     TransactionSearch,
 )
+from app.shared.counting import CountResult, row_counter
+from app.shared.cursor_pagination import CountMode, CursorPage, KeysetPaginator
+from app.shared.filters import SortOrder, SortSpec
+
+
+# Line statuses that still have quantity out on rent
+OPEN_RENTAL_STATUSES = (
+    RentalStatus.ACTIVE,
+    RentalStatus.LATE,
+    RentalStatus.EXTENDED,
+    RentalStatus.PARTIAL_RETURN,
+    RentalStatus.LATE_PARTIAL_RETURN,
+)
+
+# Transaction list pages: newest first, (transaction_date, id) keyset
+TRANSACTION_PAGINATOR = KeysetPaginator(
+    TransactionHeader, [SortSpec(field="transaction_date", order=SortOrder.DESC)]
+)
 
 
 class TransactionHeaderRepository:
@@ -82,10 +100,8 @@ class TransactionHeaderRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_all(
-        self,
-        skip: int = 0,
-        limit: int = 100,
+    @staticmethod
+    def _list_conditions(
         transaction_type: Optional[TransactionType] = None,
         status: Optional[TransactionStatus] = None,
         payment_status: Optional[PaymentStatus] = None,
@@ -95,11 +111,8 @@ class TransactionHeaderRepository:
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
         active_only: bool = True,
-    ) -> List[TransactionHeader]:
-        """Get all transaction headers with optional filtering."""
-        query = select(TransactionHeader)
-
-        # Apply filters
+    ) -> list:
+        """WHERE conditions shared by the transaction list queries."""
         conditions = []
         if active_only:
             conditions.append(TransactionHeader.is_active == True)
@@ -124,7 +137,36 @@ class TransactionHeaderRepository:
             conditions.append(
                 TransactionHeader.transaction_date <= datetime.combine(date_to, datetime.max.time())
             )
+        return conditions
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+        payment_status: Optional[PaymentStatus] = None,
+        customer_id: Optional[UUID] = None,
+        location_id: Optional[UUID] = None,
+        sales_person_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        active_only: bool = True,
+    ) -> List[TransactionHeader]:
+        """Get all transaction headers with optional filtering."""
+        query = select(TransactionHeader)
 
+        conditions = self._list_conditions(
+            transaction_type=transaction_type,
+            status=status,
+            payment_status=payment_status,
+            customer_id=customer_id,
+            location_id=location_id,
+            sales_person_id=sales_person_id,
+            date_from=date_from,
+            date_to=date_to,
+            active_only=active_only,
+        )
         if conditions:
             query = query.where(and_(*conditions))
 
@@ -133,6 +175,26 @@ class TransactionHeaderRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        count: CountMode = CountMode.NONE,
+        **filters: Any,
+    ) -> CursorPage:
+        """
+        Newest-first page of transaction headers using keyset pagination.
+
+        Accepts the same filters as ``get_all``; cost does not grow with depth.
+        """
+        query = select(TransactionHeader)
+        conditions = self._list_conditions(**filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+        return await TRANSACTION_PAGINATOR.paginate(
+            self.session, query, cursor=cursor, limit=limit, count=count
+        )
+
     async def get_all_with_lines(
         self,
         skip: int = 0,
@@ -198,41 +260,25 @@ class TransactionHeaderRepository:
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
         active_only: bool = True,
-    ) -> int:
-        """Count all transaction headers with optional filtering."""
-        query = select(func.count(TransactionHeader.id))
-
-        # Apply filters
-        conditions = []
-        if active_only:
-            conditions.append(TransactionHeader.is_active == True)
-        if transaction_type:
-            conditions.append(TransactionHeader.transaction_type == transaction_type.value)
-        if status:
-            conditions.append(TransactionHeader.status == status.value)
-        if payment_status:
-            conditions.append(TransactionHeader.payment_status == payment_status.value)
-        if customer_id:
-            conditions.append(TransactionHeader.customer_id == str(customer_id))
-        if location_id:
-            conditions.append(TransactionHeader.location_id == str(location_id))
-        if sales_person_id:
-            conditions.append(TransactionHeader.sales_person_id == str(sales_person_id))
-        if date_from:
-            conditions.append(
-                TransactionHeader.transaction_date
-                >= datetime.combine(date_from, datetime.min.time())
-            )
-        if date_to:
-            conditions.append(
-                TransactionHeader.transaction_date <= datetime.combine(date_to, datetime.max.time())
-            )
-
+    ) -> CountResult:
+        """Count all transaction headers with optional filtering (exact, estimated or cached)."""
+        query = select(TransactionHeader.id)
+
+        conditions = self._list_conditions(
+            transaction_type=transaction_type,
+            status=status,
+            payment_status=payment_status,
+            customer_id=customer_id,
+            location_id=location_id,
+            sales_person_id=sales_person_id,
+            date_from=date_from,
+            date_to=date_to,
+            active_only=active_only,
+        )
         if conditions:
             query = query.where(and_(*conditions))
 
-        result = await self.session.execute(query)
-        return result.scalar()
+        return await row_counter.count(self.session, query)
 
     async def search(
         self,
@@ -384,19 +430,181 @@ class TransactionHeaderRepository:
 
         query = select(TransactionHeader).where(
             and_(
-                TransactionHeader.transaction_type == TransactionType.RENTAL.value,
-                TransactionHeader.status == TransactionStatus.IN_PROGRESS.value,
-                TransactionHeader.rental_end_date <= as_of_date,
-                TransactionHeader.actual_return_date.is_(None),
+                TransactionHeader.transaction_type == TransactionType.RENTAL,
+                TransactionHeader.next_due_date.isnot(None),
+                TransactionHeader.next_due_date <= as_of_date,
                 TransactionHeader.is_active == True,
             )
         )
 
-        query = query.order_by(asc(TransactionHeader.rental_end_date))
+        query = query.order_by(asc(TransactionHeader.next_due_date), asc(TransactionHeader.id))
 
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def refresh_next_due_dates(self, transaction_ids: List[UUID]) -> None:
+        """
+        Recompute the precomputed next_due_date for rental transactions.
+
+        Runs a single UPDATE with a correlated MIN() over the open lines, so it
+        must be called after line changes have been flushed. Fully returned
+        rentals end up with NULL and drop out of the due/overdue indexes.
+        """
+        if not transaction_ids:
+            return
+
+        earliest_open_end_date = (
+            select(func.min(TransactionLine.rental_end_date))
+            .where(
+                and_(
+                    TransactionLine.transaction_id == TransactionHeader.id,
+                    TransactionLine.returned_quantity < TransactionLine.quantity,
+                    TransactionLine.current_rental_status.in_(OPEN_RENTAL_STATUSES),
+                )
+            )
+            .scalar_subquery()
+        )
+
+        await self.session.execute(
+            update(TransactionHeader)
+            .where(
+                and_(
+                    TransactionHeader.id.in_([str(tid) for tid in transaction_ids]),
+                    TransactionHeader.transaction_type == TransactionType.RENTAL,
+                )
+            )
+            .values(next_due_date=earliest_open_end_date)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _rental_counter_aggregates():
+        """Per-transaction rental counters recomputed from the lines."""
+        is_returned = TransactionLine.returned_quantity >= TransactionLine.quantity
+        is_partial = and_(
+            TransactionLine.returned_quantity > 0,
+            TransactionLine.returned_quantity < TransactionLine.quantity,
+        )
+        return (
+            select(
+                TransactionLine.transaction_id.label("transaction_id"),
+                func.count().label("rental_line_count"),
+                func.count().filter(is_returned).label("returned_line_count"),
+                func.count().filter(is_partial).label("partial_return_line_count"),
+                func.coalesce(func.sum(TransactionLine.returned_quantity), 0).label("returned_quantity_total"),
+            )
+            .group_by(TransactionLine.transaction_id)
+        )
+
+    async def apply_rental_counter_delta(
+        self,
+        transaction_id: UUID,
+        returned_lines: int = 0,
+        partial_lines: int = 0,
+        returned_quantity: Decimal = Decimal("0"),
+    ):
+        """
+        Adjust a rental's return counters in place.
+
+        The increments are applied in SQL so concurrent returns against the
+        same rental cannot overwrite each other. Returns the updated counters
+        together with next_due_date so the caller can derive the header status
+        without another query.
+        """
+        result = await self.session.execute(
+            update(TransactionHeader)
+            .where(TransactionHeader.id == str(transaction_id))
+            .values(
+                returned_line_count=TransactionHeader.returned_line_count + returned_lines,
+                partial_return_line_count=TransactionHeader.partial_return_line_count + partial_lines,
+                returned_quantity_total=TransactionHeader.returned_quantity_total + returned_quantity,
+            )
+            .returning(
+                TransactionHeader.rental_line_count,
+                TransactionHeader.returned_line_count,
+                TransactionHeader.partial_return_line_count,
+                TransactionHeader.returned_quantity_total,
+                TransactionHeader.next_due_date,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.one_or_none()
+
+    async def refresh_rental_counters(self, transaction_ids: List[UUID]) -> None:
+        """Recompute the rental return counters from the lines in one UPDATE."""
+        if not transaction_ids:
+            return
+
+        counters = self._rental_counter_aggregates().subquery()
+
+        await self.session.execute(
+            update(TransactionHeader)
+            .where(
+                and_(
+                    TransactionHeader.id == counters.c.transaction_id,
+                    TransactionHeader.id.in_([str(tid) for tid in transaction_ids]),
+                )
+            )
+            .values(
+                rental_line_count=counters.c.rental_line_count,
+                returned_line_count=counters.c.returned_line_count,
+                partial_return_line_count=counters.c.partial_return_line_count,
+                returned_quantity_total=counters.c.returned_quantity_total,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def find_rental_counter_mismatches(
+        self,
+        transaction_ids: Optional[List[UUID]] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare stored rental counters with a full recompute from the lines.
+
+        Returns one entry per rental whose counters differ, with both the
+        stored and the expected values.
+        """
+        counters = self._rental_counter_aggregates().subquery()
+        fields = (
+            "rental_line_count",
+            "returned_line_count",
+            "partial_return_line_count",
+            "returned_quantity_total",
+        )
+
+        query = (
+            select(
+                TransactionHeader.id,
+                *[getattr(TransactionHeader, name) for name in fields],
+                *[counters.c[name].label(f"expected_{name}") for name in fields],
+            )
+            .join(counters, counters.c.transaction_id == TransactionHeader.id)
+            .where(
+                and_(
+                    TransactionHeader.transaction_type == TransactionType.RENTAL,
+                    or_(*[
+                        getattr(TransactionHeader, name).is_distinct_from(counters.c[name])
+                        for name in fields
+                    ]),
+                )
+            )
+            .order_by(TransactionHeader.id)
+            .limit(limit)
+        )
+        if transaction_ids:
+            query = query.where(TransactionHeader.id.in_([str(tid) for tid in transaction_ids]))
+
+        result = await self.session.execute(query)
+        return [
+            {
+                "transaction_id": row.id,
+                "stored": {name: row._mapping[name] for name in fields},
+                "expected": {name: row._mapping[f"expected_{name}"] for name in fields},
+            }
+            for row in result
+        ]
+
     async def update(
         self, transaction_id: UUID, transaction_data: TransactionHeaderUpdate
     ) -> Optional[TransactionHeader]:
@@ -592,11 +800,11 @@ class TransactionHeaderRepository:
         date_to: Optional[date] = None,
         overdue_only: bool = False,
         active_only: bool = True,
-    ) -> int:
-        """Count rental transactions with the same filters."""
+    ) -> CountResult:
+        """Count rental transactions with the same filters (exact, estimated or cached)."""
         
         query = (
-            select(func.count(TransactionHeader.id))
+            select(TransactionHeader.id)
             .join(RentalLifecycle, TransactionHeader.id == RentalLifecycle.transaction_id, isouter=True)
         )
 
@@ -647,8 +855,7 @@ class TransactionHeaderRepository:
         if conditions:
             query = query.where(and_(*conditions))
 
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        return await row_counter.count(self.session, query)
 
 
 class TransactionLineRepository:
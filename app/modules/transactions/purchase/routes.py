@@ -23,6 +23,7 @@ from app.modules.transactions.purchase.schemas import (
     NewPurchaseResponse,
 )
 from app.core.errors import NotFoundError, ValidationError, ConflictError
+from app.modules.monitoring.query_budget import query_budget_route
 
 
 router = APIRouter(tags=["purchases"])
@@ -34,6 +35,7 @@ def get_purchase_service(session: AsyncSession = Depends(get_session)) -> Purcha
 
 
 @router.get("/", response_model=List[PurchaseResponse])
+@query_budget_route(max_repeats=3)
 async def get_purchase_transactions(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
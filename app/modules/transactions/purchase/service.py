@@ -27,12 +27,16 @@ from app.modules.transactions.purchase.schemas import (
     NewPurchaseResponse
 )
 from app.modules.transactions.base.repository import TransactionHeaderRepository, TransactionLineRepository
+from app.modules.suppliers.models import Supplier
 from app.modules.suppliers.repository import SupplierRepository
+from app.modules.master_data.locations.models import Location
 from app.modules.master_data.locations.repository import LocationRepository
+from app.modules.master_data.item_master.models import Item
 from app.modules.master_data.item_master.repository import ItemMasterRepository
 from app.modules.inventory.repository import StockLevelRepository, StockMovementRepository
 from app.modules.inventory.models import MovementType, ReferenceType
 from app.modules.inventory.schemas import StockLevelCreate
+from app.shared.loaders import get_loaders
 
 
 class PurchaseService:
@@ -47,6 +51,7 @@ class PurchaseService:
         self.item_repository = ItemMasterRepository(session)
         self.stock_level_repository = StockLevelRepository(session)
         self.stock_movement_repository = StockMovementRepository(session)
+        self.loaders = get_loaders(session)
     
     async def get_purchase_transactions(
         self,
@@ -209,18 +214,21 @@ class PurchaseService:
         # Get supplier details
         supplier = None
         if transaction.customer_id:
-            supplier = await self.supplier_repository.get_by_id(UUID(transaction.customer_id))
+            supplier = await self.loaders[Supplier].load(transaction.customer_id)
         
         # Get location details
         location = None
         if transaction.location_id:
-            location = await self.location_repository.get_by_id(UUID(transaction.location_id))
+            location = await self.loaders[Location].load(transaction.location_id)
             
-        # Get item details for each line
+        # Get item details for each line (one query for all lines)
+        items_map = await self.loaders[Item].load_map(
+            line.item_id for line in transaction.transaction_lines
+        )
         items_details = {}
         for line in transaction.transaction_lines:
             if line.item_id:
-                item = await self.item_repository.get_by_id(UUID(line.item_id))
+                item = items_map.get(UUID(line.item_id))
                 if item:
                     items_details[str(line.item_id)] = {
                         "id": item.id,
@@ -286,9 +294,9 @@ class PurchaseService:
         if not location:
             raise NotFoundError(f"Location with ID {purchase_data.location_id} not found")
         
-        # Validate all items exist
-        for item_data in purchase_data.items:
-            item = await self.item_repository.get_by_id(UUID(item_data.item_id))
+        # Validate all items exist (one query; the line loop below reuses them)
+        items = await self.loaders[Item].load_many(item_data.item_id for item_data in purchase_data.items)
+        for item_data, item in zip(purchase_data.items, items):
             if not item:
                 raise NotFoundError(f"Item with ID {item_data.item_id} not found")
         
@@ -327,7 +335,7 @@ class PurchaseService:
         for item_data in purchase_data.items:
             print(f"DEBUG: Processing item {item_data.item_id}")
             # Get item details for description
-            item = await self.item_repository.get_by_id(UUID(item_data.item_id))
+            item = await self.loaders[Item].load(item_data.item_id)
             print(f"DEBUG: Retrieved item: {item}")
             
             # Calculate line amounts
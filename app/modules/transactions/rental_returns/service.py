@@ -34,6 +34,7 @@ from app.modules.transactions.rental_returns.schemas import (
     RentalReturnFees,
 )
 from app.modules.transactions.rentals.services import RentalsService
+from app.modules.transactions.services.rental_status_updater import RentalStatusUpdater
 from app.modules.customers.repository import CustomerRepository
 from app.modules.inventory.repository import ItemRepository, StockLevelRepository
 from app.modules.inventory.models import StockLevel, StockMovement, MovementType, ReferenceType
@@ -53,6 +54,7 @@ class RentalReturnsService:
         self.stock_level_repository = StockLevelRepository(session)
         self.location_repository = LocationRepository(session)
         self.rentals_service = RentalsService(session)
+        self.status_updater = RentalStatusUpdater(session)
         self.logger = get_purchase_logger()
 
     async def create_rental_return(self, return_data: RentalReturnCreate) -> TransactionHeader:
@@ -125,6 +127,7 @@ class RentalReturnsService:
                 await self.session.flush()
                 
                 # Process return items
+                line_returns = []
                 for idx, item in enumerate(return_data.return_items):
                     # Get original line
                     original_line = next(
@@ -169,10 +172,11 @@ class RentalReturnsService:
                     )
                     self.session.add(return_line)
                     
-                    # Update original line
-                    original_line.returned_quantity = (original_line.returned_quantity or Decimal("0")) + item.return_quantity
+                    # Update original line; its status follows from the returned quantity
+                    previous_returned = original_line.returned_quantity or Decimal("0")
+                    original_line.returned_quantity = previous_returned + item.return_quantity
                     original_line.return_date = return_data.actual_return_date
-                    original_line.current_rental_status = RentalStatus.COMPLETED
+                    line_returns.append((original_line, previous_returned))
                     
                     # Update inventory
                     await self._update_inventory_for_return(
@@ -208,6 +212,13 @@ class RentalReturnsService:
                     original_transaction.status = TransactionStatus.COMPLETED
                 else:
                     original_transaction.status = TransactionStatus.PARTIAL
+
+                # Refresh line statuses, next_due_date and the header return counters
+                await self.status_updater.apply_line_returns(
+                    original_transaction.id,
+                    line_returns,
+                    as_of_date=return_data.actual_return_date
+                )
             
             # Return the complete transaction
             return await self.transaction_repository.get_with_lines(return_transaction.id)
@@ -271,6 +282,12 @@ class RentalReturnsService:
                 
                 # Update transaction status
                 transaction.status = TransactionStatus.COMPLETED
+                transaction.next_due_date = None
+                transaction.returned_line_count = transaction.rental_line_count
+                transaction.partial_return_line_count = 0
+                transaction.returned_quantity_total = sum(
+                    line.quantity for line in transaction.transaction_lines
+                )
                 
                 # Apply any fees
                 if return_data.late_fees:
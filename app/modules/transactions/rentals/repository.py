@@ -4,12 +4,12 @@ Rentals Repository
 Data access layer for rental-specific operations.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, update
+from sqlalchemy import select, and_, or_, func, update, tuple_
 from sqlalchemy.orm import selectinload
 
 from app.modules.transactions.base.models import (
@@ -20,7 +20,10 @@ from app.modules.transactions.base.models import (
     PaymentStatus,
     RentalStatus,
 )
-from app.modules.transactions.base.repository import TransactionHeaderRepository
+from app.modules.transactions.base.repository import (
+    TransactionHeaderRepository,
+    OPEN_RENTAL_STATUSES,
+)
 
 
 class RentalsRepository(TransactionHeaderRepository):
@@ -51,6 +54,28 @@ class RentalsRepository(TransactionHeaderRepository):
             filters.append(TransactionHeader.transaction_date >= datetime.combine(date_from, datetime.min.time()))
         if date_to:
             filters.append(TransactionHeader.transaction_date <= datetime.combine(date_to, datetime.max.time()))
+        if rental_status:
+            filters.append(
+                select(TransactionLine.id)
+                .where(
+                    and_(
+                        TransactionLine.transaction_id == TransactionHeader.id,
+                        TransactionLine.current_rental_status == rental_status,
+                    )
+                )
+                .exists()
+            )
+        if overdue_only:
+            filters.append(
+                select(TransactionLine.id)
+                .where(
+                    and_(
+                        TransactionLine.transaction_id == TransactionHeader.id,
+                        *self._open_line_filters(date.today(), inclusive=False),
+                    )
+                )
+                .exists()
+            )
 
         stmt = (
             select(TransactionHeader)
@@ -62,35 +87,7 @@ class RentalsRepository(TransactionHeaderRepository):
         )
         
         result = await self.session.execute(stmt)
-        rentals = result.scalars().unique().all()
-        
-        # Additional filtering for rental status and overdue
-        if rental_status or overdue_only:
-            filtered_rentals = []
-            for rental in rentals:
-                # Check rental status in transaction lines
-                if rental_status:
-                    has_matching_status = any(
-                        line.current_rental_status == rental_status 
-                        for line in rental.transaction_lines
-                    )
-                    if not has_matching_status:
-                        continue
-                
-                # Check if overdue
-                if overdue_only:
-                    is_overdue = any(
-                        line.rental_end_date and line.rental_end_date < date.today() and 
-                        line.returned_quantity < line.quantity
-                        for line in rental.transaction_lines
-                    )
-                    if not is_overdue:
-                        continue
-                
-                filtered_rentals.append(rental)
-            return filtered_rentals
-        
-        return rentals
+        return result.scalars().unique().all()
 
     async def get_rental_by_id(self, rental_id: UUID) -> Optional[TransactionHeader]:
         """Get a single rental transaction by ID."""
@@ -152,55 +149,153 @@ class RentalsRepository(TransactionHeaderRepository):
             'average_amount': float(summary.average_amount or 0),
         }
 
-    async def get_rentals_due_for_return(
+    @staticmethod
+    def _open_line_filters(target_date: date, inclusive: bool) -> list:
+        """
+        Predicates for rental lines still out on rent and due by target_date.
+
+        rental_start_date <= target_date is implied by the end-date bound but lets
+        the planner range-scan idx_rental_dates (start, end); the status IN list
+        is served by idx_rental_status.
+        """
+        end_date_bound = (
+            TransactionLine.rental_end_date <= target_date
+            if inclusive
+            else TransactionLine.rental_end_date < target_date
+        )
+        return [
+            TransactionLine.rental_start_date <= target_date,
+            end_date_bound,
+            TransactionLine.current_rental_status.in_(OPEN_RENTAL_STATUSES),
+            TransactionLine.returned_quantity < TransactionLine.quantity,
+        ]
+
+    def _due_rentals_query(
         self,
-        as_of_date: Optional[date] = None
-    ) -> List[TransactionHeader]:
-        """Get rentals due for return."""
-        target_date = as_of_date or date.today()
-        
+        target_date: date,
+        inclusive: bool,
+        use_next_due_date: bool,
+    ):
+        """
+        Build the base select of (header, due_date) for due/overdue reports.
+
+        With use_next_due_date the filter runs entirely on the precomputed
+        TransactionHeader.next_due_date column (partial index, returned rentals
+        are NULL and never scanned). Otherwise the due date is aggregated from
+        transaction_lines using the line-level indexes.
+        """
+        if use_next_due_date:
+            due_date = TransactionHeader.next_due_date
+            cutoff = due_date <= target_date if inclusive else due_date < target_date
+            stmt = select(TransactionHeader, due_date.label("rental_due_date")).where(
+                and_(
+                    TransactionHeader.transaction_type == TransactionType.RENTAL,
+                    TransactionHeader.is_active == True,
+                    due_date.isnot(None),
+                    cutoff,
+                )
+            )
+            return stmt, due_date
+
+        due_lines = (
+            select(
+                TransactionLine.transaction_id.label("transaction_id"),
+                func.min(TransactionLine.rental_end_date).label("rental_due_date"),
+            )
+            .where(and_(*self._open_line_filters(target_date, inclusive)))
+            .group_by(TransactionLine.transaction_id)
+            .subquery()
+        )
         stmt = (
-            select(TransactionHeader)
-            .join(TransactionLine)
+            select(TransactionHeader, due_lines.c.rental_due_date)
+            .join(due_lines, due_lines.c.transaction_id == TransactionHeader.id)
             .where(
                 and_(
                     TransactionHeader.transaction_type == TransactionType.RENTAL,
+                    TransactionHeader.is_active == True,
                     TransactionHeader.status != TransactionStatus.COMPLETED,
-                    TransactionLine.rental_end_date <= target_date,
-                    TransactionLine.returned_quantity < TransactionLine.quantity
                 )
             )
-            .options(selectinload(TransactionHeader.transaction_lines))
-            .distinct()
         )
-        
+        return stmt, due_lines.c.rental_due_date
+
+    async def get_due_rentals_page(
+        self,
+        as_of_date: Optional[date] = None,
+        inclusive: bool = True,
+        location_id: Optional[UUID] = None,
+        after_due_date: Optional[date] = None,
+        after_id: Optional[UUID] = None,
+        limit: Optional[int] = 100,
+        use_next_due_date: bool = True,
+    ) -> List[Tuple[TransactionHeader, date]]:
+        """
+        Get one keyset page of rentals due (inclusive) or overdue (exclusive) as of a date.
+
+        Rows are ordered by (due_date, id); pass the last row's values as
+        after_due_date/after_id to fetch the next page. A limit of None
+        returns every matching rental.
+        """
+        target_date = as_of_date or date.today()
+        stmt, due_date = self._due_rentals_query(target_date, inclusive, use_next_due_date)
+
+        if location_id:
+            stmt = stmt.where(TransactionHeader.location_id == str(location_id))
+        if after_due_date is not None and after_id is not None:
+            stmt = stmt.where(
+                tuple_(due_date, TransactionHeader.id) > tuple_(after_due_date, str(after_id))
+            )
+
+        stmt = stmt.order_by(due_date.asc(), TransactionHeader.id.asc()).limit(limit)
+
         result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return [(row[0], row[1]) for row in result.all()]
 
-    async def get_overdue_rentals(
+    async def get_due_rentals_by_location(
         self,
-        as_of_date: Optional[date] = None
-    ) -> List[TransactionHeader]:
-        """Get overdue rentals."""
+        as_of_date: Optional[date] = None,
+        inclusive: bool = True,
+        use_next_due_date: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Count due (or overdue) rentals per location in one grouped query."""
         target_date = as_of_date or date.today()
-        
+        base, due_date = self._due_rentals_query(target_date, inclusive, use_next_due_date)
+
         stmt = (
-            select(TransactionHeader)
-            .join(TransactionLine)
-            .where(
-                and_(
-                    TransactionHeader.transaction_type == TransactionType.RENTAL,
-                    TransactionHeader.status != TransactionStatus.COMPLETED,
-                    TransactionLine.rental_end_date < target_date,
-                    TransactionLine.returned_quantity < TransactionLine.quantity
-                )
+            base.with_only_columns(
+                TransactionHeader.location_id,
+                func.count(TransactionHeader.id).label("rental_count"),
+                func.min(due_date).label("earliest_due_date"),
             )
-            .options(selectinload(TransactionHeader.transaction_lines))
-            .distinct()
+            .group_by(TransactionHeader.location_id)
+            .order_by(TransactionHeader.location_id)
         )
-        
+
         result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return [
+            {
+                "location_id": row.location_id,
+                "rental_count": row.rental_count,
+                "earliest_due_date": row.earliest_due_date,
+            }
+            for row in result.all()
+        ]
+
+    async def get_rentals_due_for_return(
+        self,
+        as_of_date: Optional[date] = None
+    ) -> List[TransactionHeader]:
+        """Get rentals due for return."""
+        rows = await self.get_due_rentals_page(as_of_date, inclusive=True, limit=None)
+        return [header for header, _ in rows]
+
+    async def get_overdue_rentals(
+        self,
+        as_of_date: Optional[date] = None
+    ) -> List[TransactionHeader]:
+        """Get overdue rentals."""
+        rows = await self.get_due_rentals_page(as_of_date, inclusive=False, limit=None)
+        return [header for header, _ in rows]
 
     async def get_customer_rental_history(
         self,
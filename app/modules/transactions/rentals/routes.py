@@ -24,6 +24,7 @@ from app.modules.transactions.rentals.schemas import (
     NewRentalResponse,
     RentableItemResponse,
     RentalPeriodUpdate,
+    RentalDueLocationSummary,
 )
 from app.core.errors import NotFoundError, ValidationError, ConflictError
 
@@ -227,17 +228,64 @@ async def extend_rental_period(
 
 @router.get("/reports/due-for-return", response_model=List[RentalResponse])
 async def get_rentals_due_for_return(
+    as_of_date: Optional[date] = Query(None, description="As of date"),
+    location_id: Optional[UUID] = Query(None, description="Filter by location ID"),
+    after_due_date: Optional[date] = Query(None, description="Keyset cursor: due date of the last row of the previous page"),
+    after_id: Optional[UUID] = Query(None, description="Keyset cursor: ID of the last row of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    service: RentalsService = Depends(get_rentals_service),
+):
+    """
+    Get rental transactions due for return, ordered by due date.
+
+    Pages with keyset pagination: pass the `next_due_date` and `id` of the last
+    row as `after_due_date` and `after_id` to fetch the next page.
+    """
+    return await service.get_rental_transactions_due_for_return(
+        as_of_date=as_of_date,
+        location_id=location_id,
+        after_due_date=after_due_date,
+        after_id=after_id,
+        limit=limit,
+    )
+
+
+@router.get("/reports/due-for-return/by-location", response_model=List[RentalDueLocationSummary])
+async def get_rentals_due_for_return_by_location(
     as_of_date: Optional[date] = Query(None, description="As of date"),
     service: RentalsService = Depends(get_rentals_service),
 ):
-    """Get rental transactions due for return."""
-    return await service.get_rental_transactions_due_for_return(as_of_date)
+    """Get counts of rentals due for return grouped by location."""
+    return await service.get_due_rentals_by_location(as_of_date=as_of_date)
 
 
 @router.get("/reports/overdue", response_model=List[RentalResponse])
 async def get_overdue_rentals(
+    as_of_date: Optional[date] = Query(None, description="As of date"),
+    location_id: Optional[UUID] = Query(None, description="Filter by location ID"),
+    after_due_date: Optional[date] = Query(None, description="Keyset cursor: due date of the last row of the previous page"),
+    after_id: Optional[UUID] = Query(None, description="Keyset cursor: ID of the last row of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
+    service: RentalsService = Depends(get_rentals_service),
+):
+    """
+    Get overdue rental transactions, most overdue first.
+
+    Uses the same keyset pagination as the due-for-return report.
+    """
+    return await service.get_overdue_rentals(
+        as_of_date=as_of_date,
+        location_id=location_id,
+        after_due_date=after_due_date,
+        after_id=after_id,
+        limit=limit,
+    )
+
+
+@router.get("/reports/overdue/by-location", response_model=List[RentalDueLocationSummary])
+async def get_overdue_rentals_by_location(
     as_of_date: Optional[date] = Query(None, description="As of date"),
     service: RentalsService = Depends(get_rentals_service),
 ):
-    """Get overdue rental transactions."""
-    return await service.get_overdue_rentals(as_of_date)
\ No newline at end of file
+    """Get counts of overdue rentals grouped by location."""
+    return await service.get_due_rentals_by_location(as_of_date=as_of_date, overdue_only=True)
@@ -287,6 +287,7 @@ class RentalResponse(BaseModel):
     pickup_required: bool = Field(False, description="Whether pickup is required")
     pickup_date: Optional[date] = Field(None, description="Pickup date")
     pickup_time: Optional[str] = Field(None, description="Pickup time")
+    next_due_date: Optional[date] = Field(None, description="Earliest return date among items still on rent")
     created_at: datetime
     updated_at: datetime
     items: List[RentalLineItemResponse] = Field(default_factory=list, description="Rental items")
@@ -342,6 +343,15 @@ class RentalResponse(BaseModel):
         )
 
 
+class RentalDueLocationSummary(BaseModel):
+    """Schema for due/overdue rental counts grouped by location."""
+
+    location_id: Optional[UUID] = Field(None, description="Location ID")
+    location_name: Optional[str] = Field(None, description="Location name")
+    rental_count: int = Field(..., description="Number of rentals due at this location")
+    earliest_due_date: date = Field(..., description="Earliest due date at this location")
+
+
 class RentalPeriodUpdate(BaseModel):
     """Schema for updating rental period."""
 
@@ -4,6 +4,7 @@ Simplified Rentals Service
 Streamlined business logic for rental operations with reduced complexity.
 """
 
+import asyncio
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from decimal import Decimal
@@ -20,6 +21,7 @@ from app.modules.transactions.base.models import (
     TransactionType,
     TransactionStatus,
     PaymentMethod,
+    PaymentStatus,
     LineItemType,
     RentalStatus,
     RentalPeriodUnit,
@@ -28,16 +30,21 @@ from app.modules.transactions.base.repository import (
     TransactionHeaderRepository,
     TransactionLineRepository,
 )
+from app.modules.transactions.rentals.repository import RentalsRepository
 from app.modules.transactions.rentals.schemas import (
     RentalResponse,
     RentalItemCreate,
     NewRentalRequest,
     NewRentalResponse,
+    RentalDueLocationSummary,
 )
+from app.modules.customers.models import Customer
 from app.modules.customers.repository import CustomerRepository
 from app.modules.inventory.repository import ItemRepository, StockLevelRepository
 from app.modules.inventory.models import StockLevel, StockMovement, MovementType, ReferenceType
+from app.modules.master_data.locations.models import Location
 from app.modules.master_data.locations.repository import LocationRepository
+from app.shared.loaders import get_loaders
 from app.core.logger import get_purchase_logger
 
 
@@ -48,10 +55,12 @@ class RentalsService:
         self.session = session
         self.transaction_repository = TransactionHeaderRepository(session)
         self.line_repository = TransactionLineRepository(session)
+        self.rentals_repository = RentalsRepository(session)
         self.customer_repository = CustomerRepository(session)
         self.item_repository = ItemRepository(session)
         self.stock_level_repository = StockLevelRepository(session)
         self.location_repository = LocationRepository(session)
+        self.loaders = get_loaders(session)
         self.logger = get_purchase_logger()
 
     async def create_rental(self, rental_data: NewRentalRequest) -> NewRentalResponse:
@@ -90,14 +99,14 @@ class RentalsService:
     async def _validate_rental_prerequisites(self, rental_data: NewRentalRequest) -> None:
         """Validate all rental prerequisites in one method."""
         # Validate customer
-        customer = await self.customer_repository.get_by_id(rental_data.customer_id)
+        customer = await self.loaders[Customer].load(rental_data.customer_id)
         if not customer:
             raise NotFoundError(f"Customer {rental_data.customer_id} not found")
         if not customer.can_transact:
             raise ValidationError(f"Customer {customer.name} cannot transact")
         
         # Validate location
-        location = await self.location_repository.get_by_id(rental_data.location_id)
+        location = await self.loaders[Location].load(rental_data.location_id)
         if not location:
             raise NotFoundError(f"Location {rental_data.location_id} not found")
 
@@ -267,6 +276,10 @@ class RentalsService:
             # Bulk insert stock movements
             self.session.add_all(stock_movements)
             
+            # Precompute the due date used by the due/overdue reports
+            transaction.next_due_date = min(line.rental_end_date for line in transaction_lines)
+            transaction.rental_line_count = len(transaction_lines)
+
             # Update transaction totals
             transaction.subtotal = total_amount
             transaction.total_amount = total_amount
@@ -366,15 +379,101 @@ class RentalsService:
         # Temporary implementation
         raise NotFoundError(f"Rental {rental_id} not found")
     
-    async def get_rental_transactions_due_for_return(self, as_of_date: Optional[date] = None):
-        """Get rental transactions due for return."""
-        # Temporary implementation
-        return []
+    async def get_rental_transactions_due_for_return(
+        self,
+        as_of_date: Optional[date] = None,
+        location_id: Optional[UUID] = None,
+        after_due_date: Optional[date] = None,
+        after_id: Optional[UUID] = None,
+        limit: int = 100,
+        use_next_due_date: bool = True,
+    ) -> List[RentalResponse]:
+        """Get rental transactions due for return on or before the given date."""
+        rows = await self.rentals_repository.get_due_rentals_page(
+            as_of_date=as_of_date,
+            inclusive=True,
+            location_id=location_id,
+            after_due_date=after_due_date,
+            after_id=after_id,
+            limit=limit,
+            use_next_due_date=use_next_due_date,
+        )
+        return await self._build_due_rental_responses(rows)
     
-    async def get_overdue_rentals(self, as_of_date: Optional[date] = None):
-        """Get overdue rental transactions."""
-        # Temporary implementation
-        return []
+    async def get_overdue_rentals(
+        self,
+        as_of_date: Optional[date] = None,
+        location_id: Optional[UUID] = None,
+        after_due_date: Optional[date] = None,
+        after_id: Optional[UUID] = None,
+        limit: int = 100,
+        use_next_due_date: bool = True,
+    ) -> List[RentalResponse]:
+        """Get rental transactions past their due date."""
+        rows = await self.rentals_repository.get_due_rentals_page(
+            as_of_date=as_of_date,
+            inclusive=False,
+            location_id=location_id,
+            after_due_date=after_due_date,
+            after_id=after_id,
+            limit=limit,
+            use_next_due_date=use_next_due_date,
+        )
+        return await self._build_due_rental_responses(rows)
+
+    async def get_due_rentals_by_location(
+        self,
+        as_of_date: Optional[date] = None,
+        overdue_only: bool = False,
+        use_next_due_date: bool = True,
+    ) -> List[RentalDueLocationSummary]:
+        """Get due (or overdue) rental counts grouped by location."""
+        groups = await self.rentals_repository.get_due_rentals_by_location(
+            as_of_date=as_of_date,
+            inclusive=not overdue_only,
+            use_next_due_date=use_next_due_date,
+        )
+        location_ids = [g["location_id"] for g in groups if g["location_id"]]
+        locations = await self._load_by_ids(Location, location_ids)
+
+        return [
+            RentalDueLocationSummary(
+                location_id=g["location_id"],
+                location_name=locations[g["location_id"]].location_name
+                if g["location_id"] in locations
+                else None,
+                rental_count=g["rental_count"],
+                earliest_due_date=g["earliest_due_date"],
+            )
+            for g in groups
+        ]
+
+    async def _load_by_ids(self, model, ids: List[str]) -> Dict[str, Any]:
+        """Load rows of a model by ID in one query, keyed by string ID."""
+        if not ids:
+            return {}
+        result = await self.session.execute(select(model).where(model.id.in_(set(ids))))
+        return {str(row.id): row for row in result.scalars().all()}
+
+    async def _build_due_rental_responses(
+        self, rows: List[tuple]
+    ) -> List[RentalResponse]:
+        """Build report responses, loading customers and locations once per page."""
+        customers = await self._load_by_ids(
+            Customer, [t.customer_id for t, _ in rows if t.customer_id]
+        )
+        locations = await self._load_by_ids(
+            Location, [t.location_id for t, _ in rows if t.location_id]
+        )
+
+        responses = []
+        for transaction, due_date in rows:
+            customer = customers.get(transaction.customer_id)
+            location = locations.get(transaction.location_id)
+            response = self._rental_response(transaction, customer, location)
+            response.next_due_date = due_date
+            responses.append(response)
+        return responses
 
     # Simplified getter methods
     async def get_rental(self, rental_id: UUID) -> RentalResponse:
@@ -412,19 +511,23 @@ class RentalsService:
         result = await self.session.execute(stmt)
         transactions = result.scalars().unique().all()
         
-        return [await self._build_rental_response(t) for t in transactions]
+        # Built concurrently so the customer/location loads batch into one query each
+        return list(await asyncio.gather(*[self._build_rental_response(t) for t in transactions]))
 
     async def _build_rental_response(self, transaction: TransactionHeader) -> RentalResponse:
         """Build rental response from transaction."""
         # Get customer and location
-        customer = await self.customer_repository.get_by_id(UUID(transaction.customer_id)) if transaction.customer_id else None
-        location = await self.location_repository.get_by_id(UUID(transaction.location_id)) if transaction.location_id else None
+        customer = await self.loaders[Customer].load(transaction.customer_id) if transaction.customer_id else None
+        location = await self.loaders[Location].load(transaction.location_id) if transaction.location_id else None
         
-        # Build response
+        return self._rental_response(transaction, customer, location)
+
+    def _rental_response(self, transaction: TransactionHeader, customer, location) -> RentalResponse:
+        """Map a rental transaction and its resolved customer/location to a response."""
         return RentalResponse(
             id=transaction.id,
             customer={"id": customer.id, "name": customer.name} if customer else None,
-            location={"id": location.id, "name": location.name} if location else None,
+            location={"id": location.id, "name": location.location_name} if location else None,
             transaction_date=transaction.transaction_date.date(),
             reference_number=transaction.transaction_number,
             notes=transaction.notes,
@@ -432,9 +535,10 @@ class RentalsService:
             tax_amount=transaction.tax_amount,
             discount_amount=transaction.discount_amount,
             total_amount=transaction.total_amount,
-            deposit_amount=transaction.deposit_amount,
+            deposit_amount=transaction.deposit_amount or Decimal("0"),
             status=transaction.status.value,
-            payment_status=transaction.payment_status.value,
+            payment_status=getattr(transaction.payment_status, "value", transaction.payment_status)
+            or PaymentStatus.PENDING.value,
             delivery_required=transaction.delivery_required,
             delivery_address=transaction.delivery_address,
             delivery_date=transaction.delivery_date,
@@ -442,6 +546,7 @@ class RentalsService:
             pickup_required=transaction.pickup_required,
             pickup_date=transaction.pickup_date,
             pickup_time=transaction.pickup_time,
+            next_due_date=transaction.next_due_date,
             created_at=transaction.created_at,
             updated_at=transaction.updated_at,
             items=[]
@@ -21,7 +21,9 @@ from app.modules.transactions.base.models import (
     PaymentStatus,
 )
 from app.modules.transactions.base.repository import TransactionHeaderRepository
-from app.core.errors import NotFoundError
+from app.modules.transactions.schemas import TransactionHeaderResponse
+from app.core.errors import NotFoundError, ValidationError
+from app.shared.cursor_pagination import CountMode, CursorPage
 
 
 router = APIRouter(tags=["transactions"])
@@ -34,6 +36,46 @@ def get_transaction_repository(session: AsyncSession = Depends(get_session)) ->
 
 # Read-only endpoints for cross-module transaction queries
 
+# Registered before "/{transaction_id}" so the path is not parsed as an id
+@router.get("/page", response_model=CursorPage[TransactionHeaderResponse])
+async def get_transaction_page(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=1000),
+    count: CountMode = Query(CountMode.NONE, description="Whether to include a total count"),
+    transaction_type: Optional[TransactionType] = None,
+    status: Optional[TransactionStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    customer_id: Optional[UUID] = None,
+    location_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    repository: TransactionHeaderRepository = Depends(get_transaction_repository)
+):
+    """
+    Get transactions newest first with cursor pagination.
+
+    Same filters as the list endpoint, but each page costs the same however
+    deep it is. Pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    try:
+        page = await repository.get_page(
+            cursor=cursor,
+            limit=limit,
+            count=count,
+            transaction_type=transaction_type,
+            status=status,
+            payment_status=payment_status,
+            customer_id=customer_id,
+            location_id=location_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValidationError as e:
+        # ``status`` is shadowed by the filter parameter here
+        raise HTTPException(status_code=422, detail=str(e))
+    return page.map(TransactionHeaderResponse.model_validate)
+
+
 @router.get("/{transaction_id}")
 async def get_transaction(
     transaction_id: UUID, 
@@ -35,10 +35,14 @@ from app.modules.transactions.sales.schemas import (
     LocationNestedResponse,
     SaleLineItemResponse,
 )
+from app.modules.customers.models import Customer
 from app.modules.customers.repository import CustomerRepository
 from app.modules.inventory.repository import ItemRepository, StockLevelRepository, InventoryUnitRepository
 from app.modules.inventory.models import StockLevel, StockMovement, MovementType, ReferenceType, InventoryUnit
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.locations.models import Location
 from app.modules.master_data.locations.repository import LocationRepository
+from app.shared.loaders import get_loaders
 from app.core.logger import get_purchase_logger
 
 
@@ -54,6 +58,7 @@ class SalesService:
         self.stock_level_repository = StockLevelRepository(session)
         self.inventory_unit_repository = InventoryUnitRepository(session)
         self.location_repository = LocationRepository(session)
+        self.loaders = get_loaders(session)
         self.logger = get_purchase_logger()
 
     async def get_sale_transactions(
@@ -104,41 +109,12 @@ class SalesService:
             result = await self.session.execute(stmt)
             transactions = result.scalars().unique().all()
 
-            # Get all unique customer and location IDs
-            customer_ids = list({UUID(t.customer_id) for t in transactions if t.customer_id})
-            location_ids = list({UUID(t.location_id) for t in transactions if t.location_id})
-            
-            # Batch fetch customers and locations
-            customers = {}
-            locations = {}
-            
-            if customer_ids:
-                customers = {}
-                for customer_id in customer_ids:
-                    customer = await self.customer_repository.get_by_id(customer_id)
-                    if customer:
-                        customers[customer.id] = customer
-            
-            if location_ids:
-                for location_id in location_ids:
-                    location = await self.location_repository.get_by_id(location_id)
-                    if location:
-                        locations[location.id] = location
-
-            # Get all unique item IDs from transaction lines
-            item_ids = []
-            for transaction in transactions:
-                for line in transaction.transaction_lines:
-                    if line.item_id:
-                        item_ids.append(UUID(line.item_id))
-            
-            # Batch fetch items
-            items = {}
-            if item_ids:
-                for item_id in list(set(item_ids)):
-                    item = await self.item_repository.get_by_id(item_id)
-                    if item:
-                        items[str(item.id)] = {"id": item.id, "name": item.item_name}
+            # Batch fetch customers, locations and line items (one query each)
+            customers = await self.loaders[Customer].load_map(t.customer_id for t in transactions)
+            locations = await self.loaders[Location].load_map(t.location_id for t in transactions)
+            items = self._item_details(await self.loaders[Item].load_map(
+                line.item_id for t in transactions for line in t.transaction_lines
+            ))
 
             # Transform to sale response format
             sale_responses = []
@@ -178,20 +154,15 @@ class SalesService:
             location = None
             
             if transaction.customer_id:
-                customer = await self.customer_repository.get_by_id(UUID(transaction.customer_id))
+                customer = await self.loaders[Customer].load(transaction.customer_id)
             
             if transaction.location_id:
-                location = await self.location_repository.get_by_id(UUID(transaction.location_id))
+                location = await self.loaders[Location].load(transaction.location_id)
 
             # Get item details for all lines
-            item_ids = [UUID(line.item_id) for line in transaction.transaction_lines if line.item_id]
-            items = {}
-            
-            if item_ids:
-                for item_id in list(set(item_ids)):
-                    item = await self.item_repository.get_by_id(item_id)
-                    if item:
-                        items[str(item.id)] = {"id": item.id, "name": item.item_name}
+            items = self._item_details(await self.loaders[Item].load_map(
+                line.item_id for line in transaction.transaction_lines
+            ))
 
             # Transform to sale response
             return SaleResponse.from_transaction(
@@ -220,11 +191,10 @@ class SalesService:
 
             # Validate all items exist and are saleable
             item_ids = [item.item_id for item in sale_data.items]
-            items_dict = {}
-            for item_id in item_ids:
-                item = await self.item_repository.get_by_id(item_id)
-                if item:
-                    items_dict[str(item.id)] = item
+            items_dict = {
+                str(item_id): item
+                for item_id, item in (await self.loaders[Item].load_map(item_ids)).items()
+            }
             
             missing_items = set(str(item_id) for item_id in item_ids) - set(items_dict.keys())
             if missing_items:
@@ -339,6 +309,11 @@ class SalesService:
             await self.session.rollback()
             raise
 
+    @staticmethod
+    def _item_details(items: Dict[UUID, Item]) -> Dict[str, Dict[str, Any]]:
+        """Item id/name pairs keyed by item id, as the sale responses expect."""
+        return {str(item_id): {"id": item.id, "name": item.item_name} for item_id, item in items.items()}
+
     async def _get_default_location(self) -> Any:
         """Get default location for sales."""
         # Try to get the first active location
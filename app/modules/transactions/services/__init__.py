@@ -10,6 +10,7 @@ from .return_processors import (
     RentalReturnProcessor
 )
 from .return_workflows import WorkflowManager
+from .rental_return_executor import RentalReturnExecutor
 
 __all__ = [
     "UnifiedReturnService",
@@ -17,5 +18,6 @@ __all__ = [
     "SaleReturnProcessor",
     "PurchaseReturnProcessor",
     "RentalReturnProcessor",
-    "WorkflowManager"
+    "WorkflowManager",
+    "RentalReturnExecutor"
 ]
\ No newline at end of file
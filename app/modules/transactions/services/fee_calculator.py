@@ -2,12 +2,14 @@
 Fee calculation utilities for rental transactions.
 """
 
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Sequence
 from uuid import UUID
 from datetime import date, datetime
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from app.modules.transactions.base.models import (
     TransactionHeader, 
@@ -19,6 +21,69 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+CENT = Decimal('0.01')
+
+# Damage level -> (damage % of item value, cleaning fee multiplier, replacement % of item value)
+DAMAGE_LEVEL_FACTORS = {
+    'MINOR': (Decimal('0'), Decimal('1'), Decimal('0')),
+    'MODERATE': (Decimal('0.25'), Decimal('1'), Decimal('0')),
+    'MAJOR': (Decimal('0.50'), Decimal('2'), Decimal('0')),
+    'TOTAL_LOSS': (Decimal('0'), Decimal('0'), Decimal('1')),
+}
+
+
+@dataclass
+class RentalFeeBatch:
+    """
+    Columnar fee results for a batch of rental transactions.
+
+    Every list is aligned with ``transaction_ids``: index ``i`` of each column
+    belongs to ``transaction_ids[i]``. Amounts are Decimals quantized to cents.
+    """
+    as_of_date: date
+    transaction_ids: List[UUID] = field(default_factory=list)
+    found: List[bool] = field(default_factory=list)
+    rental_end_date: List[Optional[date]] = field(default_factory=list)
+    daily_rental_amount: List[Decimal] = field(default_factory=list)
+    late_fee_days: List[int] = field(default_factory=list)
+    late_fee_rate: List[Decimal] = field(default_factory=list)
+    late_fee_amount: List[Decimal] = field(default_factory=list)
+    accumulated_late_fees: List[Decimal] = field(default_factory=list)
+    new_late_fees: List[Decimal] = field(default_factory=list)
+    damage_fees: List[Decimal] = field(default_factory=list)
+    extension_days: List[int] = field(default_factory=list)
+    total_extension_cost: List[Decimal] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.transaction_ids)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get the results for one transaction as a dict."""
+        return {
+            'transaction_id': self.transaction_ids[index],
+            'found': self.found[index],
+            'rental_end_date': self.rental_end_date[index],
+            'daily_rental_amount': self.daily_rental_amount[index],
+            'late_fee_days': self.late_fee_days[index],
+            'late_fee_rate': self.late_fee_rate[index],
+            'late_fee_amount': self.late_fee_amount[index],
+            'accumulated_late_fees': self.accumulated_late_fees[index],
+            'new_late_fees': self.new_late_fees[index],
+            'damage_fees': self.damage_fees[index],
+            'extension_days': self.extension_days[index],
+            'total_extension_cost': self.total_extension_cost[index],
+            'is_overdue': self.late_fee_days[index] > 0,
+        }
+
+    def totals(self) -> Dict[str, Decimal]:
+        """Sum the amount columns across the batch."""
+        return {
+            'late_fee_amount': sum(self.late_fee_amount, Decimal('0')),
+            'new_late_fees': sum(self.new_late_fees, Decimal('0')),
+            'damage_fees': sum(self.damage_fees, Decimal('0')),
+            'total_extension_cost': sum(self.total_extension_cost, Decimal('0')),
+        }
+
 
 class RentalFeeCalculator:
     """Calculator for rental-related fees."""
@@ -41,9 +106,10 @@ class RentalFeeCalculator:
         if not as_of_date:
             as_of_date = date.today()
         
-        # Get transaction details
+        # Get transaction details with lines (rental dates live on the lines)
         result = await self.session.execute(
             select(TransactionHeader)
+            .options(selectinload(TransactionHeader.transaction_lines))
             .where(TransactionHeader.id == transaction_id)
         )
         transaction = result.scalar_one_or_none()
@@ -55,11 +121,24 @@ class RentalFeeCalculator:
                 'is_overdue': False
             }
         
+        # Get late fee rate (could be customer-specific or item-specific)
+        late_fee_rate = await self._get_late_fee_rate(transaction_id)
+        
+        return self._late_fee_breakdown(transaction, late_fee_rate, as_of_date)
+    
+    def _late_fee_breakdown(
+        self,
+        transaction: TransactionHeader,
+        late_fee_rate: Decimal,
+        as_of_date: date
+    ) -> Dict[str, Any]:
+        """Compute the late fee for a transaction whose lines are already loaded."""
+        rental_end_date = transaction.rental_end_date
+        
         # Calculate days overdue
-        days_overdue = max(0, (as_of_date - transaction.rental_end_date).days)
-        is_overdue = days_overdue > 0
+        days_overdue = max(0, (as_of_date - rental_end_date).days) if rental_end_date else 0
         
-        if not is_overdue:
+        if days_overdue == 0:
             return {
                 'late_fee_days': 0,
                 'late_fee_amount': Decimal('0'),
@@ -69,9 +148,6 @@ class RentalFeeCalculator:
         # Calculate daily rental amount (base for late fee calculation)
         daily_rental_amount = self._calculate_daily_rental_amount(transaction)
         
-        # Get late fee rate (could be customer-specific or item-specific)
-        late_fee_rate = await self._get_late_fee_rate(transaction_id)
-        
         # Calculate late fee
         daily_late_fee = daily_rental_amount * late_fee_rate
         max_late_fee = daily_rental_amount * self.max_late_fee_multiplier
@@ -81,10 +157,10 @@ class RentalFeeCalculator:
         return {
             'late_fee_days': days_overdue,
             'late_fee_rate': late_fee_rate,
-            'daily_rental_amount': daily_rental_amount,
-            'daily_late_fee': daily_late_fee,
-            'late_fee_amount': total_late_fee,
-            'max_late_fee': max_late_fee,
+            'daily_rental_amount': daily_rental_amount.quantize(CENT, ROUND_HALF_UP),
+            'daily_late_fee': daily_late_fee.quantize(CENT, ROUND_HALF_UP),
+            'late_fee_amount': total_late_fee.quantize(CENT, ROUND_HALF_UP),
+            'max_late_fee': max_late_fee.quantize(CENT, ROUND_HALF_UP),
             'is_overdue': True
         }
     
@@ -121,20 +197,7 @@ class RentalFeeCalculator:
         
         # Calculate based on damage level
         item_value = line.unit_price
-        damage_fee = Decimal('0')
-        cleaning_fee = Decimal('0')
-        replacement_cost = Decimal('0')
-        
-        if damage_level == 'MINOR':
-            cleaning_fee = self.default_cleaning_fee
-        elif damage_level == 'MODERATE':
-            damage_fee = item_value * Decimal('0.25')  # 25% of value
-            cleaning_fee = self.default_cleaning_fee
-        elif damage_level == 'MAJOR':
-            damage_fee = item_value * Decimal('0.50')  # 50% of value
-            cleaning_fee = self.default_cleaning_fee * 2
-        elif damage_level == 'TOTAL_LOSS':
-            replacement_cost = item_value
+        damage_fee, cleaning_fee, replacement_cost = self._damage_components(item_value, damage_level)
         
         total_damage_cost = damage_fee + cleaning_fee + replacement_cost
         
@@ -275,9 +338,22 @@ class RentalFeeCalculator:
             'total_extension_cost': total_extension_cost
         }
     
+    def _damage_components(self, item_value: Decimal, damage_level: str) -> tuple:
+        """Split the damage cost for an item into (damage, cleaning, replacement)."""
+        damage_pct, cleaning_multiplier, replacement_pct = DAMAGE_LEVEL_FACTORS.get(
+            damage_level, (Decimal('0'), Decimal('0'), Decimal('0'))
+        )
+        return (
+            item_value * damage_pct,
+            self.default_cleaning_fee * cleaning_multiplier,
+            item_value * replacement_pct,
+        )
+    
     def _calculate_daily_rental_amount(self, transaction: TransactionHeader) -> Decimal:
         """Calculate daily rental amount from transaction."""
-        if not transaction.rental_period or not transaction.rental_period_unit:
+        rental_period = getattr(transaction, 'rental_period', None)
+        rental_period_unit = getattr(transaction, 'rental_period_unit', None)
+        if not rental_period or not rental_period_unit:
             # Fallback: assume total amount is for the entire period
             if transaction.rental_start_date and transaction.rental_end_date:
                 total_days = (transaction.rental_end_date - transaction.rental_start_date).days
@@ -286,16 +362,16 @@ class RentalFeeCalculator:
         
         # Calculate based on rental period unit
         total_amount = transaction.total_amount
-        period = transaction.rental_period
+        period = rental_period
         
-        if transaction.rental_period_unit == 'DAY':
+        if rental_period_unit == 'DAY':
             return total_amount / period
-        elif transaction.rental_period_unit == 'WEEK':
+        elif rental_period_unit == 'WEEK':
             return total_amount / (period * 7)
-        elif transaction.rental_period_unit == 'MONTH':
+        elif rental_period_unit == 'MONTH':
             return total_amount / (period * 30)  # Approximate
-        elif transaction.rental_period_unit == 'HOUR':
-            return total_amount / (period / 24)  # Convert to days
+        elif rental_period_unit == 'HOUR':
+            return total_amount / (Decimal(period) / 24)  # Convert to days
         
         return total_amount
     
@@ -305,6 +381,117 @@ class RentalFeeCalculator:
         # In future, could check customer preferences, item categories, etc.
         return self.default_late_fee_rate
     
+    async def _get_late_fee_rates(
+        self, transactions: Sequence[TransactionHeader]
+    ) -> Dict[str, Decimal]:
+        """
+        Batch counterpart of _get_late_fee_rate, keyed by transaction ID.
+
+        Customers and items carry no late fee rate yet, so every transaction gets
+        the default; per-customer or per-item overrides belong here as one IN query.
+        """
+        return {str(t.id): self.default_late_fee_rate for t in transactions}
+    
+    async def calculate_fees_batch(
+        self,
+        transaction_ids: Sequence[UUID],
+        as_of_date: Optional[date] = None,
+        damage_levels: Optional[Dict[UUID, str]] = None,
+        extend_to: Optional[date] = None,
+    ) -> RentalFeeBatch:
+        """
+        Calculate late fees, damage fees and extension estimates for many rentals.
+
+        Headers, lines and lifecycles are loaded with set queries (no per-transaction
+        round trips) and all fees are computed in a single pass.
+
+        Args:
+            transaction_ids: Rental transactions to price
+            as_of_date: Date to compute lateness against (defaults to today)
+            damage_levels: Optional damage level per transaction line ID
+            extend_to: Optional new end date to estimate extension cost for
+
+        Returns:
+            RentalFeeBatch aligned with transaction_ids; unknown IDs have found=False
+        """
+        if not as_of_date:
+            as_of_date = date.today()
+        damage_levels = {str(k): v for k, v in (damage_levels or {}).items()}
+        batch = RentalFeeBatch(as_of_date=as_of_date)
+        if not transaction_ids:
+            return batch
+        
+        ids = list(dict.fromkeys(str(tid) for tid in transaction_ids))
+        
+        transaction_result = await self.session.execute(
+            select(TransactionHeader)
+            .options(selectinload(TransactionHeader.transaction_lines))
+            .where(TransactionHeader.id.in_(ids))
+        )
+        transactions = {str(t.id): t for t in transaction_result.scalars().all()}
+        
+        lifecycle_result = await self.session.execute(
+            select(RentalLifecycle).where(RentalLifecycle.transaction_id.in_(ids))
+        )
+        lifecycles = {str(lc.transaction_id): lc for lc in lifecycle_result.scalars().all()}
+        
+        late_fee_rates = await self._get_late_fee_rates(list(transactions.values()))
+        zero = Decimal('0')
+        
+        for transaction_id in transaction_ids:
+            key = str(transaction_id)
+            transaction = transactions.get(key)
+            batch.transaction_ids.append(transaction_id)
+            batch.found.append(transaction is not None)
+            
+            if transaction is None:
+                for column in (
+                    batch.daily_rental_amount, batch.late_fee_rate, batch.late_fee_amount,
+                    batch.accumulated_late_fees, batch.new_late_fees, batch.damage_fees,
+                    batch.total_extension_cost,
+                ):
+                    column.append(zero)
+                batch.rental_end_date.append(None)
+                batch.late_fee_days.append(0)
+                batch.extension_days.append(0)
+                continue
+            
+            lifecycle = lifecycles.get(key)
+            rental_end_date = transaction.rental_end_date
+            daily_rental_amount = (
+                self._calculate_daily_rental_amount(transaction) if rental_end_date else zero
+            )
+            late_fee_rate = late_fee_rates.get(key, self.default_late_fee_rate)
+            late = self._late_fee_breakdown(transaction, late_fee_rate, as_of_date)
+            accumulated_late_fees = lifecycle.total_late_fees if lifecycle else zero
+            
+            # Damage: fees already charged plus any pending assessments for this rental's lines
+            damage_fees = lifecycle.total_damage_fees if lifecycle else zero
+            for line in transaction.transaction_lines:
+                level = damage_levels.get(str(line.id))
+                if level:
+                    damage_fees += sum(self._damage_components(line.unit_price, level), zero)
+            
+            # Extension estimate (10% extension fee, same as estimate_extension_cost)
+            extension_days = 0
+            extension_cost = zero
+            if extend_to and rental_end_date and extend_to > rental_end_date:
+                extension_days = (extend_to - rental_end_date).days
+                extension_cost = daily_rental_amount * extension_days * Decimal('1.10')
+            
+            batch.rental_end_date.append(rental_end_date)
+            batch.daily_rental_amount.append(daily_rental_amount.quantize(CENT, ROUND_HALF_UP))
+            batch.late_fee_days.append(late['late_fee_days'])
+            batch.late_fee_rate.append(late_fee_rate)
+            batch.late_fee_amount.append(late['late_fee_amount'])
+            batch.accumulated_late_fees.append(accumulated_late_fees)
+            batch.new_late_fees.append(max(zero, late['late_fee_amount'] - accumulated_late_fees))
+            batch.damage_fees.append(damage_fees.quantize(CENT, ROUND_HALF_UP))
+            batch.extension_days.append(extension_days)
+            batch.total_extension_cost.append(extension_cost.quantize(CENT, ROUND_HALF_UP))
+        
+        return batch
+    
     async def calculate_partial_return_adjustment(
         self,
         transaction_id: UUID,
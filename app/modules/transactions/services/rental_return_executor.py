@@ -0,0 +1,326 @@
+"""
+Batched inventory updates for rental returns.
+
+A rental return touches one stock level and, for serialised items, one
+inventory unit per returned line. Doing that line by line costs several
+round trips per line; the executor below applies a whole return event with a
+fixed number of statements regardless of how many lines it contains.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import String, Numeric, case, cast, column, func, insert, select, tuple_, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import UUIDType
+from app.modules.inventory.models import (
+    InventoryUnit,
+    InventoryUnitCondition,
+    InventoryUnitStatus,
+    MovementType,
+    ReferenceType,
+    StockLevel,
+    StockMovement,
+)
+from app.core.errors import ValidationError
+
+
+def unit_status_for_return(condition: str, cleaning_condition: Optional[str] = None) -> str:
+    """
+    Map a return inspection to the inventory unit status it leaves the unit in.
+
+    Units in good shape go straight back to AVAILABLE, units that need
+    cleaning or a closer look go to MAINTENANCE and damaged units are
+    flagged DAMAGED.
+    """
+    if condition in ("EXCELLENT", "GOOD"):
+        return InventoryUnitStatus.AVAILABLE.value
+    if condition == "FAIR":
+        if cleaning_condition and cleaning_condition != "CLEAN":
+            return InventoryUnitStatus.MAINTENANCE.value
+        return InventoryUnitStatus.AVAILABLE.value
+    if condition == "DAMAGED":
+        return InventoryUnitStatus.DAMAGED.value
+    return InventoryUnitStatus.MAINTENANCE.value
+
+
+@dataclass
+class RentalReturnLine:
+    """One returned line as seen by the executor."""
+    item_id: UUID
+    location_id: UUID
+    quantity: Decimal
+    condition: str
+    cleaning_condition: Optional[str] = None
+    notes: Optional[str] = None
+    inventory_unit_id: Optional[UUID] = None
+    transaction_line_id: Optional[UUID] = None
+
+
+@dataclass
+class RentalReturnLineResult:
+    """Outcome of a single returned line."""
+    index: int
+    item_id: UUID
+    quantity: Decimal
+    unit_status: str
+    stock_level_id: Optional[UUID] = None
+    inventory_unit_id: Optional[UUID] = None
+    quantity_before: Optional[Decimal] = None
+    quantity_after: Optional[Decimal] = None
+    movement_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class RentalReturnBatchResult:
+    """Per-line results of a batched return, in input order."""
+    lines: List[RentalReturnLineResult] = field(default_factory=list)
+    statements: int = 0
+
+    @property
+    def success(self) -> bool:
+        return all(line.success for line in self.lines)
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"Line {line.index + 1}: {line.error}" for line in self.lines if line.error]
+
+
+class RentalReturnExecutor:
+    """
+    Apply the inventory side of a rental return in one atomic batch.
+
+    The executor locks every involved stock level with a single
+    ``SELECT ... FOR UPDATE`` (ordered by id so concurrent returns cannot
+    deadlock), validates all lines against the locked quantities, and then
+    writes with one statement each: stock levels and inventory units via
+    ``UPDATE ... FROM (VALUES ...)`` and the stock movements via a multi-row
+    ``INSERT``. Either every line is applied or none is.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def execute(
+        self,
+        lines: Sequence[RentalReturnLine],
+        reference_id: str,
+        updated_by: Optional[str] = None,
+    ) -> RentalReturnBatchResult:
+        """
+        Return ``lines`` to stock.
+
+        Raises:
+            ValidationError: If any line cannot be applied. Nothing is written
+                in that case; the message lists every failing line.
+        """
+        result = RentalReturnBatchResult(lines=[
+            RentalReturnLineResult(
+                index=index,
+                item_id=line.item_id,
+                quantity=Decimal(str(line.quantity)),
+                unit_status=unit_status_for_return(line.condition, line.cleaning_condition),
+                inventory_unit_id=line.inventory_unit_id,
+            )
+            for index, line in enumerate(lines)
+        ])
+        if not lines:
+            return result
+
+        async with self.session.begin_nested():
+            stock_levels = await self._lock_stock_levels(lines)
+            result.statements += 1
+
+            stock_updates = self.plan(lines, stock_levels, result)
+            if not result.success:
+                raise ValidationError("; ".join(result.errors))
+
+            await self.session.execute(self._stock_level_update(stock_updates, updated_by))
+            result.statements += 1
+
+            unit_update = self._unit_update(lines, result, updated_by)
+            if unit_update is not None:
+                await self.session.execute(unit_update)
+                result.statements += 1
+
+            await self.session.execute(
+                insert(StockMovement).values(
+                    self._movement_rows(lines, result, reference_id, updated_by)
+                )
+            )
+            result.statements += 1
+
+        # The writes above bypass the unit of work; drop cached quantities.
+        for stock_level in stock_levels.values():
+            self.session.expire(stock_level)
+
+        return result
+
+    async def _lock_stock_levels(
+        self, lines: Sequence[RentalReturnLine]
+    ) -> Dict[Tuple[str, str], StockLevel]:
+        """Lock the stock level of every (item, location) pair in one query."""
+        pairs = {(str(line.item_id), str(line.location_id)) for line in lines}
+        stmt = (
+            select(StockLevel)
+            .where(tuple_(StockLevel.item_id, StockLevel.location_id).in_(sorted(pairs)))
+            .order_by(StockLevel.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        rows = (await self.session.execute(stmt)).scalars().all()
+        return {(str(sl.item_id), str(sl.location_id)): sl for sl in rows}
+
+    @staticmethod
+    def plan(
+        lines: Sequence[RentalReturnLine],
+        stock_levels: Dict[Tuple[str, str], StockLevel],
+        result: RentalReturnBatchResult,
+    ) -> "OrderedDict[UUID, Decimal]":
+        """
+        Fill in before/after quantities for each line and total the quantity
+        returned per stock level. Lines that cannot be applied get an error.
+        """
+        returned: "OrderedDict[UUID, Decimal]" = OrderedDict()
+        available: Dict[UUID, Decimal] = {}
+
+        for line, line_result in zip(lines, result.lines):
+            if line_result.quantity <= 0:
+                line_result.error = "Return quantity must be positive"
+                continue
+
+            stock_level = stock_levels.get((str(line.item_id), str(line.location_id)))
+            if stock_level is None:
+                line_result.error = (
+                    f"No stock level for item {line.item_id} at location {line.location_id}"
+                )
+                continue
+
+            already = returned.get(stock_level.id, Decimal("0"))
+            if already + line_result.quantity > stock_level.quantity_on_rent:
+                line_result.error = (
+                    f"Cannot return {line_result.quantity} units of item {line.item_id}; "
+                    f"only {stock_level.quantity_on_rent - already} on rent"
+                )
+                continue
+
+            before = available.get(stock_level.id, stock_level.quantity_available)
+            line_result.stock_level_id = stock_level.id
+            line_result.quantity_before = before
+            line_result.quantity_after = before + line_result.quantity
+            available[stock_level.id] = line_result.quantity_after
+            returned[stock_level.id] = already + line_result.quantity
+
+        return returned
+
+    @staticmethod
+    def _stock_level_update(returned: Dict[UUID, Decimal], updated_by: Optional[str]):
+        """Move every returned quantity from on-rent to available in one UPDATE."""
+        data = values(
+            column("id", UUIDType()), column("quantity", Numeric(10, 2)), name="returned"
+        ).data([(stock_level_id, quantity) for stock_level_id, quantity in returned.items()])
+        # VALUES parameters reach Postgres untyped; make the arithmetic numeric.
+        quantity = cast(data.c.quantity, Numeric(10, 2))
+
+        return (
+            update(StockLevel)
+            .where(StockLevel.id == data.c.id)
+            .values(
+                quantity_available=StockLevel.quantity_available + quantity,
+                quantity_on_rent=StockLevel.quantity_on_rent - quantity,
+                updated_by=updated_by,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _unit_update(
+        lines: Sequence[RentalReturnLine],
+        result: RentalReturnBatchResult,
+        updated_by: Optional[str],
+    ):
+        """Apply all unit status transitions in one UPDATE, or None if no units."""
+        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        conditions = {c.value for c in InventoryUnitCondition}
+        rows = []
+        for line, line_result in zip(lines, result.lines):
+            if not line.inventory_unit_id:
+                continue
+            note = (
+                f"\n[{timestamp}] Status updated to {line_result.unit_status}: {line.notes}"
+                if line.notes else ""
+            )
+            rows.append((
+                line.inventory_unit_id,
+                line_result.unit_status,
+                line.condition if line.condition in conditions else None,
+                note,
+            ))
+        if not rows:
+            return None
+
+        data = values(
+            column("id", UUIDType()),
+            column("status", String(20)),
+            column("condition", String(20)),
+            column("note", String()),
+            name="unit_returns",
+        ).data(rows)
+
+        return (
+            update(InventoryUnit)
+            .where(InventoryUnit.id == data.c.id)
+            .values(
+                status=data.c.status,
+                condition=func.coalesce(data.c.condition, InventoryUnit.condition),
+                notes=case(
+                    (data.c.note == "", InventoryUnit.notes),
+                    else_=func.coalesce(InventoryUnit.notes, "") + data.c.note,
+                ),
+                updated_by=updated_by,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _movement_rows(
+        lines: Sequence[RentalReturnLine],
+        result: RentalReturnBatchResult,
+        reference_id: str,
+        created_by: Optional[str],
+    ) -> List[dict]:
+        """Build one RENTAL_RETURN movement row per line."""
+        rows = []
+        for line, line_result in zip(lines, result.lines):
+            line_result.movement_id = uuid4()
+            rows.append({
+                "id": line_result.movement_id,
+                "stock_level_id": line_result.stock_level_id,
+                "item_id": line.item_id,
+                "location_id": line.location_id,
+                "is_active": True,
+                "movement_type": MovementType.RENTAL_RETURN.value,
+                "reference_type": ReferenceType.TRANSACTION.value,
+                "reference_id": reference_id,
+                "quantity_change": line_result.quantity,
+                "quantity_before": line_result.quantity_before,
+                "quantity_after": line_result.quantity_after,
+                "reason": f"Returned {line_result.quantity} units from rent",
+                "notes": f"Condition: {line.condition}",
+                "transaction_line_id": line.transaction_line_id,
+                "created_by": created_by,
+                "updated_by": created_by,
+            })
+        return rows
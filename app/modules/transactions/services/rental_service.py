@@ -22,6 +22,7 @@ from app.modules.transactions.base.models import (
     ReturnEventType,
     InspectionCondition
 )
+from app.modules.transactions.base.repository import OPEN_RENTAL_STATUSES, TransactionHeaderRepository
 from app.modules.transactions.services.rental_status_updater import RentalStatusUpdater
 from app.core.errors import NotFoundError, ValidationError, ConflictError
 import logging
@@ -361,20 +362,37 @@ class RentalReturnService:
         lifecycle.total_late_fees += return_event.late_fees_charged
         lifecycle.total_other_fees += return_event.other_fees_charged
         
-        # Update transaction line returned quantities
+        # Update transaction line returned quantities and the header counters
         if return_event.items_returned:
+            line_returns = []
             for item in return_event.items_returned:
-                line_id = UUID(item['transaction_line_id'])
+                line_id = UUID(str(item['transaction_line_id']))
                 quantity = Decimal(str(item['quantity']))
                 
-                await self.session.execute(
+                # Incremented in SQL, so concurrent completions of the same
+                # rental cannot overwrite each other's returned quantities;
+                # RETURNING refreshes the loaded line with the committed total
+                result = await self.session.execute(
                     update(TransactionLine)
-                    .where(TransactionLine.id == line_id)
+                    .where(
+                        and_(
+                            TransactionLine.id == line_id,
+                            TransactionLine.transaction_id == lifecycle.transaction_id
+                        )
+                    )
                     .values(
                         returned_quantity=TransactionLine.returned_quantity + quantity,
                         return_date=return_event.event_date
                     )
+                    .returning(TransactionLine)
+                    .execution_options(populate_existing=True)
                 )
+                line = result.scalar_one_or_none()
+                if line is None:
+                    raise NotFoundError(f"Transaction line {line_id} not found")
+                line_returns.append((line, line.returned_quantity - quantity))
+            
+            await self.status_updater.apply_line_returns(lifecycle.transaction_id, line_returns)
         
         # Update rental status based on return event
         total_quantity = sum(line.quantity for line in transaction.transaction_lines)
@@ -420,14 +438,22 @@ class RentalReturnService:
         
         self.session.add(extension_event)
         
-        # Update lifecycle and transaction
+        # Update lifecycle and the lines still out on rent; the header's
+        # end date derives from the lines, and next_due_date follows them
         lifecycle.expected_return_date = new_end_date
         
         await self.session.execute(
-            update(TransactionHeader)
-            .where(TransactionHeader.id == transaction_id)
+            update(TransactionLine)
+            .where(
+                and_(
+                    TransactionLine.transaction_id == str(transaction_id),
+                    TransactionLine.returned_quantity < TransactionLine.quantity,
+                    TransactionLine.current_rental_status.in_(OPEN_RENTAL_STATUSES),
+                )
+            )
             .values(rental_end_date=new_end_date)
         )
+        await TransactionHeaderRepository(self.session).refresh_next_due_dates([transaction_id])
         
         # Update status to EXTENDED
         await self.status_service.update_rental_status(
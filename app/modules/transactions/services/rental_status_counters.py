@@ -0,0 +1,188 @@
+"""
+Incremental rental status maintenance.
+
+Rental headers keep counters (lines fully returned, lines partially returned,
+quantity returned) that the return path adjusts as lines change. Together
+with the precomputed ``next_due_date`` they are enough to derive the header
+status without reloading the transaction lines. The consistency checker
+compares the stored counters against a full recompute from the lines.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.transactions.base.models import RentalStatus, TransactionLine
+from app.modules.transactions.base.repository import TransactionHeaderRepository
+from app.modules.transactions.services.rental_status_calculator import (
+    HeaderStatus,
+    LineItemStatus,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Line item status -> status stored on TransactionLine.current_rental_status
+LINE_STATUS_TO_RENTAL_STATUS = {
+    LineItemStatus.ACTIVE: RentalStatus.ACTIVE,
+    LineItemStatus.LATE: RentalStatus.LATE,
+    LineItemStatus.LATE_PARTIAL_RETURN: RentalStatus.LATE_PARTIAL_RETURN,
+    LineItemStatus.PARTIAL_RETURN: RentalStatus.PARTIAL_RETURN,
+    LineItemStatus.RETURNED: RentalStatus.COMPLETED,
+}
+
+
+@dataclass
+class RentalCounterDelta:
+    """Change to a header's rental counters caused by one or more line returns."""
+    returned_lines: int = 0
+    partial_lines: int = 0
+    returned_quantity: Decimal = Decimal("0")
+
+    def __add__(self, other: "RentalCounterDelta") -> "RentalCounterDelta":
+        return RentalCounterDelta(
+            returned_lines=self.returned_lines + other.returned_lines,
+            partial_lines=self.partial_lines + other.partial_lines,
+            returned_quantity=self.returned_quantity + other.returned_quantity,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.returned_lines or self.partial_lines or self.returned_quantity)
+
+
+def line_return_delta(
+    quantity: Decimal,
+    previous_returned: Decimal,
+    returned: Decimal,
+) -> RentalCounterDelta:
+    """Counter change for a line whose returned quantity moved between two values."""
+    previous_returned = previous_returned or Decimal("0")
+    returned = returned or Decimal("0")
+
+    was_full = previous_returned >= quantity
+    is_full = returned >= quantity
+    was_partial = Decimal("0") < previous_returned < quantity
+    is_partial = Decimal("0") < returned < quantity
+
+    return RentalCounterDelta(
+        returned_lines=int(is_full) - int(was_full),
+        partial_lines=int(is_partial) - int(was_partial),
+        returned_quantity=returned - previous_returned,
+    )
+
+
+def derive_line_status(
+    quantity: Decimal,
+    returned: Decimal,
+    rental_end_date: Optional[date],
+    as_of_date: date,
+) -> LineItemStatus:
+    """Line status from the line's own fields (same rules as RentalStatusCalculator)."""
+    returned = returned or Decimal("0")
+    if returned >= quantity:
+        return LineItemStatus.RETURNED
+    is_late = rental_end_date is not None and rental_end_date < as_of_date
+    if returned > 0:
+        return LineItemStatus.LATE_PARTIAL_RETURN if is_late else LineItemStatus.PARTIAL_RETURN
+    return LineItemStatus.LATE if is_late else LineItemStatus.ACTIVE
+
+
+def derive_header_status(
+    rental_line_count: int,
+    returned_line_count: int,
+    partial_return_line_count: int,
+    next_due_date: Optional[date],
+    as_of_date: date,
+) -> HeaderStatus:
+    """
+    Header status from the stored counters in O(1).
+
+    A header has late items when the earliest end date among its open lines
+    (``next_due_date``) has passed.
+    """
+    if rental_line_count and returned_line_count >= rental_line_count:
+        return HeaderStatus.RETURNED
+
+    has_late_items = next_due_date is not None and next_due_date < as_of_date
+    has_returned_items = (returned_line_count + partial_return_line_count) > 0
+
+    if has_late_items and has_returned_items:
+        return HeaderStatus.LATE_PARTIAL_RETURN
+    if has_late_items:
+        return HeaderStatus.LATE
+    if has_returned_items:
+        return HeaderStatus.PARTIAL_RETURN
+    return HeaderStatus.ACTIVE
+
+
+def apply_line_return(
+    line: TransactionLine,
+    previous_returned: Decimal,
+    as_of_date: Optional[date] = None,
+) -> RentalCounterDelta:
+    """
+    Refresh a line's stored status after its returned quantity changed and
+    return the counter delta to apply to its header.
+    """
+    as_of_date = as_of_date or date.today()
+    status = derive_line_status(line.quantity, line.returned_quantity, line.rental_end_date, as_of_date)
+    line.current_rental_status = LINE_STATUS_TO_RENTAL_STATUS[status]
+    return line_return_delta(line.quantity, previous_returned, line.returned_quantity)
+
+
+class RentalCounterConsistencyChecker:
+    """
+    Verify the incrementally maintained rental counters against a full
+    recompute from the transaction lines, optionally repairing drift.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = TransactionHeaderRepository(session)
+
+    async def check(
+        self,
+        transaction_ids: Optional[Sequence[Any]] = None,
+        repair: bool = False,
+        limit: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Find rentals whose stored counters disagree with their lines.
+
+        Args:
+            transaction_ids: Rentals to check (None = all rentals)
+            repair: Recompute the counters of mismatched rentals
+            limit: Maximum number of mismatches reported per run
+
+        Returns:
+            Summary with the mismatched rentals and whether they were repaired
+        """
+        mismatches = await self.repository.find_rental_counter_mismatches(
+            transaction_ids=transaction_ids, limit=limit
+        )
+
+        repaired = 0
+        if repair and mismatches:
+            await self.repository.refresh_rental_counters(
+                [row["transaction_id"] for row in mismatches]
+            )
+            await self.session.commit()
+            repaired = len(mismatches)
+
+        if mismatches:
+            logger.warning(
+                f"Rental counter check found {len(mismatches)} inconsistent transactions"
+                f" ({repaired} repaired)"
+            )
+
+        return {
+            "mismatch_count": len(mismatches),
+            "repaired_count": repaired,
+            "mismatches": mismatches,
+        }
+
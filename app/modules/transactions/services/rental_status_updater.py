@@ -5,7 +5,7 @@ Centralized service for updating rental statuses with comprehensive logging
 and audit trails. Integrates with the status calculator to apply changes.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime, date
 from decimal import Decimal
@@ -22,11 +22,17 @@ from app.modules.transactions.base.models import (
     RentalStatusLog,
     RentalStatusChangeReason
 )
+from app.modules.transactions.base.repository import TransactionHeaderRepository
 from app.modules.transactions.services.rental_status_calculator import (
     RentalStatusCalculator,
     HeaderStatus,
     LineItemStatus
 )
+from app.modules.transactions.services.rental_status_counters import (
+    RentalCounterDelta,
+    apply_line_return,
+    derive_header_status,
+)
 from app.core.errors import NotFoundError, ValidationError
 import logging
 
@@ -295,32 +301,170 @@ class RentalStatusUpdater:
         
         return results
     
+    async def apply_line_returns(
+        self,
+        transaction_id: UUID,
+        line_returns: Sequence[Tuple[TransactionLine, Decimal]],
+        as_of_date: Optional[date] = None
+    ) -> HeaderStatus:
+        """
+        Record returned quantities on a rental without recalculating it.
+        
+        Each entry pairs a line whose returned_quantity has already been
+        updated with the returned quantity it had before. The line statuses
+        are refreshed, next_due_date is recomputed and the header counters
+        are adjusted in place; the new header status is derived from them.
+        
+        Args:
+            transaction_id: ID of the rental transaction
+            line_returns: (line, previous returned quantity) pairs
+            as_of_date: Date to derive statuses as of (defaults to today)
+            
+        Returns:
+            The header status after the returns
+        """
+        if not as_of_date:
+            as_of_date = date.today()
+        
+        delta = RentalCounterDelta()
+        for line, previous_returned in line_returns:
+            delta += apply_line_return(line, previous_returned, as_of_date)
+        
+        repository = TransactionHeaderRepository(self.session)
+        await self.session.flush()
+        await repository.refresh_next_due_dates([transaction_id])
+        
+        counters = await repository.apply_rental_counter_delta(
+            transaction_id,
+            returned_lines=delta.returned_lines,
+            partial_lines=delta.partial_lines,
+            returned_quantity=delta.returned_quantity
+        )
+        if counters is None:
+            raise NotFoundError(f"Transaction {transaction_id} not found")
+        
+        return derive_header_status(
+            counters.rental_line_count,
+            counters.returned_line_count,
+            counters.partial_return_line_count,
+            counters.next_due_date,
+            as_of_date
+        )
+    
     async def update_status_from_return_event(
         self,
         transaction_id: UUID,
         return_event_id: UUID,
         changed_by: Optional[UUID] = None,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        as_of_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """
         Update rental status based on a return event.
         
+        The status is derived from the header's return counters and
+        next_due_date, which the return path keeps current, so the
+        transaction lines are not reloaded.
+        
         Args:
             transaction_id: ID of the rental transaction
             return_event_id: ID of the return event that triggered the update
             changed_by: User who processed the return
             notes: Additional notes about the return
+            as_of_date: Date to derive status as of (defaults to today)
             
         Returns:
             Status update results
         """
-        return await self.update_transaction_status(
-            transaction_id=transaction_id,
-            changed_by=changed_by,
-            change_reason=RentalStatusChangeReason.RETURN_EVENT,
-            change_trigger=f"return_event_{return_event_id}",
-            notes=notes or "Status updated due to return event"
+        if not as_of_date:
+            as_of_date = date.today()
+        
+        result = await self.session.execute(
+            select(
+                TransactionHeader.rental_line_count,
+                TransactionHeader.returned_line_count,
+                TransactionHeader.partial_return_line_count,
+                TransactionHeader.returned_quantity_total,
+                TransactionHeader.next_due_date,
+                RentalLifecycle.id.label("lifecycle_id"),
+                RentalLifecycle.current_status
+            )
+            .outerjoin(RentalLifecycle, RentalLifecycle.transaction_id == TransactionHeader.id)
+            .where(TransactionHeader.id == transaction_id)
         )
+        counters = result.one_or_none()
+        
+        if not counters:
+            raise NotFoundError(f"Transaction {transaction_id} not found")
+        
+        new_status = derive_header_status(
+            counters.rental_line_count,
+            counters.returned_line_count,
+            counters.partial_return_line_count,
+            counters.next_due_date,
+            as_of_date
+        ).value
+        old_status = counters.current_status
+        header_changed = old_status != new_status
+        
+        summary = {
+            'total_lines': counters.rental_line_count,
+            'returned_lines': counters.returned_line_count,
+            'partially_returned_lines': counters.partial_return_line_count,
+            'total_returned_quantity': float(counters.returned_quantity_total or 0),
+            'next_due_date': counters.next_due_date.isoformat() if counters.next_due_date else None
+        }
+        
+        changes_made = []
+        if header_changed:
+            if counters.lifecycle_id:
+                await self.session.execute(
+                    update(RentalLifecycle)
+                    .where(RentalLifecycle.id == counters.lifecycle_id)
+                    .values(
+                        current_status=new_status,
+                        last_status_change=datetime.utcnow(),
+                        status_changed_by=changed_by
+                    )
+                )
+            
+            header_log = await self._create_status_log(
+                transaction_id=transaction_id,
+                old_status=old_status,
+                new_status=new_status,
+                change_reason=RentalStatusChangeReason.RETURN_EVENT,
+                change_trigger=f"return_event_{return_event_id}",
+                changed_by=changed_by,
+                notes=notes or "Status updated due to return event",
+                status_metadata={
+                    'summary': summary,
+                    'as_of_date': as_of_date.isoformat()
+                },
+                system_generated=changed_by is None
+            )
+            
+            changes_made.append({
+                'type': 'header',
+                'old_status': old_status,
+                'new_status': new_status,
+                'log_id': header_log.id
+            })
+        
+        await self.session.commit()
+        
+        return {
+            'transaction_id': transaction_id,
+            'header_status_changed': header_changed,
+            'changes_made': changes_made,
+            'total_changes': len(changes_made),
+            'status_data': {
+                'transaction_id': transaction_id,
+                'header_status': new_status,
+                'calculated_as_of': as_of_date.isoformat(),
+                'summary': summary
+            },
+            'updated_at': datetime.utcnow().isoformat()
+        }
     
     async def get_status_history(
         self,
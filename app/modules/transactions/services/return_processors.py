@@ -21,7 +21,12 @@ from app.modules.transactions.rental_returns.schemas import (
     RentalReturnCreate,
     RentalReturnLineItem
 )
+from app.modules.transactions.services.rental_return_executor import (
+    RentalReturnExecutor,
+    RentalReturnLine,
+)
 from app.core.errors import ValidationError
+from app.core.logger import get_purchase_logger
 
 
 class ReturnProcessor(ABC):
@@ -31,6 +36,7 @@ class ReturnProcessor(ABC):
         self.transaction_service = transaction_service
         self.inventory_service = inventory_service
         self.session = session
+        self.logger = get_purchase_logger()
     
     @abstractmethod
     async def validate_return(
@@ -408,77 +414,38 @@ class RentalReturnProcessor(ReturnProcessor):
         return_txn: TransactionHeader, 
         return_data: RentalReturnCreate
     ) -> None:
-        """Update rental inventory status based on condition."""
-        for idx, item in enumerate(return_data.return_items):
-            line = return_txn.transaction_lines[idx]
-            
-            # Determine inventory status based on condition
-            if item.condition_on_return in ["EXCELLENT", "GOOD"]:
-                status = "AVAILABLE"
-            elif item.condition_on_return == "FAIR":
-                if item.cleaning_condition != "CLEAN":
-                    status = "REQUIRES_CLEANING"
-                else:
-                    status = "AVAILABLE"
-            else:  # POOR or DAMAGED
-                status = "REQUIRES_INSPECTION"
-            
-            # Update inventory unit status if tracked by unit
-            if line.inventory_unit_id:
-                await self.inventory_service.update_inventory_unit_status(
-                    unit_id=line.inventory_unit_id,
-                    status=status,
-                    condition=item.condition_on_return,
-                    notes=item.damage_description
-                )
-            else:
-                # Update general stock status
-                await self.inventory_service.update_stock_condition(
-                    item_id=line.item_id,
-                    location_id=return_txn.location_id,
-                    quantity=item.return_quantity,
-                    condition=item.condition_on_return,
-                    status=status
-                )
-            
-            # Move stock from on rent back to available for all returns
-            try:
-                # Get stock level for this item/location
-                stock_level = await self.inventory_service.stock_level_repository.get_by_item_location(
-                    line.item_id, return_txn.location_id
-                )
-                
-                if stock_level:
-                    from decimal import Decimal
-                    # Move quantity from on rent back to available
-                    await self.inventory_service.return_from_rent(
-                        stock_level_id=stock_level.id,
-                        quantity=Decimal(str(item.return_quantity)),
-                        transaction_id=str(return_txn.id)
-                    )
-                    
-                    self.logger.log_debug_info("Stock returned from rent", {
-                        "item_id": str(line.item_id),
-                        "quantity": item.return_quantity,
-                        "return_transaction_id": str(return_txn.id),
-                        "stock_level_id": str(stock_level.id),
-                        "condition": item.condition_on_return
-                    })
-                else:
-                    # Log warning if no stock level found
-                    self.logger.log_debug_info("No stock level found for rental return", {
-                        "item_id": str(line.item_id),
-                        "location_id": str(return_txn.location_id),
-                        "quantity": item.return_quantity
-                    })
-                    
-            except Exception as stock_error:
-                # Log the error but don't fail the return
-                self.logger.log_debug_info("Error updating stock for rental return", {
-                    "item_id": str(line.item_id),
-                    "error": str(stock_error),
-                    "return_transaction_id": str(return_txn.id)
-                })
+        """Update rental inventory status based on condition.
+
+        All lines are applied in one batch: stock levels are locked once and
+        unit statuses, stock quantities and movements are written with a
+        single statement each. A line that cannot be returned fails the whole
+        return with a ValidationError instead of being skipped.
+        """
+        lines = [
+            RentalReturnLine(
+                item_id=return_txn.transaction_lines[idx].item_id,
+                location_id=return_txn.location_id,
+                quantity=Decimal(str(item.return_quantity)),
+                condition=item.condition_on_return,
+                cleaning_condition=item.cleaning_condition,
+                notes=item.damage_description,
+                inventory_unit_id=return_txn.transaction_lines[idx].inventory_unit_id,
+                transaction_line_id=return_txn.transaction_lines[idx].id,
+            )
+            for idx, item in enumerate(return_data.return_items)
+        ]
+
+        result = await RentalReturnExecutor(self.session).execute(
+            lines,
+            reference_id=str(return_txn.id),
+            updated_by=str(return_data.processed_by) if return_data.processed_by else None,
+        )
+
+        self.logger.log_debug_info("Rental return applied to inventory", {
+            "return_id": str(return_txn.id),
+            "lines": len(result.lines),
+            "statements": result.statements,
+        })
     
     async def calculate_financials(
         self, 
@@ -15,8 +15,8 @@ from app.modules.transactions.base.models import (
     TransactionStatus,
     LineItemType
 )
-from app.modules.transactions.models.metadata import TransactionMetadata
-from app.modules.transactions.models.inspections import PurchaseCreditMemo
+from app.modules.transactions.base.models.metadata import TransactionMetadata
+from app.modules.transactions.base.models.inspections import PurchaseCreditMemo
 from app.modules.transactions.rental_returns.models import RentalInspection
 from app.modules.transactions.schemas import (
     TransactionHeaderCreate,
@@ -0,0 +1,199 @@
+"""
+Count strategies for paginated list responses.
+
+An exact ``COUNT(*)`` has to visit every matching row, which on large
+filtered lists often costs more than fetching the page itself. ``RowCounter``
+picks the cheapest acceptable answer for a filtered row query:
+
+* ``cached``: an exact count computed earlier for the same normalised
+  filter, reused until a write to one of the query's tables commits or the
+  TTL passes (the TTL covers writes made by other workers);
+* ``estimated``: the planner's row estimate from ``EXPLAIN`` when it is
+  above ``COUNT_EXACT_THRESHOLD`` - close enough for "about 120,000 items"
+  and free of any table scan;
+* ``exact``: ``COUNT(*)`` for small results, cached for next time.
+
+Responses carry the strategy so clients can render estimates accordingly.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, FrozenSet, Optional, Set
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import find_tables
+
+from app.core.config import settings
+from app.shared.cursor_pagination import count_rows
+from app.shared.write_tracking import on_tables_committed
+
+logger = logging.getLogger(__name__)
+
+
+class CountStrategy(str, Enum):
+    """How a reported count was obtained."""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class CountResult(BaseModel):
+    """A row count and the strategy that produced it."""
+    count: int
+    strategy: CountStrategy
+
+    @property
+    def is_estimate(self) -> bool:
+        return self.strategy == CountStrategy.ESTIMATED
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, with its parameters bound normally."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def planner_estimate(session: AsyncSession, query: Select) -> Optional[int]:
+    """Rows the planner expects ``query`` to return (plans it, does not run it)."""
+    result = await session.execute(Explain(query))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        logger.warning("Unexpected EXPLAIN output while estimating a count")
+        return None
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_normalise(item) for item in value]
+    return value
+
+
+def filter_key(query: Select) -> str:
+    """
+    Cache key for a filtered query: its SQL plus normalised bound values.
+
+    Repositories build conditions deterministically, so the same filters
+    always give the same key; omitted filters simply do not appear.
+    """
+    compiled = query.compile()
+    params = {name: _normalise(value) for name, value in compiled.params.items()}
+    payload = json.dumps([str(compiled), sorted(params.items())], default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@dataclass
+class _CachedCount:
+    tables: FrozenSet[str]
+    count: int
+    expires_at: float
+
+
+@dataclass
+class CountCache:
+    """
+    Exact counts by filter key, dropped when one of their tables is written to.
+
+    Keys include free-text search terms, so the cache is bounded: once it
+    holds ``max_entries`` counts the least recently used one is evicted.
+    """
+    max_entries: int = 1024
+    entries: "OrderedDict[str, _CachedCount]" = field(default_factory=OrderedDict)
+
+    def get(self, key: str) -> Optional[int]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry.count
+
+    def set(self, key: str, tables: FrozenSet[str], count: int, ttl: float) -> None:
+        self.entries[key] = _CachedCount(tables, count, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_tables(self, tables: Set[str]) -> None:
+        for key in [key for key, entry in self.entries.items() if entry.tables & tables]:
+            del self.entries[key]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+count_cache = CountCache()
+
+
+@on_tables_committed
+def _invalidate_counts(tables: Set[str]) -> None:
+    if count_cache.entries:
+        count_cache.invalidate_tables(tables)
+
+
+class RowCounter:
+    """Choose between cached, estimated and exact counts for a row query."""
+
+    def __init__(
+        self,
+        exact_threshold: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache: Optional[CountCache] = None,
+    ):
+        self.exact_threshold = exact_threshold if exact_threshold is not None else settings.COUNT_EXACT_THRESHOLD
+        self.ttl = ttl if ttl is not None else settings.COUNT_CACHE_TTL
+        self.cache = cache if cache is not None else count_cache
+
+    async def count(self, session: AsyncSession, query: Select, exact: bool = False) -> CountResult:
+        """
+        Count the rows ``query`` (a filtered select, e.g. ``select(Item.id)``) returns.
+
+        Args:
+            session: Database session
+            query: Row query without ordering or pagination
+            exact: Never fall back to a planner estimate
+        """
+        key = filter_key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return CountResult(count=cached, strategy=CountStrategy.CACHED)
+
+        if not exact:
+            estimate = await planner_estimate(session, query)
+            if estimate is not None and estimate > self.exact_threshold:
+                return CountResult(count=estimate, strategy=CountStrategy.ESTIMATED)
+
+        count = await count_rows(session, query)
+        tables = frozenset(table.name for table in find_tables(query))
+        self.cache.set(key, tables, count, self.ttl)
+        return CountResult(count=count, strategy=CountStrategy.EXACT)
+
+
+row_counter = RowCounter()
@@ -0,0 +1,237 @@
+"""
+Keyset (cursor) pagination for high-volume list endpoints.
+
+``OFFSET n`` makes the database walk and discard ``n`` rows, so deep pages
+on large tables (transaction headers, stock movements) get linearly slower,
+and the ``COUNT(*)`` that usually accompanies them scans every match. Keyset
+pagination instead remembers the sort key of the last row returned and asks
+for the rows after it, which an index on the sort columns answers in
+constant time regardless of depth.
+
+The cursor handed to clients is opaque: the last row's sort values plus its
+id (the tiebreaker that makes the order total), base64-encoded together with
+the sort it belongs to. Totals are optional - exact, a ``pg_class.reltuples``
+table estimate, or none at all. Small tables keep using the page-based
+``Page`` model from ``app.shared.pagination``.
+
+Example:
+    ```python
+    paginator = KeysetPaginator(StockMovement, [SortSpec(field="created_at", order=SortOrder.DESC)])
+    page = await paginator.paginate(session, query, cursor=cursor, limit=50)
+    return page.map(StockMovementResponse.model_validate)
+    ```
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Generic, List, Optional, Sequence, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import ValidationError
+from app.shared.filters import FilterBuilder, SortOrder, SortSpec
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class CountMode(str, Enum):
+    """How (and whether) a cursor page reports the total number of rows."""
+    NONE = "none"          # No total; cheapest
+    ESTIMATE = "estimate"  # Planner statistics for the whole table (ignores filters)
+    EXACT = "exact"        # COUNT(*) over the filtered query
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Generic keyset pagination container."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_more: bool
+    limit: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    def map(self, func: Callable[[T], R]) -> "CursorPage[R]":
+        """Same page with every item converted (e.g. ORM rows to response schemas)."""
+        return CursorPage[Any](
+            items=[func(item) for item in self.items],
+            **self.model_dump(exclude={"items"}),
+        )
+
+
+# Cursor values are JSON; these tags restore the types the sort columns need.
+def _encode_value(value: Any) -> List[Any]:
+    if value is None:
+        return ["n", None]
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    if isinstance(value, UUID):
+        return ["u", str(value)]
+    return ["v", value]
+
+
+_DECODERS = {
+    "n": lambda value: None,
+    "dt": datetime.fromisoformat,
+    "d": date.fromisoformat,
+    "dec": Decimal,
+    "u": UUID,
+    "v": lambda value: value,
+}
+
+
+def encode_cursor(signature: str, values: Sequence[Any]) -> str:
+    """Opaque cursor for the row whose sort values are ``values``."""
+    payload = json.dumps({"s": signature, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, signature: str) -> List[Any]:
+    """
+    Sort values stored in ``cursor``.
+
+    Raises:
+        ValidationError: If the cursor is malformed or was issued for a
+            different sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_DECODERS[tag](value) for tag, value in payload["k"]]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValidationError("Invalid pagination cursor")
+    if payload.get("s") != signature:
+        raise ValidationError("Pagination cursor does not match the requested sort order")
+    return values
+
+
+class KeysetPaginator:
+    """
+    Keyset pagination over a model for a fixed sort order.
+
+    The primary key is appended to the sort as a tiebreaker, so the order is
+    total even when the sort columns repeat. Sort columns should be NOT NULL
+    (``col > NULL`` never matches) and backed by an index on the sort
+    columns followed by the id, so every page is an index range scan.
+    """
+
+    def __init__(self, model: Type, sort: Sequence[SortSpec], tiebreaker: str = "id"):
+        if not sort:
+            raise ValueError("Keyset pagination needs at least one sort column")
+        self.model = model
+        self.sort = list(sort)
+        if all(spec.field != tiebreaker for spec in self.sort):
+            self.sort.append(SortSpec(field=tiebreaker, order=self.sort[-1].order))
+        self.columns = [FilterBuilder.get_field(model, spec.field) for spec in self.sort]
+        self.signature = ",".join(f"{spec.field}:{spec.order.value}" for spec in self.sort)
+
+    def keyset_condition(self, values: Sequence[Any]):
+        """WHERE clause selecting the rows that sort after ``values``."""
+        orders = {spec.order for spec in self.sort}
+        if len(orders) == 1:
+            # Uniform direction: a row comparison Postgres matches to the index.
+            # A plain tuple lets each value take its column's bind type.
+            row, after = tuple_(*self.columns), tuple(values)
+            return row < after if SortOrder.DESC in orders else row > after
+
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        branches = []
+        for index, (spec, column) in enumerate(zip(self.sort, self.columns)):
+            equal = [self.columns[i] == values[i] for i in range(index)]
+            step = column < values[index] if spec.order == SortOrder.DESC else column > values[index]
+            branches.append(and_(*equal, step))
+        return or_(*branches)
+
+    def apply(self, query: Select, cursor: Optional[str], limit: int) -> Select:
+        """Order ``query``, skip to ``cursor`` and fetch one row more than ``limit``."""
+        query = FilterBuilder.apply_sort(query, self.model, self.sort)
+        if cursor:
+            query = query.where(self.keyset_condition(decode_cursor(cursor, self.signature)))
+        return query.limit(limit + 1)
+
+    def cursor_for(self, row: Any) -> str:
+        """Cursor pointing just after ``row``."""
+        return encode_cursor(self.signature, [getattr(row, column.key) for column in self.columns])
+
+    async def paginate(
+        self,
+        session: AsyncSession,
+        query: Select,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        count: CountMode = CountMode.NONE,
+    ) -> CursorPage:
+        """
+        Fetch one page of ``query`` (a filtered ``select(model)``).
+
+        Args:
+            session: Database session
+            query: Filtered select without ordering, offset or limit
+            cursor: ``next_cursor`` of the previous page (None = first page)
+            limit: Page size
+            count: Whether and how to report the total
+        """
+        result = await session.execute(self.apply(query, cursor, limit))
+        rows = list(result.scalars().all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        total = None
+        if count == CountMode.EXACT:
+            total = await count_rows(session, query)
+        elif count == CountMode.ESTIMATE:
+            total = await estimate_table_rows(session, self.model.__tablename__)
+
+        return CursorPage(
+            items=rows,
+            next_cursor=self.cursor_for(rows[-1]) if has_more else None,
+            has_more=has_more,
+            limit=limit,
+            total=total,
+            total_is_estimate=count == CountMode.ESTIMATE and total is not None,
+        )
+
+
+async def count_rows(session: AsyncSession, query: Select) -> int:
+    """Exact number of rows ``query`` matches."""
+    subquery = query.order_by(None).limit(None).offset(None).subquery()
+    result = await session.execute(select(func.count()).select_from(subquery))
+    return result.scalar_one()
+
+
+async def estimate_table_rows(session: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Row count of ``table_name`` from planner statistics.
+
+    Free to read but only as fresh as the last ANALYZE/autovacuum, and it
+    describes the whole table, not a filtered subset. A partitioned table
+    has no rows of its own (its reltuples is -1), so the estimates of its
+    partitions are summed. None if no part of the table has been analysed.
+    """
+    result = await session.execute(
+        text("""
+            WITH RECURSIVE tree(oid) AS (
+                SELECT to_regclass(:table_name)::oid
+                UNION ALL
+                SELECT i.inhrelid FROM pg_inherits i JOIN tree ON i.inhparent = tree.oid
+            )
+            SELECT sum(c.reltuples) FILTER (WHERE c.reltuples >= 0 AND c.relkind <> 'p')::bigint
+            FROM tree JOIN pg_class c ON c.oid = tree.oid
+        """),
+        {"table_name": table_name},
+    )
+    return result.scalar_one_or_none()
@@ -6,11 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
 
+from app.db.routing import get_read_session
 from app.db.session import get_session
 from app.core.config import settings
 # Database dependency
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_session)]
 
+# Read-only database dependency (replica when available, see app.db.routing)
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
+
 
 # Common query parameters
 class CommonQueryParams(BaseModel):
@@ -237,6 +241,7 @@ async def get_request_id() -> str:
 # Export commonly used dependencies
 __all__ = [
     "AsyncSessionDep",
+    "ReadSessionDep",
     "CommonQueryParams",
     "PaginationParams",
     "get_api_key",
@@ -48,7 +48,7 @@ class FilterCondition(BaseModel):
 class FilterGroup(BaseModel):
     """Group of filter conditions with logical operator."""
     conditions: List[Union[FilterCondition, "FilterGroup"]] = Field(description="Filter conditions")
-    logic: str = Field(default="AND", regex="^(AND|OR)$", description="Logical operator")
+    logic: str = Field(default="AND", pattern="^(AND|OR)$", description="Logical operator")
 
 
 # Allow FilterGroup to reference itself
@@ -0,0 +1,146 @@
+"""
+Request-scoped batching loaders for primary-key lookups.
+
+Services often resolve related rows one id at a time (the customer of each
+transaction, the item of each line). A ``DataLoader`` collects every
+``load(id)`` issued during one event-loop tick and resolves them with a
+single ``SELECT ... WHERE id IN (...)``; results are memoised, so asking for
+the same row again within the request costs nothing.
+
+Loaders live on the session (``session.info``), which ``get_session`` opens
+per request, so the cache never outlives the request that filled it::
+
+    loaders = get_loaders(session)
+    customer = await loaders[Customer].load(transaction.customer_id)
+    items = await loaders[Item].load_many(line.item_id for line in lines)
+
+Sequential awaits in a loop still issue one query per id; coalescing needs
+the loads to be in flight together (``load_many`` or ``asyncio.gather``).
+"""
+
+import asyncio
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import Base
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+# Upper bound for the IN list of one batch query
+MAX_BATCH_SIZE = 1000
+
+
+def _key(value: Any) -> UUID:
+    """Normalise the str/UUID ids used across models to one key type."""
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+class DataLoader(Generic[ModelType]):
+    """Coalesce and memoise primary-key lookups for one model."""
+
+    def __init__(self, registry: "LoaderRegistry", model: Type[ModelType]):
+        self.registry = registry
+        self.model = model
+        self._cache: Dict[UUID, asyncio.Future] = {}
+        self._queue: List[UUID] = []
+        # The event loop only keeps weak references to tasks; a collected
+        # dispatch would leave its load() futures pending forever
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    def load(self, id: Any) -> "asyncio.Future[Optional[ModelType]]":
+        """
+        Future resolving to the row with primary key ``id`` (None if missing).
+
+        The lookup is queued and dispatched with every other load issued
+        before control returns to the event loop.
+        """
+        key = _key(id)
+        future = self._cache.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append(key)
+        if len(self._queue) == 1:
+            # Runs after every task already scheduled for this tick
+            task = loop.create_task(self._dispatch())
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+        return future
+
+    async def load_many(self, ids: Iterable[Any]) -> List[Optional[ModelType]]:
+        """Rows for ``ids`` in input order, fetched with one query."""
+        return list(await asyncio.gather(*[self.load(id) for id in ids]))
+
+    async def load_map(self, ids: Iterable[Any]) -> Dict[UUID, ModelType]:
+        """Found rows keyed by id; missing ids are left out."""
+        keys = list(dict.fromkeys(_key(id) for id in ids if id))
+        rows = await self.load_many(keys)
+        return {key: row for key, row in zip(keys, rows) if row is not None}
+
+    def clear(self, id: Any = None) -> None:
+        """Forget one memoised id, or all of them."""
+        if id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(_key(id), None)
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        pending = {key: self._cache[key] for key in keys}
+        try:
+            # One AsyncSession cannot run two statements at once
+            async with self.registry.lock:
+                found = {}
+                for start in range(0, len(keys), MAX_BATCH_SIZE):
+                    chunk = keys[start:start + MAX_BATCH_SIZE]
+                    result = await self.registry.session.execute(
+                        select(self.model).where(self.model.id.in_(chunk))
+                    )
+                    self.batches += 1
+                    found.update((_key(row.id), row) for row in result.scalars())
+        except Exception as exc:
+            for key, future in pending.items():
+                # Failures are not memoised; a later load retries
+                self._cache.pop(key, None)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+class LoaderRegistry:
+    """The loaders of one session, created on first use per model."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.lock = asyncio.Lock()
+        self._loaders: Dict[Type[Base], DataLoader] = {}
+
+    def __getitem__(self, model: Type[ModelType]) -> DataLoader[ModelType]:
+        loader = self._loaders.get(model)
+        if loader is None:
+            loader = self._loaders[model] = DataLoader(self, model)
+        return loader
+
+    def clear(self) -> None:
+        """Drop every memoised row (e.g. after writes that changed them)."""
+        for loader in self._loaders.values():
+            loader.clear()
+
+
+def get_loaders(session: AsyncSession) -> LoaderRegistry:
+    """The loader registry attached to ``session``."""
+    registry = session.info.get("loaders")
+    if registry is None:
+        registry = session.info["loaders"] = LoaderRegistry(session)
+    return registry
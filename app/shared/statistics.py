@@ -0,0 +1,196 @@
+"""
+Single-pass statistics queries with write-invalidated caching.
+
+Statistics endpoints used to issue one COUNT/MAX query per figure and one
+GROUP BY per breakdown. ``StatisticsQuery`` compiles all of them for a table
+into one statement: scalar figures become ``COUNT(*) FILTER (WHERE ...)``
+aggregates and breakdowns become ``GROUPING SETS``, with ``GROUPING()``
+telling the rows apart.
+
+Results are cached in process per query name. Any committed ORM write to the
+underlying table (see ``app.shared.write_tracking``) invalidates the entry;
+a TTL covers writes made outside the ORM.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import and_, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.shared.write_tracking import on_tables_committed
+
+
+@dataclass
+class _Breakdown:
+    label: str
+    column: Any
+    where: Optional[ColumnElement]
+    include_null: bool
+    top: Optional[int]
+
+
+class StatisticsQuery:
+    """
+    Declarative builder for a table's statistics.
+
+    Example::
+
+        stats = (
+            StatisticsQuery(Supplier, "suppliers")
+            .count("total")
+            .count("active", Supplier.is_active == True)
+            .breakdown("by_type", Supplier.supplier_type, Supplier.is_active == True)
+        )
+        result = await stats.fetch(session)
+        # {"total": 12, "active": 10, "by_type": {"INVENTORY": 7, "SERVICE": 3}}
+    """
+
+    def __init__(self, model: Type[Any], name: str, ttl: float = 300.0):
+        self.model = model
+        self.name = name
+        self.ttl = ttl
+        self._scalars: List[Tuple[str, ColumnElement]] = []
+        self._breakdowns: List[_Breakdown] = []
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__table__.name
+
+    def count(self, label: str, *where: ColumnElement) -> "StatisticsQuery":
+        """Row count, optionally restricted by ``where`` conditions."""
+        expression = func.count()
+        if where:
+            expression = expression.filter(and_(*where))
+        self._scalars.append((label, expression))
+        return self
+
+    def aggregate(self, label: str, expression: ColumnElement, *where: ColumnElement) -> "StatisticsQuery":
+        """Any aggregate (max, avg, sum...), optionally restricted by ``where``."""
+        if where:
+            expression = expression.filter(and_(*where))
+        self._scalars.append((label, expression))
+        return self
+
+    def breakdown(
+        self,
+        label: str,
+        column: Any,
+        *where: ColumnElement,
+        include_null: bool = False,
+        top: Optional[int] = None,
+    ) -> "StatisticsQuery":
+        """
+        Counts per distinct value of ``column``.
+
+        Values with no rows matching ``where`` are omitted, as with a
+        filtered GROUP BY. ``top`` keeps only the largest groups.
+        """
+        if any(existing.column is column for existing in self._breakdowns):
+            raise ValueError(f"Column {column} already has a breakdown")
+        self._breakdowns.append(_Breakdown(label, column, and_(*where) if where else None, include_null, top))
+        return self
+
+    def statement(self) -> Select:
+        columns = [expression.label(label) for label, expression in self._scalars]
+        if not self._breakdowns:
+            return select(*columns).select_from(self.model)
+
+        for index, item in enumerate(self._breakdowns):
+            count = func.count()
+            if item.where is not None:
+                count = count.filter(item.where)
+            columns.extend([
+                item.column.label(f"_b{index}_key"),
+                count.label(f"_b{index}_count"),
+                func.grouping(item.column).label(f"_b{index}_grouping"),
+            ])
+
+        grouping_sets = [tuple_()] + [tuple_(item.column) for item in self._breakdowns]
+        return select(*columns).select_from(self.model).group_by(func.grouping_sets(*grouping_sets))
+
+    def parse(self, rows: Sequence[Any]) -> Dict[str, Any]:
+        """Turn the statement's rows into ``{label: value}`` / ``{label: {key: count}}``."""
+        result: Dict[str, Any] = {label: None for label, _ in self._scalars}
+        breakdowns: List[Dict[Any, int]] = [{} for _ in self._breakdowns]
+
+        for row in rows:
+            mapping = row._mapping
+            grouped = [
+                index for index in range(len(self._breakdowns))
+                if mapping[f"_b{index}_grouping"] == 0
+            ] if self._breakdowns else []
+
+            if not grouped:
+                # Grand total row (the empty grouping set)
+                for label, _ in self._scalars:
+                    result[label] = mapping[label]
+                continue
+
+            index = grouped[0]
+            item = self._breakdowns[index]
+            key = mapping[f"_b{index}_key"]
+            count = mapping[f"_b{index}_count"] or 0
+            if count and (key is not None or item.include_null):
+                breakdowns[index][key] = count
+
+        for item, counts in zip(self._breakdowns, breakdowns):
+            if item.top is not None:
+                counts = dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:item.top])
+            result[item.label] = counts
+
+        return result
+
+    async def fetch(self, session: AsyncSession, use_cache: bool = True) -> Dict[str, Any]:
+        """Run the statement (one round trip) or return the cached result."""
+        if use_cache:
+            cached = statistics_cache.get(self.name)
+            if cached is not None:
+                return cached
+
+        rows = (await session.execute(self.statement())).all()
+        result = self.parse(rows)
+        if use_cache:
+            statistics_cache.set(self.name, self.table_name, result, self.ttl)
+        return result
+
+
+@dataclass
+class _CacheEntry:
+    table: str
+    value: Dict[str, Any]
+    expires_at: float
+
+
+@dataclass
+class StatisticsCache:
+    """In-process statistics results, dropped when their table is written to."""
+    entries: Dict[str, _CacheEntry] = field(default_factory=dict)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(name)
+        if entry is None or entry.expires_at < time.monotonic():
+            return None
+        return entry.value
+
+    def set(self, name: str, table: str, value: Dict[str, Any], ttl: float) -> None:
+        self.entries[name] = _CacheEntry(table, value, time.monotonic() + ttl)
+
+    def invalidate_tables(self, tables: Set[str]) -> None:
+        for name in [name for name, entry in self.entries.items() if entry.table in tables]:
+            del self.entries[name]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+statistics_cache = StatisticsCache()
+
+
+@on_tables_committed
+def _invalidate_statistics(tables: Set[str]) -> None:
+    if statistics_cache.entries:
+        statistics_cache.invalidate_tables(tables)
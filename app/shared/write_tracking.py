@@ -0,0 +1,157 @@
+"""
+Table write tracking for cache invalidation.
+
+Two complementary mechanisms:
+
+* In process: session hooks collect the tables an ORM session writes to
+  (flushed instances and bulk INSERT/UPDATE/DELETE statements), and the
+  ids of instances it deletes, and hand them to registered listeners once
+  the transaction commits. Rolled back writes are discarded.
+* Across processes: the ``cache_versions`` table holds a counter per cache
+  name, bumped transactionally by statement-level triggers (created by the
+  ``add_cache_versions`` migration, and by ``track_cache_version`` on
+  databases built with ``metadata.create_all``). Reading one row tells any
+  worker whether its cached copy is current.
+"""
+
+import logging
+from typing import Callable, Dict, List, Set
+
+from sqlalchemy import DDL, BigInteger, Column, DateTime, String, Table, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "written_tables"
+_DELETED_KEY = "deleted_rows"
+
+TablesListener = Callable[[Set[str]], None]
+_listeners: List[TablesListener] = []
+
+# Receives {table name: ids of the instances deleted from it}
+DeletedRowsListener = Callable[[Dict[str, Set[str]]], None]
+_deletion_listeners: List[DeletedRowsListener] = []
+
+
+cache_versions = Table(
+    "cache_versions",
+    Base.metadata,
+    Column("name", String(50), primary_key=True, comment="Cache name"),
+    Column("version", BigInteger, nullable=False, server_default="0", comment="Bumped on every write"),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+_BUMP_CACHE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_cache_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version, updated_at)
+    VALUES (TG_ARGV[0], 1, now())
+    ON CONFLICT (name) DO UPDATE
+        SET version = cache_versions.version + 1, updated_at = now();
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def track_cache_version(table: Table, name: str) -> None:
+    """
+    Bump the ``name`` cache version after every statement that writes to ``table``.
+
+    Registers the trigger as after_create DDL, so it exists on databases
+    built with ``metadata.create_all``; migrations create it themselves.
+    """
+    for statement in (
+        _BUMP_CACHE_VERSION_FUNCTION,
+        f"""
+        CREATE TRIGGER {table.name}_bump_cache_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table.name}
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('{name}')
+        """,
+    ):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+async def read_cache_version(session: AsyncSession, name: str) -> int:
+    """Current version of a named cache (0 if it has never been bumped)."""
+    result = await session.execute(
+        select(cache_versions.c.version).where(cache_versions.c.name == name)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def read_cache_versions(session: AsyncSession, names: List[str]) -> Dict[str, int]:
+    """Current versions of several named caches in one query (0 for any never bumped)."""
+    result = await session.execute(
+        select(cache_versions.c.name, cache_versions.c.version).where(cache_versions.c.name.in_(names))
+    )
+    versions = dict.fromkeys(names, 0)
+    versions.update({name: version for name, version in result.all()})
+    return versions
+
+
+def on_tables_committed(listener: TablesListener) -> TablesListener:
+    """Register ``listener(tables)`` to run after each commit that wrote to tables."""
+    _listeners.append(listener)
+    return listener
+
+
+def on_rows_deleted(listener: DeletedRowsListener) -> DeletedRowsListener:
+    """
+    Register ``listener(deleted)`` to run after each commit that deleted ORM instances.
+
+    Only instances deleted through ``session.delete`` are reported; bulk
+    DELETE statements carry no ids and show up in ``on_tables_committed``.
+    """
+    _deletion_listeners.append(listener)
+    return listener
+
+
+def _pending_tables(session) -> Set[str]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    tables = _pending_tables(session)
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(instance), "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+    for instance in session.deleted:
+        table = getattr(type(instance), "__table__", None)
+        entity_id = getattr(instance, "id", None)
+        if table is not None and entity_id is not None:
+            session.info.setdefault(_DELETED_KEY, {}).setdefault(table.name, set()).add(str(entity_id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_write_tables(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            _pending_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_tables(session):
+    tables = session.info.pop(_PENDING_KEY, None)
+    deleted = session.info.pop(_DELETED_KEY, None)
+    for listeners, written in ((_listeners, tables), (_deletion_listeners, deleted)):
+        if not written:
+            continue
+        for listener in listeners:
+            try:
+                listener(written)
+            except Exception as e:
+                logger.error(f"Write tracking listener {listener.__name__} failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tables(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_DELETED_KEY, None)
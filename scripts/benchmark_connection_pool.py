@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request connection cost: NullPool (the old engine) vs. the shared pool.
+
+Simulates requests against the configured DATABASE_URL the way the session
+dependency serves them - open a session, run a primary-key style lookup,
+commit, close - with --concurrency requests in flight, and prints latency
+percentiles plus the pool's checkout wait and connection setup metrics.
+
+Usage:
+    python scripts/benchmark_connection_pool.py --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import create_engine, get_pool_status
+
+
+async def simulate(engine, requests: int, concurrency: int) -> list:
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one_request() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with sessionmaker() as session:
+                await session.execute(text("SELECT id FROM items ORDER BY id LIMIT 1"))
+                await session.commit()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*[one_request() for _ in range(requests)])
+    return timings
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run(requests: int, concurrency: int) -> None:
+    print(f"{'engine':<10}{'median ms':>11}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for label, pooled in (("nullpool", False), ("pooled", True)):
+        engine = create_engine(pooled=pooled)
+        started = time.perf_counter()
+        timings = await simulate(engine, requests, concurrency)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:<10}{statistics.median(timings):>11.2f}{percentile(timings, 0.95):>10.2f}"
+            f"{percentile(timings, 0.99):>10.2f}{requests / elapsed:>10.0f}"
+        )
+        if pooled:
+            print(f"pool: {get_pool_status(engine)}")
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Simulated requests per engine")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark RentalFeeCalculator: per-call late fees vs. the batch fee API.
+
+Prices the currently overdue rentals (up to --limit) both ways against the
+configured DATABASE_URL and prints wall time and statement counts.
+
+Usage:
+    python scripts/benchmark_fee_calculator.py --limit 2000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.transactions.base.models import TransactionHeader, TransactionType
+from app.modules.transactions.services.fee_calculator import RentalFeeCalculator
+
+
+class StatementCounter:
+    """Count statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+async def run(limit: int, as_of_date: date) -> None:
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(TransactionHeader.id)
+            .where(
+                TransactionHeader.transaction_type == TransactionType.RENTAL,
+                TransactionHeader.next_due_date < as_of_date,
+            )
+            .order_by(TransactionHeader.next_due_date)
+            .limit(limit)
+        )
+        transaction_ids = list(result.scalars().all())
+
+    if not transaction_ids:
+        print("No overdue rentals found - seed data first.")
+        return
+
+    print(f"Pricing {len(transaction_ids)} overdue rentals as of {as_of_date}")
+
+    async with AsyncSessionLocal() as session:
+        calculator = RentalFeeCalculator(session)
+        counter.count = 0
+        started = time.perf_counter()
+        per_call_total = sum(
+            [
+                (await calculator.calculate_late_fees(tid, as_of_date))["late_fee_amount"]
+                for tid in transaction_ids
+            ]
+        )
+        per_call_seconds = time.perf_counter() - started
+        per_call_statements = counter.count
+
+    async with AsyncSessionLocal() as session:
+        calculator = RentalFeeCalculator(session)
+        counter.count = 0
+        started = time.perf_counter()
+        batch = await calculator.calculate_fees_batch(transaction_ids, as_of_date)
+        batch_seconds = time.perf_counter() - started
+        batch_statements = counter.count
+
+    batch_total = batch.totals()["late_fee_amount"]
+    print(f"{'path':<10}{'seconds':>10}{'statements':>12}{'late fees':>16}")
+    print(f"{'per-call':<10}{per_call_seconds:>10.3f}{per_call_statements:>12}{per_call_total:>16}")
+    print(f"{'batch':<10}{batch_seconds:>10.3f}{batch_statements:>12}{batch_total:>16}")
+    if batch_seconds > 0:
+        print(f"speedup: {per_call_seconds / batch_seconds:.1f}x")
+    if per_call_total != batch_total:
+        print("WARNING: per-call and batch totals differ")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum rentals to price")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="As-of date (YYYY-MM-DD)")
+    args = parser.parse_args()
+    asyncio.run(run(args.limit, args.as_of))
+
+
+if __name__ == "__main__":
+    main()
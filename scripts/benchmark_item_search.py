@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark item search: legacy ILIKE over the brand/category join vs. the search document.
+
+Seeds synthetic items (SKU prefix BENCH-) into the configured DATABASE_URL,
+then times a page of results plus the matching count for a set of POS-style
+search terms both ways and prints the plan node the new query uses.
+
+Usage:
+    python scripts/benchmark_item_search.py --items 500000
+    python scripts/benchmark_item_search.py --cleanup
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import and_, asc, func, or_, select, text
+
+import app.main  # noqa: F401 - registers all mappers
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.master_data.brands.models import Brand
+from app.modules.master_data.categories.models import Category
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.item_master.search import search_condition, search_rank
+
+SKU_PREFIX = "BENCH-"
+TERMS = ["drill", "dew", "BENCH-0004", "makita saw", "cordless", "xq9"]
+
+SEED_SQL = text("""
+    INSERT INTO items (
+        id, sku, item_name, item_status, brand_id, category_id, unit_of_measurement_id,
+        rental_period, security_deposit, description, model_number, serial_number_required,
+        warranty_period_days, reorder_point, is_rentable, is_saleable, is_active,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid()::text,
+        :prefix || lpad(n::text, 7, '0'),
+        (ARRAY['Cordless Drill', 'Circular Saw', 'Impact Driver', 'Angle Grinder',
+               'Pressure Washer', 'Tile Cutter', 'Scaffold Tower', 'Generator'])[1 + n % 8]
+            || ' ' || (n % 97),
+        'ACTIVE',
+        (SELECT id FROM brands ORDER BY id OFFSET (n % GREATEST((SELECT count(*) FROM brands), 1)) LIMIT 1),
+        (SELECT id FROM categories ORDER BY id OFFSET (n % GREATEST((SELECT count(*) FROM categories), 1)) LIMIT 1),
+        (SELECT id FROM units_of_measurement ORDER BY id LIMIT 1),
+        '1', 0, 'Synthetic benchmark item ' || md5(n::text), 'XQ' || (n % 5000), false,
+        '0', 0, true, false, true, now(), now()
+    FROM generate_series(:start, :stop) AS n
+""")
+
+
+def legacy_condition(term: str):
+    pattern = f"%{term}%"
+    return or_(
+        Item.item_name.ilike(pattern),
+        Item.sku.ilike(pattern),
+        Item.description.ilike(pattern),
+        Item.model_number.ilike(pattern),
+        Item.specifications.ilike(pattern),
+        Brand.name.ilike(pattern),
+        Category.name.ilike(pattern),
+    )
+
+
+def legacy_queries(term: str):
+    joined = (
+        select(Item.id)
+        .outerjoin(Brand, Item.brand_id == Brand.id)
+        .outerjoin(Category, Item.category_id == Category.id)
+        .where(and_(Item.is_active == True, legacy_condition(term)))
+    )
+    page = joined.order_by(asc(Item.item_name)).limit(20)
+    count = select(func.count()).select_from(joined.subquery())
+    return page, count
+
+
+def search_queries(term: str):
+    condition = and_(Item.is_active == True, search_condition(term))
+    page = (
+        select(Item.id)
+        .where(condition)
+        .order_by(search_rank(term).desc(), asc(Item.item_name))
+        .limit(20)
+    )
+    count = select(func.count(Item.id)).where(condition)
+    return page, count
+
+
+async def seed(total: int, batch_size: int = 50000) -> None:
+    async with AsyncSessionLocal() as session:
+        existing = (await session.execute(
+            select(func.count(Item.id)).where(Item.sku.like(f"{SKU_PREFIX}%"))
+        )).scalar_one()
+        if existing >= total:
+            print(f"{existing} benchmark items already present")
+            return
+
+        print(f"Seeding {total - existing} items...")
+        for start in range(existing + 1, total + 1, batch_size):
+            stop = min(start + batch_size - 1, total)
+            await session.execute(SEED_SQL, {"prefix": SKU_PREFIX, "start": start, "stop": stop})
+            await session.commit()
+            print(f"  {stop}/{total}")
+        await session.execute(text("ANALYZE items"))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text("DELETE FROM items WHERE sku LIKE :pattern"), {"pattern": f"{SKU_PREFIX}%"}
+        )
+        await session.commit()
+        print(f"Removed {result.rowcount} benchmark items")
+
+
+async def time_query(session, stmt, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        (await session.execute(stmt)).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def plan_root(session, stmt) -> str:
+    """First index node of the statement's plan (or the plan root)."""
+    compiled = stmt.compile(engine.sync_engine)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN {compiled}", params)
+    rows = [row[0] for row in result]
+    index_lines = [row.strip() for row in rows if "Index" in row]
+    return index_lines[0] if index_lines else rows[0].strip()
+
+
+async def run(items: int, repeats: int) -> None:
+    await seed(items)
+
+    print(f"{'term':<14}{'legacy ms':>11}{'search ms':>11}{'count old':>11}{'count new':>11}  plan")
+    async with AsyncSessionLocal() as session:
+        for term in TERMS:
+            legacy_page, legacy_count = legacy_queries(term)
+            page, count = search_queries(term)
+            legacy_ms = await time_query(session, legacy_page, repeats) + await time_query(session, legacy_count, repeats)
+            search_ms = await time_query(session, page, repeats) + await time_query(session, count, repeats)
+            old_total = (await session.execute(legacy_count)).scalar_one()
+            new_total = (await session.execute(count)).scalar_one()
+            plan = await plan_root(session, count)
+            print(f"{term:<14}{legacy_ms:>11.1f}{search_ms:>11.1f}{old_total:>11}{new_total:>11}  {plan}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500000, help="Number of synthetic items")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query (median reported)")
+    parser.add_argument("--cleanup", action="store_true", help="Delete benchmark items and exit")
+    args = parser.parse_args()
+    asyncio.run(cleanup() if args.cleanup else run(args.items, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
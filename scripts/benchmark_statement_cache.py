@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse/plan overhead of the hottest queries and each statement cache mode.
+
+Part one takes the 20 most frequently called statements from
+pg_stat_statements (PerformanceMetrics only keeps query labels, not SQL)
+and measures how long PostgreSQL spends parsing and planning each one -
+the cost a cached prepared statement stops paying on every call - next
+to its mean execution time. Overhead is the round trip of EXPLAIN (GENERIC_PLAN), which
+parses and plans without executing (PostgreSQL 16 or later), minus that of
+SELECT 1.
+
+Part two replays primary-key lookups through engines in each
+DATABASE_STATEMENT_CACHE_MODE and prints latency percentiles.
+
+Usage:
+    python scripts/benchmark_statement_cache.py --repeat 20 --lookups 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import StatementCacheMode, create_engine
+from app.main import app  # noqa: F401 - registers all mappers
+from app.modules.customers.models import Customer
+from app.modules.master_data.item_master.models import Item
+
+TOP_QUERIES = text("""
+    SELECT query, calls, mean_exec_time
+    FROM pg_stat_statements
+    WHERE query ~* '^\\s*(select|insert|update|delete|with)\\s'
+    ORDER BY calls DESC
+    LIMIT 20
+""")
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def _round_trip_ms(connection, sql: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await connection.execute(sql)  # No arguments: simple protocol, nothing cached
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def planning_overhead(engine, repeat: int) -> None:
+    async with engine.connect() as connection:
+        try:
+            queries = (await connection.execute(TOP_QUERIES)).all()
+        except Exception as e:
+            print(f"pg_stat_statements unavailable: {e}")
+            return
+        raw = (await connection.get_raw_connection()).driver_connection
+        baseline = await _round_trip_ms(raw, "SELECT 1", repeat)
+
+        print(f"{'calls':>10}{'parse+plan ms':>15}{'exec ms':>10}{'share':>8}  query")
+        for query, calls, mean_exec in queries:
+            label = " ".join(query.split())[:70]
+            try:
+                async with raw.transaction():  # Savepoint: a failing statement leaves the rest usable
+                    elapsed = await _round_trip_ms(raw, f"EXPLAIN (GENERIC_PLAN) {query}", repeat)
+            except Exception:
+                print(f"{calls:>10}{'n/a':>15}{mean_exec:>10.3f}{'':>8}  {label}")
+                continue
+            overhead = max(elapsed - baseline, 0.0)
+            share = 100 * overhead / (overhead + mean_exec) if overhead + mean_exec else 0
+            print(f"{calls:>10}{overhead:>15.3f}{mean_exec:>10.3f}{share:>7.1f}%  {label}")
+
+
+async def replay_lookups(lookups: int) -> None:
+    print(f"\n{'mode':<22}{'median ms':>11}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode in StatementCacheMode:
+        engine = create_engine(statement_cache_mode=mode)
+        sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessionmaker() as session:
+            item_ids = (await session.execute(select(Item.id).limit(100))).scalars().all()
+            customer_ids = (await session.execute(select(Customer.id).limit(100))).scalars().all()
+        if not item_ids or not customer_ids:
+            print("Need items and customers in the database to replay lookups")
+            await engine.dispose()
+            return
+
+        timings = []
+        async with sessionmaker() as session:
+            for i in range(lookups):
+                started = time.perf_counter()
+                await session.execute(select(Item).where(Item.id == item_ids[i % len(item_ids)]))
+                await session.execute(
+                    select(Customer).where(Customer.id == customer_ids[i % len(customer_ids)])
+                )
+                await session.commit()
+                session.expunge_all()
+                timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{mode.value:<22}{statistics.median(timings):>11.3f}"
+            f"{percentile(timings, 0.95):>10.3f}{percentile(timings, 0.99):>10.3f}"
+        )
+        await engine.dispose()
+
+
+async def run(repeat: int, lookups: int) -> None:
+    engine = create_engine(pooled=False)
+    try:
+        await planning_overhead(engine, repeat)
+    finally:
+        await engine.dispose()
+    await replay_lookups(lookups)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Planning runs per query")
+    parser.add_argument("--lookups", type=int, default=2000, help="Replayed lookups per cache mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
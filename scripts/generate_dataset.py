@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Generate a large, coherent synthetic dataset with COPY.
+
+Produces master data, items (SKUs follow the ``SKUGenerator`` rules, and
+``sku_sequences`` is advanced so new items continue the numbering),
+inventory units, stock levels, customers, suppliers, transactions with
+lines, and the stock movement ledger, at sizes from a few thousand rows
+up to millions.
+
+The history is simulated day by day from ``--days`` ago to today: stock
+is opened, purchases add to it, sales take from it, rentals move it to
+on-rent and back on their return date. Every movement records the
+balance before and after, so each stock level's ledger replays to the
+closing balance in ``stock_levels``. The last ``open_rentals`` rentals of
+the final 30 days are never returned (some are overdue).
+
+Rows are written with asyncpg's binary COPY, one connection per table,
+with tables of the same dependency level copied in parallel and the
+transaction ledger copied while the next chunk is generated. Each table
+draws from its own ``random.Random`` derived from ``--seed``, so the same
+seed and size always produce the same rows.
+
+Expects an empty, migrated database (``alembic upgrade head``), or pass
+``--truncate`` to empty it first. Targets DATABASE_URL.
+
+Usage:
+    python scripts/generate_dataset.py --preset medium --truncate
+    python scripts/generate_dataset.py --preset large --seed 7 --transactions 2000000
+"""
+
+import argparse
+import asyncio
+import enum
+import heapq
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sqlalchemy as sa  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine  # noqa: E402
+
+import app.main  # noqa: E402,F401 - registers all mappers
+from app.db.base import Base  # noqa: E402
+from app.modules.inventory.partitions import PARENT_TABLE, add_months, month_start, partition_bounds, partition_name  # noqa: E402
+from app.shared.utils.sku_generator import SKUGenerator  # noqa: E402
+
+CHUNK_SIZE = 20000
+TRANSACTION_CHUNK = 5000
+# Open rentals are dated within this many days of today
+OPEN_RENTAL_WINDOW = 30
+MAX_RENTAL_DAYS = 14
+
+CATALOGUE: Dict[str, Dict[str, List[str]]] = {
+    "Power Tools": {
+        "Drills": ["Cordless Drill", "Hammer Drill", "Impact Driver", "Core Drill", "Magnetic Drill"],
+        "Saws": ["Circular Saw", "Jigsaw", "Mitre Saw", "Reciprocating Saw", "Table Saw", "Chainsaw"],
+        "Grinders": ["Angle Grinder", "Bench Grinder", "Die Grinder", "Floor Grinder"],
+    },
+    "Construction Equipment": {
+        "Concrete": ["Concrete Mixer", "Poker Vibrator", "Power Float", "Screed Board"],
+        "Compaction": ["Plate Compactor", "Trench Rammer", "Vibrating Roller"],
+        "Access": ["Scaffold Tower", "Step Ladder", "Extension Ladder", "Podium Steps", "Scissor Lift"],
+    },
+    "Garden Machinery": {
+        "Cutting": ["Hedge Trimmer", "Brush Cutter", "Lawn Mower", "Stump Grinder"],
+        "Soil": ["Rotavator", "Turf Cutter", "Post Hole Borer", "Log Splitter"],
+    },
+    "Cleaning Equipment": {
+        "Washers": ["Pressure Washer", "Steam Cleaner", "Carpet Cleaner", "Drain Jetter"],
+        "Floor Care": ["Floor Sander", "Floor Scrubber", "Wet Vacuum", "Polisher"],
+    },
+    "Event Supplies": {
+        "Furniture": ["Folding Table", "Banquet Chair", "Cocktail Table", "Stage Platform"],
+        "Power And Light": ["Generator", "Flood Light", "Light Tower", "Cable Reel", "Heater"],
+    },
+}
+VARIANTS = ["Pro", "Compact", "Heavy Duty", "XL", "Mini", "18V", "240V", "Petrol", "Diesel", "Electric"]
+BRANDS = ["Makita", "DeWalt", "Bosch", "Hilti", "Stihl", "Husqvarna", "Karcher", "Milwaukee", "Ryobi", "Honda",
+          "Belle", "Wacker", "Altrad", "Kango", "Evolution", "Festool", "Metabo", "Hitachi", "Atlas", "Clarke"]
+FIRST_NAMES = ["Lalthanga", "Zodin", "Mary", "John", "Aisha", "Rohan", "Mei", "Carlos", "Fatima", "Liam",
+               "Priya", "Noah", "Sara", "Tomas", "Grace", "Arjun", "Elena", "Omar", "Chloe", "Vanlal"]
+LAST_NAMES = ["Sailo", "Pachuau", "Smith", "Khan", "Sharma", "Chen", "Garcia", "Okafor", "Novak", "Ralte",
+              "Brown", "Silva", "Das", "Muller", "Kim", "Lal", "Hnamte", "Wilson", "Roy", "Colney"]
+CITIES = [("Aizawl", "Mizoram"), ("Lunglei", "Mizoram"), ("Shillong", "Meghalaya"), ("Guwahati", "Assam"),
+          ("Kolkata", "West Bengal"), ("Imphal", "Manipur")]
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    """Row counts for a generated dataset."""
+
+    items: int
+    customers: int
+    transactions: int
+    open_rentals: int
+    locations: int = 3
+    suppliers: int = 50
+    units_per_item: int = 2
+    days: int = 730
+
+
+PRESETS: Dict[str, DatasetSize] = {
+    "tiny": DatasetSize(items=200, customers=100, transactions=2_000, open_rentals=200, days=120),
+    "small": DatasetSize(items=5_000, customers=2_000, transactions=50_000, open_rentals=2_000),
+    "medium": DatasetSize(items=20_000, customers=20_000, transactions=250_000, open_rentals=5_000),
+    "large": DatasetSize(items=50_000, customers=100_000, transactions=1_000_000, open_rentals=10_000, locations=5),
+    "xlarge": DatasetSize(items=200_000, customers=500_000, transactions=5_000_000, open_rentals=50_000,
+                          locations=10, suppliers=500, days=1095),
+}
+
+
+def resolve_size(preset: str, overrides: Dict[str, Optional[int]]) -> DatasetSize:
+    """``preset`` with the non-None ``overrides`` applied."""
+    values = {f.name: getattr(PRESETS[preset], f.name) for f in fields(DatasetSize)}
+    values.update({key: value for key, value in overrides.items() if value is not None})
+    return DatasetSize(**values)
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], size: int = CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
+@dataclass
+class _Stock:
+    id: str
+    item_id: str
+    location_id: str
+    available: int = 0
+    on_rent: int = 0
+
+    @property
+    def on_hand(self) -> int:
+        return self.available + self.on_rent
+
+
+class DatasetGenerator:
+    """Deterministic row generator for one dataset."""
+
+    def __init__(self, size: DatasetSize, seed: int = 42, prefix: str = "GEN", today: Optional[date] = None):
+        self.size = size
+        self.seed = seed
+        self.prefix = prefix
+        self.today = today or date.today()
+        self.start = self.today - timedelta(days=size.days)
+        self.opened_at = datetime.combine(self.start, datetime.min.time(), tzinfo=timezone.utc)
+        self._skus = SKUGenerator(session=None)  # Only its naming rules are used
+        self._build_master_data()
+
+    def rng(self, stream: str) -> random.Random:
+        """Independent random stream per table, so tables can be generated in any order."""
+        return random.Random(f"{self.seed}:{stream}")
+
+    def _uuid(self, rng: random.Random) -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def _timestamps(self, moment: datetime) -> Dict[str, Any]:
+        return {"created_at": moment, "updated_at": moment, "created_by": "datagen"}
+
+    # Master data
+
+    def _build_master_data(self) -> None:
+        rng = self.rng("master")
+        self.unit_rows = [
+            {"id": self._uuid(rng), "name": name, "abbreviation": abbreviation, **self._timestamps(self.opened_at)}
+            for name, abbreviation in [("Each", "ea"), ("Set", "set"), ("Pair", "pr"), ("Kit", "kit")]
+        ]
+        self.brand_rows = [
+            {"id": self._uuid(rng), "name": name, "code": name[:3].upper() + f"{n:02d}",
+             "description": f"{name} equipment", **self._timestamps(self.opened_at)}
+            for n, name in enumerate(BRANDS)
+        ]
+
+        self.category_rows, self.leaf_categories = [], []
+        for order, (root, children) in enumerate(CATALOGUE.items()):
+            root_id = self._uuid(rng)
+            self.category_rows.append({
+                "id": root_id, "name": root, "parent_category_id": None, "category_path": root,
+                "category_level": 1, "display_order": order, "is_leaf": False, **self._timestamps(self.opened_at),
+            })
+            for child_order, (child, products) in enumerate(children.items()):
+                child_id = self._uuid(rng)
+                path = f"{root}/{child}"
+                self.category_rows.append({
+                    "id": child_id, "name": child, "parent_category_id": root_id, "category_path": path,
+                    "category_level": 2, "display_order": child_order, "is_leaf": True,
+                    **self._timestamps(self.opened_at),
+                })
+                codes = (self._skus._generate_code_from_name(root, max_length=4),
+                         self._skus._generate_code_from_name(child, max_length=3))
+                self.leaf_categories.append((child_id, codes, products))
+
+        self.location_rows = []
+        for n in range(self.size.locations):
+            city, state = CITIES[n % len(CITIES)]
+            self.location_rows.append({
+                "id": self._uuid(rng), "location_code": f"{self.prefix}-L{n:03d}",
+                "location_name": f"{city} {'Warehouse' if n == 0 else f'Store {n}'}",
+                "location_type": "WAREHOUSE" if n == 0 else "STORE",
+                "address": f"{rng.randint(1, 400)} Main Road", "city": city, "state": state, "country": "India",
+                "postal_code": f"{rng.randint(100000, 999999)}", **self._timestamps(self.opened_at),
+            })
+        self.location_ids = [row["id"] for row in self.location_rows]
+
+        self.supplier_rows = [
+            {"id": self._uuid(rng), "supplier_code": f"{self.prefix}-S{n:05d}",
+             "company_name": f"{rng.choice(BRANDS)} {rng.choice(['Distributors', 'Supplies', 'Trading', 'Industries'])} {n}",
+             "supplier_type": rng.choice(["MANUFACTURER", "DISTRIBUTOR", "WHOLESALER"]),
+             "email": f"orders{n}@supplier.example.com", "city": rng.choice(CITIES)[0], "country": "India",
+             **self._timestamps(self.opened_at)}
+            for n in range(self.size.suppliers)
+        ]
+        self.supplier_ids = [row["id"] for row in self.supplier_rows]
+
+        # Item ids are needed by several tables, so they are drawn up front
+        item_rng = self.rng("item-ids")
+        self.item_ids = [self._uuid(item_rng) for _ in range(self.size.items)]
+        customer_rng = self.rng("customer-ids")
+        self.customer_ids = [self._uuid(customer_rng) for _ in range(self.size.customers)]
+
+    # Items
+
+    def items(self) -> Iterator[Dict[str, Any]]:
+        """Items with SKUs built the way ``SKUGenerator.generate_sku`` builds them."""
+        rng = self.rng("items")
+        self.sequences: Dict[str, int] = {}
+        self.rentable: List[int] = []
+        self.saleable: List[int] = []
+        self.prices: List[Tuple[Decimal, Decimal, Decimal]] = []
+        for n, item_id in enumerate(self.item_ids):
+            category_id, (category_code, subcategory_code), products = rng.choice(self.leaf_categories)
+            name = f"{rng.choice(products)} {rng.choice(VARIANTS)} {rng.randint(100, 9999)}"
+            kind = rng.random()
+            is_rentable, is_saleable = kind < 0.65, kind >= 0.5
+            key = "-".join([
+                category_code, subcategory_code, self._skus._get_product_code(name),
+                self._skus._get_attributes_code_from_booleans(is_rentable, is_saleable),
+            ])
+            self.sequences[key] = self.sequences.get(key, 0) + 1
+            price = rng.lognormvariate(5, 1)
+            sale, rate, cost = _money(price), _money(max(price / 25, 1)), _money(price * 0.6)
+            self.prices.append((sale, rate, cost))
+            if is_rentable:
+                self.rentable.append(n)
+            if is_saleable:
+                self.saleable.append(n)
+            yield {
+                "id": item_id, "sku": f"{key}-{self.sequences[key]:03d}", "item_name": name,
+                "item_status": "ACTIVE", "brand_id": rng.choice(self.brand_rows)["id"], "category_id": category_id,
+                "unit_of_measurement_id": self.unit_rows[0]["id"], "rental_rate_per_period": rate,
+                "rental_period": "1", "sale_price": sale, "purchase_price": cost, "security_deposit": _money(price / 5),
+                "description": f"{name} for hire and sale", "model_number": f"M{rng.randint(1000, 99999)}",
+                "serial_number_required": False, "warranty_period_days": "365",
+                "reorder_point": rng.randint(2, 15), "is_rentable": is_rentable, "is_saleable": is_saleable,
+                **self._timestamps(self.opened_at),
+            }
+
+    def sku_sequences(self) -> Iterator[Dict[str, Any]]:
+        """Sequence rows continuing after the generated SKUs (call after ``items``)."""
+        rng = self.rng("sku-sequences")
+        for key, last in self.sequences.items():
+            yield {"id": self._uuid(rng), "brand_code": key, "category_code": None,
+                   "next_sequence": str(last + 1), **self._timestamps(self.opened_at)}
+
+    def inventory_units(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng("inventory-units")
+        for n in self.rentable:
+            for k in range(self.size.units_per_item):
+                yield {
+                    "id": self._uuid(rng), "item_id": self.item_ids[n], "location_id": rng.choice(self.location_ids),
+                    "unit_code": f"{self.prefix}-U{n:07d}-{k:02d}", "serial_number": f"SN{rng.getrandbits(40):012X}",
+                    "status": "AVAILABLE", "condition": "GOOD", "purchase_date": self.opened_at,
+                    "purchase_price": self.prices[n][2], **self._timestamps(self.opened_at),
+                }
+
+    def customers(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng("customers")
+        for n, customer_id in enumerate(self.customer_ids):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            business = rng.random() < 0.2
+            city, state = rng.choice(CITIES)
+            yield {
+                "id": customer_id, "customer_code": f"{self.prefix}-C{n:08d}",
+                "customer_type": "BUSINESS" if business else "INDIVIDUAL",
+                "business_name": f"{last} {rng.choice(['Builders', 'Events', 'Contractors'])}" if business else None,
+                "first_name": first, "last_name": last, "email": f"{first.lower()}.{n}@customer.example.com",
+                "phone": f"+91{7000000000 + n}", "address_line1": f"{rng.randint(1, 999)} {last} Street",
+                "city": city, "state": state, "country": "India", "customer_tier": "BRONZE",
+                "credit_limit": _money(rng.choice([0, 5000, 20000, 100000])), "status": "ACTIVE",
+                "blacklist_status": "CLEAR", "credit_rating": "GOOD",
+                **self._timestamps(self.opened_at),
+            }
+
+    # Stock and the transaction ledger
+
+    def stock_levels(self) -> Iterator[Dict[str, Any]]:
+        """Opening stock levels (closing balances are applied after the ledger is written)."""
+        rng = self.rng("stock")
+        rentable = set(self.rentable)
+        self.stock: Dict[Tuple[int, int], _Stock] = {}
+        self.opening: List[Tuple[_Stock, int]] = []
+        for n, item_id in enumerate(self.item_ids):
+            for location, location_id in enumerate(self.location_ids):
+                stock = _Stock(self._uuid(rng), item_id, location_id)
+                self.stock[(n, location)] = stock
+                self.opening.append((stock, rng.randint(5, 40) if n in rentable else rng.randint(20, 200)))
+                yield {
+                    "id": stock.id, "item_id": item_id, "location_id": location_id,
+                    "quantity_on_hand": 0, "quantity_available": 0, "quantity_on_rent": 0,
+                    **self._timestamps(self.opened_at),
+                }
+
+    def closing_balances(self) -> Iterator[Tuple[str, int, int, int]]:
+        for stock in self.stock.values():
+            yield stock.id, stock.on_hand, stock.available, stock.on_rent
+
+    def _movement(self, rng, stock: _Stock, kind: str, change: int, moment: datetime, reason: str,
+                  header_id: Optional[str] = None, line_id: Optional[str] = None) -> Dict[str, Any]:
+        before = stock.available
+        stock.available += change
+        if kind in ("RENTAL_OUT", "RENTAL_RETURN"):
+            stock.on_rent -= change
+        return {
+            "id": self._uuid(rng), "stock_level_id": stock.id, "item_id": stock.item_id,
+            "location_id": stock.location_id, "is_active": True, "movement_type": kind,
+            "reference_type": "TRANSACTION" if header_id else "BULK_IMPORT", "reference_id": header_id,
+            "quantity_change": Decimal(change), "quantity_before": Decimal(before),
+            "quantity_after": Decimal(stock.available), "reason": reason, "transaction_line_id": line_id,
+            "created_at": moment, "updated_at": moment, "created_by": "datagen",
+        }
+
+    def ledger(self) -> Iterator[Tuple[List[Dict], List[Dict], List[Dict]]]:
+        """
+        Simulate the history; yields ``(headers, lines, movements)`` chunks in time order.
+
+        Call after ``items`` and ``stock_levels``.
+        """
+        rng = self.rng("ledger")
+        size = self.size
+        self._item_index = {item_id: n for n, item_id in enumerate(self.item_ids)}
+        headers, lines, movements = [], [], []
+        number = 0
+        returns: List[Tuple[date, int, Dict[str, Any], List[Tuple[_Stock, Dict[str, Any]]]]] = []
+
+        for stock, quantity in self.opening:
+            movements.append(self._movement(rng, stock, "INITIAL_STOCK", quantity, self.opened_at, "Opening stock"))
+
+        history_days = size.days
+        open_start = max(size.days - OPEN_RENTAL_WINDOW, 0)
+        for offset in range(1, history_days + 1):
+            day = self.start + timedelta(days=offset)
+            midnight = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+            # Rentals due back today are returned first thing
+            while returns and returns[0][0] <= day:
+                _, _, header, rented = heapq.heappop(returns)
+                moment = midnight + timedelta(hours=8)
+                for stock, line in rented:
+                    movements.append(self._movement(
+                        rng, stock, "RENTAL_RETURN", int(line["quantity"]), moment,
+                        f"Rental return - {header['transaction_number']}", header["id"], line["id"],
+                    ))
+
+            todays = size.transactions * offset // history_days - size.transactions * (offset - 1) // history_days
+            opened = 0
+            if offset > open_start and size.open_rentals:
+                window = history_days - open_start
+                position = offset - open_start
+                opened = size.open_rentals * position // window - size.open_rentals * (position - 1) // window
+            kinds = [rng.choices(("SALE", "RENTAL", "PURCHASE"), (5, 4, 1))[0] for _ in range(todays)]
+            kinds += ["OPEN_RENTAL"] * opened
+            rng.shuffle(kinds)
+            times = sorted(rng.uniform(9 * 3600, 19 * 3600) for _ in kinds)
+
+            for kind, seconds in zip(kinds, times):
+                moment = midnight + timedelta(seconds=seconds)
+                is_open = kind == "OPEN_RENTAL"
+                kind = "RENTAL" if is_open else kind
+                days_left = (self.today - day).days
+                if kind == "RENTAL" and not is_open and days_left < 2:
+                    kind = "SALE"  # Too recent to have been returned
+                location = rng.randrange(size.locations)
+                number += 1
+                header = self._header(rng, number, kind, location, moment)
+                new_lines = self._lines(rng, header, kind, location, moment, is_open, days_left)
+                if not new_lines:
+                    # Nothing in stock to sell or rent: record a restocking purchase instead
+                    header = self._header(rng, number, "PURCHASE", location, moment, header["id"])
+                    new_lines = self._lines(rng, header, "PURCHASE", location, moment, False, days_left)
+                rented = [(self.stock[(self._item_index[line["item_id"]], location)], line)
+                          for line, _ in new_lines if line["rental_end_date"] and not is_open]
+                if rented:
+                    # Returned on the last line's end date (the rows already record the return)
+                    due = max(line["rental_end_date"] for _, line in rented)
+                    heapq.heappush(returns, (due, number, header, rented))
+                for line, movement in new_lines:
+                    lines.append(line)
+                    movements.append(movement)
+                self._total(header, [line for line, _ in new_lines], is_open)
+                headers.append(header)
+
+                if len(headers) >= TRANSACTION_CHUNK:
+                    yield headers, lines, movements
+                    headers, lines, movements = [], [], []
+
+        if headers or movements:
+            yield headers, lines, movements
+
+    def _header(self, rng, number: int, kind: str, location: int, moment: datetime,
+                header_id: Optional[str] = None) -> Dict[str, Any]:
+        party = rng.choice(self.supplier_ids if kind == "PURCHASE" else self.customer_ids)
+        return {
+            "id": header_id or self._uuid(rng), "transaction_number": f"{self.prefix}-{kind[:3]}-{number:09d}",
+            "transaction_type": kind, "status": "COMPLETED", "payment_status": "PAID",
+            "transaction_date": moment, "customer_id": party, "location_id": self.location_ids[location],
+            "currency": "INR", "exchange_rate": Decimal(1), "subtotal": Decimal(0), "discount_amount": Decimal(0),
+            "tax_amount": Decimal(0), "shipping_amount": Decimal(0), "total_amount": Decimal(0),
+            "paid_amount": Decimal(0), "deposit_amount": None, "deposit_paid": False,
+            "customer_advance_balance": Decimal(0), "payment_method": rng.choice(["CASH", "CREDIT_CARD", "BANK_TRANSFER"]),
+            "delivery_required": False, "pickup_required": False, "next_due_date": None,
+            "rental_line_count": 0, "returned_line_count": 0, "partial_return_line_count": 0,
+            "returned_quantity_total": Decimal(0), "is_active": True,
+            "created_at": moment, "updated_at": moment, "created_by": "datagen",
+        }
+
+    def _lines(self, rng, header, kind: str, location: int, moment: datetime, is_open: bool,
+               days_left: int) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        pool = self.rentable if kind == "RENTAL" else self.saleable if kind == "SALE" else range(len(self.item_ids))
+        if not pool:
+            return []
+        picked = {rng.choice(pool) for _ in range(rng.randint(1, 3))}
+        day = moment.date()
+        result = []
+        for item in sorted(picked):
+            stock = self.stock[(item, location)]
+            sale, rate, cost = self.prices[item]
+            line = {
+                "id": self._uuid(rng), "transaction_id": header["id"], "line_number": len(result) + 1,
+                "line_type": "PRODUCT", "item_id": stock.item_id, "sku": None, "description": None,
+                "quantity": None, "unit_price": None, "discount_percent": Decimal(0), "discount_amount": Decimal(0),
+                "tax_rate": Decimal(0), "tax_amount": Decimal(0), "line_total": None,
+                "rental_start_date": None, "rental_end_date": None, "rental_period": None,
+                "rental_period_unit": None, "daily_rate": None, "current_rental_status": None,
+                "location_id": stock.location_id, "status": "COMPLETED", "fulfillment_status": "COMPLETED",
+                "returned_quantity": Decimal(0), "return_date": None, "is_active": True,
+                "created_at": moment, "updated_at": moment, "created_by": "datagen",
+            }
+            if kind == "PURCHASE":
+                quantity = rng.randint(5, 50)
+                price, movement_kind, change = cost, "PURCHASE", quantity
+            else:
+                quantity = min(rng.randint(1, 3), stock.available)
+                if quantity <= 0:
+                    continue
+                price, movement_kind, change = (rate, "RENTAL_OUT", -quantity) if kind == "RENTAL" else (sale, "SALE", -quantity)
+
+            line.update({"description": f"{kind.title()} of item {item}", "quantity": Decimal(quantity),
+                         "unit_price": price, "line_total": price * quantity})
+            if kind == "RENTAL":
+                period = rng.randint(1, MAX_RENTAL_DAYS)
+                if not is_open:
+                    period = min(period, days_left - 1)
+                line.update({
+                    "rental_start_date": day, "rental_end_date": day + timedelta(days=period),
+                    "rental_period": period, "rental_period_unit": "DAY", "daily_rate": rate,
+                    "unit_price": rate * period, "line_total": rate * period * quantity,
+                    "current_rental_status": "ACTIVE" if is_open else "COMPLETED",
+                })
+                if is_open:
+                    line["status"] = "PROCESSING"
+                else:
+                    line.update({"returned_quantity": line["quantity"], "return_date": line["rental_end_date"]})
+            movement = self._movement(rng, stock, movement_kind, change, moment,
+                                      f"{kind.title()} - {header['transaction_number']}", header["id"], line["id"])
+            result.append((line, movement))
+        return result
+
+    def _total(self, header: Dict[str, Any], lines: List[Dict[str, Any]], is_open: bool) -> None:
+        subtotal = sum((line["line_total"] for line in lines), Decimal(0))
+        header.update({"subtotal": subtotal, "total_amount": subtotal, "paid_amount": subtotal})
+        if header["transaction_type"] == "RENTAL":
+            header.update({
+                "rental_line_count": len(lines),
+                "returned_line_count": 0 if is_open else len(lines),
+                "returned_quantity_total": Decimal(0) if is_open else sum(line["quantity"] for line in lines),
+                "deposit_amount": _money(float(subtotal) / 5), "deposit_paid": True,
+            })
+            if is_open:
+                header.update({"status": "IN_PROGRESS", "payment_status": "PARTIAL", "paid_amount": Decimal(0),
+                               "next_due_date": min(line["rental_end_date"] for line in lines)})
+
+
+class CopyWriter:
+    """Binary COPY of row dicts into one table over a dedicated connection."""
+
+    def __init__(self, engine: AsyncEngine, table: str):
+        self.engine = engine
+        self.table: sa.Table = Base.metadata.tables[table]
+        self.rows = 0
+        self._connection = None
+        self._raw = None
+        self._columns: Optional[List[str]] = None
+        self._defaults: Dict[str, Callable[[], Any]] = {}
+        self._aware: Dict[str, bool] = {}
+
+    async def __aenter__(self) -> "CopyWriter":
+        self._connection = await self.engine.connect()
+        self._raw = (await self._connection.get_raw_connection()).driver_connection
+        types = await self._raw.fetch(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = $1",
+            self.table.name,
+        )
+        self._aware = {
+            row["column_name"]: row["data_type"] == "timestamp with time zone"
+            for row in types if row["data_type"].startswith("timestamp")
+        }
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._connection.close()
+
+    def _layout(self, keys) -> None:
+        """Copied columns: the generated ones plus Python-side defaults the database does not have."""
+        self._columns = list(keys)
+        for column in self.table.columns:
+            if column.name in keys or column.default is None or column.server_default is not None:
+                continue
+            default = column.default
+            if default.is_scalar:
+                value = default.arg
+                if isinstance(value, enum.Enum):
+                    value = value.name if isinstance(column.type, sa.Enum) else value.value
+                elif isinstance(value, float) and isinstance(column.type, sa.Numeric):
+                    value = Decimal(str(value))
+                self._defaults[column.name] = lambda value=value: value
+            elif default.is_callable:
+                self._defaults[column.name] = lambda function=default.arg: function(None)
+        self._columns += list(self._defaults)
+
+    def _value(self, name: str, value: Any) -> Any:
+        if isinstance(value, datetime) and name in self._aware:
+            if self._aware[name]:
+                return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+            return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+        return value
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._columns is None:
+            self._layout(rows[0].keys())
+        generated = [name for name in self._columns if name not in self._defaults]
+        records = [
+            tuple(self._value(name, row[name]) for name in generated)
+            + tuple(default() for default in self._defaults.values())
+            for row in rows
+        ]
+        async with self._raw.transaction():
+            await self._raw.copy_records_to_table(self.table.name, records=records, columns=self._columns)
+        self.rows += len(rows)
+
+
+async def _copy(engine: AsyncEngine, table: str, rows: Iterator[Dict[str, Any]], progress) -> None:
+    started = time.perf_counter()
+    async with CopyWriter(engine, table) as writer:
+        for chunk in _chunks(rows):
+            await writer.write(chunk)
+    progress(f"  {table}: {writer.rows} rows in {time.perf_counter() - started:.1f}s")
+
+
+async def _ensure_movement_partitions(engine: AsyncEngine, first: date, last: date) -> None:
+    """Monthly ``stock_movements`` partitions covering the history (when the table is partitioned)."""
+    async with engine.begin() as connection:
+        partitioned = (await connection.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))"
+        ), {"parent": PARENT_TABLE})).scalar_one()
+        if not partitioned:
+            return
+        month = month_start(first)
+        while month <= last:
+            await connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} {partition_bounds(month)}"
+            ))
+            month = add_months(month, 1)
+
+
+async def _apply_closing_balances(engine: AsyncEngine, generator: DatasetGenerator) -> None:
+    async with engine.connect() as connection:
+        raw = (await connection.get_raw_connection()).driver_connection
+        async with raw.transaction():
+            await raw.execute(
+                "CREATE TEMP TABLE closing_balances (id text, on_hand numeric, available numeric, on_rent numeric) "
+                "ON COMMIT DROP"
+            )
+            await raw.copy_records_to_table(
+                "closing_balances",
+                records=[(id_, Decimal(a), Decimal(b), Decimal(c)) for id_, a, b, c in generator.closing_balances()],
+            )
+            await raw.execute("""
+                UPDATE stock_levels s
+                SET quantity_on_hand = b.on_hand, quantity_available = b.available, quantity_on_rent = b.on_rent
+                FROM closing_balances b
+                WHERE s.id = b.id
+            """)
+
+
+async def truncate_all(engine: AsyncEngine) -> None:
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    async with engine.begin() as connection:
+        await connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+async def generate(
+    engine: AsyncEngine,
+    size: DatasetSize,
+    seed: int = 42,
+    prefix: str = "GEN",
+    progress: Callable[[str], None] = print,
+) -> DatasetGenerator:
+    """Generate and copy the whole dataset; returns the generator (for its ids)."""
+    generator = DatasetGenerator(size, seed=seed, prefix=prefix)
+    started = time.perf_counter()
+
+    progress("Master data, suppliers and customers")
+    await asyncio.gather(
+        _copy(engine, "units_of_measurement", iter(generator.unit_rows), progress),
+        _copy(engine, "brands", iter(generator.brand_rows), progress),
+        _copy(engine, "categories", iter(generator.category_rows), progress),
+        _copy(engine, "locations", iter(generator.location_rows), progress),
+        _copy(engine, "suppliers", iter(generator.supplier_rows), progress),
+        _copy(engine, "customers", generator.customers(), progress),
+    )
+
+    progress("Items")
+    await _copy(engine, "items", generator.items(), progress)
+
+    progress("SKU sequences, inventory units and stock levels")
+    await asyncio.gather(
+        _copy(engine, "sku_sequences", generator.sku_sequences(), progress),
+        _copy(engine, "inventory_units", generator.inventory_units(), progress),
+        _copy(engine, "stock_levels", generator.stock_levels(), progress),
+        _ensure_movement_partitions(engine, generator.start, generator.today),
+    )
+
+    progress("Transactions, lines and stock movements")
+    ledger_started = time.perf_counter()
+    async with CopyWriter(engine, "transaction_headers") as headers_writer, \
+            CopyWriter(engine, "transaction_lines") as lines_writer, \
+            CopyWriter(engine, "stock_movements") as movements_writer:
+
+        async def write_chunk(headers, lines, movements) -> None:
+            await headers_writer.write(headers)
+            await asyncio.gather(lines_writer.write(lines), movements_writer.write(movements))
+
+        chunks = generator.ledger()
+        pending: Optional[asyncio.Task] = None
+        while True:
+            # Generate the next chunk while the previous one is being copied
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if pending is not None:
+                await pending
+                progress(f"  {headers_writer.rows}/{size.transactions + size.open_rentals} transactions")
+            if chunk is None:
+                break
+            pending = asyncio.create_task(write_chunk(*chunk))
+    progress(
+        f"  {headers_writer.rows} transactions, {lines_writer.rows} lines, {movements_writer.rows} movements "
+        f"in {time.perf_counter() - ledger_started:.1f}s"
+    )
+
+    progress("Closing stock balances")
+    await _apply_closing_balances(engine, generator)
+
+    async with engine.connect() as connection:
+        raw = (await connection.get_raw_connection()).driver_connection
+        await raw.execute("ANALYZE")
+    progress(f"Dataset generated in {time.perf_counter() - started:.1f}s")
+    return generator
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=list(PRESETS), default="small", help="Dataset size")
+    for name in ("items", "customers", "transactions", "open-rentals", "locations", "suppliers", "days"):
+        parser.add_argument(f"--{name}", type=int, help=f"Override the preset's {name.replace('-', ' ')}")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--prefix", default="GEN", help="Prefix for codes and transaction numbers")
+    parser.add_argument("--truncate", action="store_true", help="Empty every table first")
+    args = parser.parse_args()
+
+    size = resolve_size(args.preset, {
+        "items": args.items, "customers": args.customers, "transactions": args.transactions,
+        "open_rentals": args.open_rentals, "locations": args.locations, "suppliers": args.suppliers,
+        "days": args.days,
+    })
+
+    from app.db.session import engine
+
+    try:
+        if args.truncate:
+            await truncate_all(engine)
+        else:
+            async with engine.connect() as connection:
+                if (await connection.execute(text("SELECT EXISTS (SELECT 1 FROM items)"))).scalar_one():
+                    sys.exit("The database already has items; pass --truncate to replace them")
+        print(f"Generating {args.preset} dataset (seed {args.seed}): {size}")
+        await generate(engine, size, seed=args.seed, prefix=args.prefix)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+"""
+Load-test and benchmark suite for the hot endpoints.
+
+Not collected by pytest; run ``python -m tests.benchmarks.run --help``.
+"""
@@ -0,0 +1,136 @@
+"""
+Seed a benchmark dataset at a configurable scale.
+
+The rows come from ``scripts/generate_dataset.py``: a seeded simulation
+of stock, sales, rentals and purchases written with COPY, so two runs at
+the same scale and seed produce the same rows (and the same ids), and
+results can be compared. The scales are the generator's presets.
+
+Codes and transaction numbers carry the ``BENCH`` prefix. Seeding an
+already seeded database is a no-op; ``reset_database`` empties every
+table first.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_password_hash
+from app.db.session import engine
+from app.modules.customers.models import Customer
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.locations.models import Location
+from app.modules.suppliers.models import Supplier
+from app.modules.transactions.base.models import TransactionHeader, TransactionLine
+from app.modules.users.models import User
+from scripts.generate_dataset import PRESETS, DatasetSize, generate, resolve_size, truncate_all
+
+PREFIX = "BENCH"
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "BenchPassword123"
+
+BenchmarkScale = DatasetSize
+SCALES: Dict[str, BenchmarkScale] = PRESETS
+
+
+@dataclass
+class OpenRental:
+    """A seeded rental still out with the customer, for the returns flow."""
+
+    id: str
+    lines: List[Tuple[str, int]]
+    end_date: date
+    deposit: Decimal
+
+
+@dataclass
+class SeededData:
+    """Ids the flows pick from."""
+
+    location_ids: List[str]
+    supplier_ids: List[str]
+    customer_ids: List[str]
+    rentable_item_ids: List[str]
+    saleable_item_ids: List[str]
+    item_names: List[str]
+    open_rentals: List[OpenRental] = field(default_factory=list)
+
+
+async def reset_database(session: AsyncSession) -> None:
+    """Empty every application table (benchmark databases only)."""
+    await session.close()
+    await truncate_all(engine)
+
+
+async def is_seeded(session: AsyncSession, scale: BenchmarkScale) -> bool:
+    items = (await session.execute(select(func.count(Item.id)))).scalar_one()
+    transactions = (await session.execute(
+        select(func.count(TransactionHeader.id)).where(
+            TransactionHeader.transaction_number.like(f"{PREFIX}-%")
+        )
+    )).scalar_one()
+    return items == scale.items and transactions == scale.transactions + scale.open_rentals
+
+
+async def seed_dataset(session: AsyncSession, scale: BenchmarkScale, seed: int = 42, progress=print) -> None:
+    """Generate the dataset for ``scale`` and the benchmark user; the caller must start from an empty database."""
+    await generate(engine, scale, seed=seed, prefix=PREFIX, progress=progress)
+    await session.execute(insert(User.__table__), [{
+        "username": BENCH_USERNAME,
+        "email": "bench@example.com",
+        "password": get_password_hash(BENCH_PASSWORD),
+        "full_name": "Benchmark User",
+        "is_superuser": True,
+        "is_verified": True,
+    }])
+    await session.commit()
+
+
+async def load_dataset(session: AsyncSession, max_open_rentals: Optional[int] = None) -> SeededData:
+    """Read back the ids the flows need from a seeded database."""
+    async def ids(statement) -> List[str]:
+        return [str(value) for value in (await session.execute(statement)).scalars()]
+
+    location_ids = await ids(select(Location.id).where(Location.location_code.like(f"{PREFIX}-%")).order_by(Location.location_code))
+    supplier_ids = await ids(select(Supplier.id).where(Supplier.supplier_code.like(f"{PREFIX}-%")).order_by(Supplier.supplier_code))
+    customer_ids = await ids(select(Customer.id).where(Customer.customer_code.like(f"{PREFIX}-%")).order_by(Customer.customer_code))
+    rentable = await ids(select(Item.id).where(Item.is_rentable == True).order_by(Item.sku))
+    saleable = await ids(select(Item.id).where(Item.is_saleable == True).order_by(Item.sku))
+    names = list((await session.execute(select(Item.item_name).order_by(Item.sku).limit(500))).scalars())
+
+    open_lines = (await session.execute(
+        select(TransactionHeader.id, TransactionHeader.deposit_amount, TransactionLine.id,
+               TransactionLine.quantity, TransactionLine.rental_end_date)
+        .join(TransactionLine, TransactionLine.transaction_id == TransactionHeader.id)
+        .where(
+            TransactionHeader.transaction_number.like(f"{PREFIX}-REN-%"),
+            TransactionHeader.status == "IN_PROGRESS",
+            TransactionLine.returned_quantity == 0,
+        )
+        .order_by(TransactionHeader.transaction_number, TransactionLine.line_number)
+    )).all()
+    rentals: Dict[str, OpenRental] = {}
+    for rental_id, deposit, line_id, quantity, end_date in open_lines:
+        rental = rentals.setdefault(str(rental_id), OpenRental(str(rental_id), [], end_date, deposit or Decimal("0")))
+        rental.lines.append((str(line_id), int(quantity)))
+        rental.end_date = max(rental.end_date, end_date)
+    open_rentals = list(rentals.values())[:max_open_rentals]
+
+    return SeededData(
+        location_ids=location_ids,
+        supplier_ids=supplier_ids,
+        customer_ids=customer_ids,
+        rentable_item_ids=rentable,
+        saleable_item_ids=saleable,
+        item_names=names,
+        open_rentals=open_rentals,
+    )
+
+
+def resolve_scale(name: str, overrides: Iterable[Tuple[str, Optional[int]]] = ()) -> BenchmarkScale:
+    """A preset with any non-None ``(field, value)`` overrides applied."""
+    return resolve_size(name, dict(overrides))
@@ -0,0 +1,155 @@
+"""
+The benchmarked flows, driven through the app in-process.
+
+Requests go through ``httpx.ASGITransport``, so the full middleware stack,
+dependency injection and database access are exercised without a server
+or network in between. The rental status sweep has no HTTP endpoint (the
+scheduler runs it daily) and is timed by calling the updater directly.
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Deque, Dict, List
+
+import httpx
+
+from app.db.session import AsyncSessionLocal
+from app.modules.transactions.services.rental_status_updater import RentalStatusUpdater
+from tests.benchmarks.dataset import BENCH_PASSWORD, BENCH_USERNAME, OpenRental, SeededData
+from tests.benchmarks.harness import Flow, FlowError, expect
+
+SEARCH_TERMS = ["drill", "saw", "PT-DRI", "pressure washer", "m123", "generator", "ladder", "mixer"]
+
+
+@dataclass
+class BenchmarkContext:
+    """State shared by the flows of one run."""
+
+    client: httpx.AsyncClient
+    data: SeededData
+    headers: Dict[str, str]
+    rng: random.Random
+    open_rentals: Deque[OpenRental]
+
+
+async def create_context(app, data: SeededData, seed: int = 42) -> BenchmarkContext:
+    """Client bound to ``app`` and logged in as the benchmark user."""
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=120
+    )
+    response = expect(await client.post(
+        "/api/auth/login", json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+    ))
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return BenchmarkContext(client, data, headers, random.Random(seed), deque(data.open_rentals))
+
+
+def build_flows(context: BenchmarkContext) -> Dict[str, Flow]:
+    """Flows by name, in the order they are run."""
+    client, data, headers, rng = context.client, context.data, context.headers, context.rng
+    today = date.today()
+
+    def items(pool: List[str], count: int) -> List[str]:
+        return rng.sample(pool, min(count, len(pool)))
+
+    async def login(iteration: int) -> None:
+        expect(await client.post(
+            "/api/auth/login", json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+        ))
+
+    async def item_search(iteration: int) -> None:
+        term = SEARCH_TERMS[iteration % len(SEARCH_TERMS)]
+        expect(await client.get(
+            f"/api/master-data/item-master/search/{term}", params={"limit": 20}, headers=headers
+        ))
+
+    async def inventory_overview(iteration: int) -> None:
+        params = {"skip": rng.randrange(0, 500), "limit": 50}
+        if iteration % 3 == 1:
+            params["stock_status"] = "LOW_STOCK"
+        elif iteration % 3 == 2:
+            params["search"] = rng.choice(SEARCH_TERMS)
+        expect(await client.get("/api/inventory/items/overview", params=params, headers=headers))
+
+    async def new_sale(iteration: int) -> None:
+        expect(await client.post("/api/transactions/sales/new", headers=headers, json={
+            "customer_id": rng.choice(data.customer_ids),
+            "transaction_date": today.isoformat(),
+            "notes": "benchmark",
+            "items": [
+                {"item_id": item_id, "quantity": 1, "unit_cost": "25.00", "tax_rate": "0", "discount_amount": "0"}
+                for item_id in items(data.saleable_item_ids, rng.randint(1, 3))
+            ],
+        }))
+
+    async def new_rental(iteration: int) -> None:
+        days = rng.randint(1, 14)
+        expect(await client.post("/api/transactions/rentals/new", headers=headers, json={
+            "transaction_date": today.isoformat(),
+            "customer_id": rng.choice(data.customer_ids),
+            "location_id": rng.choice(data.location_ids),
+            "payment_method": "CASH",
+            "notes": "benchmark",
+            "items": [
+                {
+                    "item_id": item_id, "quantity": 1, "rental_period_value": days,
+                    "rental_start_date": today.isoformat(),
+                    "rental_end_date": (today + timedelta(days=days)).isoformat(),
+                }
+                for item_id in items(data.rentable_item_ids, rng.randint(1, 3))
+            ],
+        }))
+
+    async def new_purchase(iteration: int) -> None:
+        expect(await client.post("/api/transactions/purchases/new", headers=headers, json={
+            "supplier_id": rng.choice(data.supplier_ids),
+            "location_id": rng.choice(data.location_ids),
+            "purchase_date": today.isoformat(),
+            "notes": "benchmark",
+            "items": [
+                {"item_id": item_id, "quantity": rng.randint(1, 10), "unit_cost": "15.00", "condition": "A"}
+                for item_id in items(data.rentable_item_ids + data.saleable_item_ids, rng.randint(1, 3))
+            ],
+        }))
+
+    async def rental_return(iteration: int) -> None:
+        if not context.open_rentals:
+            raise FlowError("No seeded open rentals left to return; seed a larger dataset")
+        rental = context.open_rentals.popleft()
+        expect(await client.post("/api/transactions/rental-returns/", headers=headers, json={
+            "original_transaction_id": rental.id,
+            "return_reason_code": "END_OF_RENTAL",
+            "scheduled_return_date": rental.end_date.isoformat(),
+            "actual_return_date": today.isoformat(),
+            "deposit_amount": str(rental.deposit),
+            "damage_assessment_required": False,
+            "photos_required": False,
+            "return_items": [
+                {
+                    "original_line_id": line_id, "return_quantity": quantity,
+                    "condition_on_return": "GOOD", "cleaning_condition": "CLEAN",
+                    "functionality_check": "WORKING",
+                }
+                for line_id, quantity in rental.lines
+            ],
+        }))
+
+    async def status_sweep(iteration: int) -> None:
+        async with AsyncSessionLocal() as session:
+            results = await RentalStatusUpdater(session).batch_update_overdue_statuses()
+            await session.commit()
+        if results["failed_updates"]:
+            raise FlowError(f"{results['failed_updates']} of {results['updates_needed']} status updates failed")
+
+    return {
+        "login": login,
+        "item_search": item_search,
+        "inventory_overview": inventory_overview,
+        "new_sale": new_sale,
+        "new_rental": new_rental,
+        "new_purchase": new_purchase,
+        "rental_return": rental_return,
+        "status_sweep": status_sweep,
+    }
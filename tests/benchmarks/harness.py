@@ -0,0 +1,169 @@
+"""
+Load generation, reporting and the regression gate for the benchmark suite.
+
+A flow is an async callable taking the iteration number. ``run_flow``
+keeps ``concurrency`` workers calling it until ``requests`` calls have
+been made; a call that raises counts as an error, the others are timed
+into an ``HdrHistogram``.
+
+Reports are plain JSON (``build_report``) so runs can be kept and
+compared: ``compare_reports`` lists every flow whose p95 latency or
+throughput regressed by more than the allowed fraction against a
+baseline report, or that started failing.
+"""
+
+import asyncio
+import itertools
+import platform
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.modules.monitoring.histograms import HdrHistogram
+
+Flow = Callable[[int], Awaitable[None]]
+
+# Error messages kept per flow
+MAX_ERROR_SAMPLES = 5
+
+
+class FlowError(Exception):
+    """A flow call did not produce the expected result."""
+
+
+def expect(response: httpx.Response, *statuses: int) -> httpx.Response:
+    """Raise ``FlowError`` unless the response has one of ``statuses`` (default: any 2xx)."""
+    ok = response.status_code in statuses if statuses else response.is_success
+    if not ok:
+        request = response.request
+        raise FlowError(f"{request.method} {request.url.path}: {response.status_code} {response.text[:200]}")
+    return response
+
+
+@dataclass
+class FlowResult:
+    """Outcome of one flow run."""
+
+    name: str
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latency: HdrHistogram = field(default_factory=HdrHistogram, repr=False)
+    error_samples: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Successful calls per second."""
+        return (self.requests - self.errors) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "latency_ms": {
+                "mean": round(self.latency.mean * 1000, 2),
+                "p50": round(self.latency.percentile(50) * 1000, 2),
+                "p95": round(self.latency.percentile(95) * 1000, 2),
+                "p99": round(self.latency.percentile(99) * 1000, 2),
+                "max": round(self.latency.max * 1000, 2),
+            },
+            "error_samples": self.error_samples,
+        }
+
+
+async def run_flow(name: str, flow: Flow, concurrency: int, requests: int, warmup: int = 0) -> FlowResult:
+    """Call ``flow`` ``requests`` times from ``concurrency`` workers (after ``warmup`` untimed calls)."""
+    for iteration in range(warmup):
+        try:
+            await flow(-1 - iteration)
+        except Exception:
+            pass
+
+    result = FlowResult(name=name, concurrency=concurrency)
+    iterations = itertools.count()
+
+    async def worker() -> None:
+        for iteration in iterations:
+            if iteration >= requests:
+                return
+            started = time.perf_counter()
+            try:
+                await flow(iteration)
+            except Exception as e:
+                result.errors += 1
+                if len(result.error_samples) < MAX_ERROR_SAMPLES:
+                    result.error_samples.append(f"{type(e).__name__}: {e}"[:300])
+            else:
+                result.latency.record(time.perf_counter() - started)
+            finally:
+                result.requests += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def build_report(results: List[FlowResult], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "metadata": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **metadata,
+        },
+        "flows": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare_reports(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float = 0.2,
+    min_delta_ms: float = 2.0,
+) -> List[str]:
+    """
+    Regressions of ``current`` against ``baseline``.
+
+    A flow regresses when its p95 grows by more than ``max_regression``
+    (and by at least ``min_delta_ms``, so sub-millisecond noise does not
+    fail the gate), when its throughput drops by more than
+    ``max_regression``, or when it has errors and the baseline had none.
+    Flows missing from either report are skipped.
+    """
+    regressions = []
+    for name, flow in current["flows"].items():
+        before = baseline.get("flows", {}).get(name)
+        if before is None:
+            continue
+        p95, p95_before = flow["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        if p95 > p95_before * (1 + max_regression) and p95 - p95_before >= min_delta_ms:
+            regressions.append(f"{name}: p95 {p95_before:.1f} ms -> {p95:.1f} ms")
+        rps, rps_before = flow["throughput_rps"], before["throughput_rps"]
+        if rps < rps_before * (1 - max_regression):
+            regressions.append(f"{name}: throughput {rps_before:.1f} -> {rps:.1f} req/s")
+        if flow["errors"] and not before["errors"]:
+            regressions.append(f"{name}: {flow['errors']} errors (baseline had none)")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Fixed-width table of a report's flows."""
+    lines = [
+        f"{'flow':<20} {'conc':>5} {'reqs':>7} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for name, flow in report["flows"].items():
+        latency = flow["latency_ms"]
+        lines.append(
+            f"{name:<20} {flow['concurrency']:>5} {flow['requests']:>7} {flow['errors']:>7} "
+            f"{flow['throughput_rps']:>9.1f} {latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -1,15 +1,26 @@
 import pytest
 import pytest_asyncio
+from decimal import Decimal
+from types import SimpleNamespace
 from typing import AsyncGenerator
 from fastapi.testclient import TestClient
+from sqlalchemy import create_mock_engine, insert
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.main import app
-from app.core.database import get_db, Base
+from app.core.database import get_db
+from app.db.base import Base
 from app.core.config import settings
 from app.modules.users.models import User
 from app.modules.users.services import UserService
 from app.core.security import get_password_hash, create_token_pair
+from app.modules.monitoring.query_budget import QueryBudget
+from app.modules.inventory.models import StockLevel
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.locations.models import Location, LocationType
+from app.modules.master_data.units.models import UnitOfMeasurement
+from app.modules.transactions.services.rental_service import RentalStatusService
 
 
 # Test database URL
@@ -38,6 +49,11 @@ TestingSessionLocal = async_sessionmaker(
 )
 
 
+def compile_sql(clause) -> str:
+    """PostgreSQL SQL of a statement or clause, for tests of statement shape."""
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
 @pytest_asyncio.fixture(scope="function")
 async def setup_test_db():
     """Setup test database"""
@@ -62,6 +78,71 @@ async def db_session(setup_test_db) -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@pytest.fixture
+def insert_row(db_session):
+    """
+    Insert one row of a model's table through Core and return its id.
+    
+    Column defaults apply, and nothing is validated by the model's
+    constructor, so tests only spell out the columns they care about.
+    """
+    async def insert_row(model, **values):
+        table = model.__table__
+        result = await db_session.execute(insert(table).values(**values).returning(table.c.id))
+        return result.scalar_one()
+    return insert_row
+
+
+@pytest.fixture
+def stock_item(insert_row):
+    """
+    Insert an item with a stock level at a shared test location.
+    
+    Usage:
+        drill = await stock_item("DRILL-1", on_hand=10, on_rent=4, reorder_point=5)
+        drill.item_id, drill.location_id, drill.stock_level_id
+    """
+    shared = {}
+    
+    async def stock_item(sku, on_hand=0, on_rent=0, reorder_point=0):
+        if not shared:
+            shared["unit_id"] = await insert_row(UnitOfMeasurement, name="Each")
+            shared["location_id"] = await insert_row(
+                Location, location_code="STOCK-WH", location_name="Stock Warehouse",
+                location_type=LocationType.WAREHOUSE.value, address="1 Main Road",
+                city="Aizawl", state="Mizoram", country="India",
+            )
+        item_id = await insert_row(
+            Item, sku=sku, item_name=f"Item {sku}",
+            unit_of_measurement_id=shared["unit_id"], reorder_point=reorder_point,
+        )
+        stock_level_id = await insert_row(
+            StockLevel, item_id=item_id, location_id=shared["location_id"],
+            quantity_on_hand=Decimal(on_hand), quantity_on_rent=Decimal(on_rent),
+            quantity_available=Decimal(on_hand) - Decimal(on_rent),
+        )
+        return SimpleNamespace(item_id=item_id, location_id=shared["location_id"], stock_level_id=stock_level_id)
+    return stock_item
+
+
+@pytest.fixture
+def rental_status_changes(monkeypatch):
+    """
+    Record rental status changes instead of applying them.
+    
+    ``RentalStatusService.update_rental_status`` also writes the header's
+    ``current_rental_status``, which is derived from the lines rather than
+    stored, so workflow tests record the requested status instead.
+    """
+    changes = []
+    
+    async def update_rental_status(self, transaction_id, new_status, changed_by=None, notes=None):
+        changes.append((transaction_id, new_status))
+    
+    monkeypatch.setattr(RentalStatusService, "update_rental_status", update_rental_status)
+    return changes
+
+
 @pytest.fixture
 def client(db_session):
     """Create test client"""
@@ -80,6 +161,37 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="session")
+def create_all_ddl():
+    """
+    The PostgreSQL DDL ``Base.metadata.create_all`` emits, as a list of statements.
+    
+    Compiled against a mock engine, so schema tests (triggers, extensions)
+    cover the create_all path without a database.
+    """
+    statements = []
+    mock_engine = create_mock_engine(
+        "postgresql+asyncpg://",
+        lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=mock_engine.dialect)).strip()),
+    )
+    Base.metadata.create_all(mock_engine, checkfirst=False)
+    return statements
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert a statement budget for a block, including requests made through ``client``.
+    
+    Usage:
+        with query_budget(max_queries=15, max_repeats=2, label="purchase list"):
+            client.get("/api/transactions/purchases/", headers=auth_headers)
+    """
+    def budget(max_queries=None, max_repeats=None, label=None) -> QueryBudget:
+        return QueryBudget(max_queries, max_repeats, label=label, process_wide=True)
+    return budget
+
+
 @pytest_asyncio.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create test user"""
@@ -1258,4 +1258,19 @@ class TestPerformanceEndpoints:
         total_time = sum(rt for _, _, rt in results)
         print(f"Bulk retrieval results (Total: {total_time:.3f}s):")
         for endpoint, status, rt in results:
-            print(f"  {endpoint}: {status} in {rt:.3f}s")
\ No newline at end of file
+            print(f"  {endpoint}: {status} in {rt:.3f}s")
+
+    def test_list_endpoints_query_budgets(self, client: TestClient, auth_headers: dict, query_budget):
+        """Test list endpoints run a bounded number of statements (no per-row queries)"""
+        for index in range(3):
+            category_data = {
+                "category_code": f"BUDGET{index}",
+                "category_name": f"Budget Category {index}",
+                "description": "Category for query budget test"
+            }
+            response = client.post("/api/master-data/categories/", json=category_data, headers=auth_headers)
+            assert response.status_code == 201
+        
+        with query_budget(max_repeats=2, label="category list"):
+            response = client.get("/api/master-data/categories/?limit=100", headers=auth_headers)
+        assert response.status_code == 200
@@ -0,0 +1,66 @@
+"""
+Tests for the benchmark harness: load generation and the regression gate.
+"""
+
+import asyncio
+
+import pytest
+
+from tests.benchmarks.dataset import SCALES, resolve_scale
+from tests.benchmarks.harness import FlowError, build_report, compare_reports, run_flow
+
+
+@pytest.mark.asyncio
+async def test_run_flow_honours_concurrency_and_counts_errors():
+    in_flight, peak = 0, 0
+
+    async def flow(iteration):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if iteration % 10 == 0:
+            raise FlowError(f"call {iteration} failed")
+
+    result = await run_flow("sleep", flow, concurrency=5, requests=50)
+
+    assert result.requests == 50 and result.errors == 5
+    assert peak == 5
+    assert result.latency.count == 45
+    assert result.error_samples[0] == "FlowError: call 0 failed"
+    stats = result.to_dict()
+    assert stats["error_rate"] == 0.1
+    assert 10 <= stats["latency_ms"]["p50"] < 50
+    assert stats["throughput_rps"] > 0
+
+
+def _report(p95, rps, errors=0):
+    return {"flows": {"new_sale": {
+        "latency_ms": {"p95": p95}, "throughput_rps": rps, "errors": errors,
+    }}}
+
+
+def test_compare_reports_flags_regressions_beyond_the_threshold():
+    baseline = _report(p95=40.0, rps=200.0)
+
+    assert compare_reports(_report(p95=46.0, rps=180.0), baseline, max_regression=0.2) == []
+    assert compare_reports(_report(p95=50.0, rps=200.0), baseline, max_regression=0.2) == [
+        "new_sale: p95 40.0 ms -> 50.0 ms"
+    ]
+    assert compare_reports(_report(p95=40.0, rps=150.0), baseline, max_regression=0.2) == [
+        "new_sale: throughput 200.0 -> 150.0 req/s"
+    ]
+    assert compare_reports(_report(p95=40.0, rps=200.0, errors=3), baseline)[0].startswith("new_sale: 3 errors")
+    # Sub-millisecond noise on fast endpoints is not a regression
+    assert compare_reports(_report(p95=1.5, rps=200.0), _report(p95=1.0, rps=200.0)) == []
+
+
+def test_report_and_scale_overrides():
+    report = build_report([], {"scale": "tiny"})
+    assert report["metadata"]["scale"] == "tiny" and report["flows"] == {}
+
+    scale = resolve_scale("large", [("transactions", 5000), ("items", None)])
+    assert scale.transactions == 5000
+    assert scale.items == SCALES["large"].items
+    assert SCALES["large"].transactions == 1_000_000
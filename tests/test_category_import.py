@@ -0,0 +1,61 @@
+"""
+Tests for the bulk category importer.
+"""
+
+import pytest
+from sqlalchemy import select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.master_data.categories.importer import CategoryImporter
+from app.modules.master_data.categories.models import Category
+from app.modules.master_data.categories.schemas import CategoryImport
+
+
+async def _categories(session):
+    result = await session.execute(select(Category).order_by(Category.category_path))
+    return {category.category_path: category for category in result.scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_import_resolves_parents_in_memory_and_inserts_per_level(db_session, insert_row, query_budget):
+    tools_id = await insert_row(Category, name="Tools", category_path="Tools")
+    await db_session.commit()
+    rows = [
+        # Child listed before its parent: depth ordering must handle it
+        CategoryImport(name="Cordless", parent_category_path="Tools/Power"),
+        CategoryImport(name="Power", parent_category_path="Tools"),
+        CategoryImport(name="Tools"),
+        CategoryImport(name="Power", parent_category_path="Tools"),
+        CategoryImport(name="Saws", parent_category_path="Missing"),
+    ]
+
+    with query_budget() as budget:
+        result = await CategoryImporter(db_session).run(rows, created_by="importer")
+    # One load, one insert per level, one parent update
+    assert budget.count == 4
+
+    assert [r.status for r in result.rows] == ["created", "created", "skipped", "skipped", "failed"]
+    assert result.successful_imports == 2
+    assert result.skipped_imports == 2
+    assert result.errors == [{"row": 5, "error": "Parent category 'Missing' not found"}]
+    assert result.rows[2].category_id == tools_id
+
+    categories = await _categories(db_session)
+    assert list(categories) == ["Tools", "Tools/Power", "Tools/Power/Cordless"]
+    tools, power, cordless = categories.values()
+    assert result.rows[1].category_id == power.id and result.rows[0].category_id == cordless.id
+    assert not tools.is_leaf
+    assert (power.parent_category_id, power.category_level, power.is_leaf) == (tools_id, 2, False)
+    assert (cordless.parent_category_id, cordless.category_level, cordless.is_leaf) == (power.id, 3, True)
+    assert power.created_by == cordless.created_by == "importer"
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_names_with_separator(db_session, query_budget):
+    with query_budget() as budget:
+        result = await CategoryImporter(db_session).run([CategoryImport(name="A/B")])
+
+    assert result.rows[0].status == "failed"
+    assert result.failed_imports == 1
+    assert budget.count == 1
+    assert await _categories(db_session) == {}
@@ -0,0 +1,89 @@
+"""
+Tests for set-based category path maintenance.
+"""
+
+import pytest
+from sqlalchemy import select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.master_data.categories.models import Category
+from app.modules.master_data.categories.repository import CategoryRepository, _subtree_pattern
+
+
+@pytest.fixture
+def category(insert_row):
+    """Insert a category whose parent and level follow from its path."""
+    ids = {}
+
+    async def category(path):
+        parent = path.rpartition("/")[0]
+        ids[path] = await insert_row(
+            Category, name=path.rpartition("/")[2], category_path=path,
+            parent_category_id=ids.get(parent), category_level=path.count("/") + 1,
+        )
+        return ids[path]
+    return category
+
+
+async def _levels(session):
+    result = await session.execute(select(Category.category_path, Category.category_level))
+    return dict(result.all())
+
+
+def test_subtree_pattern_escapes_wildcards():
+    assert _subtree_pattern("Audio") == "Audio/%"
+    assert _subtree_pattern("50%_Off") == "50\\%\\_Off/%"
+
+
+@pytest.mark.asyncio
+async def test_rewrite_subtree_paths_moves_only_descendants_in_one_update(db_session, category, query_budget):
+    for path in [
+        "Electronics", "Electronics/Audio", "Electronics/Audio/Headphones", "Electronics/Audio/Speakers",
+        "Electronics/Audio/Speakers/Bookshelf", "Electronics/Audiophile",
+        "50%_Off", "50%_Off/Deals", "50%XOff", "50%XOff/Deals",
+    ]:
+        await category(path)
+    await db_session.commit()
+    repository = CategoryRepository(db_session)
+
+    with query_budget() as budget:
+        updated = await repository.rewrite_subtree_paths("Electronics/Audio", "Sound", level_delta=-1)
+    assert updated == 3 and budget.count == 1
+
+    # Wildcards in the old path match literally
+    assert await repository.rewrite_subtree_paths("50%_Off", "Sale") == 1
+    await db_session.commit()
+
+    assert await _levels(db_session) == {
+        "Electronics": 1,
+        "Electronics/Audio": 2,
+        "Sound/Headphones": 2,
+        "Sound/Speakers": 2,
+        "Sound/Speakers/Bookshelf": 3,
+        "Electronics/Audiophile": 2,
+        "50%_Off": 1,
+        "Sale/Deals": 2,
+        "50%XOff": 1,
+        "50%XOff/Deals": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rewrite_subtree_paths_noop_without_change():
+    assert await CategoryRepository(session=None).rewrite_subtree_paths("A", "A") == 0
+
+
+@pytest.mark.asyncio
+async def test_get_ancestors_uses_single_in_query(db_session, category, query_budget):
+    for path in ["Electronics", "Electronics/Audio", "Electronics/Audio/Headphones", "Electronics/Video"]:
+        await category(path)
+    wireless = await category("Electronics/Audio/Headphones/Wireless")
+    await db_session.commit()
+
+    with query_budget() as budget:
+        ancestors = await CategoryRepository(db_session).get_ancestors(wireless)
+
+    assert [a.category_path for a in ancestors] == [
+        "Electronics", "Electronics/Audio", "Electronics/Audio/Headphones",
+    ]
+    assert budget.count == 2
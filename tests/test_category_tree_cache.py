@@ -0,0 +1,117 @@
+"""
+Tests for the version-stamped category tree cache.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.master_data.categories.models import Category
+from app.modules.master_data.categories.tree_cache import (
+    CategoryNode,
+    CategoryTreeCache,
+    CategoryTreeSnapshot,
+    _invalidate_category_tree,
+    category_tree_cache,
+)
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.units.models import UnitOfMeasurement
+
+
+def _node(name, parent=None, order=0, active=True, items=0):
+    return CategoryNode(
+        id=uuid4(),
+        name=name,
+        parent_category_id=parent.id if parent else None,
+        category_path=f"{parent.category_path}/{name}" if parent else name,
+        category_level=parent.category_level + 1 if parent else 1,
+        display_order=order,
+        is_leaf=True,
+        is_active=active,
+        created_at=datetime(2026, 1, 1),
+        updated_at=None,
+        created_by=None,
+        updated_by=None,
+        item_count=items,
+    )
+
+
+def _tree():
+    tools = _node("Tools")
+    power = _node("Power", tools, order=2)
+    hand = _node("Hand", tools, order=1)
+    old = _node("Old", tools, active=False)
+    drills = _node("Drills", power, items=7)
+    return [drills, old, hand, power, tools], tools, power, hand, drills
+
+
+def test_snapshot_counts_sorts_and_breadcrumbs():
+    nodes, tools, power, hand, drills = _tree()
+    snapshot = CategoryTreeSnapshot.build(3, nodes)
+
+    assert [n.name for n in snapshot.child_nodes(tools.id)] == ["Old", "Hand", "Power"]
+    assert tools.child_count == 3 - 1  # inactive children not counted
+    assert power.child_count == 1 and drills.child_count == 0
+    assert [n.name for n in snapshot.breadcrumb(drills.id)] == ["Tools", "Power", "Drills"]
+    assert snapshot.get_by_path("Tools/Power/Drills").item_count == 7
+
+
+@pytest.mark.asyncio
+async def test_cache_rebuilds_only_when_the_category_version_changes(db_session, insert_row, query_budget):
+    tools = await insert_row(Category, name="Tools", category_path="Tools", is_leaf=False)
+    power = await insert_row(
+        Category, name="Power", category_path="Tools/Power", parent_category_id=tools,
+        category_level=2, display_order=2, is_leaf=False,
+    )
+    await insert_row(
+        Category, name="Hand", category_path="Tools/Hand", parent_category_id=tools,
+        category_level=2, display_order=1,
+    )
+    drills = await insert_row(
+        Category, name="Drills", category_path="Tools/Power/Drills", parent_category_id=power, category_level=3,
+    )
+    unit = await insert_row(UnitOfMeasurement, name="Each")
+    for n in range(3):
+        await insert_row(
+            Item, sku=f"TREE-{n}", item_name=f"Drill {n}", unit_of_measurement_id=unit,
+            reorder_point=0, category_id=drills,
+        )
+    await db_session.commit()
+    cache = CategoryTreeCache()
+
+    with query_budget() as budget:
+        first = await cache.get(db_session)
+        second = await cache.get(db_session)
+    assert first is second
+    assert budget.count == 3  # version, load, version
+    assert [n.name for n in first.child_nodes(tools)] == ["Hand", "Power"]
+    assert [n.name for n in first.breadcrumb(drills)] == ["Tools", "Power", "Drills"]
+    assert first.get_by_path("Tools/Power/Drills").item_count == 3
+
+    # The statement trigger bumps the version, so other workers rebuild too
+    await db_session.execute(update(Category).where(Category.id == power).values(name="Electric"))
+    await db_session.commit()
+    with query_budget() as budget:
+        third = await cache.get(db_session)
+    assert third is not first and third.version > first.version
+    assert budget.count == 2
+    assert [n.name for n in third.breadcrumb(drills)] == ["Tools", "Electric", "Drills"]
+
+
+def test_local_category_commits_invalidate_cache():
+    category_tree_cache._snapshot = CategoryTreeSnapshot.build(1, [])
+    _invalidate_category_tree({"items"})
+    assert category_tree_cache._snapshot is not None
+    _invalidate_category_tree({"categories"})
+    assert category_tree_cache._snapshot is None
+
+
+def test_create_all_attaches_category_version_trigger(create_all_ddl):
+    trigger = next(s for s in create_all_ddl if s.startswith("CREATE TRIGGER categories_bump_cache_version"))
+    function = next(n for n, s in enumerate(create_all_ddl) if "FUNCTION bump_cache_version()" in s)
+
+    assert "FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('categories')" in trigger
+    assert function < create_all_ddl.index(trigger)
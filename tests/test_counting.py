@@ -0,0 +1,155 @@
+"""
+Tests for the count strategy layer.
+"""
+
+import pytest
+from sqlalchemy import insert, select, text
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.customers.models import Customer, CustomerType
+from app.modules.suppliers.models import Supplier, SupplierType
+from app.modules.suppliers.repository import SupplierRepository
+from app.modules.transactions.base.models import TransactionHeader, TransactionStatus, TransactionType
+from app.modules.transactions.base.repository import TransactionHeaderRepository
+from app.shared.counting import (
+    CountCache,
+    CountStrategy,
+    Explain,
+    RowCounter,
+    count_cache,
+    filter_key,
+)
+from tests.conftest import compile_sql
+
+
+def _customers(customer_type=CustomerType.BUSINESS):
+    return select(Customer.id).where(Customer.is_active == True, Customer.customer_type == customer_type.value)
+
+
+def test_explain_and_filter_key():
+    sql = compile_sql(Explain(_customers()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT customers.id")
+
+    assert filter_key(_customers()) == filter_key(_customers())
+    assert filter_key(_customers()) != filter_key(_customers(CustomerType.INDIVIDUAL))
+
+
+async def _insert_customers(db_session, prefix, count, customer_type=CustomerType.BUSINESS):
+    await db_session.execute(insert(Customer.__table__), [
+        {"customer_code": f"{prefix}-{n}", "customer_type": customer_type.value, "business_name": f"{prefix} {n}"}
+        for n in range(count)
+    ])
+
+
+@pytest.mark.asyncio
+async def test_small_results_are_counted_exactly_then_cached_until_a_write(db_session, insert_row, query_budget):
+    counter = RowCounter(exact_threshold=1_000_000, ttl=60, cache=count_cache)
+    count_cache.clear()
+    await _insert_customers(db_session, "RC-B", 3)
+    await _insert_customers(db_session, "RC-I", 2, CustomerType.INDIVIDUAL)
+    await db_session.commit()
+
+    with query_budget() as budget:
+        first = await counter.count(db_session, _customers())
+    assert (first.count, first.strategy) == (3, CountStrategy.EXACT)
+    assert budget.count == 2  # EXPLAIN, then COUNT(*)
+
+    with query_budget() as budget:
+        second = await counter.count(db_session, _customers())
+    assert (second.count, second.strategy) == (3, CountStrategy.CACHED)
+    assert budget.count == 0
+
+    # Committed writes to another table keep the count, writes to customers drop it
+    await insert_row(Supplier, supplier_code="RC-S1", company_name="Aizawl Traders",
+                     supplier_type=SupplierType.DISTRIBUTOR.value)
+    await db_session.commit()
+    assert (await counter.count(db_session, _customers())).strategy == CountStrategy.CACHED
+
+    await _insert_customers(db_session, "RC-N", 1)
+    await db_session.commit()
+    third = await counter.count(db_session, _customers())
+    assert (third.count, third.strategy) == (4, CountStrategy.EXACT)
+    count_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_large_results_use_the_planner_estimate(db_session, query_budget):
+    counter = RowCounter(exact_threshold=100, ttl=60, cache=CountCache())
+    await _insert_customers(db_session, "EST", 300)
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE customers"))
+
+    with query_budget() as budget:
+        result = await counter.count(db_session, _customers())
+    assert result.strategy == CountStrategy.ESTIMATED and result.is_estimate
+    assert 200 <= result.count <= 400
+    assert budget.count == 1
+
+    exact = await counter.count(db_session, _customers(), exact=True)
+    assert (exact.count, exact.strategy) == (300, CountStrategy.EXACT)
+
+
+def test_count_cache_evicts_the_least_recently_used_entry():
+    cache = CountCache(max_entries=2)
+    cache.set("a", frozenset({"customers"}), 1, ttl=60)
+    cache.set("b", frozenset({"customers"}), 2, ttl=60)
+    assert cache.get("a") == 1
+
+    cache.set("c", frozenset({"customers"}), 3, ttl=60)
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b") is None
+
+    cache.set("expired", frozenset({"customers"}), 4, ttl=-1)
+    assert cache.get("expired") is None and "expired" not in cache.entries
+
+
+@pytest.mark.asyncio
+async def test_supplier_pages_use_the_count_from_the_count_result(db_session):
+    count_cache.clear()
+    await db_session.execute(insert(Supplier.__table__), [
+        {"supplier_code": f"PG-{n:02}", "company_name": f"Supplier {n:02}",
+         "supplier_type": SupplierType.DISTRIBUTOR.value}
+        for n in range(45)
+    ])
+    await db_session.commit()
+
+    page = await SupplierRepository(db_session).get_paginated(page=2, page_size=20)
+    assert (page["total"], page["total_pages"], page["has_next"], page["has_prev"]) == (45, 3, True, True)
+    assert len(page["items"]) == 20
+    count_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_rental_counts_apply_the_rental_list_filters(db_session, insert_row):
+    count_cache.entries.clear()
+    customer = str(await insert_row(
+        Customer, customer_code="CNT-C1", customer_type=CustomerType.INDIVIDUAL.value, first_name="Lal",
+    ))
+    other = str(await insert_row(
+        Customer, customer_code="CNT-C2", customer_type=CustomerType.INDIVIDUAL.value, first_name="Zova",
+    ))
+    for number, customer_id, transaction_type, status in [
+        ("CNT-1", customer, TransactionType.RENTAL, TransactionStatus.IN_PROGRESS),
+        ("CNT-2", customer, TransactionType.RENTAL, TransactionStatus.COMPLETED),
+        ("CNT-3", customer, TransactionType.SALE, TransactionStatus.IN_PROGRESS),
+        ("CNT-4", other, TransactionType.RENTAL, TransactionStatus.IN_PROGRESS),
+    ]:
+        await insert_row(
+            TransactionHeader, transaction_number=number, transaction_type=transaction_type,
+            status=status, customer_id=customer_id,
+        )
+    await db_session.commit()
+
+    repository = TransactionHeaderRepository(db_session)
+    everyone = await repository.count_rentals_with_lifecycle()
+    assert (everyone.count, everyone.strategy) == (3, CountStrategy.EXACT)
+
+    mine = await repository.count_rentals_with_lifecycle(customer_id=customer)
+    assert mine.count == 2
+    in_progress = await repository.count_rentals_with_lifecycle(
+        customer_id=customer, status=TransactionStatus.IN_PROGRESS
+    )
+    assert in_progress.count == 1
+
+    again = await repository.count_rentals_with_lifecycle(customer_id=customer)
+    assert (again.count, again.strategy) == (2, CountStrategy.CACHED)
@@ -0,0 +1,125 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select, text
+
+import app.main  # noqa: F401 - registers all mappers
+from app.core.errors import ValidationError
+from app.modules.inventory.models import StockMovement
+from app.modules.transactions.base.models import TransactionHeader, TransactionType
+from app.modules.transactions.base.repository import TRANSACTION_PAGINATOR
+from app.shared.cursor_pagination import (
+    CountMode,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+    estimate_table_rows,
+)
+from app.shared.filters import SortOrder, SortSpec
+from tests.conftest import compile_sql
+
+
+def test_cursor_round_trip_and_rejection():
+    values = [datetime(2026, 5, 1, 12, 30), Decimal("10.50"), uuid4(), "A-1", None]
+    cursor = encode_cursor("a:desc,id:desc", values)
+    assert decode_cursor(cursor, "a:desc,id:desc") == values
+
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, "a:asc,id:asc")
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", "a:desc,id:desc")
+
+
+def test_keyset_condition_uses_row_comparison_for_uniform_order():
+    assert TRANSACTION_PAGINATOR.signature == "transaction_date:desc,id:desc"
+    cursor = encode_cursor(TRANSACTION_PAGINATOR.signature, [datetime(2026, 1, 1), uuid4()])
+    sql = compile_sql(TRANSACTION_PAGINATOR.apply(select(TRANSACTION_PAGINATOR.model), cursor, 20))
+
+    assert "(transaction_headers.transaction_date, transaction_headers.id) < (" in sql
+    assert "ORDER BY transaction_headers.transaction_date DESC, transaction_headers.id DESC" in sql
+    assert "LIMIT" in sql and "OFFSET" not in sql
+
+    mixed = KeysetPaginator(StockMovement, [
+        SortSpec(field="movement_type", order=SortOrder.ASC),
+        SortSpec(field="created_at", order=SortOrder.DESC),
+    ])
+    condition = compile_sql(mixed.keyset_condition(["SALE", datetime(2026, 1, 1), uuid4()]))
+    assert "stock_movements.movement_type > " in condition
+    assert "stock_movements.movement_type = " in condition and " OR " in condition
+
+
+async def _walk(paginator, session, query, limit, count=CountMode.NONE):
+    pages, cursor = [], None
+    while True:
+        page = await paginator.paginate(session, query, cursor=cursor, limit=limit, count=count)
+        pages.append(page)
+        if not page.has_more:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.asyncio
+async def test_paginate_walks_every_row_once_in_keyset_order(db_session, insert_row):
+    start = datetime(2026, 3, 1, 9, 0)
+    # Repeated dates and customers make the id tiebreaker decide the order
+    for n, (hours, customer) in enumerate([(0, "cust-b"), (1, "cust-a"), (1, "cust-b"), (1, "cust-a"),
+                                           (3, "cust-a"), (3, "cust-b"), (5, "cust-a")]):
+        await insert_row(
+            TransactionHeader, transaction_number=f"KS-{n}", transaction_type=TransactionType.RENTAL,
+            transaction_date=start - timedelta(hours=hours), customer_id=customer,
+        )
+    await db_session.commit()
+    rows = (await db_session.execute(select(TransactionHeader))).scalars().all()
+
+    pages = await _walk(TRANSACTION_PAGINATOR, db_session, select(TransactionHeader), 3, CountMode.EXACT)
+    expected = sorted(rows, key=lambda row: (row.transaction_date, str(row.id)), reverse=True)
+    assert [row.id for page in pages for row in page.items] == [row.id for row in expected]
+    assert [len(page.items) for page in pages] == [3, 3, 1]
+    assert all(page.total == 7 and not page.total_is_estimate for page in pages)
+    assert decode_cursor(pages[0].next_cursor, TRANSACTION_PAGINATOR.signature) == [
+        expected[2].transaction_date, expected[2].id,
+    ]
+    assert pages[-1].next_cursor is None
+
+    # Mixed directions: customer ascending, newest first within a customer
+    mixed = KeysetPaginator(TransactionHeader, [
+        SortSpec(field="customer_id", order=SortOrder.ASC),
+        SortSpec(field="transaction_date", order=SortOrder.DESC),
+    ])
+    query = select(TransactionHeader).where(TransactionHeader.transaction_number != "KS-0")
+    pages = await _walk(mixed, db_session, query, 2)
+    # Stable sorts, least significant key first (the id tiebreaker follows the last column)
+    expected = sorted((row for row in rows if row.transaction_number != "KS-0"),
+                      key=lambda row: str(row.id), reverse=True)
+    expected.sort(key=lambda row: row.transaction_date, reverse=True)
+    expected.sort(key=lambda row: row.customer_id)
+    assert [row.id for page in pages for row in page.items] == [row.id for row in expected]
+    assert all(page.total is None for page in pages)
+
+
+@pytest.mark.asyncio
+async def test_row_estimate_sums_the_partitions_of_a_partitioned_table(db_session, stock_item):
+    drill = await stock_item("EST-1", on_hand=500)
+    assert await estimate_table_rows(db_session, "stock_movements") is None
+
+    await db_session.execute(insert(StockMovement.__table__), [
+        {
+            "stock_level_id": drill.stock_level_id, "item_id": drill.item_id, "location_id": drill.location_id,
+            "movement_type": "SALE", "reference_type": "TRANSACTION", "reason": "Sale",
+            "quantity_change": Decimal("-1"), "quantity_before": Decimal(500 - n),
+            "quantity_after": Decimal(499 - n),
+        }
+        for n in range(120)
+    ])
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE stock_movements"))
+
+    # The parent has no rows of its own; every row sits in the default partition
+    assert await estimate_table_rows(db_session, "stock_movements") == 120
+    assert await estimate_table_rows(db_session, "stock_movements_default") == 120
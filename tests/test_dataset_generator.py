@@ -0,0 +1,102 @@
+"""
+Tests for the synthetic dataset generator (row generation only, no database).
+"""
+
+import re
+from collections import defaultdict
+from datetime import date
+
+from scripts.generate_dataset import PRESETS, DatasetGenerator, DatasetSize, resolve_size
+
+SIZE = DatasetSize(items=60, customers=20, transactions=400, open_rentals=30, locations=2, suppliers=5, days=90)
+TODAY = date(2026, 3, 15)
+
+
+def generate(seed=42):
+    generator = DatasetGenerator(SIZE, seed=seed, prefix="T", today=TODAY)
+    items = list(generator.items())
+    stock = list(generator.stock_levels())
+    headers, lines, movements = [], [], []
+    for chunk_headers, chunk_lines, chunk_movements in generator.ledger():
+        headers += chunk_headers
+        lines += chunk_lines
+        movements += chunk_movements
+    return generator, items, stock, headers, lines, movements
+
+
+def test_same_seed_generates_the_same_rows():
+    first, second, other = generate(), generate(), generate(seed=7)
+
+    for a, b in zip(first[1:], second[1:]):
+        assert a == b
+    assert first[1] != other[1] and first[3] != other[3]
+
+
+def test_skus_follow_the_generator_rules_and_sequences_continue():
+    generator, items, *_ = generate()
+
+    skus = [item["sku"] for item in items]
+    assert len(set(skus)) == len(skus)
+    for item in items:
+        assert re.fullmatch(r"[A-Z]{1,4}-[A-Z]{1,3}-[A-Z0-9]{4}-[RS]-\d{3}", item["sku"]), item["sku"]
+        expected = "S" if item["is_saleable"] and not item["is_rentable"] else "R"
+        assert item["sku"].split("-")[3] == expected
+
+    sequences = {row["brand_code"]: int(row["next_sequence"]) for row in generator.sku_sequences()}
+    for key, next_sequence in sequences.items():
+        used = [int(sku.rsplit("-", 1)[1]) for sku in skus if sku.rsplit("-", 1)[0] == key]
+        assert sorted(used) == list(range(1, next_sequence))
+
+
+def test_movement_ledger_replays_to_the_closing_balances():
+    generator, items, stock, headers, lines, movements = generate()
+    line_ids = {line["id"] for line in lines}
+
+    available = defaultdict(int)
+    for movement in sorted(movements, key=lambda m: m["created_at"]):
+        assert movement["quantity_before"] == available[movement["stock_level_id"]]
+        assert movement["quantity_before"] + movement["quantity_change"] == movement["quantity_after"]
+        assert movement["quantity_after"] >= 0
+        assert movement["transaction_line_id"] is None or movement["transaction_line_id"] in line_ids
+        available[movement["stock_level_id"]] = movement["quantity_after"]
+
+    on_rent_lines = defaultdict(int)
+    stock_by_key = {(row["item_id"], row["location_id"]): row["id"] for row in stock}
+    for line in lines:
+        if line["current_rental_status"] == "ACTIVE":
+            on_rent_lines[stock_by_key[(line["item_id"], line["location_id"])]] += line["quantity"]
+
+    for stock_id, on_hand, available_now, on_rent in generator.closing_balances():
+        assert available_now == available[stock_id]
+        assert on_rent == on_rent_lines[stock_id]
+        assert on_hand == available_now + on_rent
+
+
+def test_transactions_are_coherent():
+    _, _, _, headers, lines, _ = generate()
+    lines_by_header = defaultdict(list)
+    for line in lines:
+        lines_by_header[line["transaction_id"]].append(line)
+
+    assert len(headers) == SIZE.transactions + SIZE.open_rentals
+    assert len({header["transaction_number"] for header in headers}) == len(headers)
+    assert all(header.keys() == headers[0].keys() for header in headers)
+    assert all(line.keys() == lines[0].keys() for line in lines)
+
+    open_rentals = [header for header in headers if header["status"] == "IN_PROGRESS"]
+    assert 0 < len(open_rentals) <= SIZE.open_rentals
+    assert any(header["next_due_date"] < TODAY for header in open_rentals)
+    for header in headers:
+        header_lines = lines_by_header[header["id"]]
+        assert header_lines
+        assert header["total_amount"] == sum(line["line_total"] for line in header_lines)
+        if header["transaction_type"] == "RENTAL" and header["status"] == "COMPLETED":
+            assert all(line["return_date"] and line["return_date"] < TODAY for line in header_lines)
+
+
+def test_resolve_size_applies_overrides():
+    size = resolve_size("small", {"items": 10, "customers": None})
+
+    assert size.items == 10
+    assert size.customers == PRESETS["small"].customers
+    assert PRESETS["large"].transactions == 1_000_000
@@ -0,0 +1,51 @@
+"""
+Tests for the shared pooled engine and its checkout metrics.
+"""
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+import app.core.database as core_database
+import app.db.session as db_session
+from app.db.session import MeteredAsyncQueuePool, pool_sizing
+
+
+def test_pool_sizing_splits_connection_budget_across_workers():
+    assert pool_sizing(80, 1) == (40, 40)
+    assert pool_sizing(80, 4) == (10, 10)
+    assert pool_sizing(10, 8) == (1, 1)
+    assert pool_sizing(80, 4, pool_size=5) == (5, 15)
+    assert pool_sizing(80, 4, pool_size=5, max_overflow=0) == (5, 0)
+
+    # Every dependency uses the one registry engine
+    assert core_database.engine is db_session.engine is db_session.db_manager.engine
+    assert isinstance(db_session.engine.pool, MeteredAsyncQueuePool)
+
+
+class _Connection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkout_waits_timeouts_and_new_connections():
+    pool = MeteredAsyncQueuePool(_Connection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    def exercise():
+        first = pool.connect()
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        first.close()
+        pool.connect().close()
+        return pool.recreate()
+
+    recreated = await greenlet_spawn(exercise)
+    snapshot = pool.metrics.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["connections_opened"] == 1
+    assert recreated.metrics is pool.metrics
@@ -0,0 +1,92 @@
+"""
+Tests for the batch fee API of RentalFeeCalculator.
+"""
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.transactions.base.models import (
+    TransactionHeader,
+    TransactionLine,
+    TransactionType,
+    RentalLifecycle,
+)
+from app.modules.transactions.services.fee_calculator import RentalFeeCalculator
+
+
+@pytest.fixture
+def rental(insert_row):
+    """Insert a one-line rental and return the header and line ids."""
+    async def rental(number: str, total: str, start: date, end: date):
+        header_id = await insert_row(
+            TransactionHeader, transaction_number=number, transaction_type=TransactionType.RENTAL,
+            total_amount=Decimal(total),
+        )
+        line_id = await insert_row(
+            TransactionLine, transaction_id=header_id, line_number=1, description="Rental",
+            quantity=Decimal("1"), unit_price=Decimal("200"), line_total=Decimal(total),
+            returned_quantity=Decimal("0"), rental_start_date=start, rental_end_date=end,
+        )
+        return header_id, line_id
+    return rental
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_transaction_fees(db_session, insert_row, rental, query_budget):
+    """Batch late fees equal the single-transaction computation."""
+    as_of = date(2026, 3, 15)
+    first, _ = await rental("FEE-1", "100.00", date(2026, 3, 1), date(2026, 3, 11))
+    second, _ = await rental("FEE-2", "70.00", date(2026, 3, 1), date(2026, 3, 8))
+    await insert_row(
+        RentalLifecycle, transaction_id=second, current_status="LATE",
+        total_late_fees=Decimal("5.00"), total_damage_fees=Decimal("12.50"),
+    )
+    await db_session.commit()
+    calculator = RentalFeeCalculator(db_session)
+
+    with query_budget() as budget:
+        batch = await calculator.calculate_fees_batch([first, second], as_of)
+    assert budget.count == 3  # headers, their lines, lifecycles
+
+    for index, transaction_id in enumerate((first, second)):
+        expected = await calculator.calculate_late_fees(transaction_id, as_of)
+        assert batch.late_fee_amount[index] == expected["late_fee_amount"]
+        assert batch.late_fee_days[index] == expected["late_fee_days"]
+
+    # 10/day * 5% * 4 days = 2.00
+    assert batch.late_fee_amount[0] == Decimal("2.00")
+    assert batch.new_late_fees[1] == max(Decimal("0"), batch.late_fee_amount[1] - Decimal("5.00"))
+    assert batch.damage_fees[1] == Decimal("12.50")
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_input_order_and_flags_missing(db_session, rental):
+    """Columns stay aligned with the requested IDs, unknown IDs are zeroed."""
+    as_of = date(2026, 3, 15)
+    known, line = await rental("FEE-3", "100.00", date(2026, 3, 1), date(2026, 3, 11))
+    await db_session.commit()
+    missing_id = uuid4()
+    calculator = RentalFeeCalculator(db_session)
+
+    batch = await calculator.calculate_fees_batch(
+        [missing_id, known],
+        as_of,
+        damage_levels={line: "MODERATE"},
+        extend_to=date(2026, 3, 21),
+    )
+
+    assert batch.transaction_ids == [missing_id, known]
+    assert batch.found == [False, True]
+    assert batch.row(0)["late_fee_amount"] == Decimal("0")
+    # 25% of 200 + 25 cleaning
+    damage = await calculator.calculate_damage_fees(line, "MODERATE")
+    assert batch.damage_fees[1] == damage["total_damage_cost"] == Decimal("75.00")
+    # 10/day * 10 days * 1.10
+    extension = await calculator.estimate_extension_cost(known, date(2026, 3, 21))
+    assert batch.extension_days[1] == extension["extension_days"] == 10
+    assert batch.total_extension_cost[1] == extension["total_extension_cost"] == Decimal("110.00")
+    assert batch.totals()["damage_fees"] == Decimal("75.00")
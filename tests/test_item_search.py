@@ -0,0 +1,118 @@
+"""
+Tests for the item search predicate, the search document triggers and the query plan.
+"""
+
+import pytest
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.master_data.brands.models import Brand
+from app.modules.master_data.categories.models import Category
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.item_master.repository import ItemMasterRepository
+from app.modules.master_data.item_master.search import (
+    prefix_tsquery,
+    search_condition,
+    search_rank,
+    search_tokens,
+)
+from app.modules.master_data.units.models import UnitOfMeasurement
+from tests.conftest import TEST_DATABASE_URL, compile_sql
+
+
+def test_prefix_tsquery_matches_every_token_as_prefix():
+    assert search_tokens("  DeWalt  dri-ll ") == ["dewalt", "dri", "ll"]
+    assert prefix_tsquery("DeWalt dri") == "dewalt:* & dri:*"
+    assert prefix_tsquery("  %% ") is None
+
+
+def test_search_condition_uses_vector_and_trigram_columns():
+    sql = compile_sql(search_condition("Drill"))
+    assert "items.search_vector @@ to_tsquery" in sql
+    assert "items.search_text LIKE" in sql
+    # No joins are needed: brand and category names live in the search document
+    assert "brands" not in sql and "categories" not in sql
+
+
+def test_short_terms_skip_trigram_match_and_wildcards_are_escaped():
+    assert "search_text" not in compile_sql(search_condition("xq"))
+
+    clause = search_condition("50%_off")
+    params = clause.compile(dialect=postgresql.dialect()).params
+    assert "%50\\%\\_off%" in params.values()
+
+
+def test_search_rank_combines_text_rank_and_similarity():
+    sql = compile_sql(search_rank("makita saw"))
+    assert "ts_rank_cd(items.search_vector" in sql
+    assert "word_similarity" in sql
+
+
+def test_create_all_installs_trigram_extension_and_search_triggers(create_all_ddl):
+    def position(prefix):
+        return next(n for n, statement in enumerate(create_all_ddl) if statement.startswith(prefix))
+
+    assert position("CREATE EXTENSION IF NOT EXISTS pg_trgm") < position("CREATE INDEX idx_item_search_text_trgm")
+    for trigger in ("items_search_document", "brands_refresh_item_search", "categories_refresh_item_search"):
+        assert position(f"CREATE TRIGGER {trigger}") > position("CREATE TABLE items")
+
+
+@pytest.mark.asyncio
+async def test_search_reads_the_trigger_maintained_document(db_session, insert_row):
+    unit = await insert_row(UnitOfMeasurement, name="Each")
+    brand = await insert_row(Brand, name="DeWalt")
+    category = await insert_row(Category, name="Drills", category_path="Drills")
+    for sku, name, values in [
+        ("DW-100", "Cordless Drill", {"brand_id": brand, "category_id": category}),
+        ("BC-300", "Bit Case", {"description": "Holds drill bits"}),
+        ("MK-200", "Circular Saw", {}),
+    ]:
+        await insert_row(Item, sku=sku, item_name=name, unit_of_measurement_id=unit, reorder_point=0, **values)
+    await db_session.commit()
+    repository = ItemMasterRepository(db_session)
+
+    async def found(term):
+        return [item.sku for item in await repository.search(term)]
+
+    assert await found("dewalt dri") == ["DW-100"]
+    assert await found("drills") == ["DW-100"]
+    # Name matches outrank description matches
+    assert await found("drill") == ["DW-100", "BC-300"]
+    assert await found("50%_off") == []
+
+    # Renamed brands and categories reach the items through their triggers
+    await db_session.execute(update(Brand).where(Brand.id == brand).values(name="Stanley"))
+    await db_session.execute(update(Category).where(Category.id == category).values(name="Drivers"))
+    await db_session.commit()
+    assert await found("stanley") == ["DW-100"]
+    assert await found("drivers") == ["DW-100"]
+    assert await found("dewalt") == []
+
+
+@pytest.mark.asyncio
+async def test_search_count_uses_search_index():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            has_column = (await conn.execute(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'items' AND column_name = 'search_vector'"
+            ))).first()
+            if not has_column:
+                pytest.skip("items.search_vector not migrated")
+
+            stmt = select(func.count(Item.id)).where(search_condition("drill"))
+            compiled = stmt.compile(engine.sync_engine)
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            plan = "\n".join(
+                row[0] for row in await conn.exec_driver_sql(f"EXPLAIN {compiled}", params)
+            )
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Test database unavailable: {exc}")
+    finally:
+        await engine.dispose()
+
+    assert "idx_item_search_vector" in plan or "idx_item_search_text_trgm" in plan
@@ -0,0 +1,84 @@
+"""
+Tests for fixed-memory latency histograms and merged Prometheus exposition.
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.monitoring.histograms import BUCKET_COUNT, HdrHistogram, bucket_index, bucket_upper_us
+from app.modules.monitoring.multiprocess import FileMetricsStore
+from app.modules.monitoring.performance_monitor import PerformanceMetrics, metrics, render_prometheus
+
+
+def test_percentiles_stay_within_bucket_resolution():
+    for value in (0, 1, 63, 64, 65, 1000, 123_456, 3_600_000_000):
+        index = bucket_index(value)
+        assert value <= bucket_upper_us(index) <= value * 1.04 + 1
+    assert bucket_index(3_600_000_000) == BUCKET_COUNT - 1
+
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-4, 1) for _ in range(20000)]
+    histogram = HdrHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percent in (50, 95, 99):
+        exact = values[int(len(values) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=0.04)
+    assert histogram.percentile(100) == histogram.max == values[-1]
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    restored = HdrHistogram.from_dict(histogram.to_dict()).merge(histogram)
+    assert restored.count == 40000 and restored.percentile(50) == histogram.percentile(50)
+
+
+def test_requests_are_keyed_by_route_template():
+    metrics.initialize()
+    client = TestClient(app)
+    for _ in range(3):
+        client.get("/api/monitoring/metrics/endpoint/customers/123e4567")
+
+    assert list(metrics.request_times) == ["/api/monitoring/metrics/endpoint/{endpoint_path:path}"]
+    stats = metrics.get_endpoint_stats("/api/monitoring/metrics/endpoint/{endpoint_path:path}")
+    assert stats["total_requests"] == stats["success_count"] == 3
+
+    exposition = client.get("/metrics").text
+    assert (
+        'http_requests_total{route="/api/monitoring/metrics/endpoint/{endpoint_path:path}",outcome="success"} 3'
+        in exposition
+    )
+    metrics.initialize()
+
+
+def test_worker_snapshots_merge_through_the_store(tmp_path):
+    for pid, durations in ((101, [0.01, 0.02]), (102, [0.3])):
+        worker = object.__new__(PerformanceMetrics)  # Independent of the process-wide singleton
+        worker.initialize()
+        for duration in durations:
+            worker.record_request("/api/customers/{customer_id}", duration, success=duration < 0.1)
+        worker.sql.record("SELECT * FROM customers WHERE id = $1", 0.001, 1)
+        FileMetricsStore(str(tmp_path), pid=pid).write(worker.snapshot())
+
+    snapshots = FileMetricsStore(str(tmp_path)).read_all()
+    assert len(snapshots) == 2
+    exposition = render_prometheus(snapshots)
+    route = 'route="/api/customers/{customer_id}"'
+    assert f"http_request_duration_seconds_count{{{route}}} 3" in exposition
+    assert f'http_request_duration_seconds_bucket{{{route},le="0.025"}} 2' in exposition
+    assert f'http_requests_total{{{route},outcome="error"}} 1' in exposition
+    assert "sql_query_duration_seconds_count{" in exposition and "} 2\n" in exposition
+
+
+def test_gauges_ignore_snapshots_of_exited_workers():
+    worker = object.__new__(PerformanceMetrics)
+    worker.initialize()
+    worker.active_requests = 2
+    live = worker.snapshot()
+    exited = dict(live, written_at=live["written_at"] - 600)
+
+    assert "http_requests_in_progress 4\n" in render_prometheus([live, exited])
+    assert "http_requests_in_progress 2\n" in render_prometheus([live, exited], stale_after=30)
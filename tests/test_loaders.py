@@ -0,0 +1,50 @@
+"""
+Tests for the request-scoped batching loaders.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.customers.models import Customer
+from app.modules.master_data.item_master.models import Item
+from app.shared.loaders import get_loaders
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_coalesce_into_one_query(db_session, stock_item, query_budget):
+    ids = [(await stock_item(f"LOAD-{n}")).item_id for n in range(3)]
+    await db_session.commit()
+    loader = get_loaders(db_session)[Item]
+    missing = uuid4()
+
+    with query_budget() as budget:
+        found = await asyncio.gather(
+            loader.load(ids[0]), loader.load(str(ids[1])), loader.load(ids[0]), loader.load(missing)
+        )
+    assert [row.id if row else None for row in found] == [ids[0], ids[1], ids[0], None]
+    assert found[0] is found[2]
+    assert budget.count == 1 and loader.batches == 1
+
+    # Memoised for the rest of the request; only the new id is fetched
+    with query_budget() as budget:
+        assert await loader.load(ids[1]) is found[1]
+        rows = await loader.load_map([ids[0], ids[2], missing])
+    assert {key: row.sku for key, row in rows.items()} == {ids[0]: "LOAD-0", ids[2]: "LOAD-2"}
+    assert budget.count == 1 and loader.batches == 2
+
+    # Dispatch tasks are held until they finish, then released
+    await asyncio.sleep(0)
+    assert not loader._dispatch_tasks
+
+
+def test_registry_is_per_session_and_per_model():
+    session = AsyncSession()
+    registry = get_loaders(session)
+    assert get_loaders(session) is registry
+    assert registry[Item] is registry[Item]
+    assert registry[Item] is not registry[Customer]
+    assert get_loaders(AsyncSession()) is not registry
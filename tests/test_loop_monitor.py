@@ -0,0 +1,62 @@
+"""
+Tests for the event loop lag monitor.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.modules.monitoring.loop_monitor import EventLoopMonitor
+from app.modules.monitoring.performance_monitor import PerformanceMetrics, render_prometheus
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_reported_with_its_stack():
+    monitor = EventLoopMonitor(interval=0.02, threshold=0.05)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        _blocking_call(0.3)
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    status = monitor.status()
+    assert not status["running"] and status["samples"] > 5
+    assert status["blocking_events"] == 1
+    assert status["lag_ms"]["max"] >= 250
+    # Only the time beyond the threshold counts as blocked
+    assert 0.2 <= monitor.blocked_seconds <= monitor.lag.max - 0.05 + 1e-6
+
+    report = status["recent_blocking"][0]
+    assert report["blocked_ms"] >= 250
+    assert any("_blocking_call" in entry for entry in report["stack"])
+    assert "test_blocking_call_is_reported_with_its_stack" in report["task"]
+
+
+@pytest.mark.asyncio
+async def test_lag_is_exported_to_prometheus():
+    monitor = EventLoopMonitor(interval=0.01, threshold=1.0)
+    await monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    assert monitor.blocking_events == 0
+    snapshot = PerformanceMetrics().snapshot()
+    snapshot["event_loop"] = monitor.snapshot()
+    text = render_prometheus([snapshot])
+
+    assert f"event_loop_lag_seconds_count {monitor.lag.count}" in text
+    assert "event_loop_blocking_events_total 0" in text
+
+
+def test_blocking_reports_require_authentication():
+    # Reports carry source paths and stacks
+    assert TestClient(app).get("/api/monitoring/event-loop").status_code in (401, 403)
@@ -0,0 +1,74 @@
+"""
+Tests for the sampling profiler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.modules.monitoring.profiler import SamplingProfiler
+
+
+class _Route:
+    path = "/api/items/{item_id}"
+
+
+def _busy_handler(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cpu_samples_are_attributed_to_the_request_route():
+    profiler = SamplingProfiler()
+
+    async def request():
+        profiler.register_request({"type": "http", "method": "GET", "route": _Route()})
+        try:
+            _busy_handler(0.3)
+        finally:
+            profiler.unregister_request()
+
+    profiler.start(mode="cpu", interval=0.005, max_overhead=0.05)
+    await asyncio.create_task(request())
+    await asyncio.sleep(0.05)
+    profiler.stop()
+
+    status = profiler.status()
+    assert not status["running"] and status["samples"] > 5
+    assert status["samples_by_route"]["GET /api/items/{item_id}"] > 5
+    # The sampler stretches its interval rather than exceed the overhead cap
+    assert status["effective_interval_ms"] >= status["interval_ms"]
+
+    busy = [line for line in profiler.collapsed().splitlines() if line.startswith("GET /api/items/{item_id};")]
+    assert busy and all("_busy_handler" in line for line in busy)
+
+    tree = profiler.flamegraph()
+    assert tree["value"] == sum(int(line.rsplit(" ", 1)[1]) for line in profiler.collapsed().splitlines())
+
+
+@pytest.mark.asyncio
+async def test_wall_samples_follow_the_await_chain_and_runs_time_out():
+    profiler = SamplingProfiler()
+
+    async def query_database():
+        await asyncio.sleep(0.3)
+
+    async def request():
+        profiler.register_request({"type": "http", "method": "POST", "route": _Route()})
+        try:
+            await query_database()
+        finally:
+            profiler.unregister_request()
+
+    profiler.start(mode="wall", interval=0.005, max_duration=0.2)
+    with pytest.raises(RuntimeError):
+        profiler.start()
+    await request()
+    assert not profiler.running  # Stopped by max_duration
+
+    stacks = profiler.collapsed()
+    assert "POST /api/items/{item_id};" in stacks
+    assert "request;" in stacks and "query_database" in stacks
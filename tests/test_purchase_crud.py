@@ -332,7 +332,7 @@ class TestPurchaseCRUD:
         
         assert response.status_code == 404
 
-    async def test_get_purchases_list(self, client: TestClient, test_data, auth_headers):
+    async def test_get_purchases_list(self, client: TestClient, test_data, auth_headers, query_budget):
         """Test getting list of purchases with filters."""
         
         # Create multiple purchases
@@ -363,8 +363,9 @@ class TestPurchaseCRUD:
             )
             assert response.status_code == 201
         
-        # Get list of purchases
-        response = client.get("/api/purchases/", headers=auth_headers)
+        # Get list of purchases; related rows are batch loaded, not fetched per purchase
+        with query_budget(max_repeats=2, label="purchase list"):
+            response = client.get("/api/transactions/purchases/", headers=auth_headers)
         assert response.status_code == 200
         
         result = response.json()
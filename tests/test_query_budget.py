@@ -0,0 +1,59 @@
+"""
+Tests for query budgets and the route budget decorator.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.modules.monitoring.query_budget import QueryBudget, QueryBudgetExceeded, query_budget_route
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE categories (id INTEGER, parent_id INTEGER)"))
+        yield connection
+
+
+def test_budget_reports_repeated_fingerprints(connection):
+    with QueryBudget(max_queries=5, max_repeats=3, label="category list") as budget:
+        connection.execute(text("SELECT * FROM categories"))
+        for parent_id in range(3):
+            connection.execute(text(f"SELECT count(*) FROM categories WHERE parent_id = {parent_id}"))
+    assert budget.count == 4
+
+    with pytest.raises(QueryBudgetExceeded) as error:
+        with QueryBudget(max_queries=5, max_repeats=3, label="category list"):
+            for parent_id in range(6):
+                connection.execute(text(f"SELECT count(*) FROM categories WHERE parent_id = {parent_id}"))
+    message = str(error.value)
+    assert "category list: 6 statements, budget 5" in message
+    assert "possible N+1" in message
+    assert "6 x SELECT count(*) FROM categories WHERE parent_id = ?" in message
+
+    # Statements after the block are not counted
+    connection.execute(text("SELECT * FROM categories"))
+    assert error.value.budget.count == 6
+
+
+def test_route_decorator_follows_enforcement_setting(connection, monkeypatch, caplog):
+    @query_budget_route(max_queries=1)
+    async def list_categories(limit: int = 10):
+        connection.execute(text("SELECT * FROM categories"))
+        connection.execute(text("SELECT * FROM categories LIMIT 1"))
+        return limit
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENFORCEMENT", "off")
+    assert asyncio.run(list_categories(limit=5)) == 5
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENFORCEMENT", "warn")
+    assert asyncio.run(list_categories()) == 10
+    assert "Query budget exceeded" in caplog.text
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENFORCEMENT", "raise")
+    with pytest.raises(QueryBudgetExceeded, match="2 statements, budget 1"):
+        asyncio.run(list_categories())
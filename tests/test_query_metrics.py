@@ -0,0 +1,79 @@
+"""
+Tests for SQL statement fingerprinting, metrics and N+1 detection.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.modules.monitoring.query_metrics import (
+    QueryMetrics,
+    RequestQueries,
+    begin_request,
+    end_request,
+    fingerprint,
+    fingerprint_id,
+    instrument_engine,
+)
+
+
+def test_fingerprints_ignore_values_and_list_lengths():
+    assert fingerprint(
+        "SELECT items.id FROM items\n WHERE items.id = $1::UUID AND items.sku IN ($2, $3, $4) LIMIT $5"
+    ) == "SELECT items.id FROM items WHERE items.id = ?::UUID AND items.sku IN (?, ...) LIMIT ?"
+    assert fingerprint("select * from t where name = 'O''Brien' and n = 42 -- note") == (
+        "select * from t where name = ? and n = ?"
+    )
+    assert fingerprint("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == fingerprint(
+        "INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4), ($5, $6)"
+    )
+    # Identifiers containing digits are kept
+    assert fingerprint("SELECT 1 FROM stock_movements_p2026_02") == "SELECT ? FROM stock_movements_p2026_02"
+
+
+def test_repeated_fingerprint_in_one_request_is_flagged_once():
+    metrics = QueryMetrics(n_plus_one_threshold=3)
+    request = RequestQueries(correlation_id="req-1", path="/api/categories/")
+    token = begin_request(request)
+    try:
+        for category_id in range(6):
+            metrics.record(f"SELECT count(*) FROM categories WHERE parent_id = {category_id}", 0.002, 1)
+        metrics.record("SELECT * FROM categories", 0.004, 6)
+    finally:
+        end_request(token)
+    metrics.record("SELECT * FROM categories", 0.2, 6)  # Outside any request
+
+    assert request.statements == 7
+    assert len(metrics.recent_n_plus_one) == 1
+    report = metrics.recent_n_plus_one[0]
+    assert report["correlation_id"] == "req-1"
+    assert report["fingerprint"] == "SELECT count(*) FROM categories WHERE parent_id = ?"
+
+    listing = metrics.fingerprints["SELECT * FROM categories"]
+    assert listing.histogram.count == 2 and listing.rows == 12 and listing.n_plus_one == 0
+    assert listing.histogram.percentile(50) == pytest.approx(0.004, rel=0.04)
+    assert listing.histogram.percentile(99) == 0.2
+
+
+def test_instrumented_engine_records_statements_and_errors():
+    metrics = QueryMetrics(max_fingerprints=2)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, metrics)
+    instrument_engine(engine, metrics)  # Idempotent
+
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER)"))
+        connection.execute(text("INSERT INTO t (id) VALUES (1), (2)"))
+        try:
+            connection.execute(text("SELECT * FROM missing"))
+        except Exception:
+            pass
+
+    assert metrics.summary()["statements"] == 3
+    assert metrics.fingerprints["other"].errors == 1  # Over the fingerprint limit
+    inserted = metrics.fingerprints["INSERT INTO t (id) VALUES (?), ..."]
+    assert inserted.histogram.count == 1 and inserted.rows == 2
+
+    exposition = "\n".join(metrics.prometheus_lines())
+    label = fingerprint_id("INSERT INTO t (id) VALUES (?), ...")
+    assert f'sql_query_duration_seconds_bucket{{fingerprint="{label}",le="+Inf"}} 1' in exposition
+    assert f'sql_query_rows_total{{fingerprint="{label}"}} 2' in exposition
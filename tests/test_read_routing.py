@@ -0,0 +1,116 @@
+"""
+Tests for read replica routing and read-your-writes stickiness.
+"""
+
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 - registers all mappers
+from app.db.routing import (
+    READ_ONLY_KEY,
+    REPLICA_ENGINE_KEY,
+    ReadSession,
+    ReplicaRouter,
+    RequestRouting,
+    _stick_to_primary,
+    begin_request,
+    client_key,
+    end_request,
+    is_read_only,
+    read_only,
+    replica_router,
+)
+from app.db.session import create_engine
+from app.modules.inventory.repository import StockMovementRepository
+from app.modules.master_data.brands.models import Brand
+
+
+def _router(**overrides) -> ReplicaRouter:
+    options = dict(max_lag=5, check_interval=5, sticky_seconds=10)
+    options.update(overrides)
+    return ReplicaRouter(
+        ["postgresql+asyncpg://u:p@replica-a/db", "postgresql+asyncpg://u:p@replica-b/db"],
+        engine_factory=lambda url: create_engine(url, pooled=False),
+        **options,
+    )
+
+
+def _mark(replica, healthy=True, lag=0.5, age=0.0):
+    replica.healthy, replica.lag_seconds = healthy, lag
+    replica.checked_at = time.monotonic() - age
+
+
+def test_reads_go_to_fresh_replicas_and_fall_back_to_primary():
+    router = _router()
+    first, second = router.replicas
+    assert router.read_target() is None  # Nothing checked yet
+
+    _mark(first)
+    _mark(second)
+    assert {router.read_target().url, router.read_target().url} == {first.url, second.url}
+
+    _mark(first, lag=30)        # Lagging too far behind
+    _mark(second, age=60)       # Health check result too old
+    assert router.read_target() is None
+
+    _mark(second)
+    assert router.read_target() is second
+    assert router.status()[0]["usable"] is False and router.status()[1]["usable"] is True
+
+
+def test_client_reads_stick_to_primary_after_a_write():
+    key = client_key("Bearer token-1", "10.0.0.1")
+    assert key == client_key("Bearer token-1", "10.0.0.2") != client_key(None, "10.0.0.1")
+    for replica in replica_router.replicas:
+        _mark(replica)
+
+    routing = RequestRouting(client_key=key)
+    token = begin_request(routing)
+    try:
+        _stick_to_primary({"stock_movements"})
+    finally:
+        end_request(token)
+    assert routing.wrote
+
+    # A later request from the same client, and one carrying the sticky cookie
+    assert replica_router.is_sticky(RequestRouting(client_key=key))
+    assert replica_router.is_sticky(RequestRouting(primary_until=time.time() + 5))
+    assert not replica_router.is_sticky(RequestRouting(client_key=client_key("Bearer other", None)))
+
+
+def test_read_sessions_refuse_to_flush_writes():
+    assert is_read_only(StockMovementRepository.get_movement_summary)
+    assert not is_read_only(StockMovementRepository.create)
+
+    session = Session()
+    session.info[READ_ONLY_KEY] = True
+    session.add(Brand(name="Replica Brand"))
+    with pytest.raises(RuntimeError, match="read-only"):
+        session.flush()
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_send_only_read_only_methods_to_the_replica():
+    primary = create_engine("postgresql+asyncpg://u:p@primary/db", pooled=False)
+    replica = create_engine("postgresql+asyncpg://u:p@replica-a/db", pooled=False)
+    session = ReadSession(bind=primary.sync_engine)
+    session.info[REPLICA_ENGINE_KEY] = replica.sync_engine
+
+    class Repository:
+        @read_only
+        async def report(self):
+            return session.get_bind()
+
+        async def lookup(self):
+            return session.get_bind()
+
+    assert is_read_only(Repository.report) and not is_read_only(Repository.lookup)
+    assert await Repository().report() is replica.sync_engine
+    assert await Repository().lookup() is primary.sync_engine
+    assert session.get_bind() is primary.sync_engine
+
+    # Without a fresh replica, marked methods read from the primary too
+    session.info[REPLICA_ENGINE_KEY] = None
+    assert await Repository().report() is primary.sync_engine
@@ -0,0 +1,162 @@
+"""
+Tests for the due-for-return and overdue rental report queries.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.customers.models import Customer, CustomerType
+from app.modules.master_data.locations.models import Location, LocationType
+from app.modules.transactions.base.models import (
+    RentalLifecycle,
+    RentalReturnEvent,
+    RentalStatus,
+    TransactionHeader,
+    TransactionLine,
+    TransactionStatus,
+    TransactionType,
+)
+from app.modules.transactions.rentals.repository import RentalsRepository
+from app.modules.transactions.rentals.services import RentalsService
+from app.modules.transactions.services.rental_service import RentalReturnService
+from tests.conftest import compile_sql
+
+
+def test_precomputed_due_query_never_touches_lines():
+    """The next_due_date path filters on the header column only."""
+    repo = RentalsRepository(session=None)
+    stmt, _ = repo._due_rentals_query(date(2026, 1, 1), inclusive=False, use_next_due_date=True)
+    sql = compile_sql(stmt)
+
+    assert "transaction_lines" not in sql
+    assert "transaction_headers.next_due_date IS NOT NULL" in sql
+    assert "transaction_headers.next_due_date <" in sql
+
+
+def test_line_based_due_query_uses_indexed_predicates():
+    """The fallback path filters lines on rental dates and open statuses in SQL."""
+    repo = RentalsRepository(session=None)
+    stmt, _ = repo._due_rentals_query(date(2026, 1, 1), inclusive=True, use_next_due_date=False)
+    sql = compile_sql(stmt)
+
+    assert "transaction_lines.rental_start_date <=" in sql
+    assert "transaction_lines.rental_end_date <=" in sql
+    assert "transaction_lines.current_rental_status IN" in sql
+    assert "GROUP BY transaction_lines.transaction_id" in sql
+
+
+@pytest.mark.parametrize("inclusive, operator", [(True, "<="), (False, "<")])
+def test_due_cutoff_operator(inclusive, operator):
+    """Due-for-return includes the as-of date, overdue excludes it."""
+    repo = RentalsRepository(session=None)
+    stmt, _ = repo._due_rentals_query(date(2026, 1, 1), inclusive=inclusive, use_next_due_date=True)
+
+    assert f"transaction_headers.next_due_date {operator} %(next_due_date_1)s" in compile_sql(stmt)
+
+
+@pytest.mark.asyncio
+async def test_extension_moves_open_lines_and_next_due_date(db_session, insert_row, rental_status_changes):
+    today = date.today()
+    header = await insert_row(
+        TransactionHeader, transaction_number="EXT-1", transaction_type=TransactionType.RENTAL,
+        status=TransactionStatus.IN_PROGRESS, next_due_date=today + timedelta(days=2),
+    )
+    for number, quantity, returned, status, days in [
+        (1, 2, 0, RentalStatus.ACTIVE, 2),
+        (2, 1, 1, RentalStatus.COMPLETED, -1),
+        (3, 3, 1, RentalStatus.PARTIAL_RETURN, 4),
+    ]:
+        await insert_row(
+            TransactionLine, transaction_id=header, line_number=number, description=f"Line {number}",
+            quantity=Decimal(quantity), returned_quantity=Decimal(returned), current_rental_status=status,
+            rental_start_date=today - timedelta(days=5), rental_end_date=today + timedelta(days=days),
+        )
+    lifecycle = await insert_row(RentalLifecycle, transaction_id=header, current_status=RentalStatus.ACTIVE.value)
+    await db_session.commit()
+    extended_to = today + timedelta(days=10)
+
+    event = await RentalReturnService(db_session).extend_rental(header, extended_to, "Customer request")
+
+    end_dates = (await db_session.execute(
+        select(TransactionLine.line_number, TransactionLine.rental_end_date)
+        .where(TransactionLine.transaction_id == header)
+        .order_by(TransactionLine.line_number)
+    )).all()
+    assert [tuple(row) for row in end_dates] == [
+        (1, extended_to), (2, today - timedelta(days=1)), (3, extended_to),
+    ]
+    next_due = await db_session.execute(select(TransactionHeader.next_due_date).where(TransactionHeader.id == header))
+    assert next_due.scalar_one() == extended_to
+
+    stored = (await db_session.execute(select(RentalReturnEvent).where(RentalReturnEvent.id == event.id))).scalar_one()
+    assert (stored.rental_lifecycle_id, stored.new_return_date) == (lifecycle, extended_to)
+    expected = await db_session.execute(
+        select(RentalLifecycle.expected_return_date).where(RentalLifecycle.id == lifecycle)
+    )
+    assert expected.scalar_one() == extended_to
+    assert rental_status_changes == [(header, RentalStatus.EXTENDED)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_next_due_date", [True, False])
+async def test_due_reports_over_real_rentals(db_session, insert_row, use_next_due_date):
+    today = date.today()
+
+    async def location(code, name, location_type):
+        return str(await insert_row(
+            Location, location_code=code, location_name=name, location_type=location_type.value,
+            address="1 Main Road", city="Aizawl", state="Mizoram", country="India",
+        ))
+
+    warehouse = await location("DUE-WH", "Aizawl Warehouse", LocationType.WAREHOUSE)
+    store = await location("DUE-ST", "Lunglei Store", LocationType.STORE)
+    customer = str(await insert_row(
+        Customer, customer_code="DUE-C1", customer_type=CustomerType.INDIVIDUAL.value,
+        first_name="Mary", last_name="Sailo",
+    ))
+
+    async def rental(number, location_id, due, returned=False):
+        header = await insert_row(
+            TransactionHeader, transaction_number=number, transaction_type=TransactionType.RENTAL,
+            status=TransactionStatus.COMPLETED if returned else TransactionStatus.IN_PROGRESS,
+            customer_id=customer, location_id=location_id, next_due_date=None if returned else due,
+        )
+        await insert_row(
+            TransactionLine, transaction_id=header, line_number=1, description=f"Rental {number}",
+            quantity=Decimal(2), returned_quantity=Decimal(2 if returned else 0), location_id=location_id,
+            rental_start_date=today - timedelta(days=10), rental_end_date=due,
+            current_rental_status=RentalStatus.COMPLETED if returned else RentalStatus.ACTIVE,
+        )
+        return header
+
+    overdue = await rental("DUE-1", warehouse, today - timedelta(days=1))
+    due_today = await rental("DUE-2", warehouse, today)
+    overdue_store = await rental("DUE-3", store, today - timedelta(days=3))
+    await rental("DUE-4", store, today + timedelta(days=5))
+    await rental("DUE-5", store, today - timedelta(days=4), returned=True)
+    await db_session.commit()
+
+    service = RentalsService(db_session)
+    due = await service.get_rental_transactions_due_for_return(use_next_due_date=use_next_due_date)
+    assert [rental.id for rental in due] == [overdue_store, overdue, due_today]
+    assert due[0].location.name == "Lunglei Store" and due[0].customer.name == "Mary Sailo"
+    assert due[0].next_due_date == today - timedelta(days=3)
+
+    late = await service.get_overdue_rentals(use_next_due_date=use_next_due_date)
+    assert [rental.id for rental in late] == [overdue_store, overdue]
+
+    by_location = await service.get_due_rentals_by_location(use_next_due_date=use_next_due_date)
+    assert sorted((g.location_name, g.rental_count, g.earliest_due_date) for g in by_location) == [
+        ("Aizawl Warehouse", 2, today - timedelta(days=1)),
+        ("Lunglei Store", 1, today - timedelta(days=3)),
+    ]
+    overdue_by_location = await service.get_due_rentals_by_location(
+        overdue_only=True, use_next_due_date=use_next_due_date
+    )
+    assert sorted((g.location_name, g.rental_count) for g in overdue_by_location) == [
+        ("Aizawl Warehouse", 1), ("Lunglei Store", 1),
+    ]
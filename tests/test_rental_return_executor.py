@@ -0,0 +1,160 @@
+"""
+Tests for the batched rental return executor.
+"""
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.core.errors import ValidationError
+from app.modules.inventory.models import InventoryUnit, InventoryUnitStatus, StockLevel, StockMovement
+from app.modules.transactions.services.rental_return_executor import (
+    RentalReturnBatchResult,
+    RentalReturnExecutor,
+    RentalReturnLine,
+    RentalReturnLineResult,
+    unit_status_for_return,
+)
+
+
+def _stock_level(item_id, location_id, on_hand, on_rent):
+    stock_level = StockLevel(item_id=item_id, location_id=location_id, quantity_on_hand=Decimal(on_hand))
+    stock_level.id = uuid4()
+    stock_level.quantity_on_rent = Decimal(on_rent)
+    stock_level.quantity_available = Decimal(on_hand) - Decimal(on_rent)
+    return stock_level
+
+
+def _result_for(lines):
+    return RentalReturnBatchResult(lines=[
+        RentalReturnLineResult(
+            index=i,
+            item_id=line.item_id,
+            quantity=line.quantity,
+            unit_status=unit_status_for_return(line.condition, line.cleaning_condition),
+        )
+        for i, line in enumerate(lines)
+    ])
+
+
+def test_unit_status_for_return():
+    assert unit_status_for_return("GOOD", "CLEAN") == "AVAILABLE"
+    assert unit_status_for_return("FAIR", "CLEAN") == "AVAILABLE"
+    assert unit_status_for_return("FAIR", "MAJOR_CLEANING") == "MAINTENANCE"
+    assert unit_status_for_return("POOR", "CLEAN") == "MAINTENANCE"
+    assert unit_status_for_return("DAMAGED", "CLEAN") == "DAMAGED"
+
+
+def test_plan_accumulates_lines_sharing_a_stock_level():
+    item_id, location_id = uuid4(), uuid4()
+    stock_level = _stock_level(item_id, location_id, on_hand=10, on_rent=5)
+    lines = [
+        RentalReturnLine(item_id, location_id, Decimal("2"), "GOOD"),
+        RentalReturnLine(item_id, location_id, Decimal("3"), "FAIR", "MINOR_CLEANING"),
+    ]
+    result = _result_for(lines)
+
+    returned = RentalReturnExecutor.plan(
+        lines, {(str(item_id), str(location_id)): stock_level}, result
+    )
+
+    assert result.success
+    assert returned == {stock_level.id: Decimal("5")}
+    assert [(r.quantity_before, r.quantity_after) for r in result.lines] == [
+        (Decimal("5"), Decimal("7")),
+        (Decimal("7"), Decimal("10")),
+    ]
+
+
+def test_plan_reports_every_failing_line():
+    item_id, location_id = uuid4(), uuid4()
+    stock_level = _stock_level(item_id, location_id, on_hand=10, on_rent=1)
+    lines = [
+        RentalReturnLine(item_id, location_id, Decimal("1"), "GOOD"),
+        RentalReturnLine(item_id, location_id, Decimal("1"), "GOOD"),
+        RentalReturnLine(uuid4(), location_id, Decimal("1"), "GOOD"),
+    ]
+    result = _result_for(lines)
+
+    RentalReturnExecutor.plan(lines, {(str(item_id), str(location_id)): stock_level}, result)
+
+    assert [r.success for r in result.lines] == [True, False, False]
+    assert len(result.errors) == 2
+
+
+def _data_statements(budget) -> int:
+    """Statements counted by ``budget``, leaving out the savepoint around the batch."""
+    return sum(
+        count for sql, count in budget.statements.items()
+        if not sql.upper().startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_applies_a_return_with_a_fixed_number_of_statements(
+    db_session, insert_row, stock_item, query_budget
+):
+    stocks = [await stock_item(f"RET-{n}", on_hand=20, on_rent=20) for n in range(3)]
+    units = [
+        await insert_row(
+            InventoryUnit, item_id=stocks[n % 3].item_id, location_id=stocks[n % 3].location_id,
+            unit_code=f"RET-U{n:02}", status=InventoryUnitStatus.RENTED.value,
+        )
+        for n in range(50)
+    ]
+    await db_session.commit()
+    lines = [
+        RentalReturnLine(stocks[n % 3].item_id, stocks[n % 3].location_id, Decimal("1"), "DAMAGED",
+                         notes="dent", inventory_unit_id=units[n])
+        for n in range(50)
+    ]
+
+    with query_budget() as budget:
+        result = await RentalReturnExecutor(db_session).execute(lines, reference_id="RET-1")
+    await db_session.commit()
+
+    assert result.success
+    assert result.statements == _data_statements(budget) == 4
+    assert [line.quantity_after for line in result.lines[:6]] == [Decimal(n) for n in (1, 1, 1, 2, 2, 2)]
+
+    levels = (await db_session.execute(
+        select(StockLevel.quantity_available, StockLevel.quantity_on_rent).order_by(StockLevel.quantity_available)
+    )).all()
+    assert [tuple(level) for level in levels] == [
+        (Decimal("16"), Decimal("4")), (Decimal("17"), Decimal("3")), (Decimal("17"), Decimal("3")),
+    ]
+
+    unit_rows = (await db_session.execute(select(InventoryUnit.status, InventoryUnit.condition, InventoryUnit.notes))).all()
+    assert {(row.status, row.condition) for row in unit_rows} == {("DAMAGED", "DAMAGED")}
+    assert all(row.notes.endswith("Status updated to DAMAGED: dent") for row in unit_rows)
+
+    movements = (await db_session.execute(
+        select(StockMovement).where(StockMovement.reference_id == "RET-1")
+    )).scalars().all()
+    assert {movement.id for movement in movements} == {line.movement_id for line in result.lines}
+    assert {movement.movement_type for movement in movements} == {"RENTAL_RETURN"}
+
+
+@pytest.mark.asyncio
+async def test_execute_writes_nothing_when_a_line_fails(db_session, stock_item):
+    stock = await stock_item("RET-FAIL", on_hand=10, on_rent=1)
+    await db_session.commit()
+    lines = [
+        RentalReturnLine(stock.item_id, stock.location_id, Decimal("1"), "GOOD"),
+        RentalReturnLine(stock.item_id, stock.location_id, Decimal("1"), "GOOD"),
+    ]
+
+    with pytest.raises(ValidationError, match="Line 2"):
+        await RentalReturnExecutor(db_session).execute(lines, reference_id="RET-2")
+    await db_session.commit()
+
+    level = (await db_session.execute(
+        select(StockLevel.quantity_available, StockLevel.quantity_on_rent)
+        .where(StockLevel.id == stock.stock_level_id)
+    )).one()
+    assert tuple(level) == (Decimal("9"), Decimal("1"))
+    movements = await db_session.execute(select(StockMovement.id).where(StockMovement.reference_id == "RET-2"))
+    assert movements.first() is None
@@ -0,0 +1,149 @@
+"""
+Tests for incremental rental status counters.
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.transactions.base.models import (
+    RentalLifecycle,
+    RentalReturnEvent,
+    RentalStatus,
+    ReturnEventType,
+    TransactionHeader,
+    TransactionLine,
+    TransactionStatus,
+    TransactionType,
+)
+from app.modules.transactions.base.repository import TransactionHeaderRepository
+from app.modules.transactions.services.rental_service import RentalReturnService
+from app.modules.transactions.services.rental_status_calculator import (
+    RentalStatusCalculator,
+)
+from app.modules.transactions.services.rental_status_counters import (
+    RentalCounterDelta,
+    apply_line_return,
+    derive_header_status,
+    line_return_delta,
+)
+
+
+def test_line_return_delta_transitions():
+    assert line_return_delta(Decimal("3"), Decimal("0"), Decimal("1")) == RentalCounterDelta(0, 1, Decimal("1"))
+    assert line_return_delta(Decimal("3"), Decimal("1"), Decimal("3")) == RentalCounterDelta(1, -1, Decimal("2"))
+    assert line_return_delta(Decimal("3"), Decimal("0"), Decimal("3")) == RentalCounterDelta(1, 0, Decimal("3"))
+    assert line_return_delta(Decimal("3"), Decimal("1"), Decimal("2")).is_empty is False
+
+
+def test_apply_line_return_sets_line_status():
+    line = TransactionLine(
+        transaction_id="t", line_number=1, line_type="PRODUCT", description="x",
+        quantity=Decimal("2"), unit_price=Decimal("1"),
+    )
+    line.rental_end_date = date(2024, 1, 10)
+    line.returned_quantity = Decimal("1")
+
+    delta = apply_line_return(line, Decimal("0"), as_of_date=date(2024, 1, 12))
+
+    assert line.current_rental_status == RentalStatus.LATE_PARTIAL_RETURN
+    assert delta == RentalCounterDelta(0, 1, Decimal("1"))
+
+
+@pytest.mark.asyncio
+async def test_derived_status_matches_full_recalculation():
+    rng = random.Random(7)
+    calculator = RentalStatusCalculator(session=None)
+    today = date(2024, 6, 1)
+
+    for _ in range(300):
+        header = TransactionHeader(transaction_type=TransactionType.RENTAL)
+        counters = RentalCounterDelta()
+        open_end_dates = []
+        lines = []
+        for _ in range(rng.randint(1, 5)):
+            quantity = Decimal(rng.randint(1, 4))
+            line = TransactionLine(
+                transaction_id="t", line_number=1, line_type="PRODUCT", description="x",
+                quantity=quantity, unit_price=Decimal("1"),
+            )
+            line.rental_end_date = today + timedelta(days=rng.randint(-5, 5))
+            new_returned = Decimal(rng.randint(0, int(quantity)))
+            line.returned_quantity = new_returned
+            counters += apply_line_return(line, Decimal("0"), today)
+            if new_returned < quantity:
+                open_end_dates.append(line.rental_end_date)
+            lines.append(line)
+        header.transaction_lines = lines
+
+        expected = await calculator.calculate_header_status(header, today)
+        derived = derive_header_status(
+            len(lines),
+            counters.returned_lines,
+            counters.partial_lines,
+            min(open_end_dates) if open_end_dates else None,
+            today,
+        )
+        assert derived == expected
+
+
+def test_counter_recompute_is_one_grouped_query():
+    sql = str(
+        TransactionHeaderRepository._rental_counter_aggregates()
+        .compile(dialect=postgresql.dialect())
+    )
+    assert "FILTER (WHERE transaction_lines.returned_quantity >= transaction_lines.quantity)" in sql
+    assert "GROUP BY transaction_lines.transaction_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_completing_a_return_increments_the_committed_quantity(db_session, insert_row):
+    today = date.today()
+    header = await insert_row(
+        TransactionHeader, transaction_number="CNT-1", transaction_type=TransactionType.RENTAL,
+        status=TransactionStatus.IN_PROGRESS, next_due_date=today + timedelta(days=3), rental_line_count=1,
+    )
+    line = await insert_row(
+        TransactionLine, transaction_id=header, line_number=1, description="Scaffold tower",
+        quantity=Decimal(3), unit_price=Decimal(10), rental_start_date=today - timedelta(days=2),
+        rental_end_date=today + timedelta(days=3), current_rental_status=RentalStatus.ACTIVE,
+    )
+    lifecycle = await insert_row(RentalLifecycle, transaction_id=header, current_status=RentalStatus.ACTIVE.value)
+    event = await insert_row(
+        RentalReturnEvent, rental_lifecycle_id=lifecycle, event_type=ReturnEventType.PARTIAL_RETURN.value,
+        event_date=today, items_returned=[{"transaction_line_id": str(line), "quantity": 1.0}],
+        total_quantity_returned=Decimal(1),
+    )
+    await db_session.commit()
+
+    service = RentalReturnService(db_session)
+    await service.status_service.get_rental_transaction(header)  # The line is now loaded with 0 returned
+    # Another worker completes a return of the same line in the meantime
+    await db_session.execute(
+        update(TransactionLine.__table__).where(TransactionLine.__table__.c.id == line).values(returned_quantity=1)
+    )
+    await db_session.execute(
+        update(TransactionHeader.__table__)
+        .where(TransactionHeader.__table__.c.id == header)
+        .values(partial_return_line_count=1, returned_quantity_total=1)
+    )
+
+    await service.complete_return(event)
+
+    returned = (await db_session.execute(
+        select(TransactionLine.__table__.c.returned_quantity).where(TransactionLine.__table__.c.id == line)
+    )).scalar_one()
+    counters = (await db_session.execute(
+        select(
+            TransactionHeader.__table__.c.returned_line_count,
+            TransactionHeader.__table__.c.partial_return_line_count,
+            TransactionHeader.__table__.c.returned_quantity_total,
+        ).where(TransactionHeader.__table__.c.id == header)
+    )).one()
+    assert returned == Decimal(2)
+    assert tuple(counters) == (0, 1, Decimal(2))
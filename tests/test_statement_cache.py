@@ -0,0 +1,27 @@
+"""
+Tests for the prepared statement caching modes.
+"""
+
+import pytest
+
+from app.db.session import StatementCacheMode, statement_cache_args
+
+
+def test_direct_mode_caches_statements_under_unique_names():
+    args = statement_cache_args(StatementCacheMode.DIRECT, 500)
+    assert args["prepared_statement_cache_size"] == 500
+    assert args["statement_cache_size"] == 500
+
+    name_func = args["prepared_statement_name_func"]
+    first, second = name_func(), name_func()
+    assert first != second and first.startswith("__asyncpg_")
+
+
+def test_transaction_pooling_mode_disables_caching():
+    args = statement_cache_args("transaction_pooling", 500)
+    assert args["prepared_statement_cache_size"] == 0
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+
+    with pytest.raises(ValueError):
+        statement_cache_args("session_pooling", 500)
@@ -0,0 +1,106 @@
+"""
+Tests for the single-pass statistics builder and its cache.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.customers.models import Customer, CustomerType
+from app.modules.suppliers.models import Supplier, SupplierType
+from app.shared.statistics import StatisticsQuery, statistics_cache
+from tests.conftest import compile_sql
+
+
+def _row(**values):
+    return SimpleNamespace(_mapping=values)
+
+
+def _supplier_stats():
+    active = Supplier.is_active == True
+    return (
+        StatisticsQuery(Supplier, "test_suppliers")
+        .count("total")
+        .count("active", active)
+        .breakdown("by_type", Supplier.supplier_type, active)
+        .breakdown("by_country", Supplier.country, active, top=1)
+    )
+
+
+_ROWS = [
+    _row(total=5, active=4, _b0_key=None, _b0_count=4, _b0_grouping=1,
+         _b1_key=None, _b1_count=4, _b1_grouping=1),
+    _row(total=3, active=3, _b0_key="INVENTORY", _b0_count=3, _b0_grouping=0,
+         _b1_key=None, _b1_count=3, _b1_grouping=1),
+    _row(total=2, active=1, _b0_key="SERVICE", _b0_count=1, _b0_grouping=0,
+         _b1_key=None, _b1_count=1, _b1_grouping=1),
+    _row(total=1, active=0, _b0_key="SERVICE_OLD", _b0_count=0, _b0_grouping=0,
+         _b1_key=None, _b1_count=0, _b1_grouping=1),
+    _row(total=3, active=3, _b0_key=None, _b0_count=3, _b0_grouping=1,
+         _b1_key="India", _b1_count=3, _b1_grouping=0),
+    _row(total=1, active=1, _b0_key=None, _b0_count=1, _b0_grouping=1,
+         _b1_key="Nepal", _b1_count=1, _b1_grouping=0),
+    _row(total=1, active=0, _b0_key=None, _b0_count=0, _b0_grouping=1,
+         _b1_key=None, _b1_count=0, _b1_grouping=0),
+]
+
+
+def test_statement_uses_filtered_counts_and_grouping_sets():
+    sql = compile_sql(_supplier_stats().statement())
+    assert "count(*) FILTER (WHERE suppliers.is_active = true) AS active" in sql
+    assert "GROUPING SETS((), (suppliers.supplier_type), (suppliers.country))" in sql
+    assert "grouping(suppliers.country)" in sql
+
+
+def test_parse_separates_total_row_from_breakdowns():
+    result = _supplier_stats().parse(_ROWS)
+    assert result == {
+        "total": 5,
+        "active": 4,
+        "by_type": {"INVENTORY": 3, "SERVICE": 1},
+        "by_country": {"India": 3},
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_reads_real_rows_and_is_cached_until_table_is_written(db_session, insert_row, query_budget):
+    statistics_cache.clear()
+    for code, supplier_type, country, active in [
+        ("ST-1", SupplierType.INVENTORY, "India", True),
+        ("ST-2", SupplierType.INVENTORY, "India", True),
+        ("ST-3", SupplierType.INVENTORY, "India", True),
+        ("ST-4", SupplierType.SERVICE, "Nepal", True),
+        ("ST-5", SupplierType.DIRECT, None, False),
+    ]:
+        await insert_row(Supplier, supplier_code=code, company_name=f"Supplier {code}",
+                         supplier_type=supplier_type.value, country=country, is_active=active)
+    await db_session.commit()
+    stats = _supplier_stats()
+
+    with query_budget() as budget:
+        first = await stats.fetch(db_session)
+        second = await stats.fetch(db_session)
+    assert first == second == {
+        "total": 5,
+        "active": 4,
+        "by_type": {"INVENTORY": 3, "SERVICE": 1},
+        "by_country": {"India": 3},
+    }
+    assert budget.count == 1
+
+    # Writes to other tables keep the cached result
+    await insert_row(Customer, customer_code="ST-C1", customer_type=CustomerType.BUSINESS.value)
+    await db_session.commit()
+    with query_budget() as budget:
+        await stats.fetch(db_session)
+    assert budget.count == 0
+
+    await insert_row(Supplier, supplier_code="ST-6", company_name="Supplier ST-6",
+                     supplier_type=SupplierType.SERVICE.value, country="Nepal")
+    await db_session.commit()
+    with query_budget() as budget:
+        third = await stats.fetch(db_session)
+    assert budget.count == 1
+    assert (third["total"], third["by_type"]["SERVICE"]) == (6, 2)
+    statistics_cache.clear()
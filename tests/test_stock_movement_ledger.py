@@ -0,0 +1,127 @@
+"""
+Tests for the partitioned stock movement ledger and its daily aggregates.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, select
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.inventory.models import STOCK_MOVEMENT_ROLLUP_FUNCTION, StockMovement, stock_movement_daily
+from app.modules.inventory.partitions import (
+    add_months,
+    partition_bounds,
+    partition_month,
+    partition_name,
+)
+from app.modules.inventory.repository import StockMovementRepository, summary_window
+
+UTC = timezone.utc
+
+
+def test_table_is_partitioned_monthly_with_created_at_in_primary_key():
+    table = StockMovement.__table__
+    assert table.dialect_options["postgresql"]["partition_by"] == "RANGE (created_at)"
+    assert [column.name for column in table.primary_key.columns] == ["id", "created_at"]
+    assert [column.name for column in StockMovement.__mapper__.primary_key] == ["id"]
+
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+    assert partition_name(date(2026, 2, 1)) == "stock_movements_p2026_02"
+    assert partition_month("stock_movements_p2026_02") == date(2026, 2, 1)
+    assert partition_month("stock_movements_default") is None
+    assert partition_bounds(date(2026, 12, 1)) == (
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
+
+
+def test_summary_window_reads_whole_days_from_aggregates():
+    start = datetime(2026, 3, 1, 15, 30, tzinfo=UTC)
+    end = datetime(2026, 3, 10, 12, 0, tzinfo=UTC)
+    window = summary_window(start, end)
+    assert window.has_days
+    assert (window.first_day, window.end_day) == (date(2026, 3, 2), date(2026, 3, 10))
+    assert window.raw_ranges == [
+        (start, datetime(2026, 3, 2, tzinfo=UTC)),
+        (datetime(2026, 3, 10, tzinfo=UTC), end + timedelta(microseconds=1)),
+    ]
+
+    # Midnight starts need no raw edge; naive values are UTC
+    window = summary_window(datetime(2026, 3, 1), None)
+    assert window.first_day == date(2026, 3, 1) and window.end_day is None
+    assert window.raw_ranges == []
+
+    # Less than a whole day is read entirely from movements
+    window = summary_window(start, datetime(2026, 3, 2, 9, 0, tzinfo=UTC))
+    assert not window.has_days and len(window.raw_ranges) == 1
+
+
+@pytest.mark.asyncio
+async def test_recent_movements_and_summary_over_real_movements(db_session, stock_item, query_budget):
+    drill = await stock_item("LEDGER-1", on_hand=100)
+    saw = await stock_item("LEDGER-2", on_hand=100)
+
+    def movement(stock, at, movement_type, change):
+        return {
+            "stock_level_id": stock.stock_level_id, "item_id": stock.item_id, "location_id": stock.location_id,
+            "movement_type": movement_type, "reference_type": "TRANSACTION", "reason": movement_type.title(),
+            "quantity_change": Decimal(change), "quantity_before": Decimal("100"),
+            "quantity_after": Decimal("100") + Decimal(change), "created_at": at,
+        }
+
+    await db_session.execute(insert(StockMovement.__table__), [
+        movement(drill, datetime(2026, 3, 1, 10, 0, tzinfo=UTC), "SALE", -1),    # before the window
+        movement(drill, datetime(2026, 3, 1, 16, 0, tzinfo=UTC), "SALE", -2),    # leading partial day
+        movement(drill, datetime(2026, 3, 5, 12, 0, tzinfo=UTC), "PURCHASE", 20),
+        movement(drill, datetime(2026, 3, 5, 13, 0, tzinfo=UTC), "SALE", -3),
+        movement(drill, datetime(2026, 3, 9, 23, 0, tzinfo=UTC), "SALE", -1),
+        movement(drill, datetime(2026, 3, 10, 11, 0, tzinfo=UTC), "SALE", -2),   # trailing partial day
+        movement(drill, datetime(2026, 3, 10, 13, 0, tzinfo=UTC), "SALE", -5),   # after the window
+        movement(saw, datetime(2026, 3, 5, 12, 0, tzinfo=UTC), "SALE", -4),
+    ])
+    await db_session.commit()
+
+    # The rollup trigger keeps one row per item, location, UTC day and type
+    daily = stock_movement_daily.c
+    rows = (await db_session.execute(
+        select(daily.movement_type, daily.movement_count, daily.quantity_in, daily.quantity_out, daily.net_change)
+        .where(daily.item_id == drill.item_id, daily.movement_day == date(2026, 3, 5))
+        .order_by(daily.movement_type)
+    )).all()
+    assert [tuple(row) for row in rows] == [
+        ("PURCHASE", 1, Decimal("20"), Decimal("0"), Decimal("20")),
+        ("SALE", 1, Decimal("0"), Decimal("3"), Decimal("-3")),
+    ]
+
+    repository = StockMovementRepository(db_session)
+    recent = await repository.get_recent_by_item(drill.item_id, limit=3)
+    assert [movement.quantity_change for movement in recent] == [Decimal("-5"), Decimal("-2"), Decimal("-1")]
+
+    with query_budget() as budget:
+        summary = await repository.get_movement_summary(
+            drill.item_id,
+            start_date=datetime(2026, 3, 1, 15, 30, tzinfo=UTC),
+            end_date=datetime(2026, 3, 10, 12, 0, tzinfo=UTC),
+        )
+    assert budget.count == 2  # whole days from the aggregates, edges from movements
+
+    assert summary["total_movements"] == 5
+    assert summary["total_increases"] == Decimal("20")
+    assert summary["total_decreases"] == Decimal("8")
+    assert summary["net_change"] == Decimal("12")
+    assert summary["movement_types"]["SALE"] == {"count": 4, "total_quantity": Decimal("-8")}
+    assert summary["movement_types"]["PURCHASE"] == {"count": 1, "total_quantity": Decimal("20")}
+
+
+def test_create_all_attaches_daily_rollup_trigger(create_all_ddl):
+    table = next(n for n, s in enumerate(create_all_ddl) if s.startswith("CREATE TABLE stock_movements "))
+    function = next(s for s in create_all_ddl if "FUNCTION stock_movements_daily_rollup_trigger()" in s)
+    trigger = next(n for n, s in enumerate(create_all_ddl) if s.startswith("CREATE TRIGGER stock_movements_daily_rollup"))
+
+    # The statement the migration runs, with DDL's doubled percent signs undone
+    assert function == STOCK_MOVEMENT_ROLLUP_FUNCTION.strip()
+    assert "movement stock_movements%ROWTYPE;" in function
+    assert "INSERT INTO stock_movement_daily" in function
+    assert table < trigger
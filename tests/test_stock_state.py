@@ -0,0 +1,115 @@
+"""
+Tests for trigger-maintained stock state and the low-stock queries that read it.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.main  # noqa: F401 - registers all mappers
+from app.db.base import Base
+from app.modules.inventory.models import StockLevel, StockState, stock_state_for
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.item_master.repository import ItemMasterRepository
+from app.modules.master_data.locations.models import Location
+from app.modules.master_data.units.models import UnitOfMeasurement
+from tests.conftest import TEST_DATABASE_URL
+
+# Scratch schema for the create_all check (public stays on the path for pg_trgm)
+CREATE_ALL_SCHEMA = "stock_state_create_all"
+
+
+def test_stock_state_for_matches_reorder_rules():
+    assert stock_state_for(Decimal("0"), 5) == StockState.OUT_OF_STOCK
+    assert stock_state_for(Decimal("0"), 0) == StockState.OUT_OF_STOCK
+    assert stock_state_for(Decimal("5"), 5) == StockState.LOW_STOCK
+    assert stock_state_for(Decimal("6"), 5) == StockState.IN_STOCK
+    assert stock_state_for(Decimal("1"), 0) == StockState.IN_STOCK
+    assert stock_state_for(Decimal("1"), None) == StockState.IN_STOCK
+
+
+@pytest.mark.asyncio
+async def test_low_stock_queries_read_the_trigger_maintained_state(db_session, stock_item, query_budget):
+    out = await stock_item("LS-OUT", on_hand=0, reorder_point=5)
+    await stock_item("LS-NONE", on_hand=0, reorder_point=0)
+    rented = await stock_item("LS-RENT", on_hand=10, on_rent=8, reorder_point=5)
+    low = await stock_item("LS-LOW", on_hand=3, reorder_point=5)
+    await stock_item("LS-OK", on_hand=20, reorder_point=5)
+    await db_session.commit()
+
+    states = dict((await db_session.execute(
+        select(Item.sku, StockLevel.stock_state).join(StockLevel, StockLevel.item_id == Item.id)
+    )).all())
+    assert states == {
+        "LS-OUT": "OUT_OF_STOCK", "LS-NONE": "OUT_OF_STOCK", "LS-RENT": "LOW_STOCK",
+        "LS-LOW": "LOW_STOCK", "LS-OK": "IN_STOCK",
+    }
+
+    repository = ItemMasterRepository(db_session)
+    low_stock = await repository.get_low_stock_items()
+    assert [item.id for item in low_stock] == [out.item_id, rented.item_id, low.item_id]
+
+    with query_budget() as budget:
+        summary = await repository.get_stock_alerts_summary()
+    assert summary == {"out_of_stock": 2, "low_stock": 2, "total_items": 5, "avg_reorder_point": 5.0}
+    assert budget.count == 1
+
+    # Restocking fires the trigger and takes the item off the low-stock list
+    await db_session.execute(
+        update(StockLevel).where(StockLevel.id == low.stock_level_id)
+        .values(quantity_on_hand=Decimal("30"), quantity_available=Decimal("30"))
+    )
+    await db_session.commit()
+    assert [item.id for item in await repository.get_low_stock_items()] == [out.item_id, rented.item_id]
+    assert (await repository.get_stock_alerts_summary())["low_stock"] == 1
+
+
+def test_create_all_attaches_stock_state_triggers(create_all_ddl):
+    tables = [statement for statement in create_all_ddl if statement.startswith("CREATE TABLE")]
+    triggers = [statement for statement in create_all_ddl if statement.startswith("CREATE TRIGGER")]
+
+    assert any(statement.startswith("CREATE TABLE stock_levels") for statement in tables)
+    assert any("stock_levels_stock_state" in statement and "ON stock_levels" in statement for statement in triggers)
+    assert any("items_refresh_stock_state" in statement and "ON items" in statement for statement in triggers)
+
+
+@pytest.mark.asyncio
+async def test_create_all_schema_keeps_stock_state_current():
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"server_settings": {"search_path": f"{CREATE_ALL_SCHEMA}, public"}},
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {CREATE_ALL_SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {CREATE_ALL_SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all)
+
+            session = AsyncSession(bind=conn)
+            unit = UnitOfMeasurement(name="Each")
+            location = Location(
+                location_code="L1", location_name="Store", location_type="STORE",
+                address="1 Main Road", city="Aizawl", state="Mizoram", country="India",
+            )
+            session.add_all([unit, location])
+            await session.flush()
+            item = Item(sku="T-1", item_name="Drill", unit_of_measurement_id=unit.id, reorder_point=5)
+            session.add(item)
+            await session.flush()
+            session.add(StockLevel(item_id=item.id, location_id=location.id, quantity_on_hand=Decimal("3")))
+            await session.flush()
+
+            state = select(StockLevel.stock_state, StockLevel.below_reorder)
+            assert (await conn.execute(state)).one() == ("LOW_STOCK", True)
+
+            await conn.execute(update(Item).where(Item.id == item.id).values(reorder_point=2))
+            assert (await conn.execute(state)).one() == ("IN_STOCK", False)
+
+            await conn.execute(text(f"DROP SCHEMA {CREATE_ALL_SCHEMA} CASCADE"))
+            await conn.commit()
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Test database unavailable: {exc}")
+    finally:
+        await engine.dispose()
@@ -0,0 +1,156 @@
+"""
+Tests for the in-memory typeahead prefix index and how it is kept current.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import app.main  # noqa: F401 - registers all mappers
+from app.modules.autocomplete import service as autocomplete_service
+from app.modules.autocomplete.index import PrefixIndex, word_keys
+from app.modules.autocomplete.service import TypeaheadService
+from app.modules.customers.models import Customer, CustomerType
+from app.modules.master_data.item_master.models import Item
+from app.modules.master_data.units.models import UnitOfMeasurement
+from app.modules.suppliers.models import Supplier, SupplierType
+
+
+def _index():
+    index = PrefixIndex()
+    index.rebuild([
+        ("1", "Cordless Drill 18V (DRL-001)", ["DRL-001", *word_keys("Cordless Drill 18V")]),
+        ("2", "Drill Press (DRL-002)", ["DRL-002", *word_keys("Drill Press")]),
+        ("3", "Circular Saw (SAW-001)", ["SAW-001", *word_keys("Circular Saw")]),
+    ])
+    return index
+
+
+def test_search_matches_code_and_any_word_prefix():
+    index = _index()
+    assert [entity_id for entity_id, _ in index.search("drl")] == ["1", "2"]
+    assert [entity_id for entity_id, _ in index.search("DRILL")] == ["1", "2"]
+    assert index.search("saw") == [("3", "Circular Saw (SAW-001)")]
+    assert index.search("xyz") == []
+    assert len(index.search("d", limit=1)) == 1
+
+
+def test_upsert_and_remove_keep_index_sorted():
+    index = _index()
+    index.upsert("3", "Mitre Saw (SAW-001)", ["SAW-001", *word_keys("Mitre Saw")])
+    assert index.search("circ") == []
+    assert index.search("mitre") == [("3", "Mitre Saw (SAW-001)")]
+
+    assert index.remove("1") is True
+    assert index.remove("1") is False
+    assert [entity_id for entity_id, _ in index.search("dr")] == ["2"]
+    assert index._keys == sorted(index._keys)
+
+
+def test_max_entries_bounds_index():
+    index = PrefixIndex(max_entries=2)
+    index.rebuild([(str(i), f"Item {i}", [f"item {i}"]) for i in range(5)])
+    assert len(index) == 2
+    assert index.stats()["dropped"] == 3
+    assert index.upsert("9", "Item 9", ["item 9"]) is False
+    assert index.stats()["memory_bytes"] > 0
+
+
+def test_lookup_latency_on_large_index():
+    index = PrefixIndex()
+    index.rebuild(
+        (str(i), f"Item {i}", [f"SKU-{i:06d}", *word_keys(f"Tool {i % 500} Model {i}")])
+        for i in range(100000)
+    )
+    started = time.perf_counter()
+    for _ in range(100):
+        results = index.search("sku-0421", limit=10)
+    per_lookup_ms = (time.perf_counter() - started) * 1000 / 100
+    assert len(results) == 10
+    assert per_lookup_ms < 1.0
+
+
+@pytest.mark.asyncio
+async def test_requests_never_wait_for_a_full_build(monkeypatch):
+    service = TypeaheadService()
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def slow_build():
+        started.set()
+        await finish.wait()
+
+    monkeypatch.setattr(service, "_rebuild_in_background", slow_build)
+
+    # Not built yet: the build starts in the background and the request goes on
+    await service.ensure_current(session=None)
+    await started.wait()
+    assert service.rebuilding and service.suggest("drill") == []
+
+    # A second request does not start another build
+    task = service._rebuild_task
+    await service.ensure_current(session=None)
+    assert service._rebuild_task is task
+
+    finish.set()
+    await task
+    assert not service.rebuilding
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_writes_reach_the_indexes_as_deltas(db_session, insert_row, monkeypatch):
+    unit = await insert_row(UnitOfMeasurement, name="Each")
+    drill = await insert_row(
+        Item, sku="DRL-001", item_name="Cordless Drill", unit_of_measurement_id=unit, reorder_point=0
+    )
+    acme = await insert_row(
+        Customer, customer_code="CUS-001", customer_type=CustomerType.BUSINESS.value, business_name="Acme Builders"
+    )
+    apex = await insert_row(
+        Customer, customer_code="CUS-002", customer_type=CustomerType.BUSINESS.value, business_name="Apex Rentals"
+    )
+    await db_session.commit()
+
+    service = TypeaheadService()
+    await service.rebuild(db_session)
+    await db_session.commit()
+    assert service.suggest("cordless") == [{"id": str(drill), "label": "Cordless Drill (DRL-001)", "type": "item"}]
+    assert [s["id"] for s in service.suggest("a", types=["customer"])] == [str(acme), str(apex)]
+
+    async def full_load(*args):
+        raise AssertionError("a write must not trigger a full load")
+
+    monkeypatch.setattr(service, "_load", full_load)
+    monkeypatch.setattr(autocomplete_service, "typeahead_service", service)
+
+    # Rename an item, deactivate a customer, add a supplier (Core insert: no ORM hooks)
+    (await db_session.get(Item, drill)).item_name = "Hammer Drill"
+    (await db_session.get(Customer, acme)).is_active = False
+    depot = await insert_row(
+        Supplier, supplier_code="SUP-001", company_name="Drill Depot", supplier_type=SupplierType.DISTRIBUTOR.value
+    )
+    await db_session.commit()
+
+    await service.ensure_current(db_session)
+    await db_session.commit()
+    assert service.suggest("hammer") == [{"id": str(drill), "label": "Hammer Drill (DRL-001)", "type": "item"}]
+    assert service.suggest("cordless") == []
+    assert service.suggest("depot") == [{"id": str(depot), "label": "Drill Depot (SUP-001)", "type": "supplier"}]
+    assert [s["id"] for s in service.suggest("a", types=["customer"])] == [str(apex)]
+
+    # A hard delete leaves no row for a delta to find; the write hook removes it on commit
+    await db_session.delete(await db_session.get(Customer, apex))
+    assert service.suggest("apex")
+    await db_session.commit()
+    assert service.suggest("apex") == []
+
+
+def test_create_all_attaches_version_triggers_for_typeahead_tables(create_all_ddl):
+    for table in ("items", "customers", "suppliers"):
+        assert any(
+            statement.startswith(f"CREATE TRIGGER {table}_bump_cache_version")
+            and f"bump_cache_version('{table}')" in statement
+            for statement in create_all_ddl
+        )